@@ -0,0 +1,257 @@
+"""
+CACHED JWT AUTHENTICATION
+
+Resolves the user behind a JWT from a short-lived cache instead of the
+database.
+
+simplejwt's JWTAuthentication runs `SELECT ... FROM accounts_user` on every
+API request, and views that touch `request.user.profile` add a second query.
+CachedJWTAuthentication keeps a snapshot of every concrete User and Profile
+field except the password hash, and rebuilds real model instances from it
+with Model.from_db(), so views reading any user or profile field run no
+extra query. The password is deferred (unless CHECK_REVOKE_TOKEN needs it):
+reading `request.user.password` loads it from the database as usual, and
+`request.user.save()` only writes the loaded fields.
+
+Snapshots are keyed by a per-user version number. Saving or deleting the user
+or their profile bumps the version (see apps.accounts.signals), so a request
+that raced with the save can only ever write a snapshot nobody reads again.
+`User.objects.update()` does not send signals; the short TTL bounds how long
+such changes take to show up.
+"""
+
+import time
+
+from django.core.cache import caches
+from django.db import connection
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.common.app_settings import setting_getter
+
+from .models import Profile, User
+
+
+DEFAULT_AUTH_USER_CACHE_SETTINGS = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60,
+}
+
+# Bump when the snapshot layout changes so old entries are never decoded
+SNAPSHOT_VERSION = 2
+
+# User fields kept out of the cache (loaded on access instead)
+SECRET_USER_FIELDS = ('password',)
+
+
+get_auth_user_cache_setting = setting_getter('AUTH_USER_CACHE', DEFAULT_AUTH_USER_CACHE_SETTINGS)
+
+
+def concrete_attnames(model, exclude=()):
+    """Return the model's concrete field attnames in field order (what from_db expects)."""
+    return [field.attname for field in model._meta.concrete_fields if field.attname not in exclude]
+
+
+class UserSnapshotCache:
+    """
+    Service class for the versioned authenticated-user snapshot cache.
+
+    Example:
+        >>> user = UserSnapshotCache.get_user(42)   # database on first call
+        >>> user = UserSnapshotCache.get_user(42)   # cache afterwards
+        >>> UserSnapshotCache.invalidate(42)        # from the save signals
+    """
+
+    @staticmethod
+    def cache():
+        return caches[get_auth_user_cache_setting('CACHE_ALIAS')]
+
+    @staticmethod
+    def version_key(user_id):
+        return f'auth_user_version:{user_id}'
+
+    @staticmethod
+    def snapshot_key(user_id, version):
+        return f'auth_user:{SNAPSHOT_VERSION}:{user_id}:{version}'
+
+    @staticmethod
+    def user_fields():
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return concrete_attnames(User)
+        return concrete_attnames(User, exclude=SECRET_USER_FIELDS)
+
+    @classmethod
+    def get_user(cls, user_id):
+        """
+        Return the user with the given id, built from the cached snapshot when possible.
+
+        Args:
+            user_id: Primary key of the user
+
+        Returns:
+            User or None: The user (with `profile` preloaded if it exists), or
+                None if there is no such user
+        """
+        cache = cls.cache()
+        version = cache.get(cls.version_key(user_id), 0)
+        key = cls.snapshot_key(user_id, version)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = cls.load_snapshot(user_id)
+            if snapshot is None:
+                return None
+            cache.set(key, snapshot, get_auth_user_cache_setting('TIMEOUT'))
+        return cls.build_user(snapshot)
+
+    @classmethod
+    def load_snapshot(cls, user_id):
+        """
+        Read the snapshot fields of a user and their profile in one query.
+
+        Args:
+            user_id: Primary key of the user
+
+        Returns:
+            dict or None: {'user': {...}, 'profile': {...} or None}
+        """
+        user_fields = cls.user_fields()
+        profile_fields = concrete_attnames(Profile)
+        row = User.objects.filter(pk=user_id).values(
+            *user_fields, *[f'profile__{name}' for name in profile_fields]
+        ).first()
+        if row is None:
+            return None
+        profile = {name: row[f'profile__{name}'] for name in profile_fields}
+        return {
+            'user': {name: row[name] for name in user_fields},
+            'profile': profile if profile['id'] is not None else None,
+        }
+
+    @staticmethod
+    def build_user(snapshot):
+        """
+        Turn a snapshot back into User and Profile instances, as if loaded from the database.
+
+        Args:
+            snapshot (dict): As returned by load_snapshot()
+
+        Returns:
+            User: The user with the snapshot fields loaded and the secret ones deferred
+        """
+        user_values = snapshot['user']
+        user = User.from_db(User.objects.db, list(user_values), list(user_values.values()))
+        profile_values = snapshot['profile']
+        if profile_values is not None:
+            profile = Profile.from_db(Profile.objects.db, list(profile_values), list(profile_values.values()))
+            Profile.user.field.set_cached_value(profile, user)
+            User.profile.related.set_cached_value(user, profile)
+        return user
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Retire the cached snapshot of a user by moving to a new version.
+
+        Args:
+            user_id: Primary key of the user
+        """
+        cache = cls.cache()
+        key = cls.version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user through UserSnapshotCache.
+
+    Behaves like the simplejwt class it replaces: unknown and inactive users
+    are rejected, and CHECK_REVOKE_TOKEN is honoured.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Return the user for a validated token.
+
+        Args:
+            validated_token (Token): The validated access token
+
+        Returns:
+            User: The authenticated user
+
+        Raises:
+            InvalidToken: If the token carries no user id
+            AuthenticationFailed: If the user is missing, inactive or changed
+                their password (with CHECK_REVOKE_TOKEN)
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = UserSnapshotCache.get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            from rest_framework_simplejwt.utils import get_md5_hash_password
+
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+def run_authentication_benchmark(user, requests=1000):
+    """
+    Compare per-request authentication cost of simplejwt and the cached class.
+
+    Each round authenticates a request carrying a fresh access token for the
+    user and reads `role` and `profile.is_approved`, as permission classes and
+    provider views do.
+
+    Args:
+        user (User): User to authenticate as
+        requests (int): Requests per authentication class
+
+    Returns:
+        dict: Per class name, the elapsed_ms, microseconds_per_request and
+            queries_per_request
+    """
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    factory = APIRequestFactory()
+    header = f'Bearer {AccessToken.for_user(user)}'
+    UserSnapshotCache.invalidate(user.pk)
+
+    results = {}
+    for authentication in (JWTAuthentication(), CachedJWTAuthentication()):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for index in range(requests):
+                request = factory.get('/api/auth/users/me/', HTTP_AUTHORIZATION=header)
+                authenticated, token = authentication.authenticate(request)
+                authenticated.role
+                try:
+                    authenticated.profile.is_approved
+                except Profile.DoesNotExist:
+                    pass
+            elapsed = time.perf_counter() - started
+        results[type(authentication).__name__] = {
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'microseconds_per_request': round(elapsed * 1_000_000 / requests, 1),
+            'queries_per_request': round(len(queries.captured_queries) / requests, 3),
+        }
+    return results
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.authentication import run_authentication_benchmark
+from apps.accounts.models import User
+
+
+class Command(BaseCommand):
+    """
+    Management command to measure per-request JWT authentication overhead.
+    
+    Authenticates the same bearer token repeatedly with simplejwt's
+    JWTAuthentication and with CachedJWTAuthentication, touching the user's
+    role and profile like permission classes do, and reports the time and
+    database queries each class spends per request.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Benchmark per-request cost of JWT authentication with and without the user snapshot cache'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument('--user-id', type=int, default=None,
+                            help='User to authenticate as (default: first active user)')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='Requests per authentication class (default: 1000)')
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        users = User.objects.filter(is_active=True)
+        if options['user_id']:
+            users = users.filter(pk=options['user_id'])
+        user = users.order_by('pk').first()
+        if user is None:
+            raise CommandError('No active user found to authenticate as')
+
+        results = run_authentication_benchmark(user, requests=options['requests'])
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name}: {result['microseconds_per_request']} us/request, "
+                f"{result['queries_per_request']} queries/request ({result['elapsed_ms']} ms total)"
+            )
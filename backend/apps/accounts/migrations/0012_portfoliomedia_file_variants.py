@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_portfoliomedia_is_featured'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfoliomedia',
+            name='file_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/JPEG derivatives of image media (see apps.common.images)'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:13
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_profile_rating_totals(apps, schema_editor):
+    """
+    Recompute each provider profile's rating totals from their booking reviews.
+    """
+    Profile = apps.get_model('accounts', 'Profile')
+    Review = apps.get_model('reviews', 'Review')
+
+    totals = {
+        row['provider']: (row['total'], row['count'])
+        for row in Review.objects.order_by().values('provider').annotate(total=Sum('rating'), count=Count('pk'))
+    }
+
+    for profile in Profile.objects.filter(Q(user_id__in=list(totals)) | Q(reviews_count__gt=0)).only('pk', 'user_id'):
+        total, count = totals.get(profile.user_id, (0, 0))
+        average = (Decimal(total) / count).quantize(Decimal('0.01'), ROUND_HALF_UP) if count else Decimal('0')
+        Profile.objects.filter(pk=profile.pk).update(rating_sum=total, reviews_count=count, avg_rating=average)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_portfoliomedia_file_variants'),
+        ('reviews', '0006_reviewimage_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Running sum of review ratings (see apps.common.ratings)'),
+        ),
+        migrations.RunPython(backfill_profile_rating_totals, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+import copy
 import os
 from uuid import uuid4
 
@@ -102,7 +103,9 @@ class User(AbstractUser):
             super().save(*args, **kwargs)
         
         # If there's a new profile picture and this is an existing user
-        if self.id and self.profile_picture:
+        # (saves limited to other fields, like last_login, cannot change it)
+        update_fields = kwargs.get('update_fields')
+        if self.id and self.profile_picture and (update_fields is None or 'profile_picture' in update_fields):
             # Check if there was an old picture
             try:
                 old_instance = User.objects.get(id=self.id)
@@ -240,10 +243,80 @@ class Profile(models.Model):
         default=0,
         help_text="Cached count of reviews"
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        help_text="Running sum of review ratings (see apps.common.ratings)"
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded values so unchanged profiles are not re-saved."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.get_field_values()
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None):
+        """Reload fields from the database and remember them as unchanged (covers deferred fields)."""
+        super().refresh_from_db(using=using, fields=fields)
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is not None:
+            self._loaded_values = {**loaded, **self.get_field_values(fields)}
+    
+    def get_field_values(self, names=None):
+        """
+        Copy the current values of the concrete fields set on this instance.
+        
+        Args:
+            names (iterable): Limit to these field names/attnames (default: all)
+        
+        Returns:
+            dict: attname -> value for every field that is not deferred
+        """
+        return {
+            field.attname: copy.deepcopy(self.__dict__[field.attname])
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__ and (names is None or field.attname in names or field.name in names)
+        }
+    
+    def get_changed_fields(self):
+        """
+        Get the fields whose value differs from the database row.
+        
+        A field that was deferred when the profile was loaded and has been
+        assigned since counts as changed.
+        
+        Returns:
+            list | None: Changed field attnames, or None if the profile was not
+                loaded from the database (so everything must be saved)
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None or self._state.adding:
+            return None
+        return [
+            name for name, value in self.get_field_values().items()
+            if name not in loaded or loaded[name] != value
+        ]
+    
+    def save_if_changed(self):
+        """
+        Save only the fields that changed since the profile was loaded.
+        
+        Returns:
+            bool: True if anything was written
+        """
+        changed = self.get_changed_fields()
+        if changed == []:
+            return False
+        if changed is None:
+            self.save()
+        else:
+            self.save(update_fields=[*changed, 'updated_at'])
+        self._loaded_values = self.get_field_values()
+        return True
+    
     def __str__(self):
         """
         String representation of the Profile model.
@@ -339,6 +412,17 @@ class PortfolioProject(models.Model):
         """
         return f"{self.title} - {self.profile.user.email}"
     
+    def _prefetched_media(self):
+        """
+        Return the prefetched media files, or None if they were not prefetched.
+        
+        Lets the counters below work from prefetch_related('media_files')
+        instead of issuing a query each when projects are listed.
+        """
+        if 'media_files' in getattr(self, '_prefetched_objects_cache', {}):
+            return list(self.media_files.all())
+        return None
+    
     @property
     def primary_image(self):
         """
@@ -347,6 +431,11 @@ class PortfolioProject(models.Model):
         Returns:
             PortfolioMedia: The primary image for the project
         """
+        media = self._prefetched_media()
+        if media is not None:
+            images = [item for item in media if item.media_type == 'image']
+            return (next((item for item in images if item.is_featured), None)
+                    or next((item for item in images if item.order == 1), None))
         featured = self.media_files.filter(media_type='image', is_featured=True).first()
         if featured:
             return featured
@@ -370,6 +459,9 @@ class PortfolioProject(models.Model):
         Returns:
             int: The number of images in the project
         """
+        media = self._prefetched_media()
+        if media is not None:
+            return sum(1 for item in media if item.media_type == 'image')
         return self.media_files.filter(media_type='image').count()
     
     @property
@@ -380,6 +472,9 @@ class PortfolioProject(models.Model):
         Returns:
             int: The number of videos in the project
         """
+        media = self._prefetched_media()
+        if media is not None:
+            return sum(1 for item in media if item.media_type == 'video')
         return self.media_files.filter(media_type='video').count()
 
 
@@ -448,6 +543,10 @@ class PortfolioMedia(models.Model):
     )
     media_type = models.CharField(max_length=10, choices=MEDIA_TYPE_CHOICES, default='image')
     file = models.FileField(upload_to=portfolio_project_media_path)
+    file_variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Resized WebP/JPEG derivatives of image media (see apps.common.images)"
+    )
     order = models.PositiveIntegerField(default=1, help_text="Display order within project")
     caption = models.CharField(max_length=200, blank=True, null=True, help_text="Optional caption for this media")
     is_featured = models.BooleanField(default=False, help_text="Featured image for project cover")
@@ -478,14 +577,14 @@ class PortfolioMedia(models.Model):
         temporary locations to project-specific locations.
         """
         is_new = self.pk is None
-        old_file_path = None
+        old_file_name = None
         
-        # If this is an update and file has changed, store old path for cleanup
+        # If this is an update and file has changed, store old name for cleanup
         if not is_new and self.file:
             try:
                 old_instance = PortfolioMedia.objects.get(pk=self.pk)
                 if old_instance.file != self.file:
-                    old_file_path = old_instance.file.path
+                    old_file_name = old_instance.file.name
             except PortfolioMedia.DoesNotExist:
                 pass
         
@@ -497,22 +596,21 @@ class PortfolioMedia(models.Model):
             self._move_file_to_project_location()
         
         # Clean up old file if it was replaced
-        if old_file_path and os.path.exists(old_file_path):
+        if old_file_name:
             try:
-                os.remove(old_file_path)
-            except OSError:
+                self.file.storage.delete(old_file_name)
+            except Exception:
                 pass
     
     def _move_file_to_project_location(self):
         """
         Move file from temporary location to project-specific location.
         
-        This method handles moving uploaded files from temporary storage
-        to their final project-specific locations.
+        The move is a storage-side rename (see apps.common.storage.move_file):
+        the file contents are not downloaded or uploaded again.
         """
         try:
-            from django.core.files.storage import default_storage
-            from django.core.files.base import ContentFile
+            from apps.common.storage import move_file
             
             # Get current file path
             current_path = self.file.name
@@ -524,8 +622,8 @@ class PortfolioMedia(models.Model):
             # Generate new path with project ID
             filename = os.path.basename(current_path)
             ext = filename.split('.')[-1].lower()
-            user_id = str(self.profile.user.id)
-            project_id = str(self.id)
+            user_id = str(self.project.profile.user.id)
+            project_id = str(self.project.id)
             unique_id = uuid4().hex[:8]
             
             # Create new filename with project ID
@@ -535,28 +633,13 @@ class PortfolioMedia(models.Model):
             subfolder = 'videos' if self.media_type == 'video' else 'images'
             
             # Create new path
-            new_path = os.path.join('portfolio', user_id, 'projects', project_id, subfolder, new_filename)
+            new_path = '/'.join(['portfolio', user_id, 'projects', project_id, subfolder, new_filename])
             
-            # Move the file
-            if default_storage.exists(current_path):
-                # Read the file content
-                with default_storage.open(current_path, 'rb') as f:
-                    file_content = f.read()
-                
-                # Save to new location
-                default_storage.save(new_path, ContentFile(file_content))
-                
-                # Update the file field
-                self.file.name = new_path
-                
-                # Save without triggering this method again
-                super().save(update_fields=['file'])
-                
-                # Delete old file
-                try:
-                    default_storage.delete(current_path)
-                except:
-                    pass  # Ignore if file doesn't exist
+            # Move the file and update the file field
+            self.file.name = move_file(self.file.storage, current_path, new_path)
+            
+            # Save without triggering this method again
+            super().save(update_fields=['file'])
                 
         except Exception as e:
             import logging
@@ -2,6 +2,9 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.conf import settings
+from apps.common.eager_loading import EagerLoadingMixin
+from apps.common.sparse_fields import SparseFieldsetMixin
+from apps.common.images import image_url_for_request, image_variant_urls
 from .models import (
     Profile, UserPreference, PortfolioProject, PortfolioMedia,
     ProviderDocument, DocumentVerificationHistory, DocumentRequirement
@@ -14,13 +17,15 @@ class PortfolioMediaSerializer(serializers.ModelSerializer):
     Serializer for PortfolioMedia model.
     
     Handles serialization of portfolio media files with URL generation
-    for frontend display.
+    for frontend display. Image URLs point at a resized derivative of the
+    size requested with ?image_size= (default large) once one exists.
     """
     file_url = serializers.SerializerMethodField()
+    file_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = PortfolioMedia
-        fields = ['id', 'media_type', 'file', 'file_url', 'order', 'caption', 'created_at']
+        fields = ['id', 'media_type', 'file', 'file_url', 'file_variants', 'order', 'caption', 'created_at']
         read_only_fields = ['created_at']
     
     def get_file_url(self, obj):
@@ -35,19 +40,34 @@ class PortfolioMediaSerializer(serializers.ModelSerializer):
         """
         if obj.file:
             request = self.context.get('request')
+            file_url = image_url_for_request(obj.file, obj.file_variants, request, default_size='large')
             if request:
-                return request.build_absolute_uri(obj.file.url)
-            return f"{settings.BACKEND_URL}{obj.file.url}"
+                return request.build_absolute_uri(file_url)
+            return f"{settings.BACKEND_URL}{file_url}"
         return None
+    
+    def get_file_variants(self, obj):
+        """
+        Get the URLs of the resized derivatives of an image.
+        
+        Args:
+            obj: The PortfolioMedia instance
+            
+        Returns:
+            dict: {size: {'width', 'height', 'webp', 'jpeg'}}, empty for videos
+        """
+        return image_variant_urls(obj.file, obj.file_variants, self.context.get('request'))
 
 
-class PortfolioProjectSerializer(serializers.ModelSerializer):
+class PortfolioProjectSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for PortfolioProject model.
     
     Handles serialization of portfolio projects including related media files
     and computed properties for frontend display.
     """
+    prefetch_related_fields = ('media_files',)
+    
     media_files = PortfolioMediaSerializer(many=True, read_only=True)
     primary_image_url = serializers.SerializerMethodField()
     media_count = serializers.ReadOnlyField()
@@ -75,18 +95,23 @@ class PortfolioProjectSerializer(serializers.ModelSerializer):
         primary_image = obj.primary_image
         if primary_image and primary_image.file:
             request = self.context.get('request')
+            image_url = image_url_for_request(
+                primary_image.file, primary_image.file_variants, request, default_size='medium'
+            )
             if request:
-                return request.build_absolute_uri(primary_image.file.url)
-            return f"{settings.BACKEND_URL}{primary_image.file.url}"
+                return request.build_absolute_uri(image_url)
+            return f"{settings.BACKEND_URL}{image_url}"
         return None
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for Profile model.
     
     Handles serialization of user profile information including
     service areas and portfolio projects.
     """
+    prefetch_related_fields = ('service_areas',)
+    
     service_areas = serializers.StringRelatedField(many=True, read_only=True)
     portfolio_projects = PortfolioProjectSerializer(many=True, read_only=True)
     
@@ -99,7 +124,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['is_approved', 'avg_rating', 'reviews_count']
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for User model.
     
@@ -9,8 +9,10 @@ The signal handlers ensure data consistency between User and Profile models
 and automate the profile creation process for new users.
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from .authentication import UserSnapshotCache
 from .models import User, Profile
 
 @receiver(post_save, sender=User)
@@ -39,7 +41,7 @@ def create_user_profile(sender, instance, created, **kwargs):
         Profile.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def save_user_profile(sender, instance, created=False, **kwargs):
     """
     Save the Profile instance when the User is saved.
     
@@ -48,16 +50,55 @@ def save_user_profile(sender, instance, **kwargs):
     data consistency between the User and Profile models.
     
     This handler is triggered for both new and existing users, but
-    only attempts to save the profile for existing users that have
-    an associated profile.
+    only saves a profile that was loaded alongside the user and has
+    changed since. A login (which only updates last_login) therefore no
+    longer re-saves, or even loads, the profile.
     
     Args:
         sender: The model class that sent the signal (User)
         instance: The actual instance of the User that was saved
+        created: Boolean indicating whether a new record was created
         **kwargs: Additional keyword arguments
         
     Example:
         When a user updates their email address, this signal ensures
         that any changes to their profile are also saved.
     """
-    instance.profile.save()
\ No newline at end of file
+    if created:
+        return  # create_user_profile has just written it
+    profile = User.profile.related.get_cached_value(instance, default=None)
+    if profile is not None:
+        profile.save_if_changed()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    """
+    Retire the cached authentication snapshot of a saved or deleted user.
+    
+    Runs after commit so no request can cache the pre-commit row under the
+    new version (see apps.accounts.authentication).
+    
+    Args:
+        sender: The model class that sent the signal (User)
+        instance: The User that was saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: UserSnapshotCache.invalidate(user_id))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    """
+    Retire the cached authentication snapshot when a profile changes.
+    
+    Args:
+        sender: The model class that sent the signal (Profile)
+        instance: The Profile that was saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: UserSnapshotCache.invalidate(user_id))
\ No newline at end of file
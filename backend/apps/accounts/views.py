@@ -2181,6 +2181,8 @@ class ProviderDocumentViewSet(viewsets.ModelViewSet):
         
         This endpoint allows providers to upload multiple documents in a single
         request, which is more efficient than uploading documents one by one.
+        All files are validated first, stored concurrently and inserted with
+        one query; if any file fails, none of them are kept.
         
         Args:
             request: The HTTP request object containing files and metadata
@@ -2218,29 +2220,60 @@ class ProviderDocumentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        created_documents = []
-        errors = []
+        from apps.common.uploads import BatchUploadService, BatchUploadError
+        
+        # Validate every file and document type before anything is stored
+        valid_document_types = {choice for choice, _ in ProviderDocument.DOCUMENT_TYPE_CHOICES}
+        allowed_types = [
+            'application/pdf',
+            'image/jpeg',
+            'image/png',
+            'image/jpg',
+            'application/msword',
+            'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        ]
+        errors = [
+            f"File {i+1}: invalid document type '{document_type}'"
+            for i, document_type in enumerate(document_types)
+            if document_type not in valid_document_types
+        ]
+        try:
+            BatchUploadService.validate(files, allowed_types=allowed_types, max_size=5 * 1024 * 1024)
+        except BatchUploadError as e:
+            errors.extend(e.errors)
+        if errors:
+            return Response(
+                {'error': 'No documents were uploaded', 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
+        documents = []
+        named_files = []
         for i, file in enumerate(files):
-            try:
-                document_type = document_types[i] if i < len(document_types) else 'other'
-                title = titles[i] if i < len(titles) else f"Document {i+1}"
-                description = descriptions[i] if i < len(descriptions) else ""
-                
-                # Create document
-                document = ProviderDocument.objects.create(
-                    provider=profile,
-                    document_type=document_type,
-                    title=title,
-                    description=description,
-                    file=file,
-                    status='pending'
-                )
-                
-                created_documents.append(document)
-                
-            except Exception as e:
-                errors.append(f"File {i+1}: {str(e)}")
+            document = ProviderDocument(
+                provider=profile,
+                document_type=document_types[i],
+                title=titles[i] if i < len(titles) else f"Document {i+1}",
+                description=descriptions[i] if i < len(descriptions) else "",
+                status='pending',
+                # bulk_create skips ProviderDocument.save(), so set file metadata here
+                file_size=file.size,
+                file_type=getattr(file, 'content_type', '')
+            )
+            documents.append(document)
+            named_files.append((document.file.field.generate_filename(document, file.name), file))
+        
+        # Store all files concurrently, then insert every row in one statement
+        try:
+            stored = BatchUploadService.store(named_files)
+            for document, item in zip(documents, stored):
+                document.file.name = item['name']
+            created_documents = BatchUploadService.create_records(ProviderDocument, documents, stored)
+        except BatchUploadError as e:
+            return Response(
+                {'error': 'Failed to upload documents, please try again', 'errors': e.errors},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
         
         # Serialize created documents
         serializer = ProviderDocumentSerializer(
@@ -2249,15 +2282,11 @@ class ProviderDocumentViewSet(viewsets.ModelViewSet):
             context={'request': request}
         )
         
-        response_data = {
+        return Response({
             'message': f'Successfully uploaded {len(created_documents)} documents',
-            'documents': serializer.data
-        }
-        
-        if errors:
-            response_data['errors'] = errors
-        
-        return Response(response_data, status=status.HTTP_201_CREATED)
+            'documents': serializer.data,
+            'upload_timings': BatchUploadService.timings(stored)
+        }, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['get'])
     def expiring_soon(self, request):
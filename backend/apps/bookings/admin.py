@@ -366,7 +366,7 @@ class ProviderScheduleAdmin(ModelAdmin):
         }),
         ('Recurring Schedule', {
             'fields': (
-                'is_recurring', 'recurring_pattern', 'recurring_until'
+                'is_recurring', 'recurring_pattern', 'recurring_interval', 'recurring_until'
             ),
             'classes': ('collapse',)
         }),
@@ -0,0 +1,310 @@
+"""
+PROVIDER AVAILABILITY RESOLVER
+
+Single source of truth for when a provider can actually take a booking.
+
+A provider's free time on a date is computed with interval arithmetic:
+
+    free = weekly template            (the service's ServiceTimeSlots on that
+                                       weekday, else ProviderAvailability
+                                       minus its break)
+         + schedule 'available' entries (ProviderSchedule extra hours)
+         - schedule blocks             (ProviderSchedule blocked/vacation/maintenance)
+         - existing bookings           (the provider's active bookings)
+
+Every input is loaded for the whole date range with one query per source,
+and each day is resolved with sorted interval merges and a two-pointer
+subtraction, so asking for a month costs the same four queries as asking for
+a day.
+
+Times are handled as minutes since midnight; an end time at or before the
+start time (e.g. 22:00-00:00) runs to the end of the day.
+
+Example:
+    >>> resolver = AvailabilityResolver(service.provider, service)
+    >>> resolver.free_windows(date(2024, 2, 1), date(2024, 2, 7))
+    {date(2024, 2, 1): [(time(9, 0), time(13, 0)), (time(14, 0), time(17, 0))], ...}
+    >>> resolver.filter_slots(BookingSlot.objects.filter(service=service))
+    [<BookingSlot ...>, ...]
+"""
+
+from datetime import time, timedelta
+
+from .models import Booking, ProviderAvailability, ProviderSchedule, ServiceTimeSlot
+
+DAY_MINUTES = 24 * 60
+
+# Bookings without a slot occupy the provider for this long from booking_time
+DEFAULT_BOOKING_MINUTES = 60
+
+BLOCKING_SCHEDULE_TYPES = ('blocked', 'vacation', 'maintenance')
+INACTIVE_BOOKING_STATUSES = ('cancelled', 'rejected')
+
+
+def to_minutes(value):
+    """Convert a time to minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes):
+    """Convert minutes since midnight back to a time (1440 becomes 23:59)."""
+    if minutes >= DAY_MINUTES:
+        return time(23, 59)
+    return time(minutes // 60, minutes % 60)
+
+
+def time_range(start_time, end_time):
+    """
+    Turn a start/end time pair into a (start, end) minute interval.
+
+    Args:
+        start_time (time): Start of the interval
+        end_time (time): End of the interval; at or before start means end of day
+
+    Returns:
+        tuple: (start_minutes, end_minutes)
+    """
+    start = to_minutes(start_time)
+    end = to_minutes(end_time)
+    return start, end if end > start else DAY_MINUTES
+
+
+def merge_intervals(intervals):
+    """
+    Sort intervals and merge the ones that overlap or touch.
+
+    Args:
+        intervals (iterable): (start, end) pairs in any order
+
+    Returns:
+        list: Sorted, disjoint (start, end) pairs
+    """
+    merged = []
+    for start, end in sorted(interval for interval in intervals if interval[1] > interval[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(base, cuts):
+    """
+    Remove every cut from the base intervals in a single sweep.
+
+    Args:
+        base (list): Sorted, disjoint (start, end) pairs
+        cuts (list): Sorted, disjoint (start, end) pairs
+
+    Returns:
+        list: Sorted, disjoint pieces of base not covered by any cut
+    """
+    result = []
+    index = 0
+    for start, end in base:
+        # Cuts ending before this interval cannot touch later intervals either
+        while index < len(cuts) and cuts[index][1] <= start:
+            index += 1
+        cursor = start
+        position = index
+        while position < len(cuts) and cuts[position][0] < end:
+            cut_start, cut_end = cuts[position]
+            if cut_start > cursor:
+                result.append((cursor, cut_start))
+            cursor = max(cursor, cut_end)
+            position += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def overlaps(intervals, start, end):
+    """Whether [start, end) intersects any of the sorted, disjoint intervals."""
+    return any(interval_start < end and start < interval_end for interval_start, interval_end in intervals)
+
+
+class AvailabilityResolver:
+    """
+    Resolve a provider's free time windows over a date range.
+
+    Attributes:
+        provider (User): Provider whose time is resolved
+        service (Service): Service being booked (optional); its active
+            ServiceTimeSlots replace the provider's hours on their weekdays
+        exclude_booking_ids (iterable): Bookings that should not count as busy,
+            e.g. the booking being rescheduled
+    """
+
+    def __init__(self, provider, service=None, exclude_booking_ids=()):
+        self.provider = provider
+        self.service = service
+        self.exclude_booking_ids = set(exclude_booking_ids)
+
+    def _weekly_templates(self):
+        """
+        Load the weekly working hours, grouped by weekday.
+
+        On weekdays where the service has active ServiceTimeSlots those are the
+        working hours; other weekdays use the provider's general availability.
+
+        Returns:
+            dict: weekday -> merged list of (start, end) minute intervals
+        """
+        templates = {}
+        availabilities = ProviderAvailability.objects.filter(provider=self.provider, is_available=True)
+        for availability in availabilities:
+            hours = [time_range(availability.start_time, availability.end_time)]
+            if availability.break_start and availability.break_end:
+                hours = subtract_intervals(hours, [time_range(availability.break_start, availability.break_end)])
+            templates.setdefault(availability.weekday, []).extend(hours)
+
+        if self.service is not None:
+            service_templates = {}
+            for slot in ServiceTimeSlot.objects.filter(service=self.service, is_active=True):
+                service_templates.setdefault(slot.day_of_week, []).append(time_range(slot.start_time, slot.end_time))
+            templates.update(service_templates)
+
+        return {weekday: merge_intervals(intervals) for weekday, intervals in templates.items()}
+
+    def _schedule_intervals(self, start_date, end_date):
+        """
+        Load ProviderSchedule entries in the range as extra and blocked time.
+
+        Recurring rules are expanded for the range only.
+
+        Returns:
+            tuple: (extra, blocked) dicts of date -> list of (start, end)
+        """
+        extra, blocked = {}, {}
+        entries = ProviderSchedule.objects.filter(provider=self.provider).only(
+            'date', 'start_time', 'end_time', 'is_all_day', 'schedule_type',
+            'is_recurring', 'recurring_pattern', 'recurring_interval', 'recurring_until',
+        )
+        for entry, day in entries.occurrences(start_date, end_date):
+            if entry.is_all_day or not entry.start_time or not entry.end_time:
+                interval = (0, DAY_MINUTES)
+            else:
+                interval = time_range(entry.start_time, entry.end_time)
+            target = blocked if entry.schedule_type in BLOCKING_SCHEDULE_TYPES else extra
+            target.setdefault(day, []).append(interval)
+        return extra, blocked
+
+    def _booked_intervals(self, start_date, end_date):
+        """
+        Load the provider's active bookings in the range as busy time.
+
+        A booking on a slot of the service being resolved that still has spare
+        capacity does not make that slot busy: other customers may still join it.
+
+        Returns:
+            dict: date -> list of (start, end)
+        """
+        busy = {}
+        bookings = Booking.objects.filter(
+            service__provider=self.provider, booking_date__gte=start_date, booking_date__lte=end_date
+        ).exclude(
+            status__in=INACTIVE_BOOKING_STATUSES
+        ).exclude(
+            pk__in=self.exclude_booking_ids
+        ).select_related('booking_slot').only(
+            'booking_date', 'booking_time', 'service_id',
+            'booking_slot__start_time', 'booking_slot__end_time',
+            'booking_slot__current_bookings', 'booking_slot__max_bookings',
+        )
+        for booking in bookings:
+            slot = booking.booking_slot
+            if slot is not None:
+                if (self.service is not None and booking.service_id == self.service.pk
+                        and slot.current_bookings < slot.max_bookings):
+                    continue
+                interval = time_range(slot.start_time, slot.end_time)
+            elif booking.booking_time:
+                start = to_minutes(booking.booking_time)
+                interval = (start, min(start + DEFAULT_BOOKING_MINUTES, DAY_MINUTES))
+            else:
+                continue
+            busy.setdefault(booking.booking_date, []).append(interval)
+        return busy
+
+    def _unavailable_intervals(self, start_date, end_date):
+        """
+        Blocked and booked time per date, merged.
+
+        Returns:
+            dict: date -> sorted, disjoint (start, end) pairs
+        """
+        _, blocked = self._schedule_intervals(start_date, end_date)
+        booked = self._booked_intervals(start_date, end_date)
+        return {
+            day: merge_intervals(blocked.get(day, []) + booked.get(day, []))
+            for day in set(blocked) | set(booked)
+        }
+
+    def free_intervals(self, start_date, end_date):
+        """
+        Free time per date as minute intervals.
+
+        Args:
+            start_date (date): First date (inclusive)
+            end_date (date): Last date (inclusive)
+
+        Returns:
+            dict: date -> sorted, disjoint (start, end) minute pairs; dates
+                without free time are omitted
+        """
+        templates = self._weekly_templates()
+        extra, blocked = self._schedule_intervals(start_date, end_date)
+        booked = self._booked_intervals(start_date, end_date)
+
+        free = {}
+        day = start_date
+        while day <= end_date:
+            working = merge_intervals(templates.get(day.weekday(), []) + extra.get(day, []))
+            if working:
+                unavailable = merge_intervals(blocked.get(day, []) + booked.get(day, []))
+                windows = subtract_intervals(working, unavailable)
+                if windows:
+                    free[day] = windows
+            day += timedelta(days=1)
+        return free
+
+    def free_windows(self, start_date, end_date):
+        """
+        Free time per date as (start_time, end_time) pairs.
+
+        Args:
+            start_date (date): First date (inclusive)
+            end_date (date): Last date (inclusive)
+
+        Returns:
+            dict: date -> list of (time, time); dates without free time are omitted
+        """
+        return {
+            day: [(to_time(start), to_time(end)) for start, end in windows]
+            for day, windows in self.free_intervals(start_date, end_date).items()
+        }
+
+    def filter_slots(self, slots):
+        """
+        Keep only the slots that do not clash with blocked or booked time.
+
+        Existing slots are not required to sit inside the weekly template:
+        providers can open slots outside their usual hours (e.g. express or
+        emergency slots), so only schedule blocks and bookings rule them out.
+
+        Args:
+            slots (iterable): BookingSlot instances
+
+        Returns:
+            list: The bookable slots, in their original order
+        """
+        slots = list(slots)
+        if not slots:
+            return slots
+        dates = [slot.date for slot in slots]
+        unavailable = self._unavailable_intervals(min(dates), max(dates))
+        return [
+            slot for slot in slots
+            if not overlaps(unavailable.get(slot.date, ()), *time_range(slot.start_time, slot.end_time))
+        ]
@@ -0,0 +1,190 @@
+"""
+EXPIRED BOOKING CANCELLATION
+
+Set-based auto-cancellation of bookings whose date has passed while they were
+still pending or confirmed.
+
+The auto_cancel_expired_bookings command used to cancel everything with one
+UPDATE and then loop over the same queryset to give slot capacity back one
+`booking_slot.save()` at a time. After the UPDATE the queryset's status filter
+no longer matched, so the loop released nothing, and nobody was notified.
+
+Expired bookings are now processed in pk-ordered chunks of BATCH_SIZE. Each
+chunk runs in its own transaction:
+
+    SELECT id, booking_slot_id, ... WHERE booking_date < cutoff AND status IN (...)
+        ORDER BY id LIMIT <batch> FOR UPDATE SKIP LOCKED
+    UPDATE bookings_booking SET status = 'cancelled', ... WHERE id IN (...)
+    UPDATE bookings_bookingslot SET current_bookings = current_bookings - <n> ...
+    INSERT INTO notifications_notification ... (see apps.notifications.dispatch)
+
+so a chunk costs four statements however many bookings it holds, and the
+slot capacity, notifications and booking status always change together.
+Points are only awarded when a booking completes, so pending and confirmed
+bookings have no rewards to reverse.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.app_settings import setting_getter
+
+from .models import Booking
+from .reservations import SlotReservationService
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BOOKING_EXPIRY_SETTINGS = {
+    'GRACE_PERIOD_DAYS': 1,
+    'BATCH_SIZE': 500,
+}
+
+# Statuses that still hold a slot and expect the provider or customer to act
+EXPIRABLE_STATUSES = ('pending', 'confirmed')
+
+AUTO_CANCEL_REASON = "Auto-cancelled: Booking date passed without completion"
+
+
+get_booking_expiry_setting = setting_getter('BOOKING_EXPIRY', DEFAULT_BOOKING_EXPIRY_SETTINGS)
+
+
+class ExpiredBookingService:
+    """
+    Service class for cancelling expired bookings in bulk.
+
+    Example:
+        >>> result = ExpiredBookingService.cancel_expired(grace_period=1)
+        >>> result['cancelled'], result['slots_updated'], len(result['batches'])
+        (1200, 310, 3)
+    """
+
+    @staticmethod
+    def get_expired_bookings(grace_period=None, today=None):
+        """
+        Return the bookings that are due for auto-cancellation.
+
+        Args:
+            grace_period (int): Days after the booking date before cancelling
+                (default: GRACE_PERIOD_DAYS)
+            today (date): Reference date (default: today in the local timezone)
+
+        Returns:
+            QuerySet: Expired pending/confirmed bookings
+        """
+        if grace_period is None:
+            grace_period = get_booking_expiry_setting('GRACE_PERIOD_DAYS')
+        cutoff_date = (today or timezone.localdate()) - timedelta(days=grace_period)
+        return Booking.objects.filter(booking_date__lt=cutoff_date, status__in=EXPIRABLE_STATUSES)
+
+    @staticmethod
+    def cancel_expired(grace_period=None, batch_size=None, today=None):
+        """
+        Cancel every expired booking, a pk-ordered chunk at a time.
+
+        Args:
+            grace_period (int): Days after the booking date before cancelling
+                (default: GRACE_PERIOD_DAYS)
+            batch_size (int): Bookings per chunk (default: BATCH_SIZE)
+            today (date): Reference date (default: today in the local timezone)
+
+        Returns:
+            dict: Totals ('cancelled', 'slots_updated', 'notifications') and
+                'batches', a list with the same counts plus 'selected' and
+                'duration_ms' for each chunk
+        """
+        batch_size = batch_size or get_booking_expiry_setting('BATCH_SIZE')
+        expired = ExpiredBookingService.get_expired_bookings(grace_period, today)
+        result = {'cancelled': 0, 'slots_updated': 0, 'notifications': 0, 'batches': []}
+
+        last_pk = 0
+        while True:
+            started = time.perf_counter()
+            with transaction.atomic():
+                rows = list(
+                    expired.select_for_update(skip_locked=True, of=('self',))
+                    .filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .values_list('pk', 'booking_slot_id', 'customer_id', 'service__provider_id', 'service__title')[:batch_size]
+                )
+                if not rows:
+                    break
+                batch = ExpiredBookingService.cancel_batch(rows)
+
+            batch['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            result['batches'].append(batch)
+            for key in ('cancelled', 'slots_updated', 'notifications'):
+                result[key] += batch[key]
+            last_pk = rows[-1][0]
+
+            if len(rows) < batch_size:
+                break
+
+        if result['cancelled']:
+            logger.info(
+                f"Auto-cancelled {result['cancelled']} expired booking(s), released capacity on "
+                f"{result['slots_updated']} slot(s) in {len(result['batches'])} batch(es)"
+            )
+        return result
+
+    @staticmethod
+    def cancel_batch(rows):
+        """
+        Cancel one locked chunk of expired bookings.
+
+        Must run inside the transaction that selected the rows.
+
+        Args:
+            rows (list): (booking_id, slot_id, customer_id, provider_id, service_title) tuples
+
+        Returns:
+            dict: 'selected', 'cancelled', 'slots_updated' and 'notifications' counts
+        """
+        from apps.notifications.dispatch import NotificationDispatcher
+
+        booking_ids = [row[0] for row in rows]
+        cancelled = Booking.objects.filter(pk__in=booking_ids, status__in=EXPIRABLE_STATUSES).update(
+            status='cancelled',
+            cancellation_reason=AUTO_CANCEL_REASON,
+            updated_at=timezone.now(),
+        )
+
+        slot_counts = {}
+        for _, slot_id, _, _, _ in rows:
+            if slot_id:
+                slot_counts[slot_id] = slot_counts.get(slot_id, 0) + 1
+        slots_updated = SlotReservationService.release_many(slot_counts)
+
+        notifications = NotificationDispatcher.dispatch([
+            {
+                'user': user_id,
+                'type': 'booking',
+                'title': "Booking Cancelled",
+                'message': message.format(service=service_title),
+                'related_id': booking_id,
+            }
+            for booking_id, _, customer_id, provider_id, service_title in rows
+            for user_id, message in (
+                (customer_id, "Your booking for {service} was cancelled automatically because its date has passed"),
+                (provider_id, "A booking for {service} was cancelled automatically because its date has passed"),
+            )
+        ])
+
+        provider_ids = {row[3] for row in rows}
+        transaction.on_commit(lambda: cache.delete_many([
+            f"provider_analytics:{provider_id}:{endpoint}"
+            for provider_id in provider_ids
+            for endpoint in ('statistics', 'earnings_analytics', 'service_performance')
+        ]))
+
+        return {
+            'selected': len(rows),
+            'cancelled': cancelled,
+            'slots_updated': slots_updated,
+            'notifications': len(notifications),
+        }
@@ -0,0 +1,279 @@
+"""
+PAYMENT GATEWAY HTTP CLIENT
+
+This module provides the HTTP layer used by payment gateway services such as
+KhaltiPaymentService. It replaces one-off requests.post calls with:
+
+- A module-level pooled requests.Session, so consecutive gateway calls reuse
+  TCP/TLS connections instead of paying for a new handshake every time
+- Separate connect and read timeouts, so an unreachable gateway fails fast
+  while a slow but healthy one still gets time to answer
+- Bounded retries with full jitter, applied only to idempotent calls (lookups);
+  payment initiation is never retried automatically
+- A per-gateway circuit breaker that fails fast while the gateway is down,
+  keeping workers from piling up on a dead upstream
+
+Errors raised by this module subclass requests.exceptions.RequestException, so
+existing `except requests.exceptions.RequestException` handlers keep working.
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+# Status codes worth retrying on idempotent calls
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+
+class GatewayUnavailable(requests.exceptions.RequestException):
+    """Raised when a gateway call is short-circuited by an open circuit breaker."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for a single upstream gateway.
+
+    The breaker opens after `failure_threshold` consecutive failures and rejects
+    calls for `reset_timeout` seconds. After that it lets a single trial call
+    through (half-open); success closes the breaker, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name (str): Gateway name used in log messages
+            failure_threshold (int): Consecutive failures before opening
+            reset_timeout (float): Seconds to stay open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Close the breaker and forget previous failures."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    @property
+    def state(self):
+        """
+        Return the current breaker state.
+
+        Returns:
+            str: One of 'closed', 'open' or 'half_open'
+        """
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self):
+        """
+        Check whether a call may go through.
+
+        Returns:
+            bool: True if the call should be attempted
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            # Half-open: allow exactly one trial call at a time
+            if self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Record a successful call and close the breaker."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the breaker if the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit breaker for {self.name} opened after {self._failures} failure(s)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_session = None
+_session_lock = threading.Lock()
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_session(pool_maxsize=10):
+    """
+    Return the process-wide pooled HTTP session.
+
+    The session is created on first use and shared by every gateway client in
+    the process (requests.Session is safe to share across threads for plain
+    request/response calls). The pool size only applies on creation.
+
+    Args:
+        pool_maxsize (int): Maximum pooled connections per host
+
+    Returns:
+        requests.Session: The shared session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def get_circuit_breaker(name, failure_threshold=5, reset_timeout=30):
+    """
+    Return the process-wide circuit breaker for a gateway, creating it if needed.
+
+    Args:
+        name (str): Gateway name
+        failure_threshold (int): Consecutive failures before opening (on creation)
+        reset_timeout (float): Seconds to stay open (on creation)
+
+    Returns:
+        CircuitBreaker: The gateway's circuit breaker
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+            _circuit_breakers[name] = breaker
+        return breaker
+
+
+def reset_gateway_state():
+    """
+    Drop the shared session and all circuit breakers.
+
+    Intended for tests and for worker processes after fork.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+    with _circuit_breakers_lock:
+        _circuit_breakers.clear()
+
+
+class GatewayClient:
+    """
+    HTTP client for a single payment gateway.
+
+    Wraps the shared pooled session with per-gateway headers, timeouts, retry
+    policy and circuit breaker.
+
+    Example:
+        >>> client = GatewayClient('khalti', headers={'Authorization': 'Key ...'})
+        >>> response = client.post(lookup_url, json={'pidx': pidx}, idempotent=True)
+    """
+
+    def __init__(self, name, headers=None, connect_timeout=3.05, read_timeout=15,
+                 max_retries=2, backoff=0.5, pool_maxsize=10,
+                 failure_threshold=5, reset_timeout=30):
+        """
+        Initialize the gateway client.
+
+        Args:
+            name (str): Gateway name (also selects the shared circuit breaker)
+            headers (dict): Headers sent with every request
+            connect_timeout (float): Seconds to wait for the TCP/TLS connection
+            read_timeout (float): Seconds to wait for the response
+            max_retries (int): Extra attempts for idempotent calls
+            backoff (float): Base delay in seconds for retry backoff
+            pool_maxsize (int): Maximum pooled connections per host
+            failure_threshold (int): Failures before the circuit breaker opens
+            reset_timeout (float): Seconds the circuit breaker stays open
+        """
+        self.name = name
+        self.headers = headers or {}
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = get_session(pool_maxsize)
+        self.breaker = get_circuit_breaker(name, failure_threshold, reset_timeout)
+
+    def post(self, url, json=None, idempotent=False):
+        """
+        POST to the gateway.
+
+        Idempotent calls are retried on connection errors, timeouts and
+        retryable status codes, sleeping a random time between 0 and
+        backoff * 2 ** attempt (full jitter) before each retry.
+
+        Args:
+            url (str): Absolute request URL
+            json (dict): JSON request body
+            idempotent (bool): Whether the call is safe to retry
+
+        Returns:
+            requests.Response: The gateway response (possibly an error status)
+
+        Raises:
+            GatewayUnavailable: If the circuit breaker is open
+            requests.exceptions.RequestException: If the final attempt fails
+        """
+        attempts = 1 + (self.max_retries if idempotent else 0)
+
+        for attempt in range(attempts):
+            if not self.breaker.allow_request():
+                raise GatewayUnavailable(f"{self.name} gateway is unavailable (circuit open)")
+
+            is_last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.post(url, json=json, headers=self.headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.breaker.record_failure()
+                if is_last_attempt:
+                    raise
+                logger.warning(f"{self.name} request failed (attempt {attempt + 1}/{attempts}): {str(e)}")
+            except Exception:
+                # Anything else is not retried, but must still end a half-open trial
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+                if is_last_attempt or response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                logger.warning(f"{self.name} returned {response.status_code} (attempt {attempt + 1}/{attempts})")
+
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
@@ -19,15 +19,15 @@ Cron Job Setup:
 Features:
 - Configurable grace period (default: 1 day after booking date)
 - Dry run mode for testing
-- Detailed logging of cancelled bookings
+- Set-based cancellation in pk-ordered chunks (see apps.bookings.expiry)
+- Slot capacity released with one grouped UPDATE per chunk
+- Customers and providers notified in one bulk INSERT per chunk
 - Preserves booking history with proper cancellation reason
 """
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db import transaction
-from datetime import datetime, timedelta, date
-from apps.bookings.models import Booking
+from apps.bookings.expiry import ExpiredBookingService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,6 +43,12 @@ class Command(BaseCommand):
             default=1,
             help='Number of days to wait after booking date before auto-cancelling (default: 1)',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Bookings cancelled per chunk (default: BOOKING_EXPIRY BATCH_SIZE)',
+        )
         parser.add_argument(
             '--dry-run',
             action='store_true',
@@ -60,70 +66,54 @@ class Command(BaseCommand):
         self.stdout.write(f"📅 Grace period: {self.grace_period} day(s)")
         
         try:
-            with transaction.atomic():
-                # Find and cancel expired bookings
-                cancelled_count = self.cancel_expired_bookings()
-                
-                # Show summary
-                if cancelled_count > 0:
-                    self.stdout.write(self.style.SUCCESS(f"✅ Auto-cancelled {cancelled_count} expired booking(s)"))
-                else:
-                    self.stdout.write("✨ No expired bookings to cancel")
-                
-                if self.dry_run:
-                    self.stdout.write(self.style.WARNING("🔄 Rolling back transaction (dry run)"))
-                    raise Exception("Dry run - rolling back")
-                    
-        except Exception as e:
-            if "Dry run" in str(e):
+            if self.dry_run:
+                self.show_expired_bookings()
                 self.stdout.write(self.style.SUCCESS("✅ Dry run completed successfully"))
+                return
+            
+            result = ExpiredBookingService.cancel_expired(
+                grace_period=self.grace_period, batch_size=options['batch_size']
+            )
+            
+            if options['verbosity'] >= 2:
+                for number, batch in enumerate(result['batches'], start=1):
+                    self.stdout.write(
+                        f"  📦 Batch {number}: {batch['cancelled']}/{batch['selected']} cancelled, "
+                        f"{batch['slots_updated']} slot(s) released, {batch['notifications']} notification(s) "
+                        f"in {batch['duration_ms']} ms"
+                    )
+            
+            # Show summary
+            if result['cancelled'] > 0:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ Auto-cancelled {result['cancelled']} expired booking(s), released capacity on "
+                    f"{result['slots_updated']} slot(s) in {len(result['batches'])} batch(es)"
+                ))
             else:
-                self.stdout.write(self.style.ERROR(f"❌ Error during cancellation: {str(e)}"))
-                logger.error(f"Auto-cancellation error: {str(e)}")
+                self.stdout.write("✨ No expired bookings to cancel")
+                    
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Error during cancellation: {str(e)}"))
+            logger.error(f"Auto-cancellation error: {str(e)}")
+            raise
 
-    def cancel_expired_bookings(self):
-        """Cancel bookings that have passed their scheduled date/time"""
+    def show_expired_bookings(self):
+        """Show the bookings a real run would cancel"""
         self.stdout.write("\n🧹 Finding expired bookings...")
         
-        # Define cutoff date (yesterday minus grace period)
-        cutoff_date = date.today() - timedelta(days=self.grace_period)
+        expired_bookings = ExpiredBookingService.get_expired_bookings(self.grace_period)
+        expired_count = expired_bookings.count()
         
-        # Find expired bookings that are still pending or confirmed
-        expired_bookings = Booking.objects.filter(
-            booking_date__lt=cutoff_date,
-            status__in=['pending', 'confirmed']
-        )
+        if expired_count == 0:
+            self.stdout.write("✨ No expired bookings to cancel")
+            return
         
-        expired_count = expired_bookings.count()
+        self.stdout.write(f"  📊 Found {expired_count} expired bookings to auto-cancel")
         
-        if expired_count > 0:
-            self.stdout.write(f"  📊 Found {expired_count} expired bookings to auto-cancel")
-            
-            # Show sample of what will be cancelled
-            sample_bookings = expired_bookings[:5]
-            for booking in sample_bookings:
-                self.stdout.write(f"    - Booking #{booking.id}: {booking.service.title} on {booking.booking_date} at {booking.booking_time} (Status: {booking.status})")
-            
-            if expired_count > 5:
-                self.stdout.write(f"    ... and {expired_count - 5} more")
-            
-            if not self.dry_run:
-                # Set the cancellation reason
-                cancellation_reason = "Auto-cancelled: Booking date passed without completion"
-                
-                # Update all bookings at once
-                expired_bookings.update(
-                    status='cancelled',
-                    cancellation_reason=cancellation_reason
-                )
-                
-                # Handle any slot-related updates that might be needed
-                # This needs to be done one by one since it depends on booking.booking_slot
-                for booking in expired_bookings:
-                    if booking.booking_slot:
-                        booking.booking_slot.current_bookings = max(0, booking.booking_slot.current_bookings - 1)
-                        booking.booking_slot.save()
-                
-                self.stdout.write(f"  ✅ Auto-cancelled {expired_count} expired bookings")
+        # Show sample of what will be cancelled
+        sample_bookings = expired_bookings.select_related('service').order_by('pk')[:5]
+        for booking in sample_bookings:
+            self.stdout.write(f"    - Booking #{booking.id}: {booking.service.title} on {booking.booking_date} at {booking.booking_time} (Status: {booking.status})")
         
-        return expired_count
+        if expired_count > 5:
+            self.stdout.write(f"    ... and {expired_count - 5} more")
@@ -0,0 +1,77 @@
+from datetime import time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.bookings.models import BookingSlot
+from apps.bookings.reservations import run_contention_benchmark
+from apps.services.models import Service
+
+
+class Command(BaseCommand):
+    """
+    Management command to measure slot claiming under contention.
+    
+    Starts many threads that claim the same slot at once and reports the
+    throughput and whether the slot was ever overbooked. Uses a throwaway slot
+    on the given service and deletes it afterwards. Run it against the
+    production database engine (PostgreSQL) for meaningful numbers; SQLite
+    serializes all writers.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Benchmark concurrent booking slot claims and check for overbooking'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument('--service-id', type=int, default=None,
+                            help='Service to create the benchmark slot on (default: first service)')
+        parser.add_argument('--threads', type=int, default=20, help='Concurrent workers (default: 20)')
+        parser.add_argument('--attempts', type=int, default=5, help='Claims per worker (default: 5)')
+        parser.add_argument('--capacity', type=int, default=10, help='max_bookings of the slot (default: 10)')
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        services = Service.objects.all()
+        if options['service_id']:
+            services = services.filter(pk=options['service_id'])
+        service = services.order_by('pk').first()
+        if service is None:
+            raise CommandError('No service found to create the benchmark slot on')
+
+        slot = BookingSlot.objects.create(
+            service=service,
+            date=timezone.now().date() + timedelta(days=365),
+            start_time=time(0, 0),
+            end_time=time(0, 30),
+            max_bookings=options['capacity'],
+            slot_type='normal',
+        )
+        try:
+            result = run_contention_benchmark(
+                slot.pk, threads=options['threads'], attempts_per_thread=options['attempts']
+            )
+        finally:
+            slot.delete()
+
+        self.stdout.write(
+            f"{result['attempts']} claims from {options['threads']} threads in {result['elapsed_ms']} ms "
+            f"({result['claims_per_second']} claims/s): {result['claimed']} claimed, "
+            f"{result['rejected']} rejected, {result['errors']} errors"
+        )
+        message = f"Final count {result['final_count']}/{result['max_bookings']}"
+        if result['overbooked']:
+            raise CommandError(f"{message} - slot was overbooked")
+        self.stdout.write(self.style.SUCCESS(f"{message} - no overbooking"))
@@ -0,0 +1,99 @@
+"""
+RECONCILE KHALTI PAYMENTS COMMAND
+
+Purpose: Look up pending and processing Khalti payments and bring them in line
+with Khalti's records.
+
+Payments end up in this state when the Khalti lookup could not be completed during
+the payment callback (gateway timeout, outage or open circuit breaker). This command
+looks them up in pk-ordered batches, running the lookups of each batch concurrently
+over the pooled gateway session, and then completes or fails each payment.
+
+Usage:
+    python manage.py reconcile_khalti_payments
+    python manage.py reconcile_khalti_payments --batch-size 100 --workers 16
+    python manage.py reconcile_khalti_payments --min-age 0 --limit 500
+
+Cron Job Setup:
+    # Add to crontab to run every 10 minutes
+    */10 * * * * cd /path/to/project && python manage.py reconcile_khalti_payments
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.bookings.models import Payment
+from apps.bookings.services import KhaltiPaymentService
+
+
+class Command(BaseCommand):
+    help = 'Look up pending Khalti payments concurrently and complete or fail them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of payments looked up per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Maximum concurrent Khalti lookups (default: 8)',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=5,
+            help='Only reconcile payments older than this many minutes (default: 5)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of payments to reconcile in this run',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        workers = options['workers']
+        limit = options['limit']
+        cutoff = timezone.now() - timedelta(minutes=options['min_age'])
+
+        queryset = Payment.objects.filter(
+            status__in=['pending', 'processing'],
+            khalti_token__isnull=False,
+            created_at__lte=cutoff,
+        ).exclude(khalti_token='').select_related('booking', 'applied_voucher').order_by('pk')
+
+        khalti_service = KhaltiPaymentService()
+        totals = {'completed': 0, 'failed': 0, 'unchanged': 0}
+        processed = 0
+        last_pk = 0
+
+        while limit is None or processed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            batch = list(queryset.filter(pk__gt=last_pk)[:size])
+            if not batch:
+                break
+
+            summary = khalti_service.reconcile_pending_payments(batch, max_workers=workers)
+            for outcome, count in summary.items():
+                totals[outcome] += count
+
+            processed += len(batch)
+            last_pk = batch[-1].pk
+
+            if options['verbosity'] >= 2:
+                self.stdout.write(
+                    f"Batch up to payment #{last_pk}: {summary['completed']} completed, "
+                    f"{summary['failed']} failed, {summary['unchanged']} unchanged"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {processed} payment(s): {totals['completed']} completed, "
+            f"{totals['failed']} failed, {totals['unchanged']} unchanged"
+        ))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from apps.bookings.reservations import SlotReservationService
+
+
+class Command(BaseCommand):
+    """
+    Management command to release expired booking slot holds.
+    
+    Deletes holds whose TTL has passed and gives their seats back to the
+    slots in bulk. Intended to run from cron when Celery beat is not in use.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Release expired booking slot holds in bulk'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Holds released per batch (default: SLOT_RESERVATION SWEEP_BATCH_SIZE)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        results = SlotReservationService.release_expired_holds(batch_size=options['batch_size'])
+        
+        if options['verbosity'] >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f"Released {results['holds_released']} expired hold(s) on "
+                f"{results['slots_updated']} slot(s) ({results['batches']} batch(es))"
+            ))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_add_provider_notes_to_booking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicedelivery',
+            name='delivery_photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/JPEG derivatives of delivery photos, keyed by photo URL'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:24
+
+from django.db import migrations, models
+
+
+def detach_materialized_rules(apps, schema_editor):
+    """
+    Recurring entries used to be expanded into one row per occurrence, with
+    the first row still flagged as recurring. Now that a recurring row is a
+    rule expanded on read, those first rows would repeat every occurrence a
+    second time, so they become plain one-off entries like their siblings.
+    """
+    ProviderSchedule = apps.get_model('bookings', 'ProviderSchedule')
+    ProviderSchedule.objects.filter(is_recurring=True).update(
+        is_recurring=False, recurring_pattern=None, recurring_until=None
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0012_slot_holds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='providerschedule',
+            name='recurring_interval',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Repeat every N days/weeks/months'),
+        ),
+        migrations.AddIndex(
+            model_name='providerschedule',
+            index=models.Index(fields=['provider', 'is_recurring', 'recurring_until'], name='bookings_pr_provide_b19099_idx'),
+        ),
+        migrations.RunPython(detach_materialized_rules, migrations.RunPython.noop),
+    ]
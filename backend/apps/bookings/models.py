@@ -19,6 +19,7 @@ Key Models:
 - ServiceTimeSlot: Service-specific time slots that override provider general availability
 - PaymentMethod: Centralized payment method management and support for multiple payment gateways
 - BookingSlot: Actual booking instances for specific dates
+- SlotHold: Short-lived capacity holds on booking slots during checkout
 - Booking: Core booking information and status management
 - CustomerFeedback: Customer feedback and ratings for completed bookings
 - BookingAnalytics: Analytics and insights for bookings
@@ -40,11 +41,14 @@ The models support complex business logic including:
 - Voucher and reward system integration
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
+from apps.common.ratings import RatingSnapshotMixin, RatingTotalsService, get_booking_service_id
 from apps.services.models import Service
+import calendar
 import uuid
-from datetime import timedelta
+from datetime import date, time, timedelta
 
 
 class ProviderAvailability(models.Model):
@@ -421,6 +425,14 @@ class BookingSlot(models.Model):
         # Auto-populate provider from service if not set
         if not self.provider and self.service:
             self.provider = self.service.provider
+        
+        # current_bookings is owned by SlotReservationService's conditional
+        # UPDATEs; saving a stale instance must not overwrite it
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'current_bookings'
+            ]
         super().save(*args, **kwargs)
     
     class Meta:
@@ -435,6 +447,42 @@ class BookingSlot(models.Model):
         ]
 
 
+class SlotHold(models.Model):
+    """
+    Purpose: Keep a seat on a booking slot while the customer completes checkout
+    Impact: New model - prevents overbooking between slot selection and booking creation
+    
+    A hold claims one unit of the slot's capacity (current_bookings) when it is
+    placed. Creating the booking with the hold's token consumes the hold and the
+    booking keeps the seat; holds that expire are released in bulk by the
+    release_expired_slot_holds command.
+    
+    Attributes:
+        booking_slot (ForeignKey): The slot being held
+        customer (ForeignKey): Customer holding the seat
+        token (UUIDField): Opaque token the client passes back when booking
+        expires_at (DateTimeField): When the hold lapses and the seat is released
+        created_at (DateTimeField): When the hold was placed
+    """
+    booking_slot = models.ForeignKey(BookingSlot, on_delete=models.CASCADE, related_name='holds')
+    customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='slot_holds')
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Hold on slot #{self.booking_slot_id} for {self.customer_id} until {self.expires_at}"
+    
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+    
+    class Meta:
+        ordering = ['expires_at']
+        verbose_name = 'Slot Hold'
+        verbose_name_plural = 'Slot Holds'
+
+
 class Booking(models.Model):
     """
     
@@ -624,28 +672,35 @@ class Booking(models.Model):
         if not self.total_amount:
             self.total_amount = self.price - self.discount
         
-        # Update booking slot availability
-        if self.booking_slot:
-            if self.pk is None:  # New booking
-                # Increment slot booking count for new bookings
-                self.booking_slot.current_bookings += 1
-                self.booking_slot.save()
-            else:
-                # For existing bookings, check if status changed to cancelled/rejected
-                # and decrement slot count if needed
-                old_booking = Booking.objects.filter(pk=self.pk).first()
-                if old_booking and old_booking.status != self.status:
-                    if old_booking.status in ['pending', 'confirmed', 'completed'] and self.status in ['cancelled', 'rejected']:
-                        # Decrement slot count when booking is cancelled/rejected
-                        if self.booking_slot.current_bookings > 0:
-                            self.booking_slot.current_bookings -= 1
-                            self.booking_slot.save()
-                    elif old_booking.status in ['cancelled', 'rejected'] and self.status in ['pending', 'confirmed', 'completed']:
-                        # Increment slot count when booking is reactivated
-                        self.booking_slot.current_bookings += 1
-                        self.booking_slot.save()
-        
-        super().save(*args, **kwargs)
+        # Claim or release the seat in the same transaction as the save, so a
+        # failed INSERT/UPDATE never leaves a seat claimed
+        with transaction.atomic():
+            # Update booking slot availability with conditional UPDATEs, so
+            # concurrent bookings can never push a slot past max_bookings
+            if self.booking_slot:
+                from .reservations import SlotReservationService, SlotUnavailableError
+                
+                if self.pk is None:  # New booking
+                    if not SlotReservationService.claim(self.booking_slot_id):
+                        raise SlotUnavailableError("The selected time slot is fully booked")
+                    self.booking_slot.current_bookings += 1
+                else:
+                    # For existing bookings, check if status changed to cancelled/rejected
+                    # and decrement slot count if needed
+                    old_booking = Booking.objects.filter(pk=self.pk).first()
+                    released_statuses = ['cancelled', 'rejected']
+                    if old_booking and old_booking.status != self.status:
+                        if old_booking.status not in released_statuses and self.status in released_statuses:
+                            # Decrement slot count when booking is cancelled/rejected
+                            if SlotReservationService.release(self.booking_slot_id):
+                                self.booking_slot.current_bookings = max(0, self.booking_slot.current_bookings - 1)
+                        elif old_booking.status in released_statuses and self.status not in released_statuses:
+                            # Reactivating a booking needs a free seat again
+                            if not SlotReservationService.claim(self.booking_slot_id):
+                                raise SlotUnavailableError("The booking's time slot is fully booked")
+                            self.booking_slot.current_bookings += 1
+            
+            super().save(*args, **kwargs)
     
     # Enhanced booking tracking and feedback
     @property
@@ -664,7 +719,7 @@ class Booking(models.Model):
         ordering = ['-booking_date', '-booking_time']
 
 
-class CustomerFeedback(models.Model):
+class CustomerFeedback(RatingSnapshotMixin, models.Model):
     """    
     Purpose: Collect detailed feedback from customers to improve provider quality
     Impact: New model - enhances service quality tracking and provider ratings
@@ -694,6 +749,8 @@ class CustomerFeedback(models.Model):
         (5, '5 - Excellent'),
     )
     
+    RATING_SNAPSHOT_FIELDS = ('booking_id', 'rating')
+    
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='customer_feedback')
     
     # Overall rating
@@ -720,26 +777,23 @@ class CustomerFeedback(models.Model):
         return f"Feedback for Booking #{self.booking.id}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update provider's cached ratings
-        self._update_provider_ratings()
-    
-    def _update_provider_ratings(self):
-        """Update provider's cached rating fields"""
-        provider = self.booking.service.provider
-        if hasattr(provider, 'profile'):
-            profile = provider.profile
-            # Calculate average rating from all feedback
-            all_feedback = CustomerFeedback.objects.filter(
-                booking__service__provider=provider
-            )
-            if all_feedback.exists():
-                avg_rating = all_feedback.aggregate(
-                    models.Avg('rating')
-                )['rating__avg']
-                profile.avg_rating = round(avg_rating, 2)
-                profile.reviews_count = all_feedback.count()
-                profile.save(update_fields=['avg_rating', 'reviews_count'])
+        stored = self.get_stored_rating()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Update the service's cached ratings
+            self._update_service_ratings(stored)
+        self.remember_rating()
+    
+    def _update_service_ratings(self, stored):
+        """Apply this feedback's rating change to the service's running rating totals"""
+        service_id = self.booking.service_id
+        previous = None
+        if stored:
+            previous_service_id = service_id
+            if stored['booking_id'] != self.booking_id:
+                previous_service_id = get_booking_service_id(stored['booking_id'])
+            previous = (previous_service_id, stored['rating'])
+        RatingTotalsService.apply(RatingTotalsService.adjust_service, previous, (service_id, self.rating))
     
     class Meta:
         ordering = ['-created_at']
@@ -820,6 +874,7 @@ class ServiceDelivery(models.Model):
         delivered_by (ForeignKey): Provider who marked service as delivered
         delivery_notes (TextField): Provider's notes about service delivery completion
         delivery_photos (JSONField): Photos of completed service
+        delivery_photo_variants (JSONField): Resized derivatives of delivery photos, keyed by photo URL
         customer_confirmed_at (DateTimeField): When customer confirmed service completion
         customer_rating (IntegerField): Customer satisfaction rating
         customer_notes (TextField): Customer's feedback about the service quality
@@ -862,6 +917,12 @@ class ServiceDelivery(models.Model):
         blank=True, 
         help_text="Photos of completed service (stored as list of file paths/URLs)"
     )
+    delivery_photo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/JPEG derivatives of delivery photos, keyed by photo URL"
+    )
     
     # Customer confirmation tracking
     customer_confirmed_at = models.DateTimeField(
@@ -1592,6 +1653,57 @@ class ProviderEarnings(models.Model):
         return (timezone.now() - self.earned_at).days
 
 
+def _add_months(value, months):
+    """Return (year, month) `months` after value's month."""
+    month_index = value.year * 12 + value.month - 1 + months
+    return month_index // 12, month_index % 12 + 1
+
+
+class ProviderScheduleQuerySet(models.QuerySet):
+    """
+    QuerySet for ProviderSchedule with lazy expansion of recurring entries.
+    
+    A recurring entry is stored once as a rule (pattern, interval and until
+    date) instead of one row per occurrence; its occurrences are generated on
+    demand for the window being looked at.
+    """
+    
+    def overlapping(self, start_date, end_date):
+        """
+        Entries with at least one possible occurrence between two dates.
+        
+        Args:
+            start_date (date): First date of the window (inclusive)
+            end_date (date): Last date of the window (inclusive)
+        
+        Returns:
+            QuerySet: One-off entries dated in the window plus recurring rules
+                that start before the window ends and run into it
+        """
+        one_off = models.Q(is_recurring=False, date__gte=start_date, date__lte=end_date)
+        rules = models.Q(is_recurring=True, date__lte=end_date) & (
+            models.Q(recurring_until__isnull=True) | models.Q(recurring_until__gte=start_date)
+        )
+        return self.filter(one_off | rules)
+    
+    def occurrences(self, start_date, end_date):
+        """
+        Expand the entries into their occurrences between two dates.
+        
+        Args:
+            start_date (date): First date of the window (inclusive)
+            end_date (date): Last date of the window (inclusive)
+        
+        Returns:
+            list: (ProviderSchedule, date) pairs ordered by date
+        """
+        expanded = []
+        for entry in self.overlapping(start_date, end_date):
+            expanded.extend((entry, day) for day in entry.occurrence_dates(start_date, end_date))
+        expanded.sort(key=lambda pair: (pair[1], pair[0].start_time or time.min))
+        return expanded
+
+
 class ProviderSchedule(models.Model):
     """
     Provider custom schedule and blocked times
@@ -1602,6 +1714,10 @@ class ProviderSchedule(models.Model):
     This model allows providers to manage custom schedules and blocked time periods
     that override their general availability.
     
+    A recurring entry is a rule: `date` is its first occurrence and the
+    occurrences are expanded lazily (see ProviderScheduleQuerySet). Monthly
+    rules repeat on the same day of the month and skip months without it.
+    
     Attributes:
         provider (ForeignKey): Reference to the provider
         date (DateField): Date for this schedule entry
@@ -1614,6 +1730,7 @@ class ProviderSchedule(models.Model):
         notes (TextField): Additional notes about this schedule entry
         is_recurring (BooleanField): Whether this schedule repeats
         recurring_pattern (CharField): Pattern for recurring schedule
+        recurring_interval (PositiveSmallIntegerField): Repeat every N days/weeks/months
         recurring_until (DateField): End date for recurring schedule
         created_at (DateTimeField): When the schedule entry was created
         updated_at (DateTimeField): When the schedule entry was last updated
@@ -1691,6 +1808,10 @@ class ProviderSchedule(models.Model):
         null=True,
         help_text="Pattern for recurring schedule"
     )
+    recurring_interval = models.PositiveSmallIntegerField(
+        default=1,
+        help_text="Repeat every N days/weeks/months"
+    )
     recurring_until = models.DateField(
         null=True,
         blank=True,
@@ -1700,6 +1821,8 @@ class ProviderSchedule(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProviderScheduleQuerySet.as_manager()
+    
     class Meta:
         ordering = ['date', 'start_time']
         verbose_name = 'Provider Schedule'
@@ -1707,6 +1830,7 @@ class ProviderSchedule(models.Model):
         indexes = [
             models.Index(fields=['provider', 'date']),
             models.Index(fields=['date', 'schedule_type']),
+            models.Index(fields=['provider', 'is_recurring', 'recurring_until']),
         ]
     
     def __str__(self):
@@ -1718,6 +1842,83 @@ class ProviderSchedule(models.Model):
         """Check if this schedule entry blocks availability"""
         return self.schedule_type in ['blocked', 'vacation', 'maintenance']
     
+    def occurrence_dates(self, start_date, end_date):
+        """
+        Dates this entry falls on between two dates.
+        
+        Jumps straight to the first occurrence in the window instead of
+        walking from the rule's start, so far-future windows cost the same.
+        
+        Args:
+            start_date (date): First date of the window (inclusive)
+            end_date (date): Last date of the window (inclusive)
+        
+        Yields:
+            date: Each occurrence in the window, in order
+        """
+        if self.recurring_until and self.recurring_until < end_date:
+            end_date = self.recurring_until
+        first = max(start_date, self.date)
+        if first > end_date:
+            return
+        
+        if not self.is_recurring or not self.recurring_pattern:
+            if start_date <= self.date <= end_date:
+                yield self.date
+            return
+        
+        interval = max(self.recurring_interval or 1, 1)
+        if self.recurring_pattern == 'monthly':
+            months_from_start = (first.year - self.date.year) * 12 + first.month - self.date.month
+            step = -(-months_from_start // interval) * interval if months_from_start > 0 else 0
+            while True:
+                year, month = _add_months(self.date, step)
+                if date(year, month, 1) > end_date:
+                    return
+                if self.date.day <= calendar.monthrange(year, month)[1]:
+                    occurrence = date(year, month, self.date.day)
+                    if first <= occurrence <= end_date:
+                        yield occurrence
+                step += interval
+        
+        step = timedelta(days=interval * (7 if self.recurring_pattern == 'weekly' else 1))
+        skipped = -(-(first - self.date).days // step.days)
+        occurrence = self.date + step * skipped
+        while occurrence <= end_date:
+            yield occurrence
+            occurrence += step
+    
+    def materialize(self):
+        """
+        Replace a recurring rule with one stored row per occurrence.
+        
+        For providers who need to edit or delete single occurrences. The rule
+        itself becomes the first occurrence and the rest are inserted with a
+        single bulk INSERT. Rules without an until date cannot be materialized.
+        
+        Returns:
+            list: The ProviderSchedule rows created for the later occurrences
+        """
+        if not self.is_recurring or not self.recurring_until:
+            return []
+        
+        copied_fields = ('provider_id', 'start_time', 'end_time', 'is_all_day', 'schedule_type',
+                         'max_bookings', 'title', 'notes')
+        occurrences = [
+            ProviderSchedule(date=day, **{field: getattr(self, field) for field in copied_fields})
+            for day in self.occurrence_dates(self.date, self.recurring_until)
+            if day != self.date
+        ]
+        with transaction.atomic():
+            created = ProviderSchedule.objects.bulk_create(occurrences)
+            self.is_recurring = False
+            self.recurring_pattern = None
+            self.recurring_until = None
+            self.recurring_interval = 1
+            self.save(update_fields=['is_recurring', 'recurring_pattern', 'recurring_until',
+                                     'recurring_interval', 'updated_at'])
+        return created
+    
     @property
     def duration_hours(self):
         """Calculate duration in hours"""
@@ -1900,4 +2101,14 @@ def invalidate_provider_cache_on_booking_delete(sender, instance, **kwargs):
             f"provider_analytics:{provider_id}:service_performance"
         ]
         
-        cache.delete_many(cache_keys)
\ No newline at end of file
+        cache.delete_many(cache_keys)
+
+
+@receiver(post_delete, sender=CustomerFeedback)
+def remove_customer_feedback_rating(sender, instance, **kwargs):
+    """
+    Take deleted feedback's rating off the service's cached totals
+    """
+    service_id = get_booking_service_id(instance.booking_id)
+    if service_id:
+        RatingTotalsService.adjust_service(service_id, -instance.rating, -1)
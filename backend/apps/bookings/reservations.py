@@ -0,0 +1,347 @@
+"""
+BOOKING SLOT RESERVATIONS
+
+Race-free capacity accounting for BookingSlot.current_bookings.
+
+Capacity used to be claimed with a read-modify-write in Python
+(`slot.current_bookings += 1; slot.save()`), so two customers taking the last
+seat at the same moment could both succeed, or one update could be lost.
+Every change now goes through a single conditional UPDATE:
+
+    UPDATE bookings_bookingslot
+       SET current_bookings = current_bookings + 1
+     WHERE id = %s AND current_bookings < max_bookings
+
+The database serializes concurrent UPDATEs on the row, and the WHERE clause is
+re-checked against the committed value, so at most max_bookings claims succeed
+no matter how many run at once.
+
+On top of that, customers can place a short-lived hold (SlotHold) while they
+fill in checkout details. The hold owns one seat until it is consumed by the
+booking it was placed for, released, or expires and is swept in bulk.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.common.app_settings import setting_getter
+
+from .models import BookingSlot, SlotHold
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SLOT_RESERVATION_SETTINGS = {
+    'HOLD_TTL_SECONDS': 10 * 60,
+    'MAX_HOLD_TTL_SECONDS': 30 * 60,
+    'SWEEP_BATCH_SIZE': 500,
+}
+
+
+get_slot_reservation_setting = setting_getter('SLOT_RESERVATION', DEFAULT_SLOT_RESERVATION_SETTINGS)
+
+
+class SlotUnavailableError(Exception):
+    """Raised when a booking slot has no capacity left (or is closed for booking)."""
+
+
+class SlotReservationService:
+    """
+    Service class for claiming and releasing booking slot capacity.
+
+    Example:
+        >>> hold = SlotReservationService.place_hold(slot, customer)
+        >>> hold.token, hold.expires_at
+        (UUID('...'), datetime(...))
+        >>> with transaction.atomic():
+        ...     SlotReservationService.consume_hold(hold.token, customer, slot)
+        ...     Booking.objects.create(customer=customer, booking_slot=slot, ...)
+    """
+
+    @staticmethod
+    def claim(slot_id, only_available=False):
+        """
+        Claim one unit of a slot's capacity with a conditional UPDATE.
+
+        Args:
+            slot_id (int): BookingSlot primary key
+            only_available (bool): Also require the slot to be open for booking
+
+        Returns:
+            bool: True if the capacity was claimed, False if the slot is full
+        """
+        slots = BookingSlot.objects.filter(pk=slot_id, current_bookings__lt=F('max_bookings'))
+        if only_available:
+            slots = slots.filter(is_available=True)
+        return slots.update(current_bookings=F('current_bookings') + 1) == 1
+
+    @staticmethod
+    def release(slot_id, count=1):
+        """
+        Give back capacity claimed earlier, never going below zero.
+
+        Args:
+            slot_id (int): BookingSlot primary key
+            count (int): Units to release
+
+        Returns:
+            bool: True if the slot was updated
+        """
+        return BookingSlot.objects.filter(pk=slot_id, current_bookings__gt=0).update(
+            current_bookings=Greatest(F('current_bookings') - count, Value(0))
+        ) == 1
+
+    @staticmethod
+    def release_many(counts):
+        """
+        Release capacity on several slots with a single UPDATE.
+
+        Args:
+            counts (dict): slot_id -> units to release
+
+        Returns:
+            int: Number of slots updated
+        """
+        if not counts:
+            return 0
+        released = Case(
+            *[When(pk=slot_id, then=Value(count)) for slot_id, count in counts.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        return BookingSlot.objects.filter(pk__in=list(counts), current_bookings__gt=0).update(
+            current_bookings=Greatest(F('current_bookings') - released, Value(0))
+        )
+
+    @staticmethod
+    def move(old_slot_id, new_slot_id):
+        """
+        Move one unit of capacity from one slot to another (rescheduling).
+
+        Must run inside a transaction so a failed claim leaves both slots untouched.
+
+        Args:
+            old_slot_id (int): Slot being left (may be None)
+            new_slot_id (int): Slot being taken
+
+        Raises:
+            SlotUnavailableError: If the new slot has no capacity left
+        """
+        if not SlotReservationService.claim(new_slot_id, only_available=True):
+            raise SlotUnavailableError("The selected time slot is fully booked")
+        if old_slot_id:
+            SlotReservationService.release(old_slot_id)
+
+    @staticmethod
+    def place_hold(slot, customer, ttl_seconds=None):
+        """
+        Hold one seat on a slot for a customer for a limited time.
+
+        Args:
+            slot (BookingSlot): Slot to hold
+            customer (User): Customer placing the hold
+            ttl_seconds (int): Hold lifetime (default: HOLD_TTL_SECONDS, capped
+                at MAX_HOLD_TTL_SECONDS)
+
+        Returns:
+            SlotHold: The new hold
+
+        Raises:
+            SlotUnavailableError: If the slot is full or closed
+        """
+        ttl_seconds = min(
+            ttl_seconds or get_slot_reservation_setting('HOLD_TTL_SECONDS'),
+            get_slot_reservation_setting('MAX_HOLD_TTL_SECONDS')
+        )
+        with transaction.atomic():
+            if not SlotReservationService.claim(slot.pk, only_available=True):
+                raise SlotUnavailableError("The selected time slot is fully booked")
+            return SlotHold.objects.create(
+                booking_slot=slot,
+                customer=customer,
+                expires_at=timezone.now() + timedelta(seconds=ttl_seconds),
+            )
+
+    @staticmethod
+    def extend_hold(token, customer, ttl_seconds=None):
+        """
+        Push back the expiry of a live hold, e.g. while a payment is in progress.
+
+        Args:
+            token (UUID | str): Hold token
+            customer (User): Customer who owns the hold
+            ttl_seconds (int): New lifetime from now (capped like place_hold)
+
+        Returns:
+            datetime | None: New expiry, or None if the hold is gone or expired
+        """
+        ttl_seconds = min(
+            ttl_seconds or get_slot_reservation_setting('HOLD_TTL_SECONDS'),
+            get_slot_reservation_setting('MAX_HOLD_TTL_SECONDS')
+        )
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        updated = SlotHold.objects.filter(token=token, customer=customer, expires_at__gt=now).update(
+            expires_at=expires_at
+        )
+        return expires_at if updated else None
+
+    @staticmethod
+    def consume_hold(token, customer, slot):
+        """
+        Hand a live hold's seat over to the booking being created.
+
+        Deletes the hold with a conditional DELETE (an expired or already swept
+        hold cannot be consumed) and gives its seat back, so the booking's own
+        claim in Booking.save() takes it again. Call it inside the transaction
+        that saves the booking: the release UPDATE keeps the slot row locked
+        until commit, so no other customer can take the seat in between.
+
+        Args:
+            token (UUID | str): Hold token
+            customer (User): Customer creating the booking
+            slot (BookingSlot): Slot the booking is for
+
+        Returns:
+            bool: True if a live hold was consumed
+        """
+        deleted, _ = SlotHold.objects.filter(
+            token=token, customer=customer, booking_slot=slot, expires_at__gt=timezone.now()
+        ).delete()
+        if deleted:
+            SlotReservationService.release(slot.pk)
+        return deleted > 0
+
+    @staticmethod
+    def release_hold(token, customer):
+        """
+        Cancel a hold before it expires and give its seat back.
+
+        Args:
+            token (UUID | str): Hold token
+            customer (User): Customer who owns the hold
+
+        Returns:
+            bool: True if a hold was released
+        """
+        with transaction.atomic():
+            hold = SlotHold.objects.select_for_update().filter(token=token, customer=customer).first()
+            if hold is None:
+                return False
+            hold.delete()
+            SlotReservationService.release(hold.booking_slot_id)
+            return True
+
+    @staticmethod
+    def release_expired_holds(batch_size=None, now=None):
+        """
+        Release every expired hold, a batch at a time.
+
+        Each batch locks its holds (skipping rows another sweeper holds),
+        deletes them with one DELETE and gives the seats back with one UPDATE
+        grouped by slot.
+
+        Args:
+            batch_size (int): Holds per batch (default: SWEEP_BATCH_SIZE)
+            now (datetime): Reference time (default: now)
+
+        Returns:
+            dict: {'holds_released': int, 'slots_updated': int, 'batches': int}
+        """
+        batch_size = batch_size or get_slot_reservation_setting('SWEEP_BATCH_SIZE')
+        now = now or timezone.now()
+        result = {'holds_released': 0, 'slots_updated': 0, 'batches': 0}
+
+        while True:
+            with transaction.atomic():
+                expired = list(
+                    SlotHold.objects.select_for_update(skip_locked=True)
+                    .filter(expires_at__lte=now)
+                    .order_by('pk')
+                    .values_list('pk', 'booking_slot_id')[:batch_size]
+                )
+                if not expired:
+                    break
+
+                counts = {}
+                for _, slot_id in expired:
+                    counts[slot_id] = counts.get(slot_id, 0) + 1
+
+                SlotHold.objects.filter(pk__in=[pk for pk, _ in expired]).delete()
+                result['slots_updated'] += SlotReservationService.release_many(counts)
+                result['holds_released'] += len(expired)
+                result['batches'] += 1
+
+            if len(expired) < batch_size:
+                break
+
+        if result['holds_released']:
+            logger.info(
+                f"Released {result['holds_released']} expired slot hold(s) on "
+                f"{result['slots_updated']} slot(s) in {result['batches']} batch(es)"
+            )
+        return result
+
+
+def run_contention_benchmark(slot_id, threads=20, attempts_per_thread=5):
+    """
+    Hammer one slot from many threads and report how the claims went.
+
+    Every thread runs `attempts_per_thread` claims on its own database
+    connection, all starting at the same moment.
+
+    Args:
+        slot_id (int): BookingSlot to claim
+        threads (int): Concurrent workers
+        attempts_per_thread (int): Claims per worker
+
+    Returns:
+        dict: attempts, claimed, rejected, errors, elapsed_ms, claims_per_second,
+            final_count, max_bookings and overbooked (should always be False)
+    """
+    barrier = threading.Barrier(threads)
+    lock = threading.Lock()
+    outcome = {'claimed': 0, 'rejected': 0, 'errors': 0}
+
+    def worker():
+        try:
+            barrier.wait()
+            for _ in range(attempts_per_thread):
+                try:
+                    claimed = SlotReservationService.claim(slot_id)
+                except Exception as e:
+                    logger.warning(f"Benchmark claim failed: {str(e)}")
+                    key = 'errors'
+                else:
+                    key = 'claimed' if claimed else 'rejected'
+                with lock:
+                    outcome[key] += 1
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    slot = BookingSlot.objects.get(pk=slot_id)
+    attempts = threads * attempts_per_thread
+    return {
+        'attempts': attempts,
+        **outcome,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'claims_per_second': round(attempts / elapsed, 1) if elapsed else None,
+        'final_count': slot.current_bookings,
+        'max_bookings': slot.max_bookings,
+        'overbooked': slot.current_bookings > slot.max_bookings,
+    }
@@ -20,6 +20,7 @@ Key Serializers:
 - VoucherApplicationSerializer: Handles voucher application during checkout process
 - CheckoutCalculationSerializer: Calculates checkout totals with voucher
 - BookingSerializer: Handles booking data with all enhanced fields
+- BookingSummarySerializer: Compact booking rows for dashboard lists, rendered from values()
 - BookingWizardSerializer: Handles multi-step booking creation with validation at each step
 - BookingStatusUpdateSerializer: Handles booking status updates
 - ServiceDeliveryMarkSerializer: Validates service delivery data when providers mark service as delivered
@@ -42,8 +43,14 @@ for all API endpoints in the bookings system.
 """
 
 from rest_framework import serializers
-from django.db import models
+from django.db import models, transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Concat
+from django.conf import settings
 from .models import Booking, PaymentMethod, BookingSlot, Payment, ServiceDelivery
+from .reservations import SlotReservationService, SlotUnavailableError
+from apps.common.eager_loading import EagerLoadingMixin
+from apps.common.sparse_fields import SparseFieldsetMixin, SummarySerializer
 from apps.services.serializers import ServiceSerializer
 from apps.accounts.serializers import UserSerializer
 
@@ -88,7 +95,7 @@ class PaymentMethodSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'icon_display']
 
 
-class BookingSlotSerializer(serializers.ModelSerializer):
+class BookingSlotSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for booking slots
     
@@ -117,6 +124,8 @@ class BookingSlotSerializer(serializers.ModelSerializer):
         rush_fee_amount (ReadOnlyField): Rush fee amount
         created_at (DateTime): When the slot was created
     """
+    select_related_fields = ('service',)
+    
     is_fully_booked = serializers.ReadOnlyField()
     calculated_price = serializers.ReadOnlyField()
     rush_fee_amount = serializers.ReadOnlyField()
@@ -133,7 +142,7 @@ class BookingSlotSerializer(serializers.ModelSerializer):
         read_only_fields = ['current_bookings', 'created_at', 'calculated_price', 'rush_fee_amount']
 
 
-class ServiceDeliverySerializer(serializers.ModelSerializer):
+class ServiceDeliverySerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for service delivery tracking
     
@@ -161,12 +170,16 @@ class ServiceDeliverySerializer(serializers.ModelSerializer):
         dispute_resolved_at (DateTime): When dispute was resolved
         is_fully_confirmed (ReadOnlyField): Whether service delivery is fully confirmed
         days_since_delivery (ReadOnlyField): Days since service was delivered
+        delivery_photo_previews (list): Resized delivery photo URLs (?image_size=, default medium)
         created_at (DateTime): When the service delivery record was created
         updated_at (DateTime): When the service delivery record was last updated
     """
+    select_related_fields = ('delivered_by',)
+    
     delivered_by_name = serializers.CharField(source='delivered_by.get_full_name', read_only=True)
     is_fully_confirmed = serializers.ReadOnlyField()
     days_since_delivery = serializers.ReadOnlyField()
+    delivery_photo_previews = serializers.SerializerMethodField()
     
     class Meta:
         model = ServiceDelivery
@@ -176,16 +189,36 @@ class ServiceDeliverySerializer(serializers.ModelSerializer):
             'customer_rating', 'customer_notes', 'would_recommend',
             'dispute_raised', 'dispute_reason', 'dispute_resolved',
             'dispute_resolved_at', 'is_fully_confirmed', 'days_since_delivery',
-            'created_at', 'updated_at'
+            'delivery_photo_previews', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'delivered_by', 'delivered_by_name', 'customer_confirmed_at',
             'dispute_resolved', 'dispute_resolved_at', 'is_fully_confirmed',
             'days_since_delivery', 'created_at', 'updated_at'
         ]
+    
+    def get_delivery_photo_previews(self, obj):
+        """
+        Return delivery photo URLs at the requested size, in delivery_photos order.
+        
+        Photos whose derivatives have not been generated yet keep their
+        original URL.
+        """
+        from django.core.files.storage import default_storage
+        from apps.common.images import variant_url
+        
+        request = self.context.get('request')
+        variants_by_url = obj.delivery_photo_variants or {}
+        previews = []
+        for url in obj.delivery_photos or []:
+            resized_url = variant_url(default_storage, variants_by_url.get(url), request, default_size='medium')
+            if resized_url and not resized_url.startswith('http'):
+                resized_url = f"{settings.BACKEND_URL}{resized_url}"
+            previews.append(resized_url or url)
+        return previews
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for payments with comprehensive payment support
     
@@ -236,6 +269,8 @@ class PaymentSerializer(serializers.ModelSerializer):
         has_voucher (bool): Whether payment has voucher applied
         voucher_savings (Decimal): Voucher savings amount
     """
+    select_related_fields = ('payment_method', 'cash_collected_by', 'verified_by', 'applied_voucher')
+    
     payment_method_details = PaymentMethodSerializer(source='payment_method', read_only=True)
     amount_in_paisa = serializers.ReadOnlyField()
     is_digital_payment = serializers.ReadOnlyField()
@@ -353,7 +388,7 @@ class CheckoutCalculationSerializer(serializers.Serializer):
         return value
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """
     EXISTING SERIALIZER WITH PHASE 1 ENHANCEMENTS:
     - Preserves all existing functionality
@@ -398,12 +433,14 @@ class BookingSerializer(serializers.ModelSerializer):
         express_fee (Decimal): Additional fee for express service
         legacy_status (str): Backward compatibility status mapping
         status_info (dict): Enhanced status information
+        hold_token (UUID): Slot hold placed during checkout (write-only)
     """
     service_details = ServiceSerializer(source='service', read_only=True)
     customer_details = UserSerializer(source='customer', read_only=True)
     booking_slot_details = BookingSlotSerializer(source='booking_slot', read_only=True)
     payment_details = PaymentSerializer(source='payment', read_only=True)
     service_delivery_details = ServiceDeliverySerializer(source='service_delivery', read_only=True)
+    hold_token = serializers.UUIDField(write_only=True, required=False)
     
     class Meta:
         model = Booking
@@ -423,7 +460,10 @@ class BookingSerializer(serializers.ModelSerializer):
             'is_express_booking', 'express_fee',
             
             # SERVICE DELIVERY TRACKING (NEW)
-            'service_delivery_details'
+            'service_delivery_details',
+            
+            # SLOT HOLD FROM CHECKOUT (write-only)
+            'hold_token'
         ]
         read_only_fields = ['customer', 'status', 'created_at', 'updated_at', 'payment_details']
     
@@ -453,7 +493,6 @@ class BookingSerializer(serializers.ModelSerializer):
             if booking_slot:
                 # Check if slot end time is in the past
                 if booking_slot.end_time <= current_time:
-                    from rest_framework import serializers
                     raise serializers.ValidationError({
                         'booking_slot': 'Cannot book past time slots for today. Please select a future time slot.'
                     })
@@ -461,12 +500,20 @@ class BookingSerializer(serializers.ModelSerializer):
             elif booking_time:
                 # Compare with current time
                 if booking_time <= current_time:
-                    from rest_framework import serializers
                     raise serializers.ValidationError({
                         'booking_time': 'Cannot book past time slots for today. Please select a future time.'
                     })
         
-        return super().create(validated_data)
+        # Take over the seat held during checkout, if the hold is still live;
+        # otherwise Booking.save() claims a free seat or rejects a full slot
+        hold_token = validated_data.pop('hold_token', None)
+        try:
+            with transaction.atomic():
+                if hold_token and booking_slot:
+                    SlotReservationService.consume_hold(hold_token, validated_data.get('customer'), booking_slot)
+                return super().create(validated_data)
+        except SlotUnavailableError as e:
+            raise serializers.ValidationError({'booking_slot': str(e)})
     
     def to_representation(self, instance):
         """
@@ -504,7 +551,48 @@ class BookingSerializer(serializers.ModelSerializer):
             'can_confirm_completion': instance.status == 'service_delivered'
         }
         
-        return data
+        return self.prune_representation(data)
+
+
+class BookingSummarySerializer(SummarySerializer):
+    """
+    Compact booking rows for dashboard lists (?shape=summary).
+    
+    Rendered from queryset.values(), so listing bookings costs one query and
+    no model instantiation or nested serialization.
+    
+    Fields:
+        id (int): Booking ID
+        status (str): Current status of the booking
+        booking_date (Date): Date of the booking
+        booking_time (Time): Time of the booking
+        total_amount (Decimal): Total amount to be paid
+        service_id (int): Reference to the service
+        service_title (str): Title of the booked service
+        customer_id (int): Reference to the customer
+        customer_name (str): Customer's full name
+    """
+    values_fields = ('id', 'status', 'booking_date', 'booking_time', 'total_amount', 'service_id', 'customer_id')
+    values_expressions = {
+        'service_title': F('service__title'),
+        'customer_name': Concat(
+            'customer__first_name', Value(' '), 'customer__last_name', output_field=CharField()
+        ),
+    }
+    
+    id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    booking_date = serializers.DateField(read_only=True)
+    booking_time = serializers.TimeField(read_only=True)
+    total_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    service_id = serializers.IntegerField(read_only=True)
+    service_title = serializers.CharField(read_only=True)
+    customer_id = serializers.IntegerField(read_only=True)
+    customer_name = serializers.SerializerMethodField()
+    
+    def get_customer_name(self, row):
+        """Full name with the separator trimmed when a name part is blank"""
+        return (row.get('customer_name') or '').strip()
 
 
 class BookingWizardSerializer(serializers.ModelSerializer):
@@ -896,6 +984,7 @@ class ProviderScheduleSerializer(serializers.ModelSerializer):
         notes (str): Additional notes about this schedule entry
         is_recurring (bool): Whether this schedule repeats
         recurring_pattern (str): Pattern for recurring schedule
+        recurring_interval (int): Repeat every N days/weeks/months
         recurring_until (Date): End date for recurring schedule
         is_blocked (ReadOnlyField): Whether this schedule entry blocks availability
         duration_hours (ReadOnlyField): Duration in hours
@@ -912,7 +1001,7 @@ class ProviderScheduleSerializer(serializers.ModelSerializer):
             'id', 'provider', 'provider_name', 'date',
             'start_time', 'end_time', 'is_all_day',
             'schedule_type', 'max_bookings', 'title', 'notes',
-            'is_recurring', 'recurring_pattern', 'recurring_until',
+            'is_recurring', 'recurring_pattern', 'recurring_interval', 'recurring_until',
             'is_blocked', 'duration_hours',
             'created_at', 'updated_at'
         ]
@@ -18,14 +18,31 @@ import requests
 import logging
 from django.conf import settings
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
+from apps.common.app_settings import setting_getter
 from .models import Payment, PaymentMethod, Booking
+from .gateway_client import GatewayClient
+from .reservations import SlotReservationService, SlotUnavailableError
 from decimal import Decimal
-from datetime import datetime, timedelta, time
+from datetime import time
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_KHALTI_HTTP_SETTINGS = {
+    'CONNECT_TIMEOUT': 3.05,
+    'READ_TIMEOUT': 15,
+    'LOOKUP_MAX_RETRIES': 2,
+    'RETRY_BACKOFF': 0.5,
+    'POOL_MAXSIZE': 10,
+    'BREAKER_FAILURE_THRESHOLD': 5,
+    'BREAKER_RESET_TIMEOUT': 30,
+}
+
+
+get_khalti_http_setting = setting_getter('KHALTI_HTTP', DEFAULT_KHALTI_HTTP_SETTINGS)
+
+
 class TimeSlotService:
     """
     Service class for managing time slots and availability logic.
@@ -91,9 +108,12 @@ class TimeSlotService:
         """
         Generate booking slots based on provider availability and service requirements.
         
-        This method creates booking slots for a date range by analyzing provider availability
-        settings and service-specific time slot configurations. It handles both general
-        provider availability and service-specific scheduling requirements.
+        This method creates booking slots for a date range from the provider's
+        free time as resolved by AvailabilityResolver: the service's time slots
+        (or the provider's weekly hours minus breaks), minus schedule blocks such
+        as vacations, minus time already booked. Service-specific time slots are
+        created as configured when they fit in the free time; otherwise hourly
+        slots are cut from each free window.
         
         Args:
             provider (User): Provider user instance
@@ -109,31 +129,29 @@ class TimeSlotService:
             ...     provider, service, date(2024, 2, 1), date(2024, 2, 7))
             >>> print(f"Generated {len(slots)} slots")
         """
-        from .models import ProviderAvailability, ServiceTimeSlot, BookingSlot
+        from .models import ServiceTimeSlot
+        from .availability import AvailabilityResolver, time_range, to_time
+        
+        free = AvailabilityResolver(provider, service).free_intervals(start_date, end_date)
+        if not free:
+            return []
+        
+        service_slots = {}
+        for service_slot in ServiceTimeSlot.objects.filter(service=service, is_active=True):
+            service_slots.setdefault(service_slot.day_of_week, []).append(service_slot)
         
+        now = timezone.now()
+        today = now.date()
+        current_minutes = now.hour * 60 + now.minute
         created_slots = []
-        current_date = start_date
         
-        while current_date <= end_date:
-            weekday = current_date.weekday()
-            
-            # Check provider availability for this weekday
-            provider_availability = ProviderAvailability.objects.filter(
-                provider=provider,
-                weekday=weekday,
-                is_available=True
-            )
-            
-            # Check service-specific time slots
-            service_slots = ServiceTimeSlot.objects.filter(
-                service=service,
-                day_of_week=weekday,
-                is_active=True
-            )
-            
-            if service_slots.exists():
-                # Use service-specific slots
-                for service_slot in service_slots:
+        for current_date, windows in sorted(free.items()):
+            if current_date.weekday() in service_slots:
+                # Use service-specific slots that are not blocked or booked
+                for service_slot in service_slots[current_date.weekday()]:
+                    slot_start, slot_end = time_range(service_slot.start_time, service_slot.end_time)
+                    if not any(start <= slot_start and slot_end <= end for start, end in windows):
+                        continue
                     slot = TimeSlotService._create_booking_slot(
                         service=service,
                         provider=provider,
@@ -148,48 +166,27 @@ class TimeSlotService:
                     )
                     if slot:
                         created_slots.append(slot)
-                        
-            elif provider_availability.exists():
-                # Use provider general availability
-                for availability in provider_availability:
-                    # Generate hourly slots within availability window
-                    current_time = availability.start_time
-                    end_time = availability.end_time
-                    
-                    while current_time < end_time:
-                        # Calculate slot end time (default 1 hour)
-                        next_hour = datetime.combine(current_date, current_time) + timedelta(hours=1)
-                        slot_end_time = min(next_hour.time(), end_time)
-                        
-                        # Skip if during break time
-                        if availability.break_start and availability.break_end:
-                            if availability.break_start <= current_time < availability.break_end:
-                                current_time = availability.break_end
-                                continue
-                        
-                        # NEW: Skip past slots for today
-                        today = timezone.now().date()
-                        current_time_obj = timezone.now().time()
-                        if current_date == today and slot_end_time <= current_time_obj:
-                            # Skip past slots for today
-                            current_time = (datetime.combine(current_date, current_time) + timedelta(hours=1)).time()
-                            continue
-                        
-                        slot = TimeSlotService._create_booking_slot(
-                            service=service,
-                            provider=provider,
-                            date=current_date,
-                            start_time=current_time,
-                            end_time=slot_end_time,
-                            slot_data={'created_from_availability': True}
-                        )
-                        if slot:
-                            created_slots.append(slot)
-                        
-                        # Move to next hour
-                        current_time = (datetime.combine(current_date, current_time) + timedelta(hours=1)).time()
+                continue
             
-            current_date += timedelta(days=1)
+            # Use provider general availability: hourly slots within each free window
+            for window_start, window_end in windows:
+                for slot_start in range(window_start, window_end, 60):
+                    slot_end = min(slot_start + 60, window_end)
+                    
+                    # Skip past slots for today
+                    if current_date == today and slot_end <= current_minutes:
+                        continue
+                    
+                    slot = TimeSlotService._create_booking_slot(
+                        service=service,
+                        provider=provider,
+                        date=current_date,
+                        start_time=to_time(slot_start),
+                        end_time=to_time(slot_end),
+                        slot_data={'created_from_availability': True}
+                    )
+                    if slot:
+                        created_slots.append(slot)
         
         return created_slots
     
@@ -377,6 +374,22 @@ class KhaltiPaymentService:
         self.initiate_url = f"{self.base_url}/epayment/initiate/"
         self.lookup_url = f"{self.base_url}/epayment/lookup/"
         
+        # Pooled, retrying HTTP client shared by all Khalti calls in this process
+        self.client = GatewayClient(
+            'khalti',
+            headers={
+                'Authorization': f'Key {self.secret_key}',
+                'Content-Type': 'application/json',
+            },
+            connect_timeout=get_khalti_http_setting('CONNECT_TIMEOUT'),
+            read_timeout=get_khalti_http_setting('READ_TIMEOUT'),
+            max_retries=get_khalti_http_setting('LOOKUP_MAX_RETRIES'),
+            backoff=get_khalti_http_setting('RETRY_BACKOFF'),
+            pool_maxsize=get_khalti_http_setting('POOL_MAXSIZE'),
+            failure_threshold=get_khalti_http_setting('BREAKER_FAILURE_THRESHOLD'),
+            reset_timeout=get_khalti_http_setting('BREAKER_RESET_TIMEOUT'),
+        )
+        
     def initiate_payment(self, booking, return_url, website_url, applied_voucher=None):
         """
         Initiate payment with Khalti e-Payment API v2.
@@ -399,11 +412,6 @@ class KhaltiPaymentService:
             >>> if result['success']:
             ...     redirect_url = result['data']['payment_url']
         """
-        headers = {
-            'Authorization': f'Key {self.secret_key}',
-            'Content-Type': 'application/json',
-        }
-        
         # Ensure return_url doesn't have trailing slash which can cause issues with Khalti
         if return_url.endswith('/'):
             return_url = return_url.rstrip('/')
@@ -475,12 +483,8 @@ class KhaltiPaymentService:
             logger.info(f"Khalti request payload: {payload}")
             logger.info(f"Khalti request URL: {self.initiate_url}")
             
-            response = requests.post(
-                self.initiate_url,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            # Initiation creates a payment session, so it is never retried automatically
+            response = self.client.post(self.initiate_url, json=payload, idempotent=False)
             
             logger.info(f"Khalti response status: {response.status_code}")
             logger.info(f"Khalti response headers: {dict(response.headers)}")
@@ -532,24 +536,21 @@ class KhaltiPaymentService:
         Lookup payment status with Khalti e-Payment API v2.
         
         Verifies the status of a payment using Khalti's lookup API with the
-        payment identifier (pidx) returned during initiation.
+        payment identifier (pidx) returned during initiation. Lookups are
+        idempotent, so transient failures are retried with jittered backoff.
         
         Args:
             pidx (str): Payment identifier from initiation
             
         Returns:
-            dict: Khalti API response with payment status and verification details
+            dict: Khalti API response with payment status and verification details.
+                Failures caused by the gateway being unreachable carry 'retryable': True.
             
         Example:
             >>> result = khalti_service.lookup_payment('bZB7K5D6QrqbALbKHaYtDL')
             >>> if result['success'] and result['data']['status'] == 'Completed':
             ...     # Process successful payment
         """
-        headers = {
-            'Authorization': f'Key {self.secret_key}',
-            'Content-Type': 'application/json',
-        }
-        
         payload = {
             'pidx': pidx
         }
@@ -557,12 +558,16 @@ class KhaltiPaymentService:
         try:
             logger.info(f"Looking up Khalti payment - pidx: {pidx}")
             
-            response = requests.post(
-                self.lookup_url,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            response = self.client.post(self.lookup_url, json=payload, idempotent=True)
+            
+            if response.status_code >= 500:
+                logger.error(f"Khalti payment lookup failed - Status: {response.status_code}")
+                return {
+                    'success': False,
+                    'error': 'Payment verification service unavailable',
+                    'status_code': response.status_code,
+                    'retryable': True
+                }
             
             response_data = response.json()
             
@@ -585,7 +590,8 @@ class KhaltiPaymentService:
             return {
                 'success': False,
                 'error': 'Payment verification service unavailable',
-                'exception': str(e)
+                'exception': str(e),
+                'retryable': True
             }
         except Exception as e:
             logger.error(f"Unexpected error during Khalti lookup: {str(e)}")
@@ -603,6 +609,10 @@ class KhaltiPaymentService:
         verifying the payment with Khalti's lookup API and creating payment records.
         Supports voucher application and proper booking status updates.
         
+        If Khalti cannot be reached for the lookup, the payment is recorded with
+        status 'processing' instead of failing outright; the reconcile_khalti_payments
+        command (or a repeated callback) completes it once Khalti answers.
+        
         Args:
             booking_id (int): Booking ID
             pidx (str): Payment identifier from Khalti
@@ -626,33 +636,15 @@ class KhaltiPaymentService:
             
             # Check if payment already exists
             if hasattr(booking, 'payment'):
+                payment = booking.payment
+                if payment.status in ('pending', 'processing') and payment.khalti_token == pidx:
+                    # Verification was deferred earlier; try to finish it now
+                    return self.reconcile_payment(payment)
                 return {
                     'success': False,
                     'error': 'Payment already exists for this booking'
                 }
             
-            # Lookup payment status with Khalti
-            lookup_result = self.lookup_payment(pidx)
-            
-            if not lookup_result['success']:
-                return {
-                    'success': False,
-                    'error': lookup_result.get('error', 'Payment verification failed')
-                }
-            
-            khalti_data = lookup_result['data']
-            
-            # Validate payment data
-            if khalti_data.get('status') != 'Completed':
-                return {
-                    'success': False,
-                    'error': f"Payment not completed. Status: {khalti_data.get('status')}"
-                }
-            
-            # Convert amount from paisa to NPR and validate
-            amount_paisa = khalti_data.get('total_amount', 0)
-            amount_npr = Decimal(amount_paisa) / 100
-            
             # Handle voucher validation if provided
             applied_voucher = None
             original_amount = booking.total_amount
@@ -680,6 +672,52 @@ class KhaltiPaymentService:
             tax_amount = math.floor(float(expected_amount) * 0.13 + 0.5)  # Equivalent to Math.round()
             expected_amount_with_tax = expected_amount + tax_amount
             
+            # Lookup payment status with Khalti
+            lookup_result = self.lookup_payment(pidx)
+            
+            if not lookup_result['success']:
+                if lookup_result.get('retryable'):
+                    # Khalti is unreachable: record the payment and verify it later
+                    payment = Payment.objects.create(
+                        booking=booking,
+                        payment_method=self._get_khalti_payment_method(),
+                        original_amount=original_amount + round(original_amount * Decimal('0.13'), 2),
+                        amount=expected_amount_with_tax,
+                        voucher_discount=voucher_discount,
+                        processing_fee=Decimal('0.00'),
+                        total_amount=expected_amount_with_tax,
+                        applied_voucher=applied_voucher,
+                        khalti_token=pidx,
+                        khalti_transaction_id=transaction_id,
+                        status='processing',
+                        failure_reason=lookup_result.get('error')
+                    )
+                    logger.warning(f"Khalti lookup deferred - Booking: {booking_id}, Payment: {payment.transaction_id}")
+                    return {
+                        'success': False,
+                        'pending_verification': True,
+                        'payment_id': payment.payment_id,
+                        'transaction_id': payment.transaction_id,
+                        'error': 'Payment received but verification is delayed. It will be confirmed automatically.'
+                    }
+                return {
+                    'success': False,
+                    'error': lookup_result.get('error', 'Payment verification failed')
+                }
+            
+            khalti_data = lookup_result['data']
+            
+            # Validate payment data
+            if khalti_data.get('status') != 'Completed':
+                return {
+                    'success': False,
+                    'error': f"Payment not completed. Status: {khalti_data.get('status')}"
+                }
+            
+            # Convert amount from paisa to NPR and validate
+            amount_paisa = khalti_data.get('total_amount', 0)
+            amount_npr = Decimal(amount_paisa) / 100
+            
             # Validate payment amount against expected amount with tax
             if abs(amount_npr - expected_amount_with_tax) > Decimal('0.01'):  # Allow 1 paisa difference for rounding
                 return {
@@ -687,25 +725,10 @@ class KhaltiPaymentService:
                     'error': f'Payment amount mismatch. Expected: ₹{expected_amount_with_tax} (₹{expected_amount} + ₹{tax_amount} tax), Received: ₹{amount_npr}'
                 }
             
-            # Get Khalti payment method
-            khalti_method, created = PaymentMethod.objects.get_or_create(
-                name='Khalti',
-                defaults={
-                    'payment_type': 'digital_wallet',
-                    'is_active': True,
-                    'processing_fee_percentage': Decimal('0.00'),
-                    'icon': 'khalti-icon',
-                    'gateway_config': {
-                        'public_key': self.public_key,
-                        'gateway': 'khalti'
-                    }
-                }
-            )
-            
             # Create payment record with voucher support
             payment = Payment.objects.create(
                 booking=booking,
-                payment_method=khalti_method,
+                payment_method=self._get_khalti_payment_method(),
                 original_amount=original_amount + round(original_amount * Decimal('0.13'), 2),  # Original amount with tax
                 amount=expected_amount_with_tax,  # Final amount with tax
                 voucher_discount=voucher_discount,
@@ -719,18 +742,7 @@ class KhaltiPaymentService:
                 paid_at=timezone.now()
             )
             
-            # Mark voucher as used if applied
-            if applied_voucher and voucher_discount > 0:
-                try:
-                    applied_voucher.use_voucher(amount=voucher_discount, booking=booking)
-                    logger.info(f"Voucher {voucher_code} marked as used with amount ₹{voucher_discount}")
-                except Exception as e:
-                    logger.error(f"Error marking voucher as used: {str(e)}")
-            
-            # Update booking status - FIXED: Use correct status flow
-            booking.status = 'confirmed'  # Payment completed, service scheduled
-            booking.booking_step = 'payment_completed'  # FIXED: Correct step for payment completion
-            booking.save()
+            self._finalize_completed_payment(payment)
             
             logger.info(f"Payment completed successfully - Booking: {booking_id}, Payment: {payment.transaction_id}")
             
@@ -756,6 +768,182 @@ class KhaltiPaymentService:
                 'exception': str(e)
             }
     
+    def reconcile_payment(self, payment, lookup_result=None):
+        """
+        Bring a pending or processing Khalti payment in line with Khalti's records.
+        
+        Completed lookups with a matching amount complete the payment (using the
+        voucher and confirming the booking); terminal Khalti states mark it failed;
+        anything else, including an unreachable gateway, leaves it unchanged.
+        
+        Args:
+            payment (Payment): Payment with a khalti_token (pidx)
+            lookup_result (dict): Result of lookup_payment, if already fetched
+            
+        Returns:
+            dict: Result with 'success' and 'outcome' ('completed', 'failed' or 'unchanged')
+        """
+        if lookup_result is None:
+            lookup_result = self.lookup_payment(payment.khalti_token)
+        
+        if not lookup_result['success']:
+            if lookup_result.get('retryable'):
+                return {
+                    'success': False,
+                    'outcome': 'unchanged',
+                    'pending_verification': True,
+                    'error': lookup_result.get('error', 'Payment verification service unavailable')
+                }
+            return self._fail_payment(payment, lookup_result.get('error', 'Payment verification failed'))
+        
+        khalti_data = lookup_result['data']
+        khalti_status = khalti_data.get('status')
+        
+        if khalti_status == 'Completed':
+            amount_npr = Decimal(khalti_data.get('total_amount', 0)) / 100
+            if abs(amount_npr - payment.total_amount) > Decimal('0.01'):
+                return self._fail_payment(
+                    payment,
+                    f'Payment amount mismatch. Expected: ₹{payment.total_amount}, Received: ₹{amount_npr}',
+                    khalti_data
+                )
+            
+            payment.status = 'completed'
+            payment.paid_at = timezone.now()
+            payment.khalti_response = khalti_data
+            payment.khalti_transaction_id = khalti_data.get('transaction_id') or payment.khalti_transaction_id
+            payment.failure_reason = None
+            payment.save()
+            self._finalize_completed_payment(payment)
+            
+            logger.info(f"Payment reconciled as completed - Payment: {payment.transaction_id}")
+            return {
+                'success': True,
+                'outcome': 'completed',
+                'payment_id': payment.payment_id,
+                'transaction_id': payment.transaction_id,
+                'khalti_transaction_id': payment.khalti_transaction_id,
+                'booking_status': payment.booking.status,
+                'message': 'Payment completed successfully'
+            }
+        
+        if khalti_status in ('Expired', 'User canceled', 'Refunded', 'Partially Refunded'):
+            return self._fail_payment(payment, f"Payment not completed. Status: {khalti_status}", khalti_data)
+        
+        # Still Initiated/Pending on Khalti's side
+        return {
+            'success': False,
+            'outcome': 'unchanged',
+            'pending_verification': True,
+            'error': f"Payment not completed yet. Status: {khalti_status}"
+        }
+    
+    def reconcile_pending_payments(self, payments, max_workers=8):
+        """
+        Reconcile many pending Khalti payments with concurrent lookups.
+        
+        Lookups run in a thread pool (they are pure HTTP calls over the shared
+        pooled session); results are then applied to the database sequentially
+        on the calling thread.
+        
+        Args:
+            payments (list): Payment instances with khalti_token set
+            max_workers (int): Maximum concurrent lookups
+            
+        Returns:
+            dict: Counts of 'completed', 'failed' and 'unchanged' payments
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        summary = {'completed': 0, 'failed': 0, 'unchanged': 0}
+        if not payments:
+            return summary
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(payments)))) as executor:
+            lookup_results = list(executor.map(lambda payment: self.lookup_payment(payment.khalti_token), payments))
+        
+        for payment, lookup_result in zip(payments, lookup_results):
+            try:
+                result = self.reconcile_payment(payment, lookup_result)
+            except Exception as e:
+                logger.error(f"Reconciliation failed - Payment: {payment.transaction_id}, Error: {str(e)}")
+                summary['unchanged'] += 1
+                continue
+            summary[result['outcome']] += 1
+        
+        return summary
+    
+    def _fail_payment(self, payment, reason, khalti_data=None):
+        """
+        Mark a payment as failed.
+        
+        Args:
+            payment (Payment): Payment to update
+            reason (str): Failure reason stored on the payment
+            khalti_data (dict): Khalti lookup data to store (optional)
+            
+        Returns:
+            dict: Reconciliation result with outcome 'failed'
+        """
+        payment.status = 'failed'
+        payment.failure_reason = reason
+        if khalti_data is not None:
+            payment.khalti_response = khalti_data
+        payment.save()
+        logger.warning(f"Payment reconciled as failed - Payment: {payment.transaction_id}, Reason: {reason}")
+        return {
+            'success': False,
+            'outcome': 'failed',
+            'error': reason
+        }
+    
+    def _get_khalti_payment_method(self):
+        """
+        Get or create the Khalti payment method.
+        
+        Returns:
+            PaymentMethod: The Khalti payment method
+        """
+        khalti_method, created = PaymentMethod.objects.get_or_create(
+            name='Khalti',
+            defaults={
+                'payment_type': 'digital_wallet',
+                'is_active': True,
+                'processing_fee_percentage': Decimal('0.00'),
+                'icon_emoji': '💳',
+                'gateway_config': {
+                    'public_key': self.public_key,
+                    'gateway': 'khalti'
+                }
+            }
+        )
+        return khalti_method
+    
+    def _finalize_completed_payment(self, payment):
+        """
+        Apply the side effects of a completed payment.
+        
+        Marks the applied voucher as used and moves the booking to confirmed.
+        
+        Args:
+            payment (Payment): Completed payment
+        """
+        booking = payment.booking
+        applied_voucher = payment.applied_voucher
+        
+        # Mark voucher as used if applied
+        if applied_voucher and payment.voucher_discount > 0:
+            try:
+                applied_voucher.use_voucher(amount=payment.voucher_discount, booking=booking)
+                logger.info(f"Voucher {applied_voucher.voucher_code} marked as used with amount ₹{payment.voucher_discount}")
+            except Exception as e:
+                logger.error(f"Error marking voucher as used: {str(e)}")
+        
+        # Update booking status - FIXED: Use correct status flow
+        booking.status = 'confirmed'  # Payment completed, service scheduled
+        booking.booking_step = 'payment_completed'  # FIXED: Correct step for payment completion
+        booking.save()
+    
     # Legacy method for backward compatibility
     def process_booking_payment(self, booking_id, token, amount, user):
         """
@@ -889,13 +1077,17 @@ class BookingSlotService:
         if slot.is_fully_booked:
             return False
         
-        # Update booking with slot
-        booking.booking_slot = slot
-        booking.save()
-        
-        # Update slot booking count
-        slot.current_bookings += 1
-        slot.save()
+        # New bookings claim the seat in Booking.save(); existing bookings
+        # claim it here. Both use a conditional UPDATE, so a slot that filled
+        # up since the check above is rejected instead of overbooked.
+        try:
+            with transaction.atomic():
+                if booking.pk is not None and not SlotReservationService.claim(slot.pk):
+                    return False
+                booking.booking_slot = slot
+                booking.save()
+        except SlotUnavailableError:
+            return False
         
         return True
     
@@ -977,27 +1169,26 @@ class BookingSlotService:
         express_fee = base_price * (slot.rush_fee_percentage / 100)
         total_amount = base_price + express_fee
         
-        # Create booking
-        booking = Booking.objects.create(
-            customer=customer,
-            service=service,
-            booking_date=booking_date,
-            booking_time=booking_time,
-            address=booking_data.get('address', ''),
-            city=booking_data.get('city', ''),
-            phone=booking_data.get('phone', ''),
-            note=booking_data.get('note', ''),
-            special_instructions=booking_data.get('special_instructions', ''),
-            price=base_price,
-            express_fee=express_fee,
-            total_amount=total_amount,
-            is_express_booking=True,
-            booking_slot=slot
-        )
-        
-        # Update slot
-        slot.current_bookings += 1
-        slot.save()
+        # Create booking (Booking.save() claims the slot's seat)
+        try:
+            booking = Booking.objects.create(
+                customer=customer,
+                service=service,
+                booking_date=booking_date,
+                booking_time=booking_time,
+                address=booking_data.get('address', ''),
+                city=booking_data.get('city', ''),
+                phone=booking_data.get('phone', ''),
+                note=booking_data.get('note', ''),
+                special_instructions=booking_data.get('special_instructions', ''),
+                price=base_price,
+                express_fee=express_fee,
+                total_amount=total_amount,
+                is_express_booking=True,
+                booking_slot=slot
+            )
+        except SlotUnavailableError:
+            return None, None
         
         return booking, slot
 
@@ -498,40 +498,42 @@ def emergency_slot_generation(service_id, days_ahead=7):
     retry_kwargs={'max_retries': 3, 'countdown': 300},  # Retry 3 times, wait 5 minutes
     name='auto_cancel_expired_bookings_task'
 )
-def auto_cancel_expired_bookings_task(self, grace_period=1, dry_run=False):
+def auto_cancel_expired_bookings_task(self, grace_period=1, dry_run=False, batch_size=None):
     """
     Auto-cancel bookings that have passed their scheduled date.
     
     Automatically cancels bookings that have not been completed and have passed
-    their scheduled service date by the specified grace period.
+    their scheduled service date by the specified grace period. Bookings are
+    cancelled in pk-ordered chunks, each releasing its slot capacity and
+    notifying customers and providers in bulk (see apps.bookings.expiry).
     
     Args:
         grace_period (int): Days to wait after booking date before cancelling (default: 1)
-        dry_run (bool): Run in dry-run mode without making changes (default: False)
+        dry_run (bool): Only count the expired bookings without changing them (default: False)
+        batch_size (int): Bookings per chunk (default: BOOKING_EXPIRY['BATCH_SIZE'])
     
     Returns:
-        dict: Task execution results containing status, timing information, and parameters used
+        dict: Task execution results containing status, timing information,
+            parameters used and cancellation metrics (totals and per batch)
         
     Example:
         >>> auto_cancel_expired_bookings_task.delay(1, False)
-        {'status': 'success', 'task_id': '...', 'duration_seconds': 8.3, ...}
+        {'status': 'success', 'task_id': '...', 'cancelled': 42, 'batches': [...], ...}
     """
+    from .expiry import ExpiredBookingService
+    
     task_start = timezone.now()
     logger.info(f"Starting expired booking cancellation task - Task ID: {self.request.id}")
     
     try:
-        # Prepare command arguments
-        cmd_args = ['auto_cancel_expired_bookings']
-        cmd_kwargs = {
-            'grace_period': grace_period,
-            'verbosity': 2
-        }
-        
         if dry_run:
-            cmd_kwargs['dry_run'] = True
-        
-        # Execute command
-        call_command(*cmd_args, **cmd_kwargs)
+            metrics = {
+                'expired': ExpiredBookingService.get_expired_bookings(grace_period).count(),
+                'cancelled': 0,
+                'batches': [],
+            }
+        else:
+            metrics = ExpiredBookingService.cancel_expired(grace_period=grace_period, batch_size=batch_size)
         
         task_end = timezone.now()
         duration = (task_end - task_start).total_seconds()
@@ -543,10 +545,14 @@ def auto_cancel_expired_bookings_task(self, grace_period=1, dry_run=False):
             'completed_at': task_end.isoformat(),
             'duration_seconds': duration,
             'grace_period': grace_period,
-            'dry_run': dry_run
+            'dry_run': dry_run,
+            **metrics,
         }
         
-        logger.info(f"Expired booking cancellation completed successfully in {duration:.2f}s")
+        logger.info(
+            f"Expired booking cancellation completed successfully in {duration:.2f}s: "
+            f"{metrics['cancelled']} booking(s) in {len(metrics['batches'])} batch(es)"
+        )
         return result
         
     except Exception as exc:
@@ -574,4 +580,32 @@ def auto_cancel_expired_bookings_task(self, grace_period=1, dry_run=False):
             details=error_details
         )
         
-        raise self.retry(exc=exc)
\ No newline at end of file
+        raise self.retry(exc=exc)
+
+@shared_task(bind=True)
+def release_expired_slot_holds_task(self, batch_size=None):
+    """
+    Give back the seats of expired booking slot holds.
+    
+    Runs every minute so abandoned checkouts free their seat shortly after
+    the hold lapses. Each batch is one DELETE plus one UPDATE grouped by slot.
+    
+    Args:
+        batch_size (int): Holds per batch (default: SLOT_RESERVATION['SWEEP_BATCH_SIZE'])
+    
+    Returns:
+        dict: Holds released, slots updated and batches processed
+        
+    Example:
+        >>> release_expired_slot_holds_task.delay()
+        {'holds_released': 3, 'slots_updated': 2, 'batches': 1}
+    """
+    from .reservations import SlotReservationService
+    
+    results = SlotReservationService.release_expired_holds(batch_size=batch_size)
+    if results['holds_released']:
+        logger.info(
+            f"Expired slot holds released - Task ID: {self.request.id}, "
+            f"holds: {results['holds_released']}, slots: {results['slots_updated']}"
+        )
+    return results
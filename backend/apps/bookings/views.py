@@ -22,7 +22,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 # Django core imports
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.http import HttpResponse
 from django.db.models import Sum, Count, Avg, Max, Min
@@ -46,13 +46,17 @@ from .serializers import (
     BookingSlotSerializer, PaymentSerializer, BookingWizardSerializer,
     KhaltiPaymentSerializer, ServiceDeliverySerializer, ServiceDeliveryMarkSerializer,
     ServiceCompletionConfirmSerializer, CashPaymentProcessSerializer,
-    VoucherApplicationSerializer, CheckoutCalculationSerializer
+    VoucherApplicationSerializer, CheckoutCalculationSerializer, BookingSummarySerializer
 )
 
 # Business logic services
 from .services import KhaltiPaymentService, BookingSlotService, BookingWizardService, TimeSlotService
+from .reservations import SlotReservationService, SlotUnavailableError
+from .availability import AvailabilityResolver
 
 # Permission classes and external models
+from apps.common.eager_loading import EagerLoadingViewSetMixin
+from apps.common.sparse_fields import SummaryShapeViewSetMixin
 from apps.common.permissions import IsCustomer, IsProvider, IsAdmin, IsOwnerOrAdmin
 from apps.services.models import Service
 from apps.accounts.models import User
@@ -120,10 +124,56 @@ class BookingSlotViewSet(viewsets.ModelViewSet):
         """
         if self.action in ['list', 'retrieve', 'available_slots']:
             permission_classes = [permissions.AllowAny]
+        elif self.action == 'hold':
+            permission_classes = [permissions.IsAuthenticated, IsCustomer]
         else:
             permission_classes = [permissions.IsAuthenticated, IsProvider | IsAdmin]
         return [permission() for permission in permission_classes]
     
+    @action(detail=True, methods=['post', 'patch', 'delete'])
+    def hold(self, request, pk=None):
+        """
+        Hold a seat on this slot while the customer completes checkout
+        
+        POST   /api/bookings/booking_slots/{id}/hold/   {"ttl_seconds": 600}
+        PATCH  /api/bookings/booking_slots/{id}/hold/   {"hold_token": "...", "ttl_seconds": 900}
+        DELETE /api/bookings/booking_slots/{id}/hold/?hold_token=...
+        
+        POST claims one seat and returns a hold_token to pass as `hold_token`
+        when creating the booking. PATCH extends a live hold (e.g. while a
+        payment is in progress) and DELETE gives the seat back early. Holds
+        that are not used before expires_at are released automatically.
+        """
+        slot = self.get_object()
+        
+        if request.method == 'DELETE':
+            hold_token = request.query_params.get('hold_token') or request.data.get('hold_token')
+            if not hold_token or not SlotReservationService.release_hold(hold_token, request.user):
+                return Response({"detail": "Hold not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        
+        try:
+            ttl_seconds = int(request.data.get('ttl_seconds') or 0) or None
+        except (TypeError, ValueError):
+            return Response({"detail": "ttl_seconds must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.method == 'PATCH':
+            hold_token = request.data.get('hold_token')
+            expires_at = SlotReservationService.extend_hold(hold_token, request.user, ttl_seconds) if hold_token else None
+            if expires_at is None:
+                return Response({"detail": "Hold not found or already expired"}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'hold_token': hold_token, 'slot_id': slot.id, 'expires_at': expires_at})
+        
+        try:
+            hold = SlotReservationService.place_hold(slot, request.user, ttl_seconds)
+        except SlotUnavailableError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+        
+        return Response(
+            {'hold_token': str(hold.token), 'slot_id': slot.id, 'expires_at': hold.expires_at},
+            status=status.HTTP_201_CREATED
+        )
+    
     @action(detail=False, methods=['get'])
     def available_slots(self, request):
         """
@@ -208,6 +258,9 @@ class BookingSlotViewSet(viewsets.ModelViewSet):
                 # Note: Removed express_mode filtering - frontend handles slot type filtering
                 # This provides maximum flexibility for the frontend to display slots
                 
+                # Hide slots that clash with schedule blocks or the provider's other bookings
+                available_slots = AvailabilityResolver(service.provider, service).filter_slots(available_slots)
+                
                 serializer = self.get_serializer(available_slots, many=True)
                 return Response(serializer.data)
             
@@ -239,6 +292,9 @@ class BookingSlotViewSet(viewsets.ModelViewSet):
                     all_slots.extend(available_slots)
                     current_date += timedelta(days=1)
                 
+                # Resolve blocks and bookings for the whole range at once
+                all_slots = AvailabilityResolver(service.provider, service).filter_slots(all_slots)
+                
                 serializer = self.get_serializer(all_slots, many=True)
                 return Response(serializer.data)
             
@@ -631,6 +687,9 @@ class PaymentViewSet(viewsets.ModelViewSet):
         
         if result['success']:
             return Response(result, status=status.HTTP_200_OK)
+        elif result.get('pending_verification'):
+            # Khalti could not confirm yet; the payment is reconciled in the background
+            return Response(result, status=status.HTTP_202_ACCEPTED)
         else:
             return Response(result, status=status.HTTP_400_BAD_REQUEST)
     
@@ -984,7 +1043,7 @@ class BookingWizardViewSet(viewsets.ViewSet):
 # CORE BOOKING MANAGEMENT VIEWSETS
 # ============================================================================
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(SummaryShapeViewSetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """
     CORE BOOKING VIEWSET WITH COMPREHENSIVE FUNCTIONALITY:
     
@@ -995,11 +1054,13 @@ class BookingViewSet(viewsets.ModelViewSet):
     - Service delivery tracking
     - Rescheduling and cancellation
     - Analytics and reporting
+    - Sparse fieldsets (?fields=, ?expand=) and compact list rows (?shape=summary)
     
     Maintains backward compatibility while adding new Phase 1 enhancements.
     """
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
+    summary_serializer_class = BookingSummarySerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status', 'booking_date', 'booking_step']  # Added booking_step filter
     ordering_fields = ['booking_date', 'booking_time', 'created_at']
@@ -1145,7 +1206,7 @@ class BookingViewSet(viewsets.ModelViewSet):
             )
         
         # Get all bookings for the customer
-        queryset = Booking.objects.filter(customer=request.user).select_related('service', 'service__provider', 'payment').order_by('-created_at')
+        queryset = self.eager_load(Booking.objects.filter(customer=request.user).order_by('-created_at'))
         
         # Check if grouped format is requested (for dashboard)
         format_type = request.query_params.get('format', 'list')
@@ -1284,6 +1345,10 @@ class BookingViewSet(viewsets.ModelViewSet):
             return Response(grouped_data)
         
         else:
+            # Compact dashboard rows straight from values()
+            if self.wants_summary():
+                return self.summary_list_response(queryset)
+            
             # Apply pagination if requested for list format
             page = self.paginate_queryset(queryset)
             if page is not None:
@@ -1301,6 +1366,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         ENHANCED METHOD: Get provider bookings with grouped format support
         
         GET /api/bookings/provider_bookings/?format=grouped
+        GET /api/bookings/provider_bookings/?format=grouped&shape=summary
         """
         if request.user.role != 'provider' and request.user.role != 'admin':
             return Response(
@@ -1312,9 +1378,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         format_type = request.query_params.get('format', 'list')
         
         # Base queryset for provider's bookings
-        queryset = Booking.objects.filter(
-            service__provider=request.user
-        ).select_related('service', 'customer', 'payment', 'booking_slot')
+        queryset = self.eager_load(Booking.objects.filter(service__provider=request.user))
         
         if format_type == 'grouped':
             # Group bookings by status
@@ -1325,17 +1389,25 @@ class BookingViewSet(viewsets.ModelViewSet):
             )
             completed = queryset.filter(status='completed')
             
+            if self.wants_summary():
+                render = self.get_summary_data
+            else:
+                render = lambda bookings: self.get_serializer(bookings, many=True).data
+            
             response_data = {
                 'count': queryset.count(),
                 'next': None,
                 'previous': None,
-                'pending': self.get_serializer(pending, many=True).data,
-                'upcoming': self.get_serializer(upcoming, many=True).data,
-                'completed': self.get_serializer(completed, many=True).data,
+                'pending': render(pending),
+                'upcoming': render(upcoming),
+                'completed': render(completed),
             }
             
             return Response(response_data)
         else:
+            if self.wants_summary():
+                return Response(self.get_summary_data(queryset))
+            
             # Return regular list
             serializer = self.get_serializer(queryset, many=True)
             return Response(serializer.data)
@@ -1764,17 +1836,11 @@ class BookingViewSet(viewsets.ModelViewSet):
         
         # Update booking status and reason
         cancellation_reason = request.data.get('cancellation_reason', '')
-        old_status = booking.status  # Store old status for slot management
         booking.status = 'cancelled'
         booking.cancellation_reason = cancellation_reason
+        # Booking.save() gives the slot's seat back
         booking.save()
         
-        # If the booking was confirmed or completed, update slot availability
-        # Only decrement if the booking was actually using a slot
-        if old_status in ['confirmed', 'completed'] and booking.booking_slot:
-            booking.booking_slot.current_bookings = max(0, booking.booking_slot.current_bookings - 1)
-            booking.booking_slot.save()
-        
         serializer = self.get_serializer(booking)
         return Response(serializer.data)
     
@@ -1831,6 +1897,12 @@ class BookingViewSet(viewsets.ModelViewSet):
                 end_time__lte=current_time
             )
             
+            # Drop slots the provider cannot take: schedule blocks and other
+            # bookings, ignoring the booking being rescheduled
+            available_slots = AvailabilityResolver(
+                booking.service.provider, booking.service, exclude_booking_ids=[booking.id]
+            ).filter_slots(available_slots)
+            
             # Serialize slots with price information
             slot_data = []
             for slot in available_slots:
@@ -2095,17 +2167,15 @@ class BookingViewSet(viewsets.ModelViewSet):
             if special_instructions:
                 booking.special_instructions = special_instructions.strip()
             
-            booking.save()
-            
-            # Update slot booking counts
-            # Decrement old slot count if it exists
-            if old_slot:
-                old_slot.current_bookings = max(0, old_slot.current_bookings - 1)
-                old_slot.save()
-            
-            # Increment new slot count
-            new_slot.current_bookings += 1
-            new_slot.save()
+            # Take a seat on the new slot and give the old one back atomically;
+            # the claim is a conditional UPDATE, so a slot filled since the
+            # check above is rejected here
+            try:
+                with transaction.atomic():
+                    SlotReservationService.move(old_slot.id if old_slot else None, new_slot.id)
+                    booking.save()
+            except SlotUnavailableError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
             # Calculate price difference for response
             price_difference = float(new_total_amount) - float(old_total_amount)
@@ -2491,7 +2561,7 @@ from apps.common.permissions import (
 )
 
 # Import throttling for API rate limiting
-from rest_framework.throttling import ScopedRateThrottle
+from apps.common.throttling import SlidingWindowScopedRateThrottle
 
 
 class ProviderDashboardViewSet(viewsets.ViewSet):
@@ -2518,7 +2588,7 @@ class ProviderDashboardViewSet(viewsets.ViewSet):
     high-performance viewset with comprehensive business intelligence capabilities.
     """
     permission_classes = [permissions.IsAuthenticated, IsProvider]
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = 'provider_dashboard'
     
     def get_provider(self):
@@ -3375,20 +3445,20 @@ class ProviderDashboardViewSet(viewsets.ViewSet):
                     
                     # Get blocked times from provider schedule
                     if include_blocked:
+                        # Recurring entries are rules; expand them for this window only
                         blocked_schedules = ProviderSchedule.objects.filter(
                             provider=provider,
-                            date__gte=from_date,
-                            date__lte=to_date,
                             schedule_type__in=['blocked', 'vacation', 'maintenance']
-                        )
+                        ).occurrences(from_date, to_date)
                         
-                        for schedule in blocked_schedules:
+                        for schedule, occurrence_date in blocked_schedules:
                             blocked_times.append({
                                 'id': schedule.id,
                                 'title': schedule.title or schedule.get_schedule_type_display(),
-                                'startDate': schedule.date.isoformat(),
-                                'endDate': schedule.date.isoformat(),
-                                'reason': schedule.schedule_type
+                                'startDate': occurrence_date.isoformat(),
+                                'endDate': occurrence_date.isoformat(),
+                                'reason': schedule.schedule_type,
+                                'isRecurring': schedule.is_recurring
                             })
                 
                 except ValueError:
@@ -3999,8 +4069,14 @@ class ProviderScheduleViewSet(viewsets.ModelViewSet):
             "notes": "Family vacation",
             "is_recurring": false,
             "recurring_pattern": "weekly",
-            "recurring_until": "2024-12-31"
+            "recurring_interval": 1,
+            "recurring_until": "2024-12-31",
+            "materialize": false
         }
+        
+        A recurring entry is stored once as a rule and expanded when schedules
+        and availability are read. Pass "materialize": true to store one row
+        per occurrence instead (requires recurring_until).
         """
         data = request.data.copy()
         
@@ -4008,7 +4084,24 @@ class ProviderScheduleViewSet(viewsets.ModelViewSet):
         if 'end_date' not in data or not data['end_date']:
             data['end_date'] = data.get('date')
         
-        # Create the schedule entry
+        is_recurring = bool(data.get('is_recurring', False))
+        recurring_pattern = data.get('recurring_pattern') or 'weekly'
+        if is_recurring and recurring_pattern not in ('daily', 'weekly', 'monthly'):
+            return Response(
+                {"detail": "recurring_pattern must be one of: daily, weekly, monthly"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            recurring_interval = int(data.get('recurring_interval') or 1)
+        except (TypeError, ValueError):
+            recurring_interval = 0
+        if recurring_interval < 1:
+            return Response(
+                {"detail": "recurring_interval must be a positive integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Create the schedule entry (a rule when recurring)
         schedule_entry = ProviderSchedule.objects.create(
             provider=request.user,
             title=data.get('title', ''),
@@ -4018,46 +4111,57 @@ class ProviderScheduleViewSet(viewsets.ModelViewSet):
             is_all_day=data.get('is_all_day', True),
             schedule_type=data.get('schedule_type', 'blocked'),
             notes=data.get('notes', ''),
-            is_recurring=data.get('is_recurring', False),
-            recurring_pattern=data.get('recurring_pattern') if data.get('is_recurring') else None,
-            recurring_until=data.get('recurring_until') if data.get('is_recurring') else None
+            is_recurring=is_recurring,
+            recurring_pattern=recurring_pattern if is_recurring else None,
+            recurring_interval=recurring_interval if is_recurring else 1,
+            recurring_until=(data.get('recurring_until') or None) if is_recurring else None
         )
         
-        # If recurring, create additional entries
-        if data.get('is_recurring') and data.get('recurring_until'):
-            from datetime import datetime, timedelta
-            
-            start_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-            end_date = datetime.strptime(data['recurring_until'], '%Y-%m-%d').date()
-            current_date = start_date
-            
-            pattern = data.get('recurring_pattern', 'weekly')
-            delta_days = 7 if pattern == 'weekly' else 30 if pattern == 'monthly' else 1
-            
-            while current_date <= end_date:
-                current_date += timedelta(days=delta_days)
-                if current_date <= end_date:
-                    ProviderSchedule.objects.create(
-                        provider=request.user,
-                        title=data.get('title', ''),
-                        date=current_date,
-                        start_time=data.get('start_time') if not data.get('is_all_day', True) else None,
-                        end_time=data.get('end_time') if not data.get('is_all_day', True) else None,
-                        is_all_day=data.get('is_all_day', True),
-                        schedule_type=data.get('schedule_type', 'blocked'),
-                        notes=data.get('notes', ''),
-                        is_recurring=False,  # Individual entries are not recurring
-                        recurring_pattern=None,
-                        recurring_until=None
-                    )
+        # Reload so dates and times are parsed values rather than request strings
+        schedule_entry.refresh_from_db()
+        
+        occurrences_created = 0
+        if is_recurring and data.get('materialize'):
+            occurrences_created = len(schedule_entry.materialize())
         
         return Response({
             'id': schedule_entry.id,
             'title': schedule_entry.title,
             'date': schedule_entry.date.isoformat(),
             'schedule_type': schedule_entry.schedule_type,
+            'is_recurring': schedule_entry.is_recurring,
+            'occurrences_created': occurrences_created,
             'message': 'Schedule entry created successfully'
         }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=True, methods=['post'])
+    def materialize(self, request, pk=None):
+        """
+        Store one row per occurrence of a recurring entry
+        
+        POST /api/bookings/provider_schedule/{id}/materialize/
+        
+        Lets a provider edit or delete single occurrences of a rule. The rule
+        becomes its first occurrence; the others are inserted in one batch.
+        """
+        schedule_entry = self.get_object()
+        if not schedule_entry.is_recurring:
+            return Response(
+                {"detail": "Schedule entry is not recurring"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not schedule_entry.recurring_until:
+            return Response(
+                {"detail": "Only recurring entries with recurring_until can be materialized"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        created = schedule_entry.materialize()
+        return Response({
+            'id': schedule_entry.id,
+            'occurrences_created': len(created),
+            'message': 'Recurring schedule entry materialized'
+        })
 
 
 class ProviderBookingUpdateViewSet(viewsets.ViewSet):
@@ -4068,7 +4172,7 @@ class ProviderBookingUpdateViewSet(viewsets.ViewSet):
     Impact: New viewset - enables provider booking management
     """
     permission_classes = [permissions.IsAuthenticated, CanManageProviderBookings]
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = 'provider_bookings'
     
     @action(detail=True, methods=['patch'])
@@ -4619,66 +4723,87 @@ class ProviderBookingManagementViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate file types and sizes
+        from django.core.files.storage import default_storage
+        from django.db import transaction
+        from apps.common.uploads import BatchUploadService, BatchUploadError
+        import uuid
+        import os
+        
+        # Validate every file type and size before anything is stored
         allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/webp']
         max_size = 5 * 1024 * 1024  # 5MB
+        try:
+            BatchUploadService.validate(photos, allowed_types=allowed_types, max_size=max_size)
+        except BatchUploadError as e:
+            return Response(
+                {'error': f'{e.errors[0]}. Only JPEG, PNG, and WebP images up to 5MB are allowed.', 'errors': e.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        uploaded_urls = []
-        for photo in photos:
-            if photo.content_type not in allowed_types:
-                return Response(
-                    {'error': f'Invalid file type: {photo.content_type}. Only JPEG, PNG, and WebP are allowed.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            if photo.size > max_size:
-                return Response(
-                    {'error': f'File too large: {photo.name}. Maximum size is 5MB.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Save the file with proper naming convention
-            from django.core.files.storage import default_storage
-            import uuid
-            import os
-            
-            # Get provider name (sanitized for filename)
-            provider_name = provider.get_full_name() or provider.username
-            provider_name = "".join(c for c in provider_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            provider_name = provider_name.replace(' ', '_')
-            
-            # Create filename: providername_bookingID_uuid.extension
-            file_extension = os.path.splitext(photo.name)[1]
-            unique_filename = f"{provider_name}_{booking.id}_{uuid.uuid4()}{file_extension}"
-            
-            # Save to service_delivery_photos/{booking_id}/
-            file_path = f'service_delivery_photos/{booking.id}/{unique_filename}'
-            saved_path = default_storage.save(file_path, photo)
-            # Return full URL instead of relative URL
-            relative_url = default_storage.url(saved_path)
-            full_url = f"{settings.BACKEND_URL}{relative_url}"
-            uploaded_urls.append(full_url)
-        
-        # Update or create service delivery record
-        service_delivery, created = ServiceDelivery.objects.get_or_create(
-            booking=booking,
-            defaults={
-                'delivered_by': provider,
-                'delivery_photos': uploaded_urls
-            }
-        )
+        # Get provider name (sanitized for filename)
+        provider_name = provider.get_full_name() or provider.username
+        provider_name = "".join(c for c in provider_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        provider_name = provider_name.replace(' ', '_')
+        
+        # Create filenames: service_delivery_photos/{booking_id}/providername_bookingID_uuid.extension
+        named_photos = [
+            (
+                f'service_delivery_photos/{booking.id}/'
+                f'{provider_name}_{booking.id}_{uuid.uuid4()}{os.path.splitext(photo.name)[1]}',
+                photo
+            )
+            for photo in photos
+        ]
         
-        if not created:
-            # Append to existing photos
-            existing_photos = service_delivery.delivery_photos or []
-            service_delivery.delivery_photos = existing_photos + uploaded_urls
-            service_delivery.save()
+        # Store all photos concurrently; nothing is kept if any upload fails
+        try:
+            stored = BatchUploadService.store(named_photos)
+        except BatchUploadError as e:
+            return Response(
+                {'error': 'Failed to upload photos, please try again', 'errors': e.errors},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        # Return full URLs instead of relative URLs
+        saved_photos = [
+            (f"{settings.BACKEND_URL}{default_storage.url(item['name'])}", item['name']) for item in stored
+        ]
+        uploaded_urls = [url for url, _ in saved_photos]
+        
+        try:
+            with transaction.atomic():
+                # Update or create service delivery record; lock it so concurrent uploads both append
+                service_delivery, created = ServiceDelivery.objects.select_for_update().get_or_create(
+                    booking=booking,
+                    defaults={
+                        'delivered_by': provider,
+                        'delivery_photos': uploaded_urls
+                    }
+                )
+                
+                if not created:
+                    # Append to existing photos
+                    existing_photos = service_delivery.delivery_photos or []
+                    service_delivery.delivery_photos = existing_photos + uploaded_urls
+                    service_delivery.save(update_fields=['delivery_photos', 'updated_at'])
+                
+                # Resized previews are generated in the background, keyed by photo URL
+                from apps.common.images import schedule_mapped_image_derivatives
+                schedule_mapped_image_derivatives(service_delivery, 'delivery_photo_variants', saved_photos)
+        except Exception as e:
+            BatchUploadService.discard(stored)
+            logger.error(f"Failed to record delivery photos for booking {booking.id}: {str(e)}")
+            return Response(
+                {'error': 'Failed to save photos, please try again'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
         
         return Response({
             'success': True,
             'message': f'{len(uploaded_urls)} photos uploaded successfully',
             'uploaded_photos': uploaded_urls,
-            'total_photos': len(service_delivery.delivery_photos)
+            'total_photos': len(service_delivery.delivery_photos),
+            'upload_timings': BatchUploadService.timings(stored)
         })
     
     @action(detail=False, methods=['get'])
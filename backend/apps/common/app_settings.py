@@ -0,0 +1,38 @@
+"""
+APP SETTINGS
+
+Reading of the dict-valued feature settings (EMAIL_QUEUE, SLOT_RESERVATION,
+API_THROTTLE, ...) defined in settings.py.
+
+Each feature module keeps its defaults next to the code that uses them and
+builds a getter once:
+
+    DEFAULT_EMAIL_QUEUE_SETTINGS = {'BATCH_SIZE': 50, ...}
+    get_email_queue_setting = setting_getter('EMAIL_QUEUE', DEFAULT_EMAIL_QUEUE_SETTINGS)
+
+    get_email_queue_setting('BATCH_SIZE')
+
+Keys missing from the project settings (or a missing dict) fall back to the
+module defaults. Settings are read on every call, so override_settings works
+in tests.
+"""
+
+from django.conf import settings
+
+
+def setting_getter(setting_name, defaults):
+    """
+    Build a function that reads one key of a dict setting with module defaults.
+
+    Args:
+        setting_name (str): Name of the dict in settings.py (e.g. 'EMAIL_QUEUE')
+        defaults (dict): Default value of every supported key
+
+    Returns:
+        callable: get(name) returning the configured value of that key
+    """
+    def get_setting(name):
+        return getattr(settings, setting_name, {}).get(name, defaults[name])
+
+    get_setting.__name__ = f'get_{setting_name.lower()}_setting'
+    return get_setting
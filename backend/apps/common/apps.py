@@ -6,12 +6,21 @@ class CommonConfig(AppConfig):
     Configuration class for the common app.
     
     This class defines the configuration for the common Django app,
-    which contains shared utilities, pagination, permissions, and storage
-    functionality used across other apps in the project.
+    which contains shared utilities, pagination, permissions, storage and
+    image derivative functionality used across other apps in the project.
     
     Attributes:
         default_auto_field (str): The default auto field type for models
         name (str): The full Python path to the app
     """
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.common' 
\ No newline at end of file
+    name = 'apps.common'
+    
+    def ready(self):
+        """
+        Perform initialization when the app is ready.
+        
+        Imports the signals module so image derivative handlers are connected
+        when the application starts.
+        """
+        import apps.common.signals
@@ -0,0 +1,181 @@
+"""
+EAGER LOADING
+
+Declarative select_related/prefetch_related planning for nested serializers.
+
+Serializers that nest other serializers (BookingSerializer nests the service,
+customer, slot, payment and delivery) trigger a handful of queries per row
+when the queryset they render was not joined up front. Instead of every
+viewset hand-maintaining a select_related() list that drifts from what its
+serializer actually reads, each serializer declares the relations its own
+fields need:
+
+    class PaymentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+        select_related_fields = ('payment_method', 'applied_voucher')
+
+and the planner walks nested EagerLoadingMixin serializers, prefixing their
+paths with the field source. Relations reached through a many=True field are
+turned into prefetch lookups, since they cannot be joined.
+
+Viewsets using EagerLoadingViewSetMixin apply the plan of their serializer
+class to the queryset automatically.
+"""
+
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _prefixed_prefetch(lookup, prefix):
+    """
+    Prefix a prefetch lookup (string or Prefetch object) with a relation path.
+
+    Args:
+        lookup (str | Prefetch): Lookup declared by a nested serializer
+        prefix (str): Relation path to the nested serializer, ending in '__'
+
+    Returns:
+        str | Prefetch: The lookup relative to the outer queryset
+    """
+    if not prefix:
+        return lookup
+    if isinstance(lookup, Prefetch):
+        return Prefetch(f'{prefix}{lookup.prefetch_through}', queryset=lookup.queryset, to_attr=lookup.to_attr)
+    return f'{prefix}{lookup}'
+
+
+class EagerLoadingMixin:
+    """
+    Serializer mixin declaring the relations the serializer reads.
+
+    Attributes:
+        select_related_fields (tuple): Forward FK / one-to-one paths to join
+        prefetch_related_fields (tuple): Reverse FK / many-to-many paths (or
+            Prefetch objects) to prefetch
+
+    Nested serializer fields that also use this mixin contribute their own
+    paths automatically, including the relation they are sourced from.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def get_prefetch_related_fields(cls, context=None):
+        """
+        Prefetch lookups for this serializer.
+
+        Override to add lookups that depend on the request, e.g. a Prefetch
+        filtered to the current user.
+
+        Args:
+            context (dict): Serializer context (may be None)
+
+        Returns:
+            list: Prefetch lookups relative to this serializer's model
+        """
+        return list(cls.prefetch_related_fields)
+
+    @classmethod
+    def get_eager_loading_plan(cls, context=None, prefix='', many=False, field_tree=None):
+        """
+        Collect the select/prefetch lookups for this serializer and its nested serializers.
+
+        Args:
+            context (dict): Serializer context passed to request-aware hooks
+            prefix (str): Relation path from the outer queryset, ending in '__'
+            many (bool): Whether the path crosses a to-many relation, in which
+                case nothing below it can be joined
+            field_tree (dict): Sparse fieldset selection (see
+                apps.common.sparse_fields); nested serializers that were not
+                selected are not loaded
+
+        Returns:
+            tuple: (select_related list, prefetch_related list)
+        """
+        select_related, prefetch_related = [], []
+
+        for path in cls.select_related_fields:
+            (prefetch_related if many else select_related).append(f'{prefix}{path}')
+        for lookup in cls.get_prefetch_related_fields(context):
+            prefetch_related.append(_prefixed_prefetch(lookup, prefix))
+
+        for name, field in cls._declared_fields.items():
+            nested_many = isinstance(field, serializers.ListSerializer)
+            nested = field.child if nested_many else field
+            if not isinstance(nested, EagerLoadingMixin) or field.write_only:
+                continue
+            if field_tree is not None and name not in field_tree:
+                continue
+
+            source = (field.source or name).replace('.', '__')
+            path = f'{prefix}{source}'
+            if nested_many or many:
+                prefetch_related.append(path)
+            else:
+                select_related.append(path)
+
+            nested_select, nested_prefetch = type(nested).get_eager_loading_plan(
+                context=context, prefix=f'{path}__', many=many or nested_many,
+                field_tree=field_tree.get(name) if field_tree else None
+            )
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+
+        return select_related, prefetch_related
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, context=None):
+        """
+        Apply this serializer's eager loading plan to a queryset.
+
+        Args:
+            queryset (QuerySet): Queryset of the serializer's model
+            context (dict): Serializer context (e.g. {'request': request})
+
+        Returns:
+            QuerySet: Queryset with the required joins and prefetches
+        """
+        field_tree = cls.requested_field_tree(context) if hasattr(cls, 'requested_field_tree') else None
+        select_related, prefetch_related = cls.get_eager_loading_plan(context=context, field_tree=field_tree)
+
+        # Prefetching a path twice raises, so keep the first of each lookup
+        seen, unique_prefetch = set(), []
+        for lookup in prefetch_related:
+            key = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+            if key not in seen:
+                seen.add(key)
+                unique_prefetch.append(lookup)
+
+        if select_related:
+            queryset = queryset.select_related(*dict.fromkeys(select_related))
+        if unique_prefetch:
+            queryset = queryset.prefetch_related(*unique_prefetch)
+        return queryset
+
+
+class EagerLoadingViewSetMixin:
+    """
+    ViewSet mixin applying the serializer's eager loading plan to its querysets.
+
+    The plan is applied in filter_queryset(), so list and detail endpoints get
+    it without changing get_queryset(). Custom actions that build their own
+    queryset can call eager_load() directly.
+    """
+
+    def eager_load(self, queryset):
+        """
+        Apply the current serializer class's eager loading plan to a queryset.
+
+        Args:
+            queryset (QuerySet): Queryset about to be serialized
+
+        Returns:
+            QuerySet: The queryset, joined/prefetched when the serializer declares a plan
+        """
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, EagerLoadingMixin):
+            return queryset
+        return serializer_class.setup_eager_loading(queryset, context=self.get_serializer_context())
+
+    def filter_queryset(self, queryset):
+        return self.eager_load(super().filter_queryset(queryset))
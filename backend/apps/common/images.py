@@ -0,0 +1,468 @@
+"""
+IMAGE DERIVATIVES
+
+Generates resized, compressed copies ("derivatives") of uploaded images so list
+and card views do not download full-resolution originals.
+
+For every configured size (small/medium/large by default: 200/600/1200 px wide)
+a WebP file and a JPEG fallback are written next to the original:
+
+    service_images/12/main/abc.jpg
+    service_images/12/main/derivatives/abc_200w.webp
+    service_images/12/main/derivatives/abc_200w.jpg
+    ...
+
+The stored names are recorded in a JSON "variants" field on the owning model:
+
+    {
+        "source": "service_images/12/main/abc.jpg",
+        "sizes": {
+            "small": {"width": 200, "height": 150, "webp": "...", "jpeg": "..."},
+            ...
+        }
+    }
+
+Generation runs after the upload transaction commits, either on a small
+in-process thread pool, as a Celery task, or synchronously (tests), depending on
+settings.IMAGE_DERIVATIVES['DISPATCH']. Serializers use image_url_for_request and
+image_variant_urls to pick the size asked for with ?image_size= and the format
+asked for with ?image_format= (or an Accept header that includes image/webp),
+falling back to the original until derivatives exist.
+"""
+
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps as django_apps
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .app_settings import setting_getter
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_IMAGE_DERIVATIVE_SETTINGS = {
+    'SIZES': {'small': 200, 'medium': 600, 'large': 1200},
+    'WEBP_QUALITY': 80,
+    'JPEG_QUALITY': 82,
+    'DISPATCH': 'thread',
+    'THREAD_WORKERS': 2,
+}
+
+ORIGINAL_SIZE = 'original'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+get_image_derivative_setting = setting_getter('IMAGE_DERIVATIVES', DEFAULT_IMAGE_DERIVATIVE_SETTINGS)
+
+
+def derivative_name(name, width, extension):
+    """
+    Build the storage name for a derivative of an original file.
+
+    Args:
+        name (str): Storage name of the original image
+        width (int): Derivative width in pixels
+        extension (str): File extension without the dot ('webp' or 'jpg')
+
+    Returns:
+        str: Storage name inside a 'derivatives' folder next to the original
+    """
+    folder, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return '/'.join(part for part in (folder, 'derivatives', f'{stem}_{width}w.{extension}') if part)
+
+
+def generate_derivatives(storage, name):
+    """
+    Create WebP and JPEG derivatives of an image for every configured size.
+
+    Images are never upscaled: sizes wider than the original are encoded at the
+    original width, and sizes that end up with the same width share files.
+
+    Args:
+        storage (Storage): Storage backend holding the original
+        name (str): Storage name of the original image
+
+    Returns:
+        dict: Variants structure with 'source' and 'sizes' keys
+    """
+    with storage.open(name, 'rb') as source_file:
+        image = Image.open(source_file)
+        image.load()
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    sizes = {}
+    encoded_by_width = {}
+    for label, width in sorted(get_image_derivative_setting('SIZES').items(), key=lambda item: item[1]):
+        target_width = min(width, image.width)
+        if target_width not in encoded_by_width:
+            encoded_by_width[target_width] = _encode_derivative(storage, name, image, target_width, has_alpha)
+        sizes[label] = dict(encoded_by_width[target_width])
+
+    return {'source': name, 'sizes': sizes}
+
+
+def _encode_derivative(storage, name, image, width, has_alpha):
+    """
+    Resize an image to a width and store it as WebP and JPEG.
+
+    Args:
+        storage (Storage): Storage backend to write to
+        name (str): Storage name of the original image
+        image (Image): Decoded original (RGB or RGBA)
+        width (int): Target width in pixels
+        has_alpha (bool): Whether the image has transparency
+
+    Returns:
+        dict: Width, height and stored names of the WebP and JPEG files
+    """
+    resized = image.copy()
+    if width < image.width:
+        height = max(1, round(image.height * width / image.width))
+        resized = resized.resize((width, height), Image.LANCZOS)
+
+    webp_buffer = io.BytesIO()
+    resized.save(webp_buffer, format='WEBP', quality=get_image_derivative_setting('WEBP_QUALITY'), method=4)
+
+    jpeg_image = resized
+    if has_alpha:
+        # JPEG has no alpha channel: flatten onto white
+        jpeg_image = Image.new('RGB', resized.size, (255, 255, 255))
+        jpeg_image.paste(resized, mask=resized.getchannel('A'))
+    jpeg_buffer = io.BytesIO()
+    jpeg_image.save(
+        jpeg_buffer, format='JPEG', quality=get_image_derivative_setting('JPEG_QUALITY'),
+        optimize=True, progressive=True
+    )
+
+    return {
+        'width': resized.width,
+        'height': resized.height,
+        'webp': storage.save(derivative_name(name, width, 'webp'), ContentFile(webp_buffer.getvalue())),
+        'jpeg': storage.save(derivative_name(name, width, 'jpg'), ContentFile(jpeg_buffer.getvalue())),
+    }
+
+
+def delete_derivatives(storage, variants):
+    """
+    Delete the derivative files listed in a variants structure.
+
+    Args:
+        storage (Storage): Storage backend holding the derivatives
+        variants (dict): Variants structure returned by generate_derivatives
+    """
+    names = set()
+    for size in (variants or {}).get('sizes', {}).values():
+        names.update(filter(None, (size.get('webp'), size.get('jpeg'))))
+    for stored_name in names:
+        try:
+            storage.delete(stored_name)
+        except Exception as e:
+            logger.warning(f"Failed to delete image derivative {stored_name}: {str(e)}")
+
+
+def generate_model_image_derivatives(model_label, pk, field_name='image', variants_field='image_variants'):
+    """
+    Generate derivatives for an image field of a saved model instance.
+
+    Skips work when the variants already match the current file, and discards
+    the new derivatives if the file was replaced while they were being built.
+
+    Args:
+        model_label (str): Model label, e.g. 'services.ServiceImage'
+        pk: Primary key of the instance
+        field_name (str): Name of the ImageField/FileField
+        variants_field (str): Name of the JSONField storing the variants
+
+    Returns:
+        dict: The stored variants, or None if nothing was generated
+    """
+    model = django_apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return None
+
+    previous = getattr(instance, variants_field) or {}
+    if previous.get('source') == field_file.name:
+        return previous
+
+    variants = generate_derivatives(field_file.storage, field_file.name)
+    updated = model.objects.filter(pk=pk, **{field_name: field_file.name}).update(**{variants_field: variants})
+    if not updated:
+        # The file changed underneath us; a newer job will handle it
+        delete_derivatives(field_file.storage, variants)
+        return None
+
+    delete_derivatives(field_file.storage, previous)
+    return variants
+
+
+def generate_mapped_image_derivatives(model_label, pk, variants_field, entries):
+    """
+    Generate derivatives for images referenced by key rather than by a file field.
+
+    Used for images stored as plain storage names/URLs in a JSON list (such as
+    ServiceDelivery.delivery_photos). The variants of each image are merged into
+    a JSON dict field under the image's key.
+
+    Args:
+        model_label (str): Model label, e.g. 'bookings.ServiceDelivery'
+        pk: Primary key of the instance
+        variants_field (str): Name of the JSONField mapping key -> variants
+        entries (list): [key, storage_name] pairs to process
+
+    Returns:
+        dict: Variants generated in this run, keyed like the field
+    """
+    from django.core.files.storage import default_storage
+
+    model = django_apps.get_model(model_label)
+    generated = {}
+    for key, name in entries:
+        try:
+            generated[key] = generate_derivatives(default_storage, name)
+        except Exception as e:
+            logger.error(f"Failed to generate derivatives for {name}: {str(e)}")
+
+    if not generated:
+        return generated
+
+    with transaction.atomic():
+        instance = model.objects.select_for_update().filter(pk=pk).first()
+        if instance is None:
+            for variants in generated.values():
+                delete_derivatives(default_storage, variants)
+            return {}
+        merged = dict(getattr(instance, variants_field) or {})
+        merged.update(generated)
+        model.objects.filter(pk=pk).update(**{variants_field: merged})
+
+    return generated
+
+
+def _get_executor():
+    """
+    Return the process-wide thread pool used for 'thread' dispatch.
+
+    Returns:
+        ThreadPoolExecutor: The shared executor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_image_derivative_setting('THREAD_WORKERS'),
+                    thread_name_prefix='image-derivatives'
+                )
+    return _executor
+
+
+def _run_in_thread(func, args):
+    """
+    Run a derivative job on a worker thread with its own DB connection.
+
+    Args:
+        func (callable): Job function
+        args (tuple): Job arguments
+    """
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception as e:
+        logger.error(f"Image derivative job {func.__name__}{args} failed: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def dispatch_derivative_job(func, task, *args):
+    """
+    Run a derivative job according to IMAGE_DERIVATIVES['DISPATCH'].
+
+    Args:
+        func (callable): Job function, run directly or on the thread pool
+        task: Celery task wrapping the same job, used for 'celery' dispatch
+        *args: Job arguments (must be JSON-serializable for Celery)
+    """
+    mode = get_image_derivative_setting('DISPATCH')
+    if mode == 'celery':
+        task.delay(*args)
+    elif mode == 'sync':
+        func(*args)
+    else:
+        _get_executor().submit(_run_in_thread, func, args)
+
+
+def schedule_image_derivatives(instance, field_name='image', variants_field='image_variants'):
+    """
+    Schedule derivative generation for an instance once the transaction commits.
+
+    Intended to be called from post_save receivers. Does nothing when the field
+    is empty or the stored variants already belong to the current file.
+
+    Args:
+        instance (Model): Saved model instance
+        field_name (str): Name of the ImageField/FileField
+        variants_field (str): Name of the JSONField storing the variants
+    """
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return
+    if (getattr(instance, variants_field) or {}).get('source') == field_file.name:
+        return
+
+    from .tasks import generate_image_derivatives_task
+
+    args = (instance._meta.label, instance.pk, field_name, variants_field)
+    transaction.on_commit(
+        lambda: dispatch_derivative_job(generate_model_image_derivatives, generate_image_derivatives_task, *args)
+    )
+
+
+def schedule_mapped_image_derivatives(instance, variants_field, entries):
+    """
+    Schedule derivative generation for keyed images once the transaction commits.
+
+    Args:
+        instance (Model): Saved model instance owning the images
+        variants_field (str): Name of the JSONField mapping key -> variants
+        entries (list): [key, storage_name] pairs to process
+    """
+    if not entries:
+        return
+
+    from .tasks import generate_mapped_image_derivatives_task
+
+    args = (instance._meta.label, instance.pk, variants_field, [list(entry) for entry in entries])
+    transaction.on_commit(
+        lambda: dispatch_derivative_job(
+            generate_mapped_image_derivatives, generate_mapped_image_derivatives_task, *args
+        )
+    )
+
+
+def requested_image_size(request, default=ORIGINAL_SIZE):
+    """
+    Return the image size requested with ?image_size=.
+
+    Args:
+        request (Request): Current request (may be None)
+        default (str): Size used when the request does not ask for one
+
+    Returns:
+        str: A configured size name or 'original'
+    """
+    if request is not None:
+        size = request.GET.get('image_size')
+        if size == ORIGINAL_SIZE or size in get_image_derivative_setting('SIZES'):
+            return size
+    return default
+
+
+def requested_image_format(request):
+    """
+    Return the image format the client prefers.
+
+    Args:
+        request (Request): Current request (may be None)
+
+    Returns:
+        str: 'webp' or 'jpeg'
+    """
+    if request is not None:
+        image_format = request.GET.get('image_format')
+        if image_format in ('webp', 'jpeg'):
+            return image_format
+        if 'image/webp' in request.META.get('HTTP_ACCEPT', ''):
+            return 'webp'
+    return 'jpeg'
+
+
+def image_url_for_request(field_file, variants, request=None, default_size=ORIGINAL_SIZE):
+    """
+    Pick the URL of the image variant that best fits the request.
+
+    Falls back to the original when derivatives are not available yet or the
+    variants belong to a previous file.
+
+    Args:
+        field_file (FieldFile): The original image
+        variants (dict): Variants structure stored on the model
+        request (Request): Current request (may be None)
+        default_size (str): Size used when the request does not ask for one
+
+    Returns:
+        str: Storage URL (not made absolute) or None if there is no image
+    """
+    if not field_file:
+        return None
+
+    if (variants or {}).get('source') != field_file.name:
+        return field_file.url
+    return variant_url(field_file.storage, variants, request, default_size) or field_file.url
+
+
+def variant_url(storage, variants, request=None, default_size=ORIGINAL_SIZE):
+    """
+    Return the storage URL of the derivative that best fits the request.
+
+    Args:
+        storage (Storage): Storage backend holding the derivatives
+        variants (dict): Variants structure returned by generate_derivatives
+        request (Request): Current request (may be None)
+        default_size (str): Size used when the request does not ask for one
+
+    Returns:
+        str: Storage URL, or None if the original should be served instead
+    """
+    size = requested_image_size(request, default_size)
+    variant = (variants or {}).get('sizes', {}).get(size)
+    if not variant:
+        return None
+    return storage.url(variant[requested_image_format(request)])
+
+
+def image_variant_urls(field_file, variants, request=None):
+    """
+    Return URLs of every derivative, for srcset/<picture> use on the frontend.
+
+    Args:
+        field_file (FieldFile): The original image
+        variants (dict): Variants structure stored on the model
+        request (Request): Current request, used to build absolute URLs
+
+    Returns:
+        dict: {size: {'width', 'height', 'webp', 'jpeg'}}; empty until generated
+    """
+    variants = variants or {}
+    if not field_file or variants.get('source') != field_file.name:
+        return {}
+
+    def absolute(url):
+        return request.build_absolute_uri(url) if request is not None else url
+
+    storage = field_file.storage
+    return {
+        size: {
+            'width': variant['width'],
+            'height': variant['height'],
+            'webp': absolute(storage.url(variant['webp'])),
+            'jpeg': absolute(storage.url(variant['jpeg'])),
+        }
+        for size, variant in variants.get('sizes', {}).items()
+    }
@@ -0,0 +1,134 @@
+"""
+GENERATE IMAGE DERIVATIVES COMMAND
+
+Purpose: Backfill resized WebP/JPEG derivatives for images uploaded before
+derivative generation existed, or whose derivatives failed to generate.
+
+New uploads get their derivatives automatically (see apps.common.signals); this
+command processes existing rows in-process, in pk order.
+
+Usage:
+    python manage.py generate_image_derivatives
+    python manage.py generate_image_derivatives --model services.ServiceImage --limit 500
+    python manage.py generate_image_derivatives --include-delivery-photos
+"""
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import PortfolioMedia
+from apps.bookings.models import ServiceDelivery
+from apps.common.images import generate_mapped_image_derivatives, generate_model_image_derivatives
+from apps.reviews.models import ReviewImage
+from apps.services.models import ServiceImage
+
+
+# (queryset factory, field name, variants field) per model label
+IMAGE_SOURCES = {
+    'services.ServiceImage': (lambda: ServiceImage.objects.all(), 'image', 'image_variants'),
+    'reviews.ReviewImage': (lambda: ReviewImage.objects.all(), 'image', 'image_variants'),
+    'accounts.PortfolioMedia': (lambda: PortfolioMedia.objects.filter(media_type='image'), 'file', 'file_variants'),
+}
+
+
+class Command(BaseCommand):
+    """
+    Management command to backfill resized image derivatives.
+
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Generate missing resized WebP/JPEG derivatives for uploaded images'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument(
+            '--model',
+            choices=sorted(IMAGE_SOURCES),
+            action='append',
+            help='Only process this model (repeatable; default: all image models)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of images to process per model',
+        )
+        parser.add_argument(
+            '--include-delivery-photos',
+            action='store_true',
+            help='Also process service delivery photos',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Execute the command logic.
+
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        limit = options['limit']
+
+        for model_label in options['model'] or sorted(IMAGE_SOURCES):
+            get_queryset, field_name, variants_field = IMAGE_SOURCES[model_label]
+            generated = failed = 0
+
+            for pk, name, variants in get_queryset().exclude(**{field_name: ''}).order_by('pk').values_list(
+                'pk', field_name, variants_field
+            ).iterator():
+                if (variants or {}).get('source') == name:
+                    continue
+                if limit is not None and generated + failed >= limit:
+                    break
+                try:
+                    if generate_model_image_derivatives(model_label, pk, field_name, variants_field):
+                        generated += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{model_label} #{pk}: {str(e)}")
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{model_label}: generated derivatives for {generated} image(s), {failed} failed"
+            ))
+
+        if options['include_delivery_photos']:
+            self._handle_delivery_photos(limit)
+
+    def _handle_delivery_photos(self, limit):
+        """
+        Generate derivatives for delivery photos that do not have them yet.
+
+        Delivery photos are stored as full URLs; the storage name is recovered
+        from the part of the URL after MEDIA_URL (or the storage base URL).
+
+        Args:
+            limit (int): Maximum number of deliveries to process
+        """
+        base_url = default_storage.url('')
+        processed = generated = 0
+
+        for delivery in ServiceDelivery.objects.exclude(delivery_photos=[]).order_by('pk').iterator():
+            if limit is not None and processed >= limit:
+                break
+            existing = delivery.delivery_photo_variants or {}
+            entries = [
+                [url, url.split(base_url, 1)[1]]
+                for url in delivery.delivery_photos or []
+                if url not in existing and base_url in url
+            ]
+            if not entries:
+                continue
+            processed += 1
+            generated += len(generate_mapped_image_derivatives(
+                'bookings.ServiceDelivery', delivery.pk, 'delivery_photo_variants', entries
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"bookings.ServiceDelivery: generated derivatives for {generated} delivery photo(s)"
+        ))
@@ -3,9 +3,9 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 import random
-import string
 from decimal import Decimal
 
+from apps.rewards.issuance import VoucherIssuanceService
 from apps.rewards.models import RewardAccount, RewardVoucher
 
 User = get_user_model()
@@ -88,9 +88,9 @@ class Command(BaseCommand):
             reward_account, created = RewardAccount.objects.get_or_create(
                 user=user,
                 defaults={
-                    'points_balance': random.randint(500, 2500),
+                    'current_balance': random.randint(500, 2500),
                     'total_points_earned': random.randint(2000, 10000),
-                    'tier_level': random.choice([1, 2, 3, 4]),
+                    'tier_level': random.choice(['bronze', 'silver', 'gold', 'platinum']),
                 }
             )
             
@@ -131,17 +131,12 @@ class Command(BaseCommand):
             },
         ]
 
-        # Create vouchers for each user
-        total_created = 0
+        # Build one grant per voucher; codes are generated by the issuance service
+        grants = []
         for user in users:
             for i in range(vouchers_per_user):
                 template = random.choice(voucher_templates)
                 
-                # Generate voucher code
-                date_part = timezone.now().strftime('%Y%m%d')
-                random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-                voucher_code = f'SB-{date_part}-{random_part}'
-                
                 # Determine value and status
                 min_val, max_val = template['value_range']
                 original_value = Decimal(random.randint(min_val, max_val))
@@ -178,28 +173,26 @@ class Command(BaseCommand):
                 # Calculate points redeemed (2 points per rupee)
                 points_redeemed = int(original_value * 2) if template['source'] == 'reward' else 0
                 
-                # Create voucher
-                voucher = RewardVoucher.objects.create(
-                    user=user,
-                    voucher_code=voucher_code,
-                    value=original_value,
-                    used_amount=used_amount,
-                    status=status,
-                    expires_at=expires_at,
-                    used_at=used_at,
-                    points_redeemed=points_redeemed,
-                    metadata=template['metadata']
-                )
-                
-                # Manually set created_at after creation
-                voucher.created_at = created_at
-                voucher.save(update_fields=['created_at'])
-                
-                total_created += 1
-                
-                # Show progress
-                if total_created % 10 == 0:
-                    self.stdout.write(f'Created {total_created} vouchers...')
+                grants.append({
+                    'user': user,
+                    'value': original_value,
+                    'points': points_redeemed,
+                    'status': status,
+                    'expires_at': expires_at,
+                    'used_amount': used_amount,
+                    'used_at': used_at,
+                    'metadata': template['metadata'],
+                    'created_at': created_at,
+                })
+
+        # Sample vouchers record points_redeemed without charging the accounts
+        vouchers = VoucherIssuanceService.issue(grants, charge_points=False)
+        
+        # created_at is set on insert, so backdate the whole set with one UPDATE
+        for voucher, grant in zip(vouchers, grants):
+            voucher.created_at = grant['created_at']
+        RewardVoucher.objects.bulk_update(vouchers, ['created_at'])
+        total_created = len(vouchers)
 
         self.stdout.write(
             self.style.SUCCESS(
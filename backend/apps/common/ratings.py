@@ -0,0 +1,276 @@
+"""
+RUNNING RATING TOTALS
+
+Keeps the cached ratings on services and provider profiles up to date with
+running sums instead of re-aggregating every review on each save.
+
+Service.rating_sum / reviews_count / average_rating cover the service's
+ServiceReview rows, the booking reviews (reviews.Review) and the
+CustomerFeedback of its bookings; Profile.rating_sum / reviews_count /
+avg_rating cover the provider's booking reviews. A save or delete only
+applies its own change, in one statement per affected row:
+
+    UPDATE services_service
+       SET rating_sum = rating_sum + <rating delta>,
+           reviews_count = reviews_count + <count delta>,
+           average_rating = <new sum> / <new count>
+     WHERE id = %s
+
+Editing a rating applies the old-vs-new difference; moving a review or
+feedback to a different service or provider takes it off one and adds it to
+the other.
+Anything that bypasses save()/delete() (QuerySet.update, raw SQL) can make
+the totals drift; reconcile_rating_totals() recomputes them for every row
+in one grouped query per model and fixes only the rows that are off.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, NullIf
+
+
+def average_expression(total, count):
+    """
+    Build a SQL expression for total / count rounded half up to 2 decimals (0 when count is 0).
+
+    Integer arithmetic keeps the rounding identical on every database.
+
+    Args:
+        total (Expression): Sum of the ratings
+        count (Expression): Number of ratings
+
+    Returns:
+        Expression: The average as a float
+    """
+    hundredths = (total * 200 + count) / NullIf(count * 2, Value(0))
+    return Coalesce(hundredths / Value(100.0), Value(0.0), output_field=FloatField())
+
+
+def total_subquery(queryset, group_by, aggregate):
+    """
+    Correlated subquery returning one grouped aggregate of queryset (0 when empty).
+
+    Args:
+        queryset (QuerySet): Rows already filtered on OuterRef('pk')
+        group_by (str): Lookup of the outer row's key on queryset's model
+        aggregate (Aggregate): Sum('rating') or Count('pk')
+
+    Returns:
+        Expression: The aggregate for the outer row
+    """
+    grouped = queryset.order_by().values(group_by).annotate(total=aggregate).values('total')
+    return Coalesce(Subquery(grouped, output_field=IntegerField()), Value(0))
+
+
+class RatingSnapshotMixin:
+    """
+    Model mixin remembering the rating-related values an instance was loaded with.
+
+    Subclasses list the fields that decide where the rating is counted in
+    RATING_SNAPSHOT_FIELDS; save() and delete handlers compare against the
+    snapshot to work out the delta.
+    """
+
+    RATING_SNAPSHOT_FIELDS = ('rating',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating()
+        return instance
+
+    def remember_rating(self):
+        """Record the current values of RATING_SNAPSHOT_FIELDS as the stored ones."""
+        if all(name in self.__dict__ for name in self.RATING_SNAPSHOT_FIELDS):
+            self._rating_snapshot = {name: self.__dict__[name] for name in self.RATING_SNAPSHOT_FIELDS}
+        else:
+            self._rating_snapshot = None
+
+    def get_stored_rating(self):
+        """
+        Return the snapshot of the row as stored, reading it if it was not loaded.
+
+        Returns:
+            dict or None: RATING_SNAPSHOT_FIELDS values, or None for a new row
+        """
+        if self._state.adding or self.pk is None:
+            return None
+        snapshot = getattr(self, '_rating_snapshot', None)
+        if snapshot is None:
+            snapshot = type(self)._base_manager.filter(pk=self.pk).values(*self.RATING_SNAPSHOT_FIELDS).first()
+        return snapshot
+
+
+def get_booking_service_id(booking_id):
+    """
+    Return the service of a booking without loading the booking.
+
+    Args:
+        booking_id (int): The booking
+
+    Returns:
+        int or None: The booking's service id
+    """
+    from apps.bookings.models import Booking
+
+    return Booking.objects.filter(pk=booking_id).values_list('service_id', flat=True).first()
+
+
+class RatingTotalsService:
+    """
+    Service class for the running rating totals of services and providers.
+
+    Example:
+        >>> RatingTotalsService.apply(RatingTotalsService.adjust_service, (3, 4), (3, 5))  # 4 -> 5 stars
+        >>> RatingTotalsService.adjust_provider(provider.id, -5, -1)                      # review removed
+    """
+
+    @staticmethod
+    def apply(adjust, previous, current):
+        """
+        Apply the change between two (target_id, rating) pairs.
+
+        Args:
+            adjust (callable): adjust_service or adjust_provider
+            previous (tuple or None): Target and rating before the change
+            current (tuple or None): Target and rating after the change
+        """
+        deltas = defaultdict(lambda: [0, 0])
+        for pair, sign in ((previous, -1), (current, 1)):
+            if pair is not None and pair[0] is not None and pair[1] is not None:
+                deltas[pair[0]][0] += sign * pair[1]
+                deltas[pair[0]][1] += sign
+        for target_id, (rating_delta, count_delta) in deltas.items():
+            if rating_delta or count_delta:
+                adjust(target_id, rating_delta, count_delta)
+
+    @staticmethod
+    def adjust_service(service_id, rating_delta, count_delta):
+        """
+        Add to a service's rating sum and count, and recompute its average, in one UPDATE.
+
+        Args:
+            service_id (int): The service
+            rating_delta (int): Change of the sum of ratings
+            count_delta (int): Change of the number of ratings
+        """
+        from apps.services.models import Service
+
+        total = F('rating_sum') + Value(rating_delta)
+        count = F('reviews_count') + Value(count_delta)
+        Service.objects.filter(pk=service_id).update(
+            rating_sum=total,
+            reviews_count=count,
+            average_rating=average_expression(total, count),
+        )
+
+    @staticmethod
+    def adjust_provider(provider_id, rating_delta, count_delta):
+        """
+        Add to a provider profile's rating sum and count, and recompute its average, in one UPDATE.
+
+        Args:
+            provider_id (int): The provider user
+            rating_delta (int): Change of the sum of ratings
+            count_delta (int): Change of the number of ratings
+        """
+        from apps.accounts.models import Profile
+
+        total = F('rating_sum') + Value(rating_delta)
+        count = F('reviews_count') + Value(count_delta)
+        Profile.objects.filter(user_id=provider_id).update(
+            rating_sum=total,
+            reviews_count=count,
+            avg_rating=average_expression(total, count),
+        )
+
+    @staticmethod
+    def reconcile_services():
+        """
+        Recompute every service's totals from its reviews and feedback and fix the ones that drifted.
+
+        Returns:
+            int: Number of services corrected
+        """
+        from apps.bookings.models import CustomerFeedback
+        from apps.reviews.models import Review
+        from apps.services.models import Service, ServiceReview
+
+        sources = (
+            (ServiceReview.objects.filter(service=OuterRef('pk')), 'service'),
+            (Review.objects.filter(booking__service=OuterRef('pk')), 'booking__service'),
+            (CustomerFeedback.objects.filter(booking__service=OuterRef('pk')), 'booking__service'),
+        )
+        return reconcile(
+            Service.objects.all(),
+            sum_field='rating_sum', count_field='reviews_count', average_field='average_rating',
+            expected_sum=sum(total_subquery(rows, key, Sum('rating')) for rows, key in sources),
+            expected_count=sum(total_subquery(rows, key, Count('pk')) for rows, key in sources),
+        )
+
+    @staticmethod
+    def reconcile_providers():
+        """
+        Recompute every provider profile's totals from their reviews and fix the ones that drifted.
+
+        Returns:
+            int: Number of profiles corrected
+        """
+        from apps.accounts.models import Profile
+        from apps.reviews.models import Review
+
+        reviews = Review.objects.filter(provider=OuterRef('user'))
+        return reconcile(
+            Profile.objects.all(),
+            sum_field='rating_sum', count_field='reviews_count', average_field='avg_rating',
+            expected_sum=total_subquery(reviews, 'provider', Sum('rating')),
+            expected_count=total_subquery(reviews, 'provider', Count('pk')),
+        )
+
+
+def reconcile(queryset, sum_field, count_field, average_field, expected_sum, expected_count):
+    """
+    Find rows whose cached totals differ from the expected ones and overwrite them.
+
+    Args:
+        queryset (QuerySet): Rows to check
+        sum_field, count_field, average_field (str): The cached columns
+        expected_sum, expected_count (Expression): The true totals of a row
+
+    Returns:
+        int: Number of rows corrected
+    """
+    drifted = queryset.annotate(
+        expected_sum=expected_sum,
+        expected_count=expected_count,
+    ).annotate(
+        expected_average=average_expression(F('expected_sum'), F('expected_count')),
+    ).filter(
+        ~Q(**{sum_field: F('expected_sum')})
+        | ~Q(**{count_field: F('expected_count')})
+        | ~Q(**{average_field: F('expected_average')})
+    ).values_list('pk', 'expected_sum', 'expected_count')
+
+    corrected = 0
+    for pk, total, count in drifted.iterator():
+        queryset.filter(pk=pk).update(**{
+            sum_field: Value(total),
+            count_field: Value(count),
+            average_field: average_expression(Value(total), Value(count)),
+        })
+        corrected += 1
+    return corrected
+
+
+def reconcile_rating_totals():
+    """
+    Fix drifted rating totals of all services and provider profiles.
+
+    Returns:
+        dict: Number of services and profiles corrected
+    """
+    return {
+        'services': RatingTotalsService.reconcile_services(),
+        'providers': RatingTotalsService.reconcile_providers(),
+    }
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.accounts.models import PortfolioMedia
+from apps.reviews.models import ReviewImage
+from apps.services.models import ServiceImage
+from .images import schedule_image_derivatives
+
+
+@receiver(post_save, sender=ServiceImage)
+@receiver(post_save, sender=ReviewImage)
+def generate_image_derivatives(sender, instance, **kwargs):
+    """
+    Schedule resized derivatives when a service or review image is saved.
+    
+    Generation runs after the transaction commits and is skipped when the
+    image has not changed since its derivatives were generated.
+    
+    Args:
+        sender (Model): The model class that sent the signal
+        instance (ServiceImage | ReviewImage): The image instance that was saved
+        **kwargs: Arbitrary keyword arguments
+    """
+    schedule_image_derivatives(instance, 'image', 'image_variants')
+
+
+@receiver(post_save, sender=PortfolioMedia)
+def generate_portfolio_media_derivatives(sender, instance, **kwargs):
+    """
+    Schedule resized derivatives when a portfolio image is saved.
+    
+    Videos are skipped, as are files still in the temporary upload location:
+    PortfolioMedia.save() moves those into the project folder and saves again.
+    
+    Args:
+        sender (Model): The model class that sent the signal
+        instance (PortfolioMedia): The media instance that was saved
+        **kwargs: Arbitrary keyword arguments
+    """
+    if instance.media_type != 'image' or 'temp' in (instance.file.name or ''):
+        return
+    schedule_image_derivatives(instance, 'file', 'file_variants')
@@ -0,0 +1,218 @@
+"""
+SPARSE FIELDSETS AND SUMMARY SHAPES
+
+Lets list endpoints return only what the client asks for.
+
+Sparse fieldsets (?fields= / ?expand=):
+    GET /api/bookings/bookings/?fields=id,status,booking_date,service_details.title
+    GET /api/bookings/bookings/?fields=id,status&expand=payment_details
+
+`fields` selects top-level fields; a dotted name selects fields of a nested
+serializer. `expand` adds whole nested objects on top of `fields`. Without
+`fields` the full representation is returned as before. Only GET requests on
+the root serializer are affected, so writes and nested serializers used
+elsewhere keep their complete field set.
+
+Summary shapes (?shape=summary):
+    Compact dashboard rows rendered from queryset.values() dicts, so no model
+    instances, nested serializers or per-row relation lookups are involved.
+"""
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+def parse_field_tree(*values):
+    """
+    Parse comma-separated field lists into a nested selection tree.
+
+    Args:
+        *values (str): Raw query parameter values, e.g. 'id,service_details.title'
+
+    Returns:
+        dict | None: {'id': None, 'service_details': {'title': None}}, where None
+            means "the whole field"; None if no field was named at all
+    """
+    tree = None
+    for value in values:
+        for name in (value or '').split(','):
+            parts = [part.strip() for part in name.split('.') if part.strip()]
+            if not parts:
+                continue
+            tree = {} if tree is None else tree
+            node = tree
+            for index, part in enumerate(parts):
+                is_leaf = index == len(parts) - 1
+                if is_leaf:
+                    # A plain name always wins over a dotted selection of the same field
+                    node[part] = None
+                elif node.get(part, {}) is None:
+                    break
+                else:
+                    node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin restricting output to the fields named in ?fields= / ?expand=.
+
+    Nested serializers using the mixin honour dotted selections made by their
+    parent; nested serializers without it are rendered whole.
+    """
+
+    @classmethod
+    def requested_field_tree(cls, context):
+        """
+        Read the field selection from the request in the serializer context.
+
+        Args:
+            context (dict): Serializer context
+
+        Returns:
+            dict | None: Selection tree, or None for the full representation
+        """
+        request = (context or {}).get('request')
+        if request is None or request.method != 'GET':
+            return None
+        params = getattr(request, 'query_params', request.GET)
+        if not params.get('fields'):
+            return None
+        return parse_field_tree(params.get('fields'), params.get('expand'))
+
+    def _is_root_serializer(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_field_tree(self):
+        """
+        Return the selection tree that applies to this serializer instance.
+
+        Returns:
+            dict | None: Selection tree, or None for the full representation
+        """
+        if not hasattr(self, '_field_tree'):
+            self._field_tree = self.requested_field_tree(self.context) if self._is_root_serializer() else None
+        return self._field_tree
+
+    def get_fields(self):
+        fields = super().get_fields()
+        tree = self.get_field_tree()
+        if tree is None:
+            return fields
+
+        selected = {}
+        for name, field in fields.items():
+            if name not in tree:
+                continue
+            subtree = tree[name]
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if subtree is not None and isinstance(nested, SparseFieldsetMixin):
+                nested._field_tree = subtree
+            selected[name] = field
+        return selected
+
+    def prune_representation(self, data):
+        """
+        Drop keys added in to_representation() that were not selected.
+
+        Serializers that add computed keys after super().to_representation()
+        call this last so those keys follow ?fields= as well.
+
+        Args:
+            data (dict): Representation built by the serializer
+
+        Returns:
+            dict: The representation restricted to the selected fields
+        """
+        tree = self.get_field_tree()
+        if tree is None:
+            return data
+        return {key: value for key, value in data.items() if key in tree}
+
+
+class SummarySerializer(serializers.Serializer):
+    """
+    Read-only serializer for rows produced by queryset.values().
+
+    Attributes:
+        values_fields (tuple): Model columns to select
+        values_expressions (dict): Alias -> expression for joined or computed columns
+
+    Example:
+        >>> class BookingSummarySerializer(SummarySerializer):
+        ...     values_fields = ('id', 'status')
+        ...     values_expressions = {'service_title': F('service__title')}
+        ...     id = serializers.IntegerField()
+        ...     status = serializers.CharField()
+        ...     service_title = serializers.CharField()
+        >>> BookingSummarySerializer.get_values_queryset(Booking.objects.all())
+    """
+
+    values_fields = ()
+    values_expressions = {}
+
+    @classmethod
+    def get_values_queryset(cls, queryset):
+        """
+        Turn a model queryset into the dict rows this serializer renders.
+
+        Args:
+            queryset (QuerySet): Filtered and ordered model queryset
+
+        Returns:
+            QuerySet: values() queryset with the summary columns
+        """
+        return queryset.prefetch_related(None).values(*cls.values_fields, **cls.values_expressions)
+
+
+class SummaryShapeViewSetMixin:
+    """
+    ViewSet mixin serving ?shape=summary list responses from summary_serializer_class.
+
+    The standard list action honours it automatically; custom list actions
+    call wants_summary() and summary_list_response() / get_summary_data().
+    """
+
+    summary_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.wants_summary():
+            return self.summary_list_response(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
+
+    def wants_summary(self):
+        """Whether the client asked for the compact summary shape."""
+        return self.summary_serializer_class is not None and self.request.query_params.get('shape') == 'summary'
+
+    def get_summary_data(self, queryset):
+        """
+        Render a queryset as summary rows without pagination.
+
+        Args:
+            queryset (QuerySet): Filtered and ordered model queryset
+
+        Returns:
+            list: Summary dicts
+        """
+        rows = self.summary_serializer_class.get_values_queryset(queryset)
+        return self.summary_serializer_class(rows, many=True, context=self.get_serializer_context()).data
+
+    def summary_list_response(self, queryset):
+        """
+        Build a (paginated when configured) list response of summary rows.
+
+        Args:
+            queryset (QuerySet): Filtered and ordered model queryset
+
+        Returns:
+            Response: Summary rows
+        """
+        rows = self.summary_serializer_class.get_values_queryset(queryset)
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.summary_serializer_class(page, many=True, context=context).data)
+        return Response(self.summary_serializer_class(rows, many=True, context=context).data)
@@ -0,0 +1,61 @@
+"""
+CELERY TASKS FOR COMMON UTILITIES
+
+This module contains Celery tasks for shared functionality used across apps,
+such as generating resized image derivatives in the background.
+"""
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def generate_image_derivatives_task(self, model_label, pk, field_name='image', variants_field='image_variants'):
+    """
+    Generate resized WebP/JPEG derivatives for an image field of a model instance.
+    
+    Used when settings.IMAGE_DERIVATIVES['DISPATCH'] is 'celery'. Storage and
+    decoding errors are retried a few times before giving up.
+    
+    Args:
+        model_label (str): Model label, e.g. 'services.ServiceImage'
+        pk: Primary key of the instance
+        field_name (str): Name of the image field
+        variants_field (str): Name of the JSONField storing the variants
+    
+    Returns:
+        dict: The stored variants, or None if nothing was generated
+        
+    Example:
+        >>> generate_image_derivatives_task.delay('services.ServiceImage', 12)
+    """
+    from .images import generate_model_image_derivatives
+    
+    try:
+        return generate_model_image_derivatives(model_label, pk, field_name, variants_field)
+    except Exception as exc:
+        logger.error(f"Image derivatives failed for {model_label} #{pk} - Task ID: {self.request.id}: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True)
+def generate_mapped_image_derivatives_task(self, model_label, pk, variants_field, entries):
+    """
+    Generate derivatives for images referenced by key (e.g. delivery photo URLs).
+    
+    Args:
+        model_label (str): Model label, e.g. 'bookings.ServiceDelivery'
+        pk: Primary key of the instance
+        variants_field (str): Name of the JSONField mapping key -> variants
+        entries (list): [key, storage_name] pairs to process
+    
+    Returns:
+        int: Number of images processed
+    """
+    from .images import generate_mapped_image_derivatives
+    
+    generated = generate_mapped_image_derivatives(model_label, pk, variants_field, entries)
+    logger.info(f"Generated derivatives for {len(generated)} image(s) of {model_label} #{pk} - Task ID: {self.request.id}")
+    return len(generated)
@@ -0,0 +1,212 @@
+"""
+BATCH FILE UPLOADS
+
+Concurrent, all-or-nothing handling of multi-file uploads.
+
+Endpoints that accept several files in one request (delivery photos, provider
+document bulk upload) used to save them one at a time, paying one storage round
+trip per file in sequence. BatchUploadService instead:
+
+1. Validates every file before anything is written
+2. Writes the files to storage concurrently on a bounded thread pool
+3. Deletes every file already written if any write fails
+4. Creates the database rows with a single bulk_create inside a transaction,
+   deleting the stored files again if the insert fails
+
+Every stored file comes with its upload duration so endpoints can report
+per-file timings.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import storages
+from django.db import transaction
+
+from .app_settings import setting_getter
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BATCH_UPLOAD_SETTINGS = {
+    'MAX_WORKERS': 4,
+}
+
+
+get_batch_upload_setting = setting_getter('BATCH_UPLOAD', DEFAULT_BATCH_UPLOAD_SETTINGS)
+
+
+class BatchUploadError(Exception):
+    """
+    Raised when a batch upload is rejected or could not be completed.
+
+    Attributes:
+        errors (list): Human-readable error per failed file
+        stage (str): 'validation' if nothing was written, 'storage' or 'database' otherwise
+    """
+
+    def __init__(self, errors, stage):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+        self.stage = stage
+
+
+class BatchUploadService:
+    """
+    Service class for validating and storing several uploaded files at once.
+
+    Example:
+        >>> BatchUploadService.validate(files, allowed_types=['image/png'], max_size=5 * 1024 * 1024)
+        >>> stored = BatchUploadService.store([(name, f) for name, f in zip(names, files)])
+        >>> [item['name'] for item in stored]
+        ['service_delivery_photos/12/a.png', 'service_delivery_photos/12/b.png']
+    """
+
+    @staticmethod
+    def validate(files, allowed_types=None, max_size=None):
+        """
+        Validate every file in a batch before any of them is stored.
+
+        Args:
+            files (list): Uploaded files
+            allowed_types (list): Accepted content types (None to accept all)
+            max_size (int): Maximum size in bytes (None for no limit)
+
+        Raises:
+            BatchUploadError: With one message per invalid file
+        """
+        errors = []
+        for index, uploaded_file in enumerate(files, start=1):
+            content_type = getattr(uploaded_file, 'content_type', None)
+            if allowed_types is not None and content_type not in allowed_types:
+                errors.append(f"File {index} ({uploaded_file.name}): unsupported file type {content_type}")
+            elif max_size is not None and uploaded_file.size > max_size:
+                errors.append(
+                    f"File {index} ({uploaded_file.name}): file too large, maximum size is "
+                    f"{max_size // (1024 * 1024)}MB"
+                )
+
+        if errors:
+            raise BatchUploadError(errors, stage='validation')
+
+    @staticmethod
+    def store(named_files, storage=None, max_workers=None):
+        """
+        Write files to storage concurrently.
+
+        Either every file is stored or none is: if any write fails, the files
+        already written are deleted before the error is raised.
+
+        Args:
+            named_files (list): (storage name, uploaded file) pairs
+            storage (Storage): Storage backend (default: the default storage)
+            max_workers (int): Concurrent writes (default: BATCH_UPLOAD['MAX_WORKERS'])
+
+        Returns:
+            list: One dict per file, in input order, with 'name' (as stored),
+                'original_name', 'size', 'content_type' and 'duration_ms'
+
+        Raises:
+            BatchUploadError: If any file could not be stored
+        """
+        if not named_files:
+            return []
+
+        # Resolve the backend once on this thread; workers share the instance
+        storage = storage or storages['default']
+        max_workers = max_workers or get_batch_upload_setting('MAX_WORKERS')
+
+        def save_one(name, uploaded_file):
+            started = time.perf_counter()
+            saved_name = storage.save(name, uploaded_file)
+            return {
+                'name': saved_name,
+                'original_name': uploaded_file.name,
+                'size': uploaded_file.size,
+                'content_type': getattr(uploaded_file, 'content_type', None),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            }
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(named_files))) as executor:
+            futures = [executor.submit(save_one, name, uploaded_file) for name, uploaded_file in named_files]
+
+        stored, errors = [], []
+        for index, ((_, uploaded_file), future) in enumerate(zip(named_files, futures), start=1):
+            try:
+                stored.append(future.result())
+            except Exception as e:
+                errors.append(f"File {index} ({uploaded_file.name}): {str(e)}")
+
+        if errors:
+            BatchUploadService.discard(stored, storage)
+            logger.error(f"Batch upload failed, discarded {len(stored)} stored file(s): {'; '.join(errors)}")
+            raise BatchUploadError(errors, stage='storage')
+
+        logger.info(
+            f"Stored {len(stored)} file(s) in {(time.perf_counter() - started) * 1000:.1f}ms "
+            f"with {min(max_workers, len(named_files))} worker(s)"
+        )
+        return stored
+
+    @staticmethod
+    def discard(stored, storage=None):
+        """
+        Delete files written by store().
+
+        Args:
+            stored (list): Items returned by store()
+            storage (Storage): Storage backend (default: the default storage)
+        """
+        storage = storage or storages['default']
+        for item in stored:
+            try:
+                storage.delete(item['name'])
+            except Exception as e:
+                logger.warning(f"Failed to delete {item['name']} after a failed batch upload: {str(e)}")
+
+    @staticmethod
+    def create_records(model, instances, stored, storage=None):
+        """
+        Insert the rows for stored files with a single bulk_create.
+
+        Model save() overrides and post_save signals do not run for bulk_create,
+        so instances must be fully populated by the caller. If the insert fails
+        the stored files are deleted.
+
+        Args:
+            model (Model): Model class to insert into
+            instances (list): Unsaved instances referencing the stored files
+            stored (list): Items returned by store(), cleaned up on failure
+            storage (Storage): Storage backend (default: the default storage)
+
+        Returns:
+            list: The created instances (with primary keys on supported databases)
+
+        Raises:
+            BatchUploadError: If the insert fails
+        """
+        try:
+            with transaction.atomic():
+                return model.objects.bulk_create(instances)
+        except Exception as e:
+            BatchUploadService.discard(stored, storage)
+            logger.error(f"Batch insert of {len(instances)} {model.__name__} row(s) failed: {str(e)}")
+            raise BatchUploadError([str(e)], stage='database')
+
+    @staticmethod
+    def timings(stored):
+        """
+        Summarize per-file upload timings for API responses.
+
+        Args:
+            stored (list): Items returned by store()
+
+        Returns:
+            list: {'file', 'size', 'duration_ms'} per stored file
+        """
+        return [
+            {'file': item['original_name'], 'size': item['size'], 'duration_ms': item['duration_ms']}
+            for item in stored
+        ]
@@ -0,0 +1,188 @@
+"""
+Email builders for contact messages.
+
+These functions are referenced by dotted path from the outbound email queue
+(apps.notifications.email_queue) and run in the queue worker. Each one loads the
+contact message named in the queued context, renders the HTML template and
+plain text body, and returns the message ready to send.
+"""
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template.loader import render_to_string
+
+from .models import ContactMessage
+
+
+def _get_message(context):
+    """
+    Load the contact message referenced by a queued email context.
+
+    Args:
+        context (dict): Queued context containing 'message_id'
+
+    Returns:
+        ContactMessage: The contact message instance
+
+    Raises:
+        ContactMessage.DoesNotExist: If the message was deleted after queueing
+    """
+    return ContactMessage.objects.select_related('user', 'responded_by').get(pk=context['message_id'])
+
+
+def build_admin_notification(context):
+    """
+    Build the admin notification email for a new contact message.
+
+    Args:
+        context (dict): Queued context containing 'message_id'
+
+    Returns:
+        EmailMultiAlternatives: HTML and plain text notification for admins
+    """
+    contact_message = _get_message(context)
+    subject = f'New Contact Message: {contact_message.subject}'
+
+    # Get admin email from settings
+    admin_email = getattr(settings, 'ADMIN_EMAIL', 'admin@sewabazaar.com')
+
+    # Build context for email template
+    template_context = {
+        'message': contact_message,
+        'admin_url': f"{settings.FRONTEND_URL}/admin/contact/messages/{contact_message.id}/",
+        'site_name': 'SewaBazaar'
+    }
+
+    # Render HTML email
+    html_content = render_to_string('emails/contact_admin_notification.html', template_context)
+
+    # Plain text version
+    text_content = f"""
+    New Contact Message Received
+
+    From: {contact_message.name} ({contact_message.email})
+    Subject: {contact_message.subject}
+    Priority: {contact_message.get_priority_display()}
+
+    Message:
+    {contact_message.message}
+
+    Received: {contact_message.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+
+    View and respond: {template_context['admin_url']}
+    """
+
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[admin_email]
+    )
+    msg.attach_alternative(html_content, "text/html")
+    return msg
+
+
+def build_confirmation_email(context):
+    """
+    Build the confirmation email sent to the author of a contact message.
+
+    Args:
+        context (dict): Queued context containing 'message_id'
+
+    Returns:
+        EmailMultiAlternatives: HTML and plain text confirmation for the sender
+    """
+    contact_message = _get_message(context)
+    subject = 'Message Received - SewaBazaar Support'
+
+    # Build context for email template
+    template_context = {
+        'message': contact_message,
+        'site_name': 'SewaBazaar',
+        'support_email': 'support@sewabazaar.com'
+    }
+
+    # Render HTML email
+    html_content = render_to_string('emails/contact_confirmation.html', template_context)
+
+    # Plain text version
+    text_content = f"""
+    Thank you for contacting SewaBazaar!
+
+    Hi {contact_message.name},
+
+    We have received your message with the subject: "{contact_message.subject}"
+
+    Our support team will review your message and get back to you within 24 hours.
+
+    Message ID: #{contact_message.id}
+    Received: {contact_message.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+
+    If you have any urgent concerns, please call us at +977-1-XXXXXXX
+
+    Best regards,
+    SewaBazaar Support Team
+    """
+
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[contact_message.email]
+    )
+    msg.attach_alternative(html_content, "text/html")
+    return msg
+
+
+def build_response_email(context):
+    """
+    Build the email carrying an admin's response to a contact message.
+
+    Args:
+        context (dict): Queued context containing 'message_id'
+
+    Returns:
+        EmailMultiAlternatives: HTML and plain text response for the sender
+    """
+    contact_message = _get_message(context)
+    subject = f'Re: {contact_message.subject} - SewaBazaar Support'
+
+    # Build context for email template
+    template_context = {
+        'message': contact_message,
+        'site_name': 'SewaBazaar',
+        'support_email': 'support@sewabazaar.com'
+    }
+
+    # Render HTML email
+    html_content = render_to_string('emails/contact_response.html', template_context)
+
+    # Plain text version
+    text_content = f"""
+    Response to your message - SewaBazaar Support
+
+    Hi {contact_message.name},
+
+    Thank you for contacting SewaBazaar. Here's our response to your message:
+
+    Original Subject: {contact_message.subject}
+    Message ID: #{contact_message.id}
+
+    Our Response:
+    {contact_message.admin_response}
+
+    If you have any further questions, please don't hesitate to contact us.
+
+    Best regards,
+    {contact_message.responded_by.get_full_name() if contact_message.responded_by else 'SewaBazaar Support Team'}
+    SewaBazaar Support
+    """
+
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[contact_message.email]
+    )
+    msg.attach_alternative(html_content, "text/html")
+    return msg
@@ -1,9 +1,6 @@
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db.models import Count, Avg, Q
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.conf import settings
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -17,6 +14,7 @@ from .serializers import (
     ContactMessageResponseSerializer, ContactMessageStatsSerializer
 )
 from apps.common.permissions import IsAdmin
+from apps.notifications.email_queue import EmailQueueService
 
 logger = logging.getLogger(__name__)
 
@@ -92,7 +90,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         Create a new contact message.
         
         Handles the creation of a new contact message, including validation,
-        saving to the database, and sending notification emails.
+        saving to the database, and queueing notification emails.
         
         Args:
             request (Request): The HTTP request object
@@ -108,17 +106,17 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         # Create the message
         message = serializer.save()
         
-        # Send notification email to admins
+        # Queue notification email to admins
         try:
             self.send_admin_notification(message)
         except Exception as e:
-            logger.error(f"Failed to send admin notification for contact message {message.id}: {str(e)}")
+            logger.error(f"Failed to queue admin notification for contact message {message.id}: {str(e)}")
         
-        # Send confirmation email to sender
+        # Queue confirmation email to sender
         try:
             self.send_confirmation_email(message)
         except Exception as e:
-            logger.error(f"Failed to send confirmation email for contact message {message.id}: {str(e)}")
+            logger.error(f"Failed to queue confirmation email for contact message {message.id}: {str(e)}")
         
         return Response({
             'message': 'Your message has been sent successfully! We\'ll get back to you soon.',
@@ -128,105 +126,32 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
     
     def send_admin_notification(self, contact_message):
         """
-        Send notification email to admins about new contact message.
+        Queue the notification email to admins about a new contact message.
         
-        Sends an HTML and plain text email notification to admins when a
-        new contact message is received.
+        The email is rendered and delivered by the outbound email queue worker,
+        so a slow SMTP server never delays the contact form request.
         
         Args:
             contact_message (ContactMessage): The contact message instance
         """
-        subject = f'New Contact Message: {contact_message.subject}'
-        
-        # Get admin email from settings
-        admin_email = getattr(settings, 'ADMIN_EMAIL', 'admin@sewabazaar.com')
-        
-        # Build context for email template
-        context = {
-            'message': contact_message,
-            'admin_url': f"{settings.FRONTEND_URL}/admin/contact/messages/{contact_message.id}/",
-            'site_name': 'SewaBazaar'
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/contact_admin_notification.html', context)
-        
-        # Plain text version
-        text_content = f"""
-        New Contact Message Received
-        
-        From: {contact_message.name} ({contact_message.email})
-        Subject: {contact_message.subject}
-        Priority: {contact_message.get_priority_display()}
-        
-        Message:
-        {contact_message.message}
-        
-        Received: {contact_message.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-        
-        View and respond: {context['admin_url']}
-        """
-        
-        # Send email
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[admin_email]
+        EmailQueueService.enqueue(
+            'apps.contact.emails.build_admin_notification',
+            {'message_id': contact_message.id}
         )
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
     
     def send_confirmation_email(self, contact_message):
         """
-        Send confirmation email to message sender.
+        Queue the confirmation email to the message sender.
         
-        Sends an HTML and plain text confirmation email to the sender
-        when their contact message is received.
+        The email is rendered and delivered by the outbound email queue worker.
         
         Args:
             contact_message (ContactMessage): The contact message instance
         """
-        subject = 'Message Received - SewaBazaar Support'
-        
-        # Build context for email template
-        context = {
-            'message': contact_message,
-            'site_name': 'SewaBazaar',
-            'support_email': 'support@sewabazaar.com'
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/contact_confirmation.html', context)
-        
-        # Plain text version
-        text_content = f"""
-        Thank you for contacting SewaBazaar!
-        
-        Hi {contact_message.name},
-        
-        We have received your message with the subject: "{contact_message.subject}"
-        
-        Our support team will review your message and get back to you within 24 hours.
-        
-        Message ID: #{contact_message.id}
-        Received: {contact_message.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-        
-        If you have any urgent concerns, please call us at +977-1-XXXXXXX
-        
-        Best regards,
-        SewaBazaar Support Team
-        """
-        
-        # Send email
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[contact_message.email]
+        EmailQueueService.enqueue(
+            'apps.contact.emails.build_confirmation_email',
+            {'message_id': contact_message.id}
         )
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def respond(self, request, pk=None):
@@ -234,7 +159,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         Respond to a contact message.
         
         Allows admins to respond to a specific contact message, updating
-        the message with the response and sending a notification email
+        the message with the response and queueing a notification email
         to the original sender.
         
         Args:
@@ -254,11 +179,11 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         updated_message = serializer.save()
         
-        # Send response email to the original sender
+        # Queue response email to the original sender
         try:
             self.send_response_email(updated_message)
         except Exception as e:
-            logger.error(f"Failed to send response email for message {message.id}: {str(e)}")
+            logger.error(f"Failed to queue response email for message {message.id}: {str(e)}")
         
         return Response({
             'message': 'Response sent successfully',
@@ -267,56 +192,17 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
     
     def send_response_email(self, contact_message):
         """
-        Send response email to the original message sender.
+        Queue the response email to the original message sender.
         
-        Sends an HTML and plain text response email to the original sender
-        when an admin responds to their contact message.
+        The email is rendered and delivered by the outbound email queue worker.
         
         Args:
             contact_message (ContactMessage): The contact message instance
         """
-        subject = f'Re: {contact_message.subject} - SewaBazaar Support'
-        
-        # Build context for email template
-        context = {
-            'message': contact_message,
-            'site_name': 'SewaBazaar',
-            'support_email': 'support@sewabazaar.com'
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/contact_response.html', context)
-        
-        # Plain text version
-        text_content = f"""
-        Response to your message - SewaBazaar Support
-        
-        Hi {contact_message.name},
-        
-        Thank you for contacting SewaBazaar. Here's our response to your message:
-        
-        Original Subject: {contact_message.subject}
-        Message ID: #{contact_message.id}
-        
-        Our Response:
-        {contact_message.admin_response}
-        
-        If you have any further questions, please don't hesitate to contact us.
-        
-        Best regards,
-        {contact_message.responded_by.get_full_name() if contact_message.responded_by else 'SewaBazaar Support Team'}
-        SewaBazaar Support
-        """
-        
-        # Send email
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[contact_message.email]
+        EmailQueueService.enqueue(
+            'apps.contact.emails.build_response_email',
+            {'message_id': contact_message.id}
         )
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
     
     @action(detail=True, methods=['patch'], permission_classes=[IsAdmin])
     def update_status(self, request, pk=None):
@@ -4,16 +4,30 @@ WebSocket consumers for real-time messaging functionality.
 
 import json
 import asyncio
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
 from django.utils import timezone
-from .models import Conversation, Message
-from .serializers import MessageSerializer
+from apps.common.app_settings import setting_getter
+from .models import Conversation
+from .services import MessageDeliveryError, MessageDeliveryService
 
 User = get_user_model()
 
+# Defaults for settings.MESSAGING_REALTIME
+DEFAULT_MESSAGING_REALTIME_SETTINGS = {
+    # Repeated typing frames with the same state are broadcast at most once per window
+    'TYPING_COALESCE_MS': 1000,
+    # Minimum gap between membership reloads triggered by unknown conversation ids
+    'MEMBERSHIP_RELOAD_SECONDS': 5,
+}
+
+
+get_messaging_realtime_setting = setting_getter('MESSAGING_REALTIME', DEFAULT_MESSAGING_REALTIME_SETTINGS)
+
 
 class MessagingConsumer(AsyncWebsocketConsumer):
     """
@@ -21,8 +35,14 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     - Real-time message delivery
     - Typing indicators  
     - Online status tracking
+
+    Conversation membership is loaded once per connection into
+    ``self.memberships`` ({conversation_id: (customer_id, provider_id)}) and
+    kept current by ``conversation.membership`` channel-layer events, so
+    typing, status and voice frames never touch the database.
     """
     
+
     async def connect(self):
         """Handle WebSocket connection with improved error handling"""
         try:
@@ -54,6 +74,9 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             
             self.user_id = self.user.id
             self.user_group_name = f'user_{self.user_id}'
+            self.memberships = await self.load_memberships()
+            self.memberships_loaded_at = time.monotonic()
+            self.typing_sent = {}
             
             # Join user group for direct messaging
             try:
@@ -130,32 +153,28 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         try:
             conversation_id = data.get('conversation_id')
             content = data.get('content', '').strip()
-            attachments = data.get('attachments', [])
             
             if not conversation_id or not content:
                 await self.send_error("Missing conversation_id or content")
                 return
             
             # Verify user is participant in conversation
-            conversation = await self.get_conversation(conversation_id)
-            if not conversation:
+            if not await self.get_membership(conversation_id):
                 await self.send_error("Conversation not found or access denied")
                 return
             
-            # Create message in database
-            message = await self.create_message(conversation, content, attachments)
-            if not message:
-                await self.send_error("Failed to create message")
+            # Store and render the message in one database hop
+            try:
+                payload = await self.persist_and_render(conversation_id, content)
+            except MessageDeliveryError as e:
+                await self.send_error(str(e))
                 return
             
-            # Serialize message for transmission
-            message_data = await self.serialize_message(message)
-            
-            # Send to all conversation participants
-            await self.send_to_conversation_participants(conversation_id, {
-                'type': 'message',
-                'data': message_data
-            })
+            # Answer this socket directly; the broadcast skips it
+            await self.send(text_data=json.dumps(payload))
+            await self.send_to_conversation_participants(
+                conversation_id, payload, origin_channel=self.channel_name
+            )
             
         except Exception as e:
             await self.send_error(f"Error handling chat message: {str(e)}")
@@ -171,8 +190,11 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                 return
             
             # Verify user is participant in conversation
-            conversation = await self.get_conversation(conversation_id)
-            if not conversation:
+            if not await self.get_membership(conversation_id):
+                return
+            
+            # Drop repeats of the same state inside the coalescing window
+            if not self.should_broadcast_typing(int(conversation_id), bool(is_typing)):
                 return
             
             # Send typing status to other participants (exclude sender)
@@ -214,8 +236,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                 return
             
             # Verify user is participant in conversation
-            conversation = await self.get_conversation(conversation_id)
-            if not conversation:
+            if not await self.get_membership(conversation_id):
                 await self.send_error("Conversation not found or access denied")
                 return
             
@@ -249,8 +270,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                 return
             
             # Verify user is participant in conversation
-            conversation = await self.get_conversation(conversation_id)
-            if not conversation:
+            if not await self.get_membership(conversation_id):
                 return
             
             # Send status update to all participants
@@ -272,13 +292,10 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def broadcast_user_status(self, is_online):
         """Broadcast user online/offline status to all users"""
         try:
-            # Get all conversations this user is part of
-            conversations = await self.get_user_conversations()
-            
-            # Send status to all participants in those conversations
-            for conversation in conversations:
+            # Send status to all participants in this user's conversations
+            for conversation_id in list(self.memberships):
                 await self.send_to_conversation_participants(
-                    conversation.id,
+                    conversation_id,
                     {
                         'type': 'status',
                         'data': {
@@ -292,28 +309,87 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             print(f"Error broadcasting user status: {str(e)}")
     
-    async def send_to_conversation_participants(self, conversation_id, message, exclude_user=None):
-        """Send message to all participants in a conversation"""
+    async def send_to_conversation_participants(self, conversation_id, message, exclude_user=None,
+                                                origin_channel=None):
+        """
+        Send message to all participants in a conversation
+
+        ``origin_channel`` marks the socket that already has the message so
+        the sender's other sockets still get it but that one is not echoed.
+        """
         try:
-            participants = await self.get_conversation_participants(conversation_id)
+            participant_ids = await self.get_membership(conversation_id)
+            if not participant_ids:
+                return
             
-            for participant in participants:
-                if exclude_user and participant['user_id'] == exclude_user:
+            for participant_id in participant_ids:
+                if exclude_user and participant_id == exclude_user:
                     continue
                 
-                group_name = f'user_{participant["user_id"]}'
+                group_name = f'user_{participant_id}'
                 await self.channel_layer.group_send(
                     group_name,
                     {
                         'type': 'websocket_message',
-                        'message': message
+                        'message': message,
+                        'origin_channel': origin_channel
                     }
                 )
         except Exception as e:
             print(f"Error sending to conversation participants: {str(e)}")
     
+    async def get_membership(self, conversation_id):
+        """
+        Return (customer_id, provider_id) for a conversation this user belongs to.
+
+        Unknown ids trigger a reload of the membership map, at most once per
+        MEMBERSHIP_RELOAD_SECONDS, in case an invalidation event was missed.
+
+        Args:
+            conversation_id: Conversation id as sent by the client
+
+        Returns:
+            tuple or None: Participant ids, or None if the user is not a member
+        """
+        try:
+            conversation_id = int(conversation_id)
+        except (TypeError, ValueError):
+            return None
+        
+        participant_ids = self.memberships.get(conversation_id)
+        reload_after = get_messaging_realtime_setting('MEMBERSHIP_RELOAD_SECONDS')
+        if participant_ids is None and time.monotonic() - self.memberships_loaded_at >= reload_after:
+            self.memberships = await self.load_memberships()
+            self.memberships_loaded_at = time.monotonic()
+            participant_ids = self.memberships.get(conversation_id)
+        return participant_ids
+    
+    def should_broadcast_typing(self, conversation_id, is_typing):
+        """
+        Coalesce typing frames: a change of state always goes out, a repeat of
+        the last broadcast state only once the TYPING_COALESCE_MS window has passed.
+        """
+        now = time.monotonic()
+        window = get_messaging_realtime_setting('TYPING_COALESCE_MS') / 1000
+        last = self.typing_sent.get(conversation_id)
+        if last and last[1] == is_typing and now - last[0] < window:
+            return False
+        self.typing_sent[conversation_id] = (now, is_typing)
+        return True
+    
+    async def conversation_membership(self, event):
+        """Apply a membership change sent by apps.messaging.signals"""
+        conversation_id = event['conversation_id']
+        if event.get('removed'):
+            self.memberships.pop(conversation_id, None)
+            self.typing_sent.pop(conversation_id, None)
+        else:
+            self.memberships[conversation_id] = (event['customer_id'], event['provider_id'])
+    
     async def websocket_message(self, event):
         """Handle messages from channel layer"""
+        if event.get('origin_channel') == self.channel_name:
+            return
         message = event['message']
         await self.send(text_data=json.dumps(message))
     
@@ -333,68 +409,19 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         except User.DoesNotExist:
             return None
     
-    @database_sync_to_async
-    def get_conversation(self, conversation_id):
-        """Get conversation if user is participant"""
-        try:
-            from django.db.models import Q
-            return Conversation.objects.filter(
-                Q(id=conversation_id) & 
-                (Q(customer=self.user) | Q(provider=self.user))
-            ).first()
-        except Exception:
-            return None
-    
-    @database_sync_to_async
-    def get_conversation_participants(self, conversation_id):
-        """Get all participants in a conversation"""
-        try:
-            conversation = Conversation.objects.select_related('customer', 'provider').get(id=conversation_id)
-            # Return both customer and provider as participants
-            return [
-                {'user_id': conversation.customer.id, 'user': conversation.customer},
-                {'user_id': conversation.provider.id, 'user': conversation.provider}
-            ]
-        except Exception:
-            return []
-    
     @database_sync_to_async  
-    def get_user_conversations(self):
-        """Get all conversations for current user"""
-        try:
-            from django.db.models import Q
-            return list(Conversation.objects.filter(
-                Q(customer=self.user) | Q(provider=self.user)
-            ))
-        except Exception:
-            return []
-    
-    @database_sync_to_async
-    def create_message(self, conversation, content, attachments=None):
-        """Create a new message in the database"""
-        try:
-            message = Message.objects.create(
-                conversation=conversation,
-                sender=self.user,
-                text=content,  # Using 'text' field as per model
-                message_type='text'
-            )
-            # Handle attachments if provided
-            # TODO: Implement attachment handling
-            return message
-        except Exception as e:
-            print(f"Error creating message: {str(e)}")
-            return None
+    def load_memberships(self):
+        """Map every conversation of the current user to its participant ids"""
+        rows = Conversation.objects.filter(
+            Q(customer_id=self.user_id) | Q(provider_id=self.user_id)
+        ).values_list('id', 'customer_id', 'provider_id')
+        return {conversation_id: (customer_id, provider_id) for conversation_id, customer_id, provider_id in rows}
     
     @database_sync_to_async
-    def serialize_message(self, message):
-        """Serialize message for WebSocket transmission"""
-        try:
-            serializer = MessageSerializer(message)
-            return serializer.data
-        except Exception as e:
-            print(f"Error serializing message: {str(e)}")
-            return None
+    def persist_and_render(self, conversation_id, content):
+        """Create a message and return its wire payload (see MessageDeliveryService)"""
+        result = MessageDeliveryService.persist_and_render(self.user, conversation_id, content)
+        return result['payload']
     
     async def message_deleted(self, event):
         """
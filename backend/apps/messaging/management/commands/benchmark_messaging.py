@@ -0,0 +1,88 @@
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.accounts.models import User
+from apps.messaging.models import Conversation
+from apps.messaging.services import run_throughput_benchmark
+from apps.services.models import Service, ServiceCategory
+
+
+class Command(BaseCommand):
+    """
+    Management command to measure WebSocket message throughput.
+
+    Creates a throwaway customer, provider, service and conversation, opens
+    in-process sockets for both participants with Channels'
+    WebsocketCommunicator, sends a burst of chat messages from the customer
+    and reports how fast the provider received them, and whether the sender
+    was echoed each message exactly once. Deleting the throwaway users and
+    category afterwards removes everything the benchmark created, so real
+    conversations are never touched.
+
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Benchmark chat message throughput through MessagingConsumer'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument('--messages', type=int, default=200, help='Messages to send (default: 200)')
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        conversation, fixtures = self.create_conversation()
+        try:
+            result = run_throughput_benchmark(conversation.pk, messages=options['messages'])
+        finally:
+            # Cascades to the service, conversation, messages and notifications
+            with transaction.atomic():
+                for fixture in fixtures:
+                    fixture.delete()
+
+        self.stdout.write(
+            f"{result['messages']} messages in {result['elapsed_ms']} ms "
+            f"({result['messages_per_second']} messages/s): {result['received']} received, "
+            f"{result['echoed']} echoed to the sender"
+        )
+        if result['received'] != result['messages'] or result['echoed'] != result['messages']:
+            raise CommandError('Messages were lost or echoed more than once')
+        self.stdout.write(self.style.SUCCESS('Every message delivered once'))
+
+    def create_conversation(self):
+        """
+        Create a throwaway conversation between two new users.
+
+        Returns:
+            tuple: The conversation and the objects to delete afterwards
+        """
+        suffix = uuid.uuid4().hex[:12]
+        with transaction.atomic():
+            customer = User.objects.create_user(
+                username=f'benchmark-customer-{suffix}', email=f'benchmark-customer-{suffix}@example.invalid',
+                password=None, role='customer'
+            )
+            provider = User.objects.create_user(
+                username=f'benchmark-provider-{suffix}', email=f'benchmark-provider-{suffix}@example.invalid',
+                password=None, role='provider'
+            )
+            category = ServiceCategory.objects.create(title=f'Benchmark {suffix}')
+            service = Service.objects.create(
+                provider=provider, category=category, title=f'Benchmark {suffix}', slug=f'benchmark-{suffix}',
+                description='Messaging benchmark', price=Decimal('0.00'), status='draft'
+            )
+            conversation = Conversation.objects.create(service=service, customer=customer, provider=provider)
+        return conversation, (customer, provider, category)
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:55
+
+from django.db import migrations, models
+
+
+def backfill_read_watermarks(apps, schema_editor):
+    """
+    Place each participant's watermark below their current unread messages.
+
+    The existing unread counters are trusted: the watermark goes just under
+    the last `unread_count` messages from the other participant, or on the
+    latest of them when nothing is unread.
+    """
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+
+    for conversation in Conversation.objects.iterator():
+        updates = {}
+        for watermark_field, unread, other_id in (
+            ('provider_read_watermark', conversation.unread_count_provider, conversation.customer_id),
+            ('customer_read_watermark', conversation.unread_count_customer, conversation.provider_id),
+        ):
+            read = Message.objects.filter(conversation=conversation, sender_id=other_id).order_by('-pk')
+            last_read = list(read.values_list('pk', flat=True)[unread:unread + 1])
+            updates[watermark_field] = last_read[0] if last_read else 0
+        Conversation.objects.filter(pk=conversation.pk).update(**updates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0004_message_deletion_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='customer_read_watermark',
+            field=models.PositiveBigIntegerField(default=0, help_text='Id of the last message the customer has read'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='provider_read_watermark',
+            field=models.PositiveBigIntegerField(default=0, help_text='Id of the last message the provider has read'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'sender', 'id'], name='messaging_unread_range'),
+        ),
+        migrations.RunPython(backfill_read_watermarks, migrations.RunPython.noop),
+    ]
@@ -90,6 +90,16 @@ class Conversation(models.Model):
         help_text="Number of unread messages for customer"
     )
     
+    # Read watermarks (see apps.messaging.read_state)
+    provider_read_watermark = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Id of the last message the provider has read"
+    )
+    customer_read_watermark = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Id of the last message the customer has read"
+    )
+    
     class Meta:
         # Ensure one conversation per service-customer-provider combination
         unique_together = ['service', 'provider', 'customer']
@@ -113,13 +123,15 @@ class Conversation(models.Model):
             return self.unread_count_customer
         return 0
     
-    def mark_as_read_for_user(self, user):
-        """Mark all messages as read for a specific user."""
-        if user == self.provider:
-            self.unread_count_provider = 0
-        elif user == self.customer:
-            self.unread_count_customer = 0
-        self.save(update_fields=['unread_count_provider', 'unread_count_customer'])
+    def mark_as_read_for_user(self, user, up_to_message_id=None):
+        """Mark messages as read for a specific user by moving their read watermark."""
+        from .read_state import ReadStateService
+        
+        if ReadStateService.mark_read(self, user, up_to_message_id):
+            self.refresh_from_db(fields=[
+                'unread_count_provider', 'unread_count_customer',
+                'provider_read_watermark', 'customer_read_watermark'
+            ])
 
 
 class Message(models.Model):
@@ -221,6 +233,8 @@ class Message(models.Model):
         indexes = [
             models.Index(fields=['conversation', 'created_at']),  # Updated index to match new ordering
             models.Index(fields=['sender', 'created_at']),      # Updated index to match new ordering
+            # Unread range counts above a read watermark
+            models.Index(fields=['conversation', 'sender', 'id'], name='messaging_unread_range'),
         ]
         verbose_name = 'Message'
         verbose_name_plural = 'Messages'
@@ -292,21 +306,22 @@ class Message(models.Model):
         
         # Update conversation metadata for new messages
         if is_new and self.conversation:
-            self.conversation.last_message_at = self.created_at
-            self.conversation.last_message_preview = self.text[:100] if self.text else f"[{self.message_type}]"
+            conversation = self.conversation
+            conversation.last_message_at = self.created_at
+            conversation.last_message_preview = self.text[:100] if self.text else f"[{self.message_type}]"
             
-            # Increment unread count for recipient
-            if self.sender == self.conversation.provider:
-                self.conversation.unread_count_customer += 1
-            else:
-                self.conversation.unread_count_provider += 1
+            # Increment unread count for recipient in the UPDATE itself so
+            # concurrent senders cannot overwrite each other's counts
+            unread_field = (
+                'unread_count_customer' if self.sender_id == conversation.provider_id else 'unread_count_provider'
+            )
+            setattr(conversation, unread_field, getattr(conversation, unread_field) + 1)
             
-            self.conversation.save(update_fields=[
-                'last_message_at', 
-                'last_message_preview', 
-                'unread_count_provider', 
-                'unread_count_customer'
-            ])
+            Conversation.objects.filter(pk=conversation.pk).update(**{
+                'last_message_at': conversation.last_message_at,
+                'last_message_preview': conversation.last_message_preview,
+                unread_field: models.F(unread_field) + 1,
+            })
 
 
 class MessageReadStatus(models.Model):
@@ -314,6 +329,8 @@ class MessageReadStatus(models.Model):
     Tracks when messages are read by users.
     
     This model enables read receipts and helps determine message delivery status.
+    Reading a conversation no longer writes a row per message; it moves the
+    reader's watermark on Conversation (see apps.messaging.read_state).
     """
     
     message = models.ForeignKey(
@@ -0,0 +1,141 @@
+"""
+CONVERSATION READ STATE
+
+Per-participant read watermarks for conversations.
+
+Each conversation stores, for its customer and its provider, the id of the
+last message that participant has read (customer_read_watermark /
+provider_read_watermark). A message is read by its recipient when its id is
+at or below the recipient's watermark, so marking a thread as read moves one
+number instead of writing a MessageReadStatus row per message:
+
+    UPDATE messaging_conversation
+       SET provider_read_watermark = MAX(provider_read_watermark, <last id>),
+           unread_count_provider = 0
+     WHERE id = %s
+
+The unread_count_* columns stay as a cache for conversation lists. They are
+only ever changed with F() increments (Message.save) or recomputed inside the
+same UPDATE that moves the watermark, as an index range count over
+(conversation, sender, id).
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import Conversation, Message
+
+
+def get_read_fields(conversation, user):
+    """
+    Return the watermark field, unread counter field and the other participant's id for a user.
+
+    Args:
+        conversation (Conversation): The conversation
+        user (User): A participant
+
+    Returns:
+        tuple or None: (watermark_field, unread_field, other_participant_id),
+            or None if the user is not part of the conversation
+    """
+    if user.id == conversation.provider_id:
+        return 'provider_read_watermark', 'unread_count_provider', conversation.customer_id
+    if user.id == conversation.customer_id:
+        return 'customer_read_watermark', 'unread_count_customer', conversation.provider_id
+    return None
+
+
+class ReadStateService:
+    """
+    Service class for moving read watermarks and counting unread messages.
+
+    Example:
+        >>> ReadStateService.mark_read(conversation, provider)
+        1
+        >>> ReadStateService.count_unread(conversation, provider)
+        0
+    """
+
+    @staticmethod
+    def mark_read(conversation, user, up_to_message_id=None):
+        """
+        Mark a conversation as read for a user in a single UPDATE.
+
+        Without `up_to_message_id` everything up to the latest message is read
+        and the unread counter drops to zero. With it, the watermark moves to
+        that message (never backwards) and the counter is recomputed from the
+        messages still above the watermark. The id is clamped to
+        [0, latest message id], so a client cannot mark messages that do not
+        exist yet as read.
+
+        Args:
+            conversation (Conversation): The conversation being read
+            user (User): The participant reading it
+            up_to_message_id (int, optional): Last message the user has seen
+
+        Returns:
+            int: Number of conversations updated (0 if the user is not a participant)
+        """
+        fields = get_read_fields(conversation, user)
+        if fields is None:
+            return 0
+        watermark_field, unread_field, other_id = fields
+
+        latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-pk').values('pk')[:1]
+        latest_id = Coalesce(Subquery(latest), Value(0))
+        if up_to_message_id is None:
+            watermark = Greatest(F(watermark_field), latest_id)
+            unread = Value(0)
+        else:
+            up_to_message_id = max(up_to_message_id, 0)
+            watermark = Greatest(F(watermark_field), Least(Value(up_to_message_id), latest_id))
+            # Nothing exists above the latest message, so the unclamped id counts the same
+            remaining = Message.objects.filter(
+                conversation=OuterRef('pk'), sender_id=other_id,
+                pk__gt=Greatest(OuterRef(watermark_field), Value(up_to_message_id))
+            ).values('conversation').annotate(total=Count('pk')).values('total')
+            unread = Coalesce(Subquery(remaining, output_field=IntegerField()), Value(0))
+
+        return Conversation.objects.filter(pk=conversation.pk).update(**{
+            watermark_field: watermark,
+            unread_field: unread,
+        })
+
+    @staticmethod
+    def count_unread(conversation, user):
+        """
+        Count the messages a user has not read yet.
+
+        Uses the (conversation, sender, id) index as a range scan above the
+        user's watermark, so the cost depends on the unread messages only.
+
+        Args:
+            conversation (Conversation): The conversation
+            user (User): A participant
+
+        Returns:
+            int: Unread messages from the other participant
+        """
+        fields = get_read_fields(conversation, user)
+        if fields is None:
+            return 0
+        watermark_field, _, other_id = fields
+        return Message.objects.filter(
+            conversation_id=conversation.pk, sender_id=other_id, pk__gt=getattr(conversation, watermark_field)
+        ).count()
+
+    @staticmethod
+    def is_read_by_recipient(message):
+        """
+        Check whether the recipient of a message has read it.
+
+        Args:
+            message (Message): A message with its conversation loaded
+
+        Returns:
+            bool: True if the message is at or below the recipient's watermark
+        """
+        conversation = message.conversation
+        if message.sender_id == conversation.provider_id:
+            return message.pk <= conversation.customer_read_watermark
+        return message.pk <= conversation.provider_read_watermark
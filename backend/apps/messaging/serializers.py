@@ -12,6 +12,7 @@ from django.db import transaction
 
 from .models import Conversation, Message, MessageReadStatus
 from .encryption import decrypt_message_text, is_message_encrypted
+from .read_state import ReadStateService
 from apps.services.models import Service
 
 User = get_user_model()
@@ -65,6 +66,7 @@ class MessageSerializer(serializers.ModelSerializer):
     is_deleted_for_user = serializers.SerializerMethodField()
     attachment_url = serializers.SerializerMethodField()
     timestamp = serializers.DateTimeField(source='created_at', read_only=True)
+    status = serializers.SerializerMethodField()
     
     class Meta:
         model = Message
@@ -78,6 +80,12 @@ class MessageSerializer(serializers.ModelSerializer):
             'is_flagged', 'moderation_reason', 'attachment_url', 'is_deleted_for_user'
         ]
     
+    def get_status(self, obj):
+        """Report 'read' once the recipient's read watermark has passed the message."""
+        if ReadStateService.is_read_by_recipient(obj):
+            return 'read'
+        return obj.status
+    
     def get_is_deleted_for_user(self, obj):
         """Check if message is deleted for the current user."""
         request = self.context.get('request')
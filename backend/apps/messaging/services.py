@@ -0,0 +1,162 @@
+"""
+MESSAGE DELIVERY
+
+Persist-and-render path for chat messages sent over the WebSocket.
+
+MessagingConsumer used to make three database round trips per message
+(look up the conversation, create the message, serialize it), each one a
+separate hop from the event loop to a worker thread. MessageDeliveryService
+does all of it in one synchronous call inside one transaction and hands back
+the payload that goes over the wire, so the consumer needs a single
+database_sync_to_async hop per message.
+"""
+
+import asyncio
+import json
+import time
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Conversation, Message, MessageReadStatus
+from .serializers import MessageSerializer
+
+MAX_MESSAGE_LENGTH = 5000
+
+
+class MessageDeliveryError(ValueError):
+    """Raised when a message cannot be sent to a conversation."""
+
+
+class MessageDeliveryService:
+    """
+    Service class for storing a chat message and rendering its wire payload.
+
+    Example:
+        >>> result = MessageDeliveryService.persist_and_render(user, conversation_id, 'Hello')
+        >>> result['payload']['type'], result['participant_ids']
+        ('message', (12, 7))
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def persist_and_render(sender, conversation_id, text, message_type='text'):
+        """
+        Create a message and return the payload to broadcast for it.
+
+        The conversation is loaded with its participants and service in one
+        query (the notification signal needs them), the message INSERT and the
+        F() counter UPDATE from Message.save run in the same transaction, and
+        the serializer is fed the already loaded sender and an empty read
+        status list so rendering costs no further queries.
+
+        Args:
+            sender (User): The user sending the message
+            conversation_id (int): Conversation to post to
+            text (str): Plain message text (encrypted by Message.save)
+            message_type (str): Message type, 'text' by default
+
+        Returns:
+            dict: payload ({'type': 'message', 'data': ...}) and
+                participant_ids ((customer_id, provider_id))
+
+        Raises:
+            MessageDeliveryError: If the text is empty or too long, or the
+                sender cannot post to the conversation
+        """
+        text = (text or '').strip()
+        if not text:
+            raise MessageDeliveryError("Message must have text")
+        if len(text) > MAX_MESSAGE_LENGTH:
+            raise MessageDeliveryError(f"Message text cannot exceed {MAX_MESSAGE_LENGTH} characters")
+
+        conversation = Conversation.objects.select_related('customer', 'provider', 'service').filter(
+            Q(customer=sender) | Q(provider=sender), pk=conversation_id
+        ).first()
+        if conversation is None:
+            raise MessageDeliveryError("Conversation not found or access denied")
+        if not conversation.is_active:
+            raise MessageDeliveryError("This conversation is no longer active")
+
+        message = Message(conversation=conversation, sender=sender, text=text, message_type=message_type)
+        message.save()
+
+        # A new message has no read statuses yet; skip the prefetch query
+        message._prefetched_objects_cache = {'read_statuses': MessageReadStatus.objects.none()}
+        return {
+            'payload': {'type': 'message', 'data': MessageSerializer(message).data},
+            'participant_ids': (conversation.customer_id, conversation.provider_id),
+        }
+
+
+def run_throughput_benchmark(conversation_id, messages=200):
+    """
+    Send messages through MessagingConsumer over in-process WebSockets.
+
+    Connects both participants of the conversation with Channels'
+    WebsocketCommunicator, sends `messages` chat frames from the customer and
+    waits until the provider has received every one of them. The sender's own
+    socket must see each message exactly once.
+
+    Args:
+        conversation_id (int): Conversation to send the messages to
+        messages (int): Number of messages to send
+
+    Returns:
+        dict: messages, elapsed_ms, messages_per_second, received (by the
+            provider), echoed (back to the sender) and message_ids
+    """
+    from asgiref.sync import async_to_sync
+    from channels.testing import WebsocketCommunicator
+
+    from .consumers import MessagingConsumer
+
+    conversation = Conversation.objects.get(pk=conversation_id)
+
+    async def open_socket(user_id):
+        communicator = WebsocketCommunicator(MessagingConsumer.as_asgi(), f'/ws/messaging/?user_id={user_id}')
+        connected, _ = await communicator.connect()
+        if not connected:
+            raise MessageDeliveryError(f"Could not connect user {user_id}")
+        return communicator
+
+    async def collect(communicator, count, timeout):
+        message_ids = []
+        while len(message_ids) < count:
+            frame = await communicator.receive_json_from(timeout=timeout)
+            if frame['type'] == 'message':
+                message_ids.append(frame['data']['id'])
+            elif frame['type'] == 'error':
+                raise MessageDeliveryError(frame['data']['message'])
+        return message_ids
+
+    async def run():
+        customer = await open_socket(conversation.customer_id)
+        provider = await open_socket(conversation.provider_id)
+        try:
+            started = time.perf_counter()
+            for index in range(messages):
+                await customer.send_to(text_data=json.dumps({
+                    'type': 'message',
+                    'data': {'conversation_id': conversation_id, 'content': f'Benchmark message {index}'},
+                }))
+            received = await collect(provider, messages, timeout=30)
+            elapsed = time.perf_counter() - started
+            echoed = await collect(customer, messages, timeout=30)
+            # Anything left on the sender's socket would be a duplicate echo
+            while not await customer.receive_nothing(timeout=0.2):
+                if (await customer.receive_json_from())['type'] == 'message':
+                    echoed.append(None)
+            return received, echoed, elapsed
+        finally:
+            await asyncio.gather(customer.disconnect(), provider.disconnect())
+
+    received, echoed, elapsed = async_to_sync(run)()
+    return {
+        'messages': messages,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'messages_per_second': round(messages / elapsed, 1) if elapsed else None,
+        'received': len(received),
+        'echoed': len(echoed),
+        'message_ids': received,
+    }
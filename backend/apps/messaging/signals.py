@@ -4,11 +4,62 @@ Signal handlers for the messaging app.
 This module contains Django signal handlers for messaging-related events.
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Message
+from .models import Conversation, Message
+
+# Conversation fields whose change must refresh connected sockets' membership maps
+MEMBERSHIP_FIELDS = {'customer', 'provider', 'is_active', 'customer_archived', 'provider_archived'}
+
+
+def broadcast_membership_change(conversation, removed=False):
+    """
+    Tell both participants' open sockets about a conversation membership change.
+
+    Sent after commit so consumers never see a conversation that was rolled back.
+
+    Args:
+        conversation (Conversation): The conversation that changed
+        removed (bool): Whether the conversation no longer exists
+    """
+    event = {
+        'type': 'conversation.membership',
+        'conversation_id': conversation.id,
+        'customer_id': conversation.customer_id,
+        'provider_id': conversation.provider_id,
+        'removed': removed,
+    }
+
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        for user_id in {conversation.customer_id, conversation.provider_id}:
+            async_to_sync(channel_layer.group_send)(f'user_{user_id}', event)
+
+    transaction.on_commit(send)
+
+
+@receiver(post_save, sender=Conversation)
+def conversation_membership_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Refresh socket membership maps when a conversation is created or archived.
+
+    Saves that only touch unrelated fields (e.g. the last message preview
+    written by Message.save) are ignored.
+    """
+    if not created and update_fields is not None and not MEMBERSHIP_FIELDS.intersection(update_fields):
+        return
+    broadcast_membership_change(instance)
+
+
+@receiver(post_delete, sender=Conversation)
+def conversation_membership_deleted(sender, instance, **kwargs):
+    """Drop a deleted conversation from its participants' socket membership maps."""
+    broadcast_membership_change(instance, removed=True)
 
 
 @receiver(post_save, sender=Message)
@@ -56,7 +107,7 @@ def create_message_notification(sender, instance, created, **kwargs):
     """
     # Only create notifications for new messages, not updates
     if created and instance.message_type != 'system':
-        from apps.notifications.models import Notification, UserNotificationSetting
+        from apps.notifications.dispatch import NotificationDispatcher
         
         conversation = instance.conversation
         sender_user = instance.sender
@@ -69,15 +120,6 @@ def create_message_notification(sender, instance, created, **kwargs):
             recipient = conversation.customer
             sender_name = conversation.provider.first_name or conversation.provider.username
         
-        # Check if the recipient has message notifications enabled
-        try:
-            settings = UserNotificationSetting.objects.get(user=recipient)
-            if not settings.message_notifications:
-                return  # User has disabled message notifications
-        except UserNotificationSetting.DoesNotExist:
-            # If no settings exist, assume default (enabled)
-            pass
-        
         # Get message preview based on message type
         if instance.message_type == 'text':
             # For text messages, show a preview of the text content
@@ -94,15 +136,14 @@ def create_message_notification(sender, instance, created, **kwargs):
         else:
             notification_message = f"New message from {sender_name}"
         
-        # Create the notification
-        Notification.objects.create(
-            user=recipient,
-            title="New Message Received",
-            message=notification_message,
-            notification_type="message",
-            type="message",  # Use both fields for compatibility
-            related_id=conversation.id,  # Link to conversation instead of message
-            data={
+        # Create the notification (skipped if the recipient turned message notifications off)
+        NotificationDispatcher.dispatch([{
+            'user': recipient,
+            'type': 'message',
+            'title': "New Message Received",
+            'message': notification_message,
+            'related_id': conversation.id,  # Link to conversation instead of message
+            'data': {
                 'conversation_id': conversation.id,
                 'message_id': instance.id,
                 'sender_id': sender_user.id,
@@ -110,7 +151,7 @@ def create_message_notification(sender, instance, created, **kwargs):
                 'service_title': conversation.service.title,
                 'message_type': instance.message_type
             },
-            action_required=False,
-            action_url=f"/dashboard/messages/{conversation.id}",  # Link to conversation
-            priority="medium"
-        )
\ No newline at end of file
+            'action_required': False,
+            'action_url': f"/dashboard/messages/{conversation.id}",  # Link to conversation
+            'priority': "medium",
+        }])
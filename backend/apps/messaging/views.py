@@ -18,7 +18,7 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction
 
-from .models import Conversation, Message, MessageReadStatus
+from .models import Conversation, Message
 from .serializers import (
     ConversationSerializer, 
     ConversationCreateSerializer,
@@ -132,9 +132,22 @@ class ConversationViewSet(ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
-        """Mark all messages in conversation as read for current user."""
+        """
+        Mark messages in conversation as read for current user.
+
+        Reads everything by default; pass ``up_to_message_id`` to read up to
+        (and including) a given message.
+        """
         conversation = self.get_object()
-        conversation.mark_as_read_for_user(request.user)
+        up_to_message_id = request.data.get('up_to_message_id')
+        try:
+            up_to_message_id = int(up_to_message_id) if up_to_message_id is not None else None
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'up_to_message_id must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        conversation.mark_as_read_for_user(request.user, up_to_message_id)
         
         return Response({
             'message': 'Conversation marked as read',
@@ -420,20 +433,12 @@ class MessageViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create read status if not exists
-        read_status, created = MessageReadStatus.objects.get_or_create(
-            message=message,
-            user=user
-        )
-        
-        # Update message status if newly read
-        if created and message.status != 'read':
-            message.status = 'read'
-            message.save(update_fields=['status'])
+        # Move the reader's watermark up to this message (never backwards)
+        message.conversation.mark_as_read_for_user(user, message.id)
         
         return Response({
             'message': 'Message marked as read',
-            'read_at': read_status.read_at
+            'read_at': timezone.now()
         })
 
 
@@ -472,7 +477,7 @@ class ConversationMessagesListView(generics.ListAPIView):
         # Note: Using Python filtering for SQLite compatibility
         all_messages = Message.objects.filter(
             conversation=conversation
-        ).select_related('sender')
+        ).select_related('sender', 'conversation')
         
         # Filter out messages deleted by this user using Python filtering
         filtered_messages = []
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
-from .models import Notification
+from .models import Notification, OutboundEmail
 
 
 class NotificationAdmin(ModelAdmin):
@@ -22,4 +22,26 @@ class NotificationAdmin(ModelAdmin):
     readonly_fields = ('created_at',)
 
 
-admin.site.register(Notification, NotificationAdmin)
\ No newline at end of file
+admin.site.register(Notification, NotificationAdmin)
+
+
+class OutboundEmailAdmin(ModelAdmin):
+    """
+    Admin interface for queued outbound emails.
+    
+    Provides a read-mostly view of the outbound email queue for checking
+    delivery status and the last error of failed emails.
+    
+    Attributes:
+        list_display (list): Fields to display in the list view
+        list_filter (list): Fields to filter by in the list view
+        search_fields (list): Fields to search in the list view
+        readonly_fields (list): Fields that are read-only in the admin
+    """
+    list_display = ('id', 'subject', 'builder', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'builder', 'created_at')
+    search_fields = ('subject', 'builder', 'last_error')
+    readonly_fields = ('subject', 'recipients', 'attempts', 'locked_at', 'last_error', 'sent_at', 'created_at')
+
+
+admin.site.register(OutboundEmail, OutboundEmailAdmin)
@@ -0,0 +1,154 @@
+"""
+UNREAD NOTIFICATION COUNTERS
+
+Keeps a per-user unread notification count in NotificationCounter so the
+header bell's unread_count poll reads one row instead of running
+
+    SELECT COUNT(*) FROM notifications_notification WHERE user_id = %s AND NOT is_read
+
+on every request. Every path that changes the number of unread notifications
+adjusts the counter in the same transaction:
+
+- Notification.save() / delete() for single notifications (create, mark read,
+  mark unread, delete),
+- NotificationDispatcher.dispatch() after its bulk INSERT,
+- the mark_all_read view with the number of rows its UPDATE flipped.
+
+Adjustments are F() expressions, so concurrent writers never overwrite each
+other's changes, and users that share a delta are updated with one UPDATE.
+A user's counter row is created on first use from a COUNT of their unread
+notifications. QuerySet.update()/delete() calls elsewhere bypass the counter;
+reconcile() recomputes every counter in one query and fixes the ones that
+drifted (run nightly with the notification retention job).
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Notification, NotificationCounter
+
+
+class UnreadCounterService:
+    """
+    Service class for the denormalized unread notification counters.
+
+    Example:
+        >>> UnreadCounterService.get(user.id)
+        4
+        >>> UnreadCounterService.adjust({user.id: -4})   # all marked read
+        >>> UnreadCounterService.reconcile()
+        0
+    """
+
+    @staticmethod
+    def count_unread(user_ids):
+        """
+        Count the unread notifications of several users in one grouped query.
+
+        Args:
+            user_ids (iterable): The users to count for
+
+        Returns:
+            dict: user_id -> unread count (users without unread notifications are omitted)
+        """
+        return dict(
+            Notification.objects.filter(user_id__in=list(user_ids), is_read=False)
+            .order_by()
+            .values('user_id')
+            .annotate(total=Count('pk'))
+            .values_list('user_id', 'total')
+        )
+
+    @staticmethod
+    def seed(user_ids):
+        """
+        Create missing counter rows from the current unread counts.
+
+        Args:
+            user_ids (iterable): Users that have no counter row yet
+
+        Returns:
+            dict: user_id -> seeded unread count
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return {}
+        counts = UnreadCounterService.count_unread(user_ids)
+        seeded = {user_id: counts.get(user_id, 0) for user_id in user_ids}
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id, unread_count=count) for user_id, count in seeded.items()],
+            ignore_conflicts=True,
+        )
+        return seeded
+
+    @staticmethod
+    def get(user_id):
+        """
+        Return a user's unread notification count.
+
+        Args:
+            user_id (int): The user
+
+        Returns:
+            int: Number of unread notifications
+        """
+        count = NotificationCounter.objects.filter(user_id=user_id).values_list('unread_count', flat=True).first()
+        if count is None:
+            count = UnreadCounterService.seed([user_id])[user_id]
+        return count
+
+    @staticmethod
+    def adjust(deltas):
+        """
+        Add to the unread counters of several users.
+
+        Must run in the transaction that changed the notifications. Users
+        without a counter row are seeded from a COUNT instead, which already
+        includes the change.
+
+        Args:
+            deltas (dict): user_id -> change of the unread count
+        """
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        existing = set(
+            NotificationCounter.objects.filter(user_id__in=list(deltas)).values_list('user_id', flat=True)
+        )
+        by_delta = defaultdict(list)
+        for user_id in existing:
+            by_delta[deltas[user_id]].append(user_id)
+        for delta, user_ids in by_delta.items():
+            NotificationCounter.objects.filter(user_id__in=user_ids).update(
+                unread_count=Greatest(F('unread_count') + Value(delta), Value(0))
+            )
+
+        UnreadCounterService.seed(set(deltas) - existing)
+
+    @staticmethod
+    def reconcile():
+        """
+        Recompute every counter from the notifications and fix the ones that drifted.
+
+        Returns:
+            int: Number of counters corrected
+        """
+        unread = (
+            Notification.objects.filter(user=OuterRef('user'), is_read=False)
+            .order_by()
+            .values('user')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        drifted = NotificationCounter.objects.annotate(
+            expected=Coalesce(Subquery(unread, output_field=IntegerField()), Value(0)),
+        ).exclude(unread_count=F('expected')).values_list('user_id', 'expected')
+
+        corrected = 0
+        for user_id, expected in drifted.iterator():
+            NotificationCounter.objects.filter(user_id=user_id).update(unread_count=expected)
+            corrected += 1
+        return corrected
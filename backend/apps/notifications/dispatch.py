@@ -0,0 +1,263 @@
+"""
+NOTIFICATION DISPATCHER
+
+Creates in-app notifications for many recipients at once.
+
+Signal handlers used to call Notification.objects.create() per recipient and,
+for messages, look up the recipient's UserNotificationSetting row first, so a
+fan-out to N users cost up to 2N queries plus N channel-layer round trips.
+NotificationDispatcher.dispatch() takes a list of items instead:
+
+    NotificationDispatcher.dispatch([
+        {'user': provider.id, 'type': 'booking', 'title': 'New Booking Request', 'message': '...'},
+        {'user': customer.id, 'type': 'booking', 'title': 'Booking Confirmed', 'message': '...'},
+    ])
+
+and for the whole batch
+
+1. reads every recipient's preferences from the cache with one get_many(),
+   loading the misses with a single query (users without a settings row get
+   the model defaults),
+2. drops items whose notification type the recipient has switched off,
+3. inserts the rest with bulk_create() and adds them to the recipients'
+   unread counters (see apps.notifications.counters),
+4. after commit, pushes each new notification to its recipient's `user_<id>`
+   channel group, all group_send() calls awaited together in one event loop
+   hop.
+
+Cached preferences are invalidated when a UserNotificationSetting is saved or
+deleted (see apps.notifications.signals).
+"""
+
+import asyncio
+import logging
+from collections import Counter
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.common.app_settings import setting_getter
+
+from .counters import UnreadCounterService
+from .models import Notification, UserNotificationSetting
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_NOTIFICATION_DISPATCH_SETTINGS = {
+    'PREFERENCE_CACHE_TIMEOUT': 10 * 60,
+    'BATCH_SIZE': 500,
+    'REALTIME_PUSH': True,
+}
+
+# UserNotificationSetting flag that controls each notification type
+PREFERENCE_FIELDS = {
+    'booking': 'booking_updates',
+    'booking_request': 'booking_requests',
+    'booking_update': 'booking_updates',
+    'review': 'review_notifications',
+    'payment': 'payment_notifications',
+    'system': 'system_notifications',
+    'reminder': 'reminder_notifications',
+    'message': 'message_notifications',
+}
+
+# Optional item keys copied onto the Notification as-is
+OPTIONAL_FIELDS = ('related_id', 'data', 'action_required', 'action_url', 'priority')
+
+
+get_notification_dispatch_setting = setting_getter('NOTIFICATION_DISPATCH', DEFAULT_NOTIFICATION_DISPATCH_SETTINGS)
+
+
+class NotificationPreferenceCache:
+    """
+    Service class for the cached per-user notification type preferences.
+
+    Example:
+        >>> NotificationPreferenceCache.get_many([3, 7])
+        {3: {'booking_updates': True, ...}, 7: {...}}
+        >>> NotificationPreferenceCache.invalidate(3)
+    """
+
+    @staticmethod
+    def cache_key(user_id):
+        return f'notification_prefs:{user_id}'
+
+    @staticmethod
+    def defaults():
+        """Return the preferences of a user without a settings row (the model defaults)."""
+        return {
+            field: UserNotificationSetting._meta.get_field(field).get_default()
+            for field in set(PREFERENCE_FIELDS.values())
+        }
+
+    @staticmethod
+    def get_many(user_ids):
+        """
+        Return the type preferences of several users, loading cache misses in one query.
+
+        Args:
+            user_ids (iterable): Recipient user ids
+
+        Returns:
+            dict: user_id -> {preference field: bool}
+        """
+        user_ids = set(user_ids)
+        keys = {NotificationPreferenceCache.cache_key(user_id): user_id for user_id in user_ids}
+        cached = cache.get_many(list(keys))
+        preferences = {keys[key]: value for key, value in cached.items()}
+
+        missing = user_ids - set(preferences)
+        if missing:
+            fields = sorted(set(PREFERENCE_FIELDS.values()))
+            loaded = {user_id: NotificationPreferenceCache.defaults() for user_id in missing}
+            for row in UserNotificationSetting.objects.filter(user_id__in=missing).values('user_id', *fields):
+                loaded[row.pop('user_id')] = row
+            cache.set_many(
+                {NotificationPreferenceCache.cache_key(user_id): value for user_id, value in loaded.items()},
+                get_notification_dispatch_setting('PREFERENCE_CACHE_TIMEOUT'),
+            )
+            preferences.update(loaded)
+        return preferences
+
+    @staticmethod
+    def invalidate(user_id):
+        """
+        Drop a user's cached preferences.
+
+        Args:
+            user_id: The user whose settings changed
+        """
+        cache.delete(NotificationPreferenceCache.cache_key(user_id))
+
+
+class NotificationDispatcher:
+    """
+    Service class for creating and pushing notifications in bulk.
+
+    Items are dicts with 'user' (a User or user id), 'type', 'title' and
+    'message', plus any of 'related_id', 'data', 'action_required',
+    'action_url' and 'priority'.
+
+    Example:
+        >>> NotificationDispatcher.dispatch([{'user': 7, 'type': 'review', 'title': 'New Review', 'message': '...'}])
+        [<Notification: review notification for ...>]
+        >>> NotificationDispatcher.broadcast(User.objects.filter(role='provider'), 'system', 'Maintenance', '...')
+        412
+    """
+
+    @staticmethod
+    def dispatch(items):
+        """
+        Create the notifications the recipients have enabled and push them in real time.
+
+        Args:
+            items (list): Notification items (see the class docstring)
+
+        Returns:
+            list: The created Notification instances
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        user_ids = [getattr(item['user'], 'pk', item['user']) for item in items]
+        preferences = NotificationPreferenceCache.get_many(user_ids)
+
+        notifications = []
+        for user_id, item in zip(user_ids, items):
+            preference_field = PREFERENCE_FIELDS.get(item['type'])
+            if preference_field and not preferences[user_id].get(preference_field, True):
+                continue
+            # bulk_create skips Notification.save(), so both type fields are set here
+            notifications.append(Notification(
+                user_id=user_id,
+                title=item['title'],
+                message=item['message'],
+                notification_type=item['type'],
+                type=item['type'],
+                **{field: item[field] for field in OPTIONAL_FIELDS if field in item},
+            ))
+
+        if not notifications:
+            return []
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(
+                notifications, batch_size=get_notification_dispatch_setting('BATCH_SIZE')
+            )
+            UnreadCounterService.adjust(Counter(notification.user_id for notification in created))
+        if get_notification_dispatch_setting('REALTIME_PUSH'):
+            transaction.on_commit(lambda: NotificationDispatcher.push(created))
+        return created
+
+    @staticmethod
+    def broadcast(users, notification_type, title, message, **fields):
+        """
+        Send the same notification to many users, a BATCH_SIZE chunk at a time.
+
+        Args:
+            users (QuerySet or iterable): Recipients (users or user ids)
+            notification_type (str): One of Notification.TYPE_CHOICES
+            title (str): Notification title
+            message (str): Notification message
+            **fields: Optional item keys (related_id, data, action_url, ...)
+
+        Returns:
+            int: Number of notifications created
+        """
+        if hasattr(users, 'values_list'):
+            users = users.order_by('pk').values_list('pk', flat=True).iterator()
+
+        batch_size = get_notification_dispatch_setting('BATCH_SIZE')
+        created = 0
+        batch = []
+        for user in users:
+            batch.append({'user': user, 'type': notification_type, 'title': title, 'message': message, **fields})
+            if len(batch) >= batch_size:
+                created += len(NotificationDispatcher.dispatch(batch))
+                batch = []
+        if batch:
+            created += len(NotificationDispatcher.dispatch(batch))
+        return created
+
+    @staticmethod
+    def push(notifications):
+        """
+        Send new notifications to their recipients' open WebSocket connections.
+
+        All group_send() calls are awaited together in a single async_to_sync
+        hop. Failures are logged; the notifications are already stored.
+
+        Args:
+            notifications (list): Created Notification instances
+        """
+        channel_layer = get_channel_layer()
+        if channel_layer is None or not notifications:
+            return
+
+        from .serializers import NotificationSerializer
+
+        events = [
+            (f'user_{notification.user_id}', {
+                'type': 'websocket_message',
+                'message': {'type': 'notification', 'data': dict(NotificationSerializer(notification).data)},
+            })
+            for notification in notifications
+        ]
+
+        async def send_all():
+            results = await asyncio.gather(
+                *(channel_layer.group_send(group, event) for group, event in events),
+                return_exceptions=True,
+            )
+            return [result for result in results if isinstance(result, Exception)]
+
+        try:
+            errors = async_to_sync(send_all)()
+        except Exception as e:
+            logger.error(f"Failed to push {len(events)} notification(s): {str(e)}")
+            return
+        if errors:
+            logger.error(f"Failed to push {len(errors)} of {len(events)} notification(s): {str(errors[0])}")
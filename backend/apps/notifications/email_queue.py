@@ -0,0 +1,254 @@
+"""
+OUTBOUND EMAIL QUEUE
+
+This module implements a database-backed queue for outbound email. Request handlers
+enqueue a builder reference plus a small JSON context; a worker (Celery task or
+management command) later renders the templates and delivers the queued emails in
+batches over a single reused SMTP connection.
+
+Key pieces:
+- EmailQueueService.enqueue: Insert a pending email row (cheap, request-safe)
+- EmailQueueService.send_pending: Claim a batch of due rows and deliver them
+- Exponential retry backoff with a configurable attempt limit
+
+Builders are plain functions referenced by dotted path. They receive the stored
+context dict and return a django.core.mail.EmailMessage (usually an
+EmailMultiAlternatives). Keeping the builder reference instead of rendered HTML
+means templates are rendered by the worker, never on the request path.
+
+Settings (all optional, see EMAIL_QUEUE in settings.py):
+- BATCH_SIZE: Emails claimed per batch (default: 50)
+- MAX_ATTEMPTS: Attempts before an email is marked failed (default: 5)
+- RETRY_BACKOFF_SECONDS: Base delay for the first retry (default: 60)
+- MAX_BACKOFF_SECONDS: Upper bound for the retry delay (default: 3600)
+- LEASE_SECONDS: How long a claimed row stays locked to one worker (default: 300)
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.common.app_settings import setting_getter
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_EMAIL_QUEUE_SETTINGS = {
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF_SECONDS': 60,
+    'MAX_BACKOFF_SECONDS': 60 * 60,
+    'LEASE_SECONDS': 60 * 5,
+}
+
+
+get_email_queue_setting = setting_getter('EMAIL_QUEUE', DEFAULT_EMAIL_QUEUE_SETTINGS)
+
+
+class EmailQueueService:
+    """
+    Service class for queueing and delivering outbound email.
+
+    Enqueueing is a single INSERT. Delivery claims due rows in batches (using
+    SKIP LOCKED where the database supports it, so several workers can drain the
+    queue concurrently), builds each message, and sends the whole batch over one
+    open connection from the configured EMAIL_BACKEND.
+    """
+
+    @staticmethod
+    def enqueue(builder, context=None):
+        """
+        Queue an email for asynchronous delivery.
+
+        Args:
+            builder (str): Dotted path of a function taking the context dict and
+                returning an EmailMessage
+            context (dict): JSON-serializable arguments for the builder (optional)
+
+        Returns:
+            OutboundEmail: The queued email row
+
+        Example:
+            >>> EmailQueueService.enqueue(
+            ...     'apps.contact.emails.build_confirmation_email',
+            ...     {'message_id': contact_message.id})
+        """
+        return OutboundEmail.objects.create(builder=builder, context=context or {})
+
+    @staticmethod
+    def send_pending(batch_size=None, max_batches=None, connection=None):
+        """
+        Deliver due queued emails in batches.
+
+        Each batch is claimed, built and sent over a single connection, which is
+        opened once and reused for every batch of this call.
+
+        Args:
+            batch_size (int): Emails per batch (default: EMAIL_QUEUE['BATCH_SIZE'])
+            max_batches (int): Stop after this many batches (default: until drained)
+            connection: Email backend connection to reuse (default: get_connection())
+
+        Returns:
+            dict: Counts of 'sent', 'retried' and 'failed' emails plus 'batches'
+        """
+        batch_size = batch_size or get_email_queue_setting('BATCH_SIZE')
+        results = {'sent': 0, 'retried': 0, 'failed': 0, 'batches': 0}
+
+        connection = connection or get_connection(fail_silently=False)
+        opened = False
+        try:
+            while max_batches is None or results['batches'] < max_batches:
+                batch = EmailQueueService._claim_batch(batch_size)
+                if not batch:
+                    break
+
+                if not opened:
+                    try:
+                        connection.open()
+                        opened = True
+                    except Exception as e:
+                        # Backend unreachable: push the whole batch back with backoff
+                        logger.error(f"Email queue could not open connection: {str(e)}")
+                        for outbound in batch:
+                            EmailQueueService._record_failure(outbound, e, results)
+                        results['batches'] += 1
+                        break
+
+                EmailQueueService._send_batch(batch, connection, results)
+                results['batches'] += 1
+        finally:
+            if opened:
+                try:
+                    connection.close()
+                except Exception as e:
+                    logger.warning(f"Email queue failed to close connection: {str(e)}")
+
+        return results
+
+    @staticmethod
+    def _claim_batch(batch_size):
+        """
+        Claim up to batch_size due emails for this worker.
+
+        Pending rows whose next_attempt_at has passed are due, as are 'sending'
+        rows whose lease expired (e.g. the worker that claimed them crashed).
+
+        Args:
+            batch_size (int): Maximum number of rows to claim
+
+        Returns:
+            list: Claimed OutboundEmail instances
+        """
+        now = timezone.now()
+        lease_cutoff = now - timedelta(seconds=get_email_queue_setting('LEASE_SECONDS'))
+
+        with transaction.atomic():
+            ids = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status='pending', next_attempt_at__lte=now) |
+                    Q(status='sending', locked_at__lt=lease_cutoff)
+                )
+                .order_by('next_attempt_at', 'id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return []
+            OutboundEmail.objects.filter(id__in=ids).update(status='sending', locked_at=now)
+
+        return list(OutboundEmail.objects.filter(id__in=ids).order_by('next_attempt_at', 'id'))
+
+    @staticmethod
+    def _send_batch(batch, connection, results):
+        """
+        Build and send a claimed batch over an open connection.
+
+        Args:
+            batch (list): Claimed OutboundEmail instances
+            connection: Open email backend connection
+            results (dict): Counters updated in place
+        """
+        sent_ids = []
+        for outbound in batch:
+            try:
+                message = import_string(outbound.builder)(outbound.context)
+            except ObjectDoesNotExist as e:
+                # The object the email is about is gone; retrying will not help
+                EmailQueueService._record_failure(outbound, e, results, permanent=True)
+                continue
+            except Exception as e:
+                EmailQueueService._record_failure(outbound, e, results)
+                continue
+
+            message.connection = connection
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                EmailQueueService._record_failure(outbound, e, results, message=message)
+                continue
+
+            if outbound.subject != message.subject or outbound.recipients != message.recipients():
+                OutboundEmail.objects.filter(pk=outbound.pk).update(
+                    subject=message.subject[:500],
+                    recipients=message.recipients(),
+                )
+            sent_ids.append(outbound.pk)
+
+        if sent_ids:
+            OutboundEmail.objects.filter(id__in=sent_ids).update(
+                status='sent',
+                sent_at=timezone.now(),
+                locked_at=None,
+                last_error='',
+                attempts=F('attempts') + 1,
+            )
+            results['sent'] += len(sent_ids)
+
+    @staticmethod
+    def _record_failure(outbound, error, results, permanent=False, message=None):
+        """
+        Record a failed delivery attempt and schedule a retry if allowed.
+
+        Retries back off exponentially: RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1),
+        capped at MAX_BACKOFF_SECONDS.
+
+        Args:
+            outbound (OutboundEmail): The email that failed
+            error (Exception): The error raised by the build or send step
+            results (dict): Counters updated in place
+            permanent (bool): Mark as failed without retrying
+            message (EmailMessage): The built message, if the build step succeeded
+        """
+        attempts = outbound.attempts + 1
+        updates = {
+            'attempts': attempts,
+            'locked_at': None,
+            'last_error': str(error)[:2000],
+        }
+        if message is not None:
+            updates['subject'] = message.subject[:500]
+            updates['recipients'] = message.recipients()
+
+        if permanent or attempts >= get_email_queue_setting('MAX_ATTEMPTS'):
+            updates['status'] = 'failed'
+            results['failed'] += 1
+            logger.error(f"Giving up on queued email {outbound.pk} after {attempts} attempt(s): {str(error)}")
+        else:
+            delay = min(
+                get_email_queue_setting('RETRY_BACKOFF_SECONDS') * 2 ** (attempts - 1),
+                get_email_queue_setting('MAX_BACKOFF_SECONDS'),
+            )
+            updates['status'] = 'pending'
+            updates['next_attempt_at'] = timezone.now() + timedelta(seconds=delay)
+            results['retried'] += 1
+            logger.warning(f"Queued email {outbound.pk} failed (attempt {attempts}), retrying in {delay}s: {str(error)}")
+
+        OutboundEmail.objects.filter(pk=outbound.pk).update(**updates)
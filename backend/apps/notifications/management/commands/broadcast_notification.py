@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.notifications.dispatch import NotificationDispatcher
+from apps.notifications.models import Notification
+
+
+class Command(BaseCommand):
+    """
+    Management command to send one in-app notification to many users.
+    
+    Recipients are streamed in BATCH_SIZE chunks through the bulk notification
+    dispatcher, so their preferences are honored and each chunk costs a
+    handful of queries.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Send an in-app notification to all active users, optionally filtered by role'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument(
+            '--title',
+            required=True,
+            help='Notification title'
+        )
+        parser.add_argument(
+            '--message',
+            required=True,
+            help='Notification message'
+        )
+        parser.add_argument(
+            '--type',
+            default='system',
+            choices=[choice for choice, _ in Notification.TYPE_CHOICES],
+            help='Notification type (default: system)'
+        )
+        parser.add_argument(
+            '--role',
+            choices=[choice for choice, _ in User.ROLE_CHOICES],
+            default=None,
+            help='Only notify users with this role (default: everyone)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        users = User.objects.filter(is_active=True)
+        if options['role']:
+            users = users.filter(role=options['role'])
+        if not users.exists():
+            raise CommandError('No active users match the given filters')
+
+        created = NotificationDispatcher.broadcast(
+            users, options['type'], options['title'], options['message']
+        )
+        
+        if options['verbosity'] >= 1:
+            self.stdout.write(self.style.SUCCESS(f"Created {created} notification(s)"))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from apps.notifications.counters import UnreadCounterService
+from apps.notifications.retention import NotificationRetentionService
+
+
+class Command(BaseCommand):
+    """
+    Management command to purge old read notifications.
+    
+    Deletes read notifications older than the retention period in chunks,
+    then fixes any unread counters that drifted. Intended to run from cron
+    when Celery beat is not in use.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Delete old read notifications in chunks and reconcile unread counters'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Keep read notifications this many days (default: NOTIFICATION_RETENTION READ_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Notifications deleted per chunk (default: NOTIFICATION_RETENTION BATCH_SIZE)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        results = NotificationRetentionService.purge_read(
+            retention_days=options['days'],
+            batch_size=options['batch_size']
+        )
+        corrected = UnreadCounterService.reconcile()
+        
+        if options['verbosity'] >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {results['deleted']} read notification(s) in {results['batches']} batch(es), "
+                f"corrected {corrected} unread counter(s)"
+            ))
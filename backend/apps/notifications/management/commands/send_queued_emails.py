@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from apps.notifications.email_queue import EmailQueueService
+
+
+class Command(BaseCommand):
+    """
+    Management command to deliver queued outbound emails.
+    
+    Drains the outbound email queue in batches over a single reused
+    connection. Intended to run from cron when Celery beat is not in use.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Deliver queued outbound emails in batches'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of emails per batch (default: EMAIL_QUEUE BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches (default: drain the queue)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        results = EmailQueueService.send_pending(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches']
+        )
+        
+        if options['verbosity'] >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f"Sent {results['sent']} email(s), {results['retried']} scheduled for retry, "
+                f"{results['failed']} failed ({results['batches']} batch(es))"
+            ))
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 
 
 class Notification(models.Model):
@@ -88,7 +89,50 @@ class Notification(models.Model):
             self.notification_type = self.type
         elif self.notification_type and not self.type:
             self.type = self.notification_type
-        super().save(*args, **kwargs)
+        
+        # Keep the user's unread counter in step with is_read
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'is_read' not in update_fields:
+            super().save(*args, **kwargs)
+            return
+        
+        with transaction.atomic():
+            if self._state.adding or self.pk is None:
+                super().save(*args, **kwargs)
+                delta = 0 if self.is_read else 1
+            else:
+                # Flip is_read with a conditional UPDATE so concurrent saves count the change once
+                flipped = type(self)._base_manager.filter(
+                    pk=self.pk, is_read=not self.is_read
+                ).update(is_read=self.is_read)
+                super().save(*args, **kwargs)
+                delta = flipped * (-1 if self.is_read else 1)
+            if delta:
+                from .counters import UnreadCounterService
+                UnreadCounterService.adjust({self.user_id: delta})
+    
+    def delete(self, *args, **kwargs):
+        """
+        Delete the notification and take it off the user's unread counter.
+        
+        The row is locked first, so concurrent deletes count it once.
+        QuerySet.delete() skips this; the views only bulk-delete read
+        notifications, and the nightly reconcile fixes anything else.
+        
+        Args:
+            *args: Variable length argument list
+            **kwargs: Arbitrary keyword arguments
+            
+        Returns:
+            tuple: The number of objects deleted and a per-model breakdown
+        """
+        with transaction.atomic():
+            was_unread = type(self)._base_manager.select_for_update().filter(pk=self.pk, is_read=False).exists()
+            result = super().delete(*args, **kwargs)
+            if was_unread:
+                from .counters import UnreadCounterService
+                UnreadCounterService.adjust({self.user_id: -1})
+        return result
     
     def __str__(self):
         """
@@ -101,6 +145,13 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Notification list and the unread filter / mark all read
+            models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notification_user_unread_idx'),
+            # Retention purge of old read notifications
+            models.Index(fields=['is_read', 'created_at'], name='notification_retention_idx'),
+        ]
 
 
 class UserNotificationSetting(models.Model):
@@ -177,4 +228,95 @@ class UserNotificationSetting(models.Model):
         Returns:
             str: A string representation of the notification settings
         """
-        return f"NotificationSettings({self.user.email})"
\ No newline at end of file
+        return f"NotificationSettings({self.user.email})"
+
+class NotificationCounter(models.Model):
+    """
+    Model for the denormalized per-user unread notification count.
+    
+    Kept in step with the Notification rows by apps.notifications.counters:
+    creating, reading and deleting notifications adjust unread_count with an
+    F() expression in the same transaction. A user's row is created on first
+    use from a COUNT of their unread notifications.
+    
+    Attributes:
+        user (OneToOneField): The user the count belongs to
+        unread_count (int): Number of unread notifications
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_counter'
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        """
+        Return a string representation of the counter.
+        
+        Returns:
+            str: A string representation of the counter
+        """
+        return f"NotificationCounter(user={self.user_id}, unread={self.unread_count})"
+
+
+class OutboundEmail(models.Model):
+    """
+    Model for queued outbound emails.
+    
+    Emails are queued from the request path and delivered later by the
+    email queue worker (see apps.notifications.email_queue). Each row stores
+    the dotted path of a builder function and a JSON context; the builder
+    renders the templates and returns the email message at send time, so
+    template rendering and SMTP traffic never block a request.
+    
+    Attributes:
+        STATUS_CHOICES (tuple): Available delivery states
+        builder (str): Dotted path of the function that builds the message
+        context (dict): JSON-serializable arguments passed to the builder
+        status (str): Current delivery state
+        attempts (int): Number of delivery attempts made so far
+        next_attempt_at (datetime): Earliest time the next attempt may run
+        locked_at (datetime): When a worker claimed the row for sending
+        subject (str): Rendered subject (filled in after the first build)
+        recipients (list): Rendered recipients (filled in after the first build)
+        last_error (str): Error from the most recent failed attempt
+        sent_at (datetime): When the email was delivered
+        created_at (datetime): When the email was queued
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+    
+    builder = models.CharField(max_length=255)
+    context = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    
+    subject = models.CharField(max_length=500, blank=True)
+    recipients = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    sent_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        """
+        Return a string representation of the queued email.
+        
+        Returns:
+            str: A string representation of the queued email
+        """
+        return f"OutboundEmail #{self.pk} ({self.status}): {self.subject or self.builder}"
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+        ]
@@ -0,0 +1,90 @@
+"""
+NOTIFICATION RETENTION
+
+Deletes read notifications older than READ_RETENTION_DAYS so the
+notifications table does not grow forever.
+
+Rows are removed in chunks of BATCH_SIZE, each one a short
+
+    SELECT id FROM notifications_notification
+     WHERE is_read AND created_at < cutoff LIMIT <batch>
+    DELETE FROM notifications_notification WHERE id IN (...) AND is_read
+
+served by the (is_read, created_at) index, so the purge never holds a long
+lock on the table. Read notifications do not count towards the unread
+counters, so deleting them leaves the counters alone. Unread notifications
+are kept however old they are.
+
+Settings (all optional, see NOTIFICATION_RETENTION in settings.py):
+- READ_RETENTION_DAYS: Age after which read notifications are deleted (default: 90)
+- BATCH_SIZE: Notifications deleted per chunk (default: 1000)
+"""
+
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.common.app_settings import setting_getter
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_NOTIFICATION_RETENTION_SETTINGS = {
+    'READ_RETENTION_DAYS': 90,
+    'BATCH_SIZE': 1000,
+}
+
+
+get_notification_retention_setting = setting_getter('NOTIFICATION_RETENTION', DEFAULT_NOTIFICATION_RETENTION_SETTINGS)
+
+
+class NotificationRetentionService:
+    """
+    Service class for purging old read notifications.
+
+    Example:
+        >>> NotificationRetentionService.purge_read(retention_days=90)
+        {'deleted': 18250, 'batches': 19}
+    """
+
+    @staticmethod
+    def purge_read(retention_days=None, batch_size=None, now=None):
+        """
+        Delete read notifications older than the retention period, a chunk at a time.
+
+        Args:
+            retention_days (int): Keep read notifications this many days
+                (default: READ_RETENTION_DAYS)
+            batch_size (int): Notifications per chunk (default: BATCH_SIZE)
+            now (datetime): Reference time (default: timezone.now())
+
+        Returns:
+            dict: Number of notifications deleted and chunks run
+        """
+        if retention_days is None:
+            retention_days = get_notification_retention_setting('READ_RETENTION_DAYS')
+        batch_size = batch_size or get_notification_retention_setting('BATCH_SIZE')
+        cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+        expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff).order_by()
+
+        result = {'deleted': 0, 'batches': 0}
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            # Re-check is_read so a notification marked unread meanwhile survives
+            deleted, _ = Notification.objects.filter(pk__in=ids, is_read=True).delete()
+            result['deleted'] += deleted
+            result['batches'] += 1
+            if len(ids) < batch_size:
+                break
+
+        if result['deleted']:
+            logger.info(
+                f"Purged {result['deleted']} read notification(s) older than {retention_days} day(s) "
+                f"in {result['batches']} batch(es)"
+            )
+        return result
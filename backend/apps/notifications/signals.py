@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from apps.bookings.models import Booking
 from apps.reviews.models import Review
-from .models import Notification
+from .dispatch import NotificationDispatcher, NotificationPreferenceCache
+from .models import UserNotificationSetting
 
 
 @receiver(post_save, sender=Booking)
@@ -29,53 +30,51 @@ def create_booking_notification(sender, instance, created, **kwargs):
     """
     if created:
         # Notify the service provider about a new booking
-        provider = instance.service.provider
-        Notification.objects.create(
-            user=provider,
-            title="New Booking Request",
-            message=f"You have received a new booking request for {instance.service.title}",
-            notification_type="booking",
-            related_id=instance.id
-        )
+        NotificationDispatcher.dispatch([{
+            'user': instance.service.provider_id,
+            'type': 'booking_request',
+            'title': "New Booking Request",
+            'message': f"You have received a new booking request for {instance.service.title}",
+            'related_id': instance.id,
+        }])
     else:
         # Status change notifications
         if instance.status == 'confirmed':
             # Notify the customer that their booking is confirmed
-            Notification.objects.create(
-                user=instance.customer,
-                title="Booking Confirmed",
-                message=f"Your booking for {instance.service.title} has been confirmed",
-                notification_type="booking",
-                related_id=instance.id
-            )
+            NotificationDispatcher.dispatch([{
+                'user': instance.customer_id,
+                'type': 'booking',
+                'title': "Booking Confirmed",
+                'message': f"Your booking for {instance.service.title} has been confirmed",
+                'related_id': instance.id,
+            }])
         elif instance.status == 'rejected':
             # Notify the customer that their booking is rejected
-            Notification.objects.create(
-                user=instance.customer,
-                title="Booking Rejected",
-                message=f"Your booking for {instance.service.title} has been rejected: {instance.rejection_reason}",
-                notification_type="booking",
-                related_id=instance.id
-            )
+            NotificationDispatcher.dispatch([{
+                'user': instance.customer_id,
+                'type': 'booking',
+                'title': "Booking Rejected",
+                'message': f"Your booking for {instance.service.title} has been rejected: {instance.rejection_reason}",
+                'related_id': instance.id,
+            }])
         elif instance.status == 'cancelled':
             # Notify the provider that a booking was cancelled
-            provider = instance.service.provider
-            Notification.objects.create(
-                user=provider,
-                title="Booking Cancelled",
-                message=f"A booking for {instance.service.title} has been cancelled by the customer",
-                notification_type="booking",
-                related_id=instance.id
-            )
+            NotificationDispatcher.dispatch([{
+                'user': instance.service.provider_id,
+                'type': 'booking',
+                'title': "Booking Cancelled",
+                'message': f"A booking for {instance.service.title} has been cancelled by the customer",
+                'related_id': instance.id,
+            }])
         elif instance.status == 'completed':
             # Notify the customer that their booking is completed
-            Notification.objects.create(
-                user=instance.customer,
-                title="Booking Completed",
-                message=f"Your booking for {instance.service.title} has been marked as completed",
-                notification_type="booking",
-                related_id=instance.id
-            )
+            NotificationDispatcher.dispatch([{
+                'user': instance.customer_id,
+                'type': 'booking',
+                'title': "Booking Completed",
+                'message': f"Your booking for {instance.service.title} has been marked as completed",
+                'related_id': instance.id,
+            }])
 
 
 @receiver(post_save, sender=Review)
@@ -98,12 +97,25 @@ def create_review_notification(sender, instance, created, **kwargs):
     if created:
         # Notify the service provider about the new review
         # Reviews are now linked to bookings, not services directly
-        provider = instance.provider
         service_title = instance.booking.service.title if instance.booking and instance.booking.service else "a service"
-        Notification.objects.create(
-            user=provider,
-            title="New Review",
-            message=f"You have received a new {instance.rating}-star review for {service_title}",
-            notification_type="review",
-            related_id=instance.id
-        )
\ No newline at end of file
+        NotificationDispatcher.dispatch([{
+            'user': instance.provider_id,
+            'type': 'review',
+            'title': "New Review",
+            'message': f"You have received a new {instance.rating}-star review for {service_title}",
+            'related_id': instance.id,
+        }])
+
+
+@receiver(post_save, sender=UserNotificationSetting)
+@receiver(post_delete, sender=UserNotificationSetting)
+def invalidate_notification_preferences(sender, instance, **kwargs):
+    """
+    Drop a user's cached notification preferences when their settings change.
+    
+    Args:
+        sender (Model): The UserNotificationSetting model class
+        instance (UserNotificationSetting): The settings that were saved or deleted
+        **kwargs: Arbitrary keyword arguments
+    """
+    NotificationPreferenceCache.invalidate(instance.user_id)
@@ -0,0 +1,77 @@
+"""
+CELERY TASKS FOR NOTIFICATIONS
+
+This module contains Celery tasks for the notifications app. Tasks under
+apps.notifications.tasks are routed to the 'notifications' queue (see
+sewabazaar/celery.py).
+"""
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True)
+def send_queued_emails_task(self, batch_size=None, max_batches=None):
+    """
+    Drain the outbound email queue.
+    
+    Delivers due queued emails in batches over a single reused connection.
+    Failed emails are rescheduled with exponential backoff by the queue itself,
+    so the task does not retry on delivery errors.
+    
+    Args:
+        batch_size (int): Emails per batch (default: EMAIL_QUEUE['BATCH_SIZE'])
+        max_batches (int): Stop after this many batches (default: until drained)
+    
+    Returns:
+        dict: Counts of sent, retried and failed emails plus batches processed
+        
+    Example:
+        >>> send_queued_emails_task.delay()
+        {'sent': 12, 'retried': 0, 'failed': 0, 'batches': 1}
+    """
+    from .email_queue import EmailQueueService
+    
+    results = EmailQueueService.send_pending(batch_size=batch_size, max_batches=max_batches)
+    if results['sent'] or results['retried'] or results['failed']:
+        logger.info(
+            f"Email queue drained - Task ID: {self.request.id}, sent: {results['sent']}, "
+            f"retried: {results['retried']}, failed: {results['failed']}"
+        )
+    return results
+
+
+@shared_task(bind=True)
+def purge_read_notifications_task(self, retention_days=None, batch_size=None):
+    """
+    Delete old read notifications and fix drifted unread counters.
+    
+    Read notifications older than the retention period are deleted in
+    chunks; afterwards every unread counter is checked against the
+    notifications and corrected if something bypassed it.
+    
+    Args:
+        retention_days (int): Keep read notifications this many days
+            (default: NOTIFICATION_RETENTION['READ_RETENTION_DAYS'])
+        batch_size (int): Notifications per chunk (default: NOTIFICATION_RETENTION['BATCH_SIZE'])
+    
+    Returns:
+        dict: Notifications deleted, chunks run and counters corrected
+        
+    Example:
+        >>> purge_read_notifications_task.delay()
+        {'deleted': 1840, 'batches': 2, 'counters_corrected': 0}
+    """
+    from .counters import UnreadCounterService
+    from .retention import NotificationRetentionService
+    
+    results = NotificationRetentionService.purge_read(retention_days=retention_days, batch_size=batch_size)
+    results['counters_corrected'] = UnreadCounterService.reconcile()
+    if results['deleted'] or results['counters_corrected']:
+        logger.info(
+            f"Notification retention - Task ID: {self.request.id}, deleted: {results['deleted']}, "
+            f"counters corrected: {results['counters_corrected']}"
+        )
+    return results
@@ -4,8 +4,10 @@ from rest_framework.response import Response
 from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from django.db import transaction
 import json
 import time
+from .counters import UnreadCounterService
 from .models import Notification, UserNotificationSetting
 from .serializers import NotificationSerializer, UserNotificationSettingSerializer
 from apps.common.permissions import IsOwnerOrAdmin
@@ -106,8 +108,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         # Only allow updating is_read field
-        if 'is_read' in request.data:
-            instance.is_read = request.data['is_read']
+        if 'is_read' in serializer.validated_data:
+            instance.is_read = serializer.validated_data['is_read']
             instance.save()
         
         return Response(serializer.data)
@@ -128,8 +130,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """
         """Mark a specific notification as read"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        if not notification.is_read:
+            notification.is_read = True
+            notification.save()
         return Response({'message': 'Notification marked as read'})
     
     @action(detail=False, methods=['post'], url_path='mark_all_read')
@@ -148,7 +151,10 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """
         """Mark all notifications as read"""
         notifications = self.get_queryset().filter(is_read=False)
-        count = notifications.update(is_read=True)
+        with transaction.atomic():
+            count = notifications.update(is_read=True)
+            # Subtract the rows actually flipped so concurrent new notifications stay counted
+            UnreadCounterService.adjust({request.user.id: -count})
         return Response({'message': f'{count} notifications marked as read'})
     
     @action(detail=False, methods=['get'], url_path='unread_count')
@@ -156,7 +162,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """
         Get count of unread notifications.
         
-        Returns the number of unread notifications for the authenticated user.
+        Returns the number of unread notifications for the authenticated user
+        from the denormalized counter (see apps.notifications.counters).
         
         Args:
             request (Request): The HTTP request object
@@ -165,7 +172,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             Response: HTTP response with unread count
         """
         """Get count of unread notifications"""
-        count = self.get_queryset().filter(is_read=False).count()
+        count = UnreadCounterService.get(request.user.id)
         return Response({'unread_count': count})
     
     @action(detail=False, methods=['delete'], url_path='clear_read')
@@ -183,9 +190,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
             Response: HTTP response with success message and count
         """
         """Delete all read notifications"""
-        notifications = self.get_queryset().filter(is_read=True)
-        count = notifications.count()
-        notifications.delete()
+        # Read notifications are not in the unread counter, so one DELETE is enough
+        count, _ = self.get_queryset().filter(is_read=True).delete()
         return Response({'message': f'{count} read notifications cleared'})
     
     @action(detail=False, methods=['get', 'patch'], url_path='preferences')
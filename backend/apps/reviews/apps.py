@@ -13,4 +13,12 @@ class ReviewsConfig(AppConfig):
         name (str): The full Python path to the app
     """
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.reviews'
\ No newline at end of file
+    name = 'apps.reviews'
+    
+    def ready(self):
+        """
+        Import signals when the app is ready.
+        
+        Registers the handlers that invalidate cached review eligibility.
+        """
+        import apps.reviews.signals
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.ratings import reconcile_rating_totals
+
+
+class Command(BaseCommand):
+    """
+    Management command to fix drift in the cached service and provider ratings.
+    
+    Recomputes rating sums and counts from ServiceReview, booking Review and
+    CustomerFeedback rows (services) and Review (provider profiles) in one
+    query per model and rewrites only the
+    services and profiles whose running totals are off. Intended to run from
+    cron when Celery beat is not in use.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Recompute cached rating totals of services and providers and fix the ones that drifted'
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        corrected = reconcile_rating_totals()
+        
+        if options['verbosity'] >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f"Corrected rating totals of {corrected['services']} service(s) "
+                f"and {corrected['providers']} provider(s)"
+            ))
@@ -1,14 +1,17 @@
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 import os
 
+from apps.common.ratings import RatingSnapshotMixin, RatingTotalsService, get_booking_service_id
 
-class Review(models.Model):
+
+class Review(RatingSnapshotMixin, models.Model):
     """
     Model for storing service reviews from customers.
     
@@ -36,6 +39,8 @@ class Review(models.Model):
         is_edited (BooleanField): Whether the review has been edited
         edit_deadline (DateTimeField): Deadline for editing this review
     """
+    RATING_SNAPSHOT_FIELDS = ('provider_id', 'booking_id', 'rating')
+    
     # Core relationships
     customer = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -146,8 +151,9 @@ class Review(models.Model):
         """
         Save the review instance.
         
-        Sets the edit deadline on creation (24 hours) and marks the review
-        as edited on updates.
+        Sets the edit deadline on creation (24 hours), marks the review
+        as edited on updates and keeps the provider's and service's cached
+        ratings in step (see apps.common.ratings).
         
         Args:
             *args: Variable length argument list
@@ -160,8 +166,35 @@ class Review(models.Model):
         # Mark as edited if this is an update
         if self.pk:
             self.is_edited = True
-            
-        super().save(*args, **kwargs)
+        
+        stored = self.get_stored_rating()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_rating_totals(stored)
+        self.remember_rating()
+    
+    def update_rating_totals(self, stored):
+        """
+        Apply this review's rating change to the provider's and service's cached ratings.
+        
+        Args:
+            stored (dict or None): Provider, booking and rating as stored before
+                this save, or None for a new review
+        """
+        service_id = self.booking.service_id
+        previous_provider = previous_service = None
+        if stored:
+            previous_service_id = service_id
+            if stored['booking_id'] != self.booking_id:
+                previous_service_id = get_booking_service_id(stored['booking_id'])
+            previous_provider = (stored['provider_id'], stored['rating'])
+            previous_service = (previous_service_id, stored['rating'])
+        RatingTotalsService.apply(
+            RatingTotalsService.adjust_provider, previous_provider, (self.provider_id, self.rating)
+        )
+        RatingTotalsService.apply(
+            RatingTotalsService.adjust_service, previous_service, (service_id, self.rating)
+        )
     
     @property
     def can_be_edited(self):
@@ -245,6 +278,7 @@ class ReviewImage(models.Model):
     Attributes:
         review (ForeignKey): The review this image belongs to
         image (ImageField): Review image file
+        image_variants (JSONField): Stored names of the resized derivatives of the image
         caption (CharField): Optional image caption
         order (PositiveIntegerField): Display order of the image
         created_at (DateTimeField): When the image was uploaded
@@ -265,6 +299,12 @@ class ReviewImage(models.Model):
         upload_to=review_image_upload_path,
         help_text="Review image file"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/JPEG derivatives of the image (see apps.common.images)"
+    )
     caption = models.CharField(
         max_length=200,
         blank=True,
@@ -304,139 +344,17 @@ class ReviewImage(models.Model):
         return None
 
 
-@receiver(post_save, sender=Review)
-def update_provider_rating_on_save(sender, instance, created, **kwargs):
-    """
-    Update provider's cached rating when review is created/updated.
-    
-    This signal handler maintains denormalized rating data for performance
-    by updating the provider's profile with the new rating information.
-    
-    Args:
-        sender (Model): The model class that sent the signal
-        instance (Review): The review instance that was saved
-        created (bool): Whether the instance was created or updated
-        **kwargs: Arbitrary keyword arguments
-    """
-    """
-    PHASE 2 NEW: Update provider's cached rating when review is created/updated
-    
-    Purpose: Maintain denormalized rating data for performance
-    Impact: Updates Profile.avg_rating and Profile.reviews_count
-    """
-    # Skip if review has no provider (legacy reviews)
-    if not instance.provider_id:
-        return
-        
-    provider = instance.provider
-    
-    # Get or create profile for provider
-    profile, created_profile = provider.profile, False
-    if not hasattr(provider, 'profile'):
-        from apps.accounts.models import Profile
-        profile, created_profile = Profile.objects.get_or_create(user=provider)
-    
-    # Calculate new aggregates
-    provider_reviews = Review.objects.filter(provider=provider)
-    reviews_count = provider_reviews.count()
-    
-    if reviews_count > 0:
-        total_rating = sum(review.rating for review in provider_reviews)
-        avg_rating = total_rating / reviews_count
-    else:
-        avg_rating = 0.00
-    
-    # Update profile
-    profile.reviews_count = reviews_count
-    profile.avg_rating = round(avg_rating, 2)
-    profile.save(update_fields=['reviews_count', 'avg_rating'])
-
-
 @receiver(post_delete, sender=Review)
-def update_provider_rating_on_delete(sender, instance, **kwargs):
+def remove_review_rating(sender, instance, **kwargs):
     """
-    Update provider's cached rating when review is deleted.
-    
-    This signal handler maintains accurate rating data when reviews are
-    removed by updating the provider's profile with the new rating information.
+    Take a deleted review's rating off the cached provider and service ratings.
     
     Args:
         sender (Model): The model class that sent the signal
         instance (Review): The review instance that was deleted
         **kwargs: Arbitrary keyword arguments
     """
-    """
-    PHASE 2 NEW: Update provider's cached rating when review is deleted
-    
-    Purpose: Maintain accurate rating data when reviews are removed
-    Impact: Updates Profile.avg_rating and Profile.reviews_count
-    """
-    # Skip if review has no provider (legacy reviews)
-    if not instance.provider_id:
-        return
-        
-    provider = instance.provider
-    
-    # Get profile
-    if hasattr(provider, 'profile'):
-        profile = provider.profile
-        
-        # Recalculate aggregates
-        provider_reviews = Review.objects.filter(provider=provider)
-        reviews_count = provider_reviews.count()
-        
-        if reviews_count > 0:
-            total_rating = sum(review.rating for review in provider_reviews)
-            avg_rating = total_rating / reviews_count
-        else:
-            avg_rating = 0.00
-        
-        # Update profile
-        profile.reviews_count = reviews_count
-        profile.avg_rating = round(avg_rating, 2)
-        profile.save(update_fields=['reviews_count', 'avg_rating'])
-
-
-# BACKWARD COMPATIBILITY: Keep old signal for existing service ratings
-@receiver(post_save, sender=Review)
-def update_service_rating_backward_compatibility(sender, instance, **kwargs):
-    """
-    Update service rating for existing functionality (backward compatibility).
-    
-    This signal handler maintains existing service rating functionality
-    while adding provider ratings by updating the service's average rating
-    and reviews count.
-    
-    Args:
-        sender (Model): The model class that sent the signal
-        instance (Review): The review instance that was saved
-        **kwargs: Arbitrary keyword arguments
-    """
-    """
-    BACKWARD COMPATIBILITY: Update service rating for existing functionality
-    
-    Purpose: Maintain existing service rating functionality while adding provider ratings
-    Impact: Updates Service.average_rating and Service.reviews_count
-    """
-    if instance.booking and instance.booking.service:
-        service = instance.booking.service
-        
-        # Get all reviews for this service (through bookings)
-        from apps.bookings.models import Booking
-        service_bookings = Booking.objects.filter(service=service)
-        service_reviews = Review.objects.filter(booking__in=service_bookings)
-        
-        reviews_count = service_reviews.count()
-        
-        if reviews_count > 0:
-            total_rating = sum(review.rating for review in service_reviews)
-            average_rating = total_rating / reviews_count
-        else:
-            average_rating = 0
-        
-        # Update service if it has these fields
-        if hasattr(service, 'reviews_count'):
-            service.reviews_count = reviews_count
-        if hasattr(service, 'average_rating'):
-            service.average_rating = average_rating
-            service.save()
\ No newline at end of file
+    RatingTotalsService.adjust_provider(instance.provider_id, -instance.rating, -1)
+    service_id = get_booking_service_id(instance.booking_id)
+    if service_id:
+        RatingTotalsService.adjust_service(service_id, -instance.rating, -1)
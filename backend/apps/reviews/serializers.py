@@ -16,6 +16,7 @@ from .models import Review, ReviewImage
 from .services import ReviewEligibilityService, ReviewAnalyticsService
 from apps.accounts.models import Profile, PortfolioMedia
 from apps.bookings.models import Booking
+from apps.common.images import image_url_for_request, image_variant_urls
 
 User = get_user_model()
 
@@ -125,7 +126,8 @@ class PortfolioMediaSerializer(serializers.ModelSerializer):
     full URLs for media files.
     
     Attributes:
-        file_url (SerializerMethodField): Full URL for the media file
+        file_url (SerializerMethodField): Full URL for the media file (resized for images)
+        file_variants (SerializerMethodField): URLs of the resized image derivatives
     """
     """
     Serializer for provider portfolio media
@@ -134,17 +136,19 @@ class PortfolioMediaSerializer(serializers.ModelSerializer):
     Impact: Supports visual portfolio display on provider profiles
     """
     file_url = serializers.SerializerMethodField()
+    file_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = PortfolioMedia
-        fields = ['id', 'media_type', 'file_url', 'caption', 'order']
+        fields = ['id', 'media_type', 'file_url', 'file_variants', 'caption', 'order']
     
     def get_file_url(self, obj):
         """
         Get full URL for media file.
         
         Constructs the full URL for the media file, taking into account
-        the request context if available.
+        the request context if available. Images use the size requested with
+        ?image_size= (default large) once derivatives exist.
         
         Args:
             obj (PortfolioMedia): The portfolio media instance
@@ -155,10 +159,23 @@ class PortfolioMediaSerializer(serializers.ModelSerializer):
         """Get full URL for media file"""
         if obj.file:
             request = self.context.get('request')
+            file_url = image_url_for_request(obj.file, obj.file_variants, request, default_size='large')
             if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
+                return request.build_absolute_uri(file_url)
+            return file_url
         return None
+    
+    def get_file_variants(self, obj):
+        """
+        Get URLs of the resized derivatives of an image.
+        
+        Args:
+            obj (PortfolioMedia): The portfolio media instance
+            
+        Returns:
+            dict: {size: {'width', 'height', 'webp', 'jpeg'}}, empty for videos
+        """
+        return image_variant_urls(obj.file, obj.file_variants, self.context.get('request'))
 
 
 class RatingSummarySerializer(serializers.Serializer):
@@ -195,7 +212,8 @@ class ReviewImageSerializer(serializers.ModelSerializer):
     for image files.
     
     Attributes:
-        image_url (SerializerMethodField): Full URL for the image
+        image_url (SerializerMethodField): Full URL for the image (resized when available)
+        image_variants (SerializerMethodField): URLs of the resized image derivatives
     """
     """
     Serializer for review images
@@ -204,10 +222,11 @@ class ReviewImageSerializer(serializers.ModelSerializer):
     Impact: Enables photo functionality in reviews
     """
     image_url = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = ReviewImage
-        fields = ['id', 'image', 'image_url', 'caption', 'order']
+        fields = ['id', 'image', 'image_url', 'image_variants', 'caption', 'order']
         read_only_fields = ['id']
     
     def get_image_url(self, obj):
@@ -215,7 +234,8 @@ class ReviewImageSerializer(serializers.ModelSerializer):
         Get full URL for image.
         
         Constructs the full URL for the image file, taking into account
-        the request context if available.
+        the request context if available. Uses the size requested with
+        ?image_size= (default medium) once derivatives exist.
         
         Args:
             obj (ReviewImage): The review image instance
@@ -226,10 +246,23 @@ class ReviewImageSerializer(serializers.ModelSerializer):
         """Get full URL for image"""
         if obj.image:
             request = self.context.get('request')
+            image_url = image_url_for_request(obj.image, obj.image_variants, request, default_size='medium')
             if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+                return request.build_absolute_uri(image_url)
+            return image_url
         return None
+    
+    def get_image_variants(self, obj):
+        """
+        Get URLs of the resized derivatives of the image.
+        
+        Args:
+            obj (ReviewImage): The review image instance
+            
+        Returns:
+            dict: {size: {'width', 'height', 'webp', 'jpeg'}}, empty until generated
+        """
+        return image_variant_urls(obj.image, obj.image_variants, self.context.get('request'))
 
 
 class ReviewSerializer(serializers.ModelSerializer):
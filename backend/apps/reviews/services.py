@@ -8,8 +8,11 @@ Purpose: Handle review eligibility validation and business logic
 Impact: New service layer - provides gated review functionality
 """
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
 from django.utils import timezone
+from apps.common.app_settings import setting_getter
+
 from .models import Review
 from apps.bookings.models import Booking
 import logging
@@ -17,6 +20,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_REVIEW_ELIGIBILITY_SETTINGS = {
+    'CACHE_TIMEOUT': 15 * 60,
+}
+
+
+get_review_eligibility_setting = setting_getter('REVIEW_ELIGIBILITY', DEFAULT_REVIEW_ELIGIBILITY_SETTINGS)
+
+
+def eligibility_cache_key(customer_id, provider_id):
+    """Cache key of a customer's review eligibility for one provider."""
+    return f'reviews:eligibility:{customer_id}:{provider_id}'
+
+
 class ReviewEligibilityService:
     """
     Service class for determining review eligibility.
@@ -27,6 +43,8 @@ class ReviewEligibilityService:
     
     Methods:
         is_eligible: Check if a customer is eligible to review a provider
+        get_eligibility_index: Cached reviewable bookings for many providers at once
+        invalidate: Drop a cached (customer, provider) eligibility entry
         get_eligible_bookings: Get all bookings eligible for review
         can_edit_review: Check if a user can edit a specific review
         can_delete_review: Check if a user can delete a specific review
@@ -56,7 +74,7 @@ class ReviewEligibilityService:
                 'eligible': bool,
                 'reason': str,
                 'eligible_bookings': list,
-                'booking': Booking instance (if booking_id provided)
+                'booking': eligible booking dict (if booking_id provided)
             }
         """
         result = {
@@ -79,61 +97,117 @@ class ReviewEligibilityService:
             result['reason'] = 'You cannot review yourself'
             return result
         
-        # Get completed bookings for this customer with this provider
-        eligible_bookings = Booking.objects.filter(
-            customer=customer,
-            service__provider=provider,
-            status='completed'
-        ).exclude(
-            # Exclude bookings that already have reviews
-            review__isnull=False
-        ).order_by('-booking_date')
-        
-        if not eligible_bookings.exists():
-            # Check if there are any bookings at all
-            any_bookings = Booking.objects.filter(
-                customer=customer,
-                service__provider=provider
-            ).exists()
-            
-            if not any_bookings:
+        entry = ReviewEligibilityService.get_eligibility_index(customer, [provider.id])[provider.id]
+        eligible_bookings = entry['bookings']
+        
+        if not eligible_bookings:
+            if not entry['has_bookings']:
                 result['reason'] = 'You have not booked any services with this provider'
+            elif entry['has_completed']:
+                result['reason'] = 'You have already reviewed all your completed bookings with this provider'
             else:
-                # Check if all bookings already have reviews
-                all_reviewed = not Booking.objects.filter(
-                    customer=customer,
-                    service__provider=provider,
-                    status='completed'
-                ).exclude(review__isnull=False).exists()
-                
-                if all_reviewed:
-                    result['reason'] = 'You have already reviewed all your completed bookings with this provider'
-                else:
-                    result['reason'] = 'You can only review completed bookings'
+                result['reason'] = 'You can only review completed bookings'
             
             return result
         
         # If specific booking ID provided, validate it
         if booking_id:
-            try:
-                booking = eligible_bookings.get(id=booking_id)
-                result['booking'] = booking
-                result['eligible'] = True
-                result['reason'] = 'Eligible to review this booking'
-            except Booking.DoesNotExist:
+            booking = next((row for row in eligible_bookings if str(row['id']) == str(booking_id)), None)
+            if booking is None:
                 result['reason'] = 'Invalid booking or booking not eligible for review'
                 return result
+            result['booking'] = booking
+            result['eligible'] = True
+            result['reason'] = 'Eligible to review this booking'
         else:
             # General eligibility - has at least one eligible booking
             result['eligible'] = True
-            result['reason'] = f'You have {eligible_bookings.count()} completed booking(s) eligible for review'
+            result['reason'] = f'You have {len(eligible_bookings)} completed booking(s) eligible for review'
         
-        result['eligible_bookings'] = list(eligible_bookings.values(
-            'id', 'service__title', 'booking_date', 'booking_time', 'total_amount'
-        ))
+        result['eligible_bookings'] = eligible_bookings
         
         return result
     
+    @staticmethod
+    def get_eligibility_index(customer, provider_ids):
+        """
+        Get a customer's reviewable bookings for one or many providers.
+        
+        Each (customer, provider) entry is cached; the missing ones are
+        loaded together with one anti-join query (completed bookings with no
+        review) plus, only for providers without reviewable bookings, one
+        grouped query that explains why. Entries are invalidated when a
+        booking is completed or a review is created or deleted
+        (see apps.reviews.signals).
+        
+        Args:
+            customer (User): User instance (customer)
+            provider_ids (iterable): Provider user IDs
+            
+        Returns:
+            dict: provider_id -> {
+                'bookings': list of eligible booking dicts (newest first),
+                'has_bookings': bool,
+                'has_completed': bool
+            }
+        """
+        provider_ids = list(dict.fromkeys(provider_ids))
+        keys = {eligibility_cache_key(customer.id, provider_id): provider_id for provider_id in provider_ids}
+        cached = cache.get_many(list(keys))
+        index = {keys[key]: entry for key, entry in cached.items()}
+        
+        missing = [provider_id for provider_id in provider_ids if provider_id not in index]
+        if not missing:
+            return index
+        
+        loaded = {provider_id: {'bookings': [], 'has_bookings': False, 'has_completed': False} for provider_id in missing}
+        
+        reviewable = Booking.objects.filter(
+            customer=customer,
+            service__provider_id__in=missing,
+            status='completed'
+        ).filter(
+            ~Exists(Review.objects.filter(booking_id=OuterRef('pk')))
+        ).order_by('-booking_date').values(
+            'id', 'service__provider_id', 'service__title', 'booking_date', 'booking_time', 'total_amount'
+        )
+        for row in reviewable:
+            entry = loaded[row.pop('service__provider_id')]
+            entry['bookings'].append(row)
+            entry['has_bookings'] = entry['has_completed'] = True
+        
+        unexplained = [provider_id for provider_id, entry in loaded.items() if not entry['bookings']]
+        if unexplained:
+            counts = Booking.objects.filter(
+                customer=customer,
+                service__provider_id__in=unexplained
+            ).values('service__provider_id').annotate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(status='completed'))
+            ).order_by()
+            for row in counts:
+                entry = loaded[row['service__provider_id']]
+                entry['has_bookings'] = row['total'] > 0
+                entry['has_completed'] = row['completed'] > 0
+        
+        cache.set_many(
+            {eligibility_cache_key(customer.id, provider_id): entry for provider_id, entry in loaded.items()},
+            get_review_eligibility_setting('CACHE_TIMEOUT')
+        )
+        index.update(loaded)
+        return index
+    
+    @staticmethod
+    def invalidate(customer_id, provider_id):
+        """
+        Drop the cached eligibility of a customer for a provider.
+        
+        Args:
+            customer_id (int): Customer user ID
+            provider_id (int): Provider user ID
+        """
+        cache.delete(eligibility_cache_key(customer_id, provider_id))
+    
     @staticmethod
     def get_eligible_bookings(customer, provider):
         """
@@ -149,13 +223,10 @@ class ReviewEligibilityService:
         Returns:
             QuerySet: Eligible booking instances
         """
-        return Booking.objects.filter(
-            customer=customer,
-            service__provider=provider,
-            status='completed'
-        ).exclude(
-            review__isnull=False
-        ).order_by('-booking_date')
+        booking_ids = [
+            row['id'] for row in ReviewEligibilityService.get_eligibility_index(customer, [provider.id])[provider.id]['bookings']
+        ]
+        return Booking.objects.filter(id__in=booking_ids).order_by('-booking_date')
     
     @staticmethod
     def can_edit_review(review, user):
@@ -0,0 +1,41 @@
+"""
+Django signals for the reviews app.
+
+Keeps the cached review eligibility index (ReviewEligibilityService) in
+step with the bookings and reviews it is built from.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review
+from .services import ReviewEligibilityService
+
+
+@receiver(post_save, sender='bookings.Booking')
+def invalidate_eligibility_on_booking(sender, instance, created, **kwargs):
+    """
+    Drop the customer's cached eligibility when a booking is created or completed.
+    
+    Args:
+        sender (Model): The Booking model class
+        instance (Booking): The Booking instance that was saved
+        created (bool): Boolean indicating if this is a new booking
+        **kwargs: Additional signal arguments
+    """
+    if (created or instance.status == 'completed') and instance.customer_id and instance.service_id:
+        ReviewEligibilityService.invalidate(instance.customer_id, instance.service.provider_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_eligibility_on_review(sender, instance, **kwargs):
+    """
+    Drop the customer's cached eligibility when a review is written or removed.
+    
+    Args:
+        sender (Model): The Review model class
+        instance (Review): The Review instance that was saved or deleted
+        **kwargs: Additional signal arguments
+    """
+    ReviewEligibilityService.invalidate(instance.customer_id, instance.provider_id)
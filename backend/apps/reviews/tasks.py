@@ -0,0 +1,33 @@
+"""
+CELERY TASKS FOR REVIEWS
+
+This module contains Celery tasks for the reviews app.
+"""
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True)
+def reconcile_rating_totals_task(self):
+    """
+    Fix drift in the running rating totals of services and provider profiles.
+    
+    Review saves keep the totals current with F() deltas; this catches
+    anything that bypassed them (bulk updates, raw SQL, failed writes).
+    
+    Returns:
+        dict: Number of services and providers corrected
+        
+    Example:
+        >>> reconcile_rating_totals_task.delay()
+        {'services': 0, 'providers': 1}
+    """
+    from apps.common.ratings import reconcile_rating_totals
+    
+    corrected = reconcile_rating_totals()
+    if corrected['services'] or corrected['providers']:
+        logger.warning(f"Rating totals drifted - Task ID: {self.request.id}, corrected: {corrected}")
+    return corrected
@@ -34,6 +34,7 @@ urlpatterns = [
     # GET /api/reviews/providers/{id}/profile/ - Get provider profile
     # GET /api/reviews/providers/{id}/reviews/ - Get provider reviews  
     # GET /api/reviews/providers/{id}/review-eligibility/ - Check review eligibility
+    # GET /api/reviews/providers/review_eligibility_batch/?provider_ids=1,2 - Check several providers at once
     # POST /api/reviews/providers/{id}/create-review/ - Create review
     path('', include(provider_router.urls)),
 ]
\ No newline at end of file
@@ -167,6 +167,40 @@ class ProviderProfileViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = ReviewEligibilitySerializer(eligibility)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated, IsCustomer])
+    def review_eligibility_batch(self, request):
+        """
+        Check review eligibility for several providers in one request.
+        
+        Uses the cached eligibility index, so a page listing many providers
+        costs at most two queries for all of them (none when cached).
+        
+        Args:
+            request (Request): The HTTP request object
+            
+        Returns:
+            Response: Eligibility per provider ID
+        """
+        """
+        GET /api/reviews/providers/review_eligibility_batch/?provider_ids=1,2,3
+        """
+        try:
+            provider_ids = [int(value) for value in request.query_params.get('provider_ids', '').split(',') if value]
+        except ValueError:
+            return Response({'error': 'provider_ids must be a comma-separated list of IDs'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        index = ReviewEligibilityService.get_eligibility_index(request.user, provider_ids)
+        return Response({
+            'results': {
+                str(provider_id): {
+                    'eligible': bool(entry['bookings']),
+                    'eligible_bookings': entry['bookings'],
+                }
+                for provider_id, entry in index.items()
+            }
+        })
+    
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated, IsCustomer])
     def create_review(self, request, user_id=None):
         """
@@ -20,11 +20,10 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.http import HttpResponse, JsonResponse
 from django.core.exceptions import ValidationError
-import qrcode
-import io
 import base64
 from unfold.admin import ModelAdmin
 from .models import RewardsConfig, RewardAccount, PointsTransaction, RewardVoucher
+from .qr_codes import render_qr_png
 
 
 @admin.register(RewardsConfig)
@@ -474,15 +473,9 @@ class RewardVoucherAdmin(ModelAdmin):
             str: HTML formatted QR code preview
         """
         try:
-            # Generate small QR code
-            qr = qrcode.QRCode(version=1, box_size=2, border=1)
-            qr.add_data(obj.qr_code_data)
-            qr.make(fit=True)
-            
-            img = qr.make_image(fill_color="black", back_color="white")
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            img_str = base64.b64encode(buffer.getvalue()).decode()
+            # Small QR code, rendered once per payload (see apps.rewards.qr_codes)
+            png, _ = render_qr_png(obj.qr_code_data, box_size=2, border=1)
+            img_str = base64.b64encode(png).decode()
             
             return format_html(
                 '<img src="data:image/png;base64,{}" style="width: 40px; height: 40px; cursor: pointer;" '
@@ -504,15 +497,9 @@ class RewardVoucherAdmin(ModelAdmin):
             str: HTML formatted full-size QR code
         """
         try:
-            # Generate full-size QR code
-            qr = qrcode.QRCode(version=1, box_size=10, border=4)
-            qr.add_data(obj.qr_code_data)
-            qr.make(fit=True)
-            
-            img = qr.make_image(fill_color="black", back_color="white")
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            img_str = base64.b64encode(buffer.getvalue()).decode()
+            # Full-size QR code, rendered once per payload
+            png, _ = render_qr_png(obj.qr_code_data, box_size=10, border=4)
+            img_str = base64.b64encode(png).decode()
             
             return format_html(
                 '<div style="text-align: center; padding: 20px; background: white; border: 1px solid #ddd;">'
@@ -0,0 +1,30 @@
+"""
+Django filters for the rewards app.
+
+This module contains filter classes for the rewards API, e.g. filtering
+vouchers by their effective status.
+"""
+
+import django_filters
+
+from .models import RewardVoucher
+
+
+class RewardVoucherFilter(django_filters.FilterSet):
+    """
+    Filter for a user's vouchers.
+    
+    ?status= matches the effective status annotated by
+    RewardVoucherQuerySet.with_effective_status(), so vouchers past their
+    expiry are listed as expired before the expiry sweep has marked them.
+    """
+    
+    status = django_filters.ChoiceFilter(
+        field_name='effective_status',
+        choices=RewardVoucher.VOUCHER_STATUS_CHOICES,
+        help_text='Filter by voucher status (active, used, expired, cancelled)'
+    )
+    
+    class Meta:
+        model = RewardVoucher
+        fields = ['status']
@@ -0,0 +1,268 @@
+"""
+BULK VOUCHER ISSUANCE
+
+Issues many reward vouchers at once (campaign drops, sample data, admin
+grants) with a fixed number of queries per batch instead of several per
+voucher.
+
+For each batch:
+    1. Random codes are generated in memory (no existence probes).
+    2. Charged grants lock the affected reward accounts in one SELECT ... FOR
+       UPDATE and check balances.
+    3. The vouchers are inserted with one bulk INSERT that skips rows whose
+       code is already taken; only those rows get a new code and are retried.
+    4. Balances are written back with one bulk UPDATE and the matching
+       'redeemed_voucher' PointsTransaction rows with one bulk INSERT.
+
+Everything for a batch happens in one transaction, so a batch either issues
+all its vouchers (and charges their points) or none.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.app_settings import setting_getter
+
+from .models import PointsTransaction, RewardAccount, RewardsConfig, RewardVoucher
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_VOUCHER_ISSUANCE_SETTINGS = {
+    'BATCH_SIZE': 500,
+    'MAX_CODE_ATTEMPTS': 5,
+}
+
+
+get_voucher_issuance_setting = setting_getter('VOUCHER_ISSUANCE', DEFAULT_VOUCHER_ISSUANCE_SETTINGS)
+
+
+# Per-voucher fields a grant may set in addition to user, value and points
+GRANT_FIELDS = ('status', 'expires_at', 'used_amount', 'used_at', 'usage_policy')
+
+
+class VoucherIssuanceError(ValueError):
+    """Raised when a batch of vouchers cannot be issued (e.g. insufficient points)."""
+
+
+class VoucherIssuanceService:
+    """
+    Service class for issuing reward vouchers in bulk.
+
+    Example:
+        >>> grants = [{'user_id': user.id, 'value': Decimal('100'), 'points': 1000} for user in users]
+        >>> vouchers = VoucherIssuanceService.issue(grants, metadata={'campaign': 'dashain'})
+        >>> len(vouchers)
+        250
+    """
+
+    @staticmethod
+    def issue(grants, expires_at=None, status='active', metadata=None, charge_points=True, description=None,
+              batch_size=None):
+        """
+        Issue one voucher per grant.
+
+        Args:
+            grants (iterable): Dicts with 'user_id' (or 'user'), 'value',
+                optionally 'points' (points charged; 0 issues a free voucher),
+                'metadata' and any of GRANT_FIELDS to override the defaults
+            expires_at (datetime): Default expiry (default: now +
+                RewardsConfig.voucher_validity_days)
+            status (str): Default voucher status
+            metadata (dict): Metadata stored on every voucher
+            charge_points (bool): Deduct points_redeemed from the users' reward
+                accounts and record PointsTransactions (False only records
+                points_redeemed on the vouchers, e.g. for sample data)
+            description (str): PointsTransaction description (default:
+                "Redeemed Rs.<value> voucher")
+            batch_size (int): Vouchers per transaction (default: BATCH_SIZE)
+
+        Returns:
+            list: The issued RewardVoucher instances, with primary keys
+
+        Raises:
+            VoucherIssuanceError: If an account lacks the points for its grants
+                or codes keep colliding; the failing batch is rolled back
+        """
+        batch_size = batch_size or get_voucher_issuance_setting('BATCH_SIZE')
+        if expires_at is None:
+            validity_days = RewardsConfig.get_active_config().voucher_validity_days
+            expires_at = timezone.now() + timedelta(days=validity_days)
+
+        defaults = {'status': status, 'expires_at': expires_at}
+        grants = [
+            {
+                **defaults,
+                **{field: grant[field] for field in GRANT_FIELDS if field in grant},
+                'user_id': grant['user'].pk if 'user' in grant else grant['user_id'],
+                'value': Decimal(str(grant['value'])),
+                'points_redeemed': int(grant.get('points', 0) or 0),
+                'metadata': {**(metadata or {}), **grant.get('metadata', {})},
+            }
+            for grant in grants
+        ]
+
+        issued = []
+        for start in range(0, len(grants), batch_size):
+            issued.extend(VoucherIssuanceService._issue_batch(
+                grants[start:start + batch_size], charge_points, description
+            ))
+        return issued
+
+    @staticmethod
+    def _issue_batch(grants, charge_points, description):
+        """
+        Issue one batch of vouchers in a single transaction.
+
+        Returns:
+            list: Issued RewardVoucher instances, in grant order
+        """
+        now = timezone.now()
+        issued_on = timezone.localdate()
+        batch_id = uuid.uuid4().hex
+
+        with transaction.atomic():
+            accounts = VoucherIssuanceService._charge_accounts(grants, now) if charge_points else {}
+
+            vouchers = []
+            for grant in grants:
+                voucher = RewardVoucher(**grant, created_at=now)
+                voucher.metadata['issuance_batch'] = batch_id
+                voucher.voucher_code = RewardVoucher.generate_voucher_code(issued_on)
+                voucher.qr_code_data = voucher.generate_qr_data()
+                vouchers.append(voucher)
+
+            VoucherIssuanceService._insert_vouchers(vouchers, batch_id, issued_on)
+
+            if accounts:
+                RewardAccount.objects.bulk_update(
+                    accounts.values(), ['current_balance', 'total_points_redeemed', 'last_points_redeemed', 'updated_at']
+                )
+                VoucherIssuanceService._record_transactions(vouchers, accounts, description, now)
+
+        logger.info(f"Issued {len(vouchers)} voucher(s) in batch {batch_id}")
+        return vouchers
+
+    @staticmethod
+    def _charge_accounts(grants, now):
+        """
+        Lock the reward accounts of charged grants and deduct their points in memory.
+
+        Returns:
+            dict: user_id -> RewardAccount with updated balances (unsaved)
+
+        Raises:
+            VoucherIssuanceError: If an account is missing or lacks the points
+        """
+        charges = {}
+        for grant in grants:
+            if grant['points_redeemed'] > 0:
+                charges[grant['user_id']] = charges.get(grant['user_id'], 0) + grant['points_redeemed']
+        if not charges:
+            return {}
+
+        accounts = {
+            account.user_id: account
+            for account in RewardAccount.objects.select_for_update().filter(user_id__in=list(charges))
+        }
+        for user_id, points in charges.items():
+            account = accounts.get(user_id)
+            if account is None:
+                raise VoucherIssuanceError(f"User {user_id} has no reward account")
+            if account.current_balance < points:
+                raise VoucherIssuanceError(
+                    f"Insufficient points for user {user_id}. "
+                    f"Available: {account.current_balance}, Required: {points}"
+                )
+            account.current_balance -= points
+            account.total_points_redeemed += points
+            account.last_points_redeemed = now
+            account.updated_at = now
+        return accounts
+
+    @staticmethod
+    def _insert_vouchers(vouchers, batch_id, issued_on):
+        """
+        Bulk insert vouchers, retrying only the rows whose code collided.
+
+        The INSERT skips conflicting rows instead of failing the batch; the
+        rows that made it are read back by batch id to get their primary keys,
+        and the rest get fresh codes for another round. A code repeated within
+        the round is held back until the next one, so every inserted row and
+        its primary key belong to exactly one voucher.
+
+        Raises:
+            VoucherIssuanceError: If some codes still collide after MAX_CODE_ATTEMPTS
+        """
+        pending = list(vouchers)
+        for _ in range(get_voucher_issuance_setting('MAX_CODE_ATTEMPTS')):
+            batch_codes = set()
+            unique, collided = [], []
+            for voucher in pending:
+                if voucher.voucher_code in batch_codes:
+                    collided.append(voucher)
+                else:
+                    batch_codes.add(voucher.voucher_code)
+                    unique.append(voucher)
+
+            RewardVoucher.objects.bulk_create(unique, ignore_conflicts=True)
+
+            inserted = dict(
+                RewardVoucher.objects.filter(
+                    voucher_code__in=batch_codes,
+                    metadata__issuance_batch=batch_id,
+                ).values_list('voucher_code', 'pk')
+            )
+            for voucher in unique:
+                pk = inserted.pop(voucher.voucher_code, None)
+                if pk is None:
+                    collided.append(voucher)
+                else:
+                    voucher.pk = pk
+                    voucher._state.adding = False
+                    voucher._state.db = 'default'
+            if not collided:
+                return
+
+            logger.info(f"Retrying {len(collided)} colliding voucher code(s) in batch {batch_id}")
+            for voucher in collided:
+                voucher.voucher_code = RewardVoucher.generate_voucher_code(issued_on)
+                voucher.qr_code_data = voucher.generate_qr_data()
+            pending = collided
+
+        raise VoucherIssuanceError(f"Could not find free codes for {len(pending)} voucher(s)")
+
+    @staticmethod
+    def _record_transactions(vouchers, accounts, description, now):
+        """
+        Bulk insert the 'redeemed_voucher' transactions for charged vouchers.
+
+        balance_after walks each account down from its pre-batch balance in
+        voucher order, as if the vouchers had been redeemed one by one.
+        """
+        running = {
+            user_id: account.current_balance + sum(
+                voucher.points_redeemed for voucher in vouchers if voucher.user_id == user_id
+            )
+            for user_id, account in accounts.items()
+        }
+        transactions = []
+        for voucher in vouchers:
+            if voucher.points_redeemed <= 0:
+                continue
+            running[voucher.user_id] -= voucher.points_redeemed
+            transactions.append(PointsTransaction(
+                user_id=voucher.user_id,
+                transaction_type='redeemed_voucher',
+                points=-voucher.points_redeemed,
+                balance_after=running[voucher.user_id],
+                description=description or f"Redeemed Rs.{voucher.value} voucher",
+                voucher_id=voucher.pk,
+                created_at=now,
+            ))
+        PointsTransaction.objects.bulk_create(transactions)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from apps.rewards.models import RewardVoucher
+
+
+class Command(BaseCommand):
+    """
+    Management command to mark overdue reward vouchers as expired.
+    
+    Updates active vouchers past their expiry in pk-ranged chunks. Intended
+    to run from cron when Celery beat is not in use.
+    
+    Attributes:
+        help (str): The help text for the command
+    """
+    help = 'Mark active vouchers past their expiry as expired, in batches'
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        
+        Args:
+            parser (ArgumentParser): The argument parser to add arguments to
+        """
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Vouchers updated per batch (default: VOUCHER_EXPIRY BATCH_SIZE)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Handle the command execution.
+        
+        Args:
+            *args: Variable length argument list
+            **options: Arbitrary keyword arguments containing command options
+        """
+        expired = RewardVoucher.objects.update_expired_vouchers(batch_size=options['batch_size'])
+        
+        if options['verbosity'] >= 1:
+            self.stdout.write(self.style.SUCCESS(f"Marked {expired} voucher(s) as expired"))
@@ -8,12 +8,19 @@ This command generates detailed analytics and reports about:
 4. System performance metrics
 5. Financial impact assessment
 
-Usage: python manage.py rewards_report [--export] [--date-range DAYS]
+Every section is built from grouped queries (one pass per table and
+grouping), so the number of queries does not grow with --date-range.
+Sections are independent and can run concurrently with --parallel.
+
+Usage: python manage.py rewards_report [--export] [--date-range DAYS] [--parallel] [--format text|json|jsonl]
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from django.db.models import Sum, Count, Avg, Q, F
+from django.db import connections
+from django.db.models import Sum, Count, Avg, Q
+from django.db.models.functions import ExtractHour, ExtractWeekDay, TruncDate
 from django.utils import timezone
 from datetime import timedelta, datetime
 import json
@@ -23,6 +30,22 @@ from apps.rewards.models import RewardsConfig, RewardAccount, PointsTransaction
 
 User = get_user_model()
 
+# Transaction types counted as points earned / redeemed
+EARNED_TRANSACTIONS = Q(transaction_type__startswith='earned_')
+REDEEMED_TRANSACTIONS = Q(transaction_type__in=['redeemed_voucher', 'redeemed_discount'])
+
+# Tier -> next tier, for upgrade candidates (within 80% of the next threshold)
+NEXT_TIER = {'bronze': 'silver', 'silver': 'gold', 'gold': 'platinum'}
+
+
+def decimal_converter(obj):
+    """JSON default hook for Decimal, date and datetime values."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj)} is not JSON serializable')
+
 
 class Command(BaseCommand):
     """
@@ -58,6 +81,17 @@ class Command(BaseCommand):
             default=None,
             help='Output file path for export (default: rewards_report_YYYY-MM-DD.json)',
         )
+        parser.add_argument(
+            '--parallel',
+            action='store_true',
+            help='Run the independent report sections concurrently',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['text', 'json', 'jsonl'],
+            default='text',
+            help='Output format: text (default), json, or jsonl (one line per section as it completes)',
+        )
     
     def handle(self, *args, **options):
         """
@@ -67,35 +101,94 @@ class Command(BaseCommand):
             *args: Variable length argument list
             **options: Command options dictionary
         """
-        self.stdout.write(
+        self.output_format = options['format']
+        # Keep stdout machine-readable for json/jsonl; progress goes to stderr
+        self.progress = self.stdout if self.output_format == 'text' else self.stderr
+        
+        self.progress.write(
             self.style.SUCCESS('📊 Generating SewaBazaar Rewards Analytics Report...\n')
         )
         
         self.date_range = options['date_range']
         self.start_date = timezone.now() - timedelta(days=self.date_range)
+        self.config = RewardsConfig.objects.filter(is_active=True).first()
         
         # Generate report sections
+        sections = {
+            'system_overview': self.generate_system_overview,
+            'user_engagement': self.generate_user_engagement_report,
+            'points_analytics': self.generate_points_analytics,
+            'tier_analysis': self.generate_tier_analysis,
+            'transaction_patterns': self.generate_transaction_patterns,
+            'financial_impact': self.generate_financial_impact,
+        }
         report_data = {}
+        for name, data in self.run_sections(sections, parallel=options['parallel']):
+            report_data[name] = data
+            if self.output_format == 'jsonl':
+                self.write_jsonl(name, data)
         
-        report_data['system_overview'] = self.generate_system_overview()
-        report_data['user_engagement'] = self.generate_user_engagement_report()
-        report_data['points_analytics'] = self.generate_points_analytics()
-        report_data['tier_analysis'] = self.generate_tier_analysis()
-        report_data['transaction_patterns'] = self.generate_transaction_patterns()
-        report_data['financial_impact'] = self.generate_financial_impact()
+        report_data = {name: report_data[name] for name in sections}
         report_data['recommendations'] = self.generate_recommendations(report_data)
         
         # Display report
-        self.display_report(report_data)
+        if self.output_format == 'jsonl':
+            self.write_jsonl('recommendations', report_data['recommendations'])
+        elif self.output_format == 'json':
+            self.stdout.write(json.dumps(report_data, default=decimal_converter))
+        else:
+            self.display_report(report_data)
         
         # Export if requested
         if options['export']:
             self.export_report(report_data, options['output_file'])
         
-        self.stdout.write(
+        self.progress.write(
             self.style.SUCCESS('\n✅ Report generation completed!')
         )
     
+    def run_sections(self, sections, parallel=False):
+        """
+        Run report sections, yielding each result as soon as it is ready.
+        
+        In parallel mode every section runs on its own thread (and therefore
+        its own database connection), so the report takes about as long as
+        its slowest section.
+        
+        Args:
+            sections (dict): Section name -> callable returning the section data
+            parallel (bool): Run the sections concurrently
+            
+        Yields:
+            tuple: (section name, section data)
+        """
+        if not parallel:
+            for name, generate in sections.items():
+                yield name, generate()
+            return
+        
+        def run(generate):
+            try:
+                return generate()
+            finally:
+                connections.close_all()
+        
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {executor.submit(run, generate): name for name, generate in sections.items()}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def write_jsonl(self, section, data):
+        """
+        Write one report section as a single JSON line and flush it.
+        
+        Args:
+            section (str): Section name
+            data: Section data
+        """
+        self.stdout.write(json.dumps({'section': section, 'data': data}, default=decimal_converter))
+        self.stdout.flush()
+    
     def generate_system_overview(self):
         """
         Generate system overview statistics.
@@ -103,9 +196,9 @@ class Command(BaseCommand):
         Returns:
             dict: System overview data
         """
-        self.stdout.write('🔍 Analyzing system overview...')
+        self.progress.write('🔍 Analyzing system overview...')
         
-        config = RewardsConfig.objects.filter(is_active=True).first()
+        config = self.config
         
         overview = {
             'report_date': timezone.now().isoformat(),
@@ -134,12 +227,12 @@ class Command(BaseCommand):
         Returns:
             dict: User engagement data
         """
-        self.stdout.write('👥 Analyzing user engagement...')
+        self.progress.write('👥 Analyzing user engagement...')
         
         # Active users (users with transactions in period)
         active_users = PointsTransaction.objects.filter(
             created_at__gte=self.start_date
-        ).values('user').distinct().count()
+        ).aggregate(count=Count('user', distinct=True))['count']
         
         # Top users by activity
         top_users = PointsTransaction.objects.filter(
@@ -150,18 +243,19 @@ class Command(BaseCommand):
         ).order_by('-transaction_count')[:10]
         
         # Engagement by tier
-        tier_engagement = RewardAccount.objects.values('tier_level').annotate(
+        tier_engagement = list(RewardAccount.objects.values('tier_level').annotate(
             user_count=Count('id'),
             avg_balance=Avg('current_balance'),
             avg_earned=Avg('total_points_earned'),
             avg_redeemed=Avg('total_points_redeemed')
-        )
+        ).order_by('tier_level'))
+        total_accounts = sum(tier['user_count'] for tier in tier_engagement)
         
         return {
             'active_users_period': active_users,
-            'engagement_rate': (active_users / RewardAccount.objects.count() * 100) if RewardAccount.objects.count() > 0 else 0,
+            'engagement_rate': (active_users / total_accounts * 100) if total_accounts > 0 else 0,
             'top_users': list(top_users),
-            'tier_engagement': list(tier_engagement)
+            'tier_engagement': tier_engagement
         }
     
     def generate_points_analytics(self):
@@ -171,52 +265,55 @@ class Command(BaseCommand):
         Returns:
             dict: Points analytics data
         """
-        self.stdout.write('💰 Analyzing points flow...')
+        self.progress.write('💰 Analyzing points flow...')
         
-        # Points statistics for the period
-        period_stats = PointsTransaction.objects.filter(
-            created_at__gte=self.start_date
-        ).aggregate(
-            total_earned=Sum('points', filter=Q(transaction_type__in=['earned_booking', 'earned_review', 'earned_referral', 'bonus_first_booking', 'bonus_weekend', 'bonus_tier_upgrade'])),
-            total_redeemed=Sum('points', filter=Q(transaction_type__in=['redeemed_voucher', 'redeemed_discount'])),
-            transaction_count=Count('id'),
-            avg_transaction=Avg('points')
-        )
+        period_transactions = PointsTransaction.objects.filter(created_at__gte=self.start_date)
+        
+        # Daily totals in one grouped query; the period summary is their sum
+        days = {
+            row['day']: row
+            for row in period_transactions.annotate(day=TruncDate('created_at')).values('day').annotate(
+                earned=Sum('points', filter=EARNED_TRANSACTIONS),
+                redeemed=Sum('points', filter=REDEEMED_TRANSACTIONS),
+                points=Sum('points'),
+                count=Count('id')
+            ).order_by('day')
+        }
         
         # Transaction types breakdown
-        transaction_types = PointsTransaction.objects.filter(
-            created_at__gte=self.start_date
-        ).values('transaction_type').annotate(
+        transaction_types = period_transactions.values('transaction_type').annotate(
             count=Count('id'),
             total_points=Sum('points')
         ).order_by('-total_points')
         
-        # Daily trends
+        # Daily trends (days without transactions are reported as zero)
         daily_trends = []
+        first_day = timezone.localtime(self.start_date).date()
         for i in range(self.date_range):
-            date = self.start_date + timedelta(days=i)
-            day_stats = PointsTransaction.objects.filter(
-                created_at__date=date.date()
-            ).aggregate(
-                earned=Sum('points', filter=Q(transaction_type__in=['earned_booking', 'earned_review', 'earned_referral', 'bonus_first_booking', 'bonus_weekend', 'bonus_tier_upgrade'])),
-                redeemed=Sum('points', filter=Q(transaction_type__in=['redeemed_voucher', 'redeemed_discount'])),
-                count=Count('id')
-            )
+            date = first_day + timedelta(days=i)
+            day_stats = days.get(date, {})
+            earned = day_stats.get('earned') or 0
+            redeemed = day_stats.get('redeemed') or 0
             daily_trends.append({
-                'date': date.date().isoformat(),
-                'earned': float(day_stats['earned'] or 0),
-                'redeemed': float(day_stats['redeemed'] or 0),
-                'net_flow': float((day_stats['earned'] or 0) - abs(day_stats['redeemed'] or 0)),
-                'transaction_count': day_stats['count']
+                'date': date.isoformat(),
+                'earned': float(earned),
+                'redeemed': float(redeemed),
+                'net_flow': float(earned - abs(redeemed)),
+                'transaction_count': day_stats.get('count', 0)
             })
         
+        total_earned = sum(row['earned'] or 0 for row in days.values())
+        total_redeemed = sum(row['redeemed'] or 0 for row in days.values())
+        transaction_count = sum(row['count'] for row in days.values())
+        total_points = sum(row['points'] or 0 for row in days.values())
+        
         return {
             'period_summary': {
-                'total_earned': float(period_stats['total_earned'] or 0),
-                'total_redeemed': float(abs(period_stats['total_redeemed'] or 0)),
-                'net_points_flow': float((period_stats['total_earned'] or 0) - abs(period_stats['total_redeemed'] or 0)),
-                'transaction_count': period_stats['transaction_count'],
-                'avg_transaction_amount': float(period_stats['avg_transaction'] or 0)
+                'total_earned': float(total_earned),
+                'total_redeemed': float(abs(total_redeemed)),
+                'net_points_flow': float(total_earned - abs(total_redeemed)),
+                'transaction_count': transaction_count,
+                'avg_transaction_amount': float(total_points / transaction_count) if transaction_count else 0.0
             },
             'transaction_sources': list(transaction_types),
             'daily_trends': daily_trends
@@ -229,7 +326,14 @@ class Command(BaseCommand):
         Returns:
             dict: Tier analysis data
         """
-        self.stdout.write('🏆 Analyzing tier distribution...')
+        self.progress.write('🏆 Analyzing tier distribution...')
+        
+        # Users close to tier upgrade are counted in the same grouped query
+        thresholds = (self.config.tier_thresholds if self.config else None) or {}
+        candidate_filter = Q()
+        for tier, next_tier in NEXT_TIER.items():
+            if next_tier in thresholds:
+                candidate_filter |= Q(tier_level=tier, total_points_earned__gte=thresholds[next_tier] * 0.8)
         
         # Current tier distribution
         tier_distribution = RewardAccount.objects.values('tier_level').annotate(
@@ -237,41 +341,21 @@ class Command(BaseCommand):
             avg_balance=Avg('current_balance'),
             avg_earned=Avg('total_points_earned'),
             avg_lifetime_value=Avg('lifetime_value')
-        )
+        ).order_by('tier_level')
+        if candidate_filter:
+            tier_distribution = tier_distribution.annotate(upgrade_candidates=Count('id', filter=candidate_filter))
+        tier_distribution = list(tier_distribution)
         
-        # Users close to tier upgrade
-        config = RewardsConfig.objects.filter(is_active=True).first()
         tier_progression = {}
-        
-        if config and config.tier_thresholds:
-            thresholds = config.tier_thresholds
-            
-            # Bronze to Silver
-            bronze_users = RewardAccount.objects.filter(tier_level='bronze')
-            bronze_close_to_silver = bronze_users.filter(
-                total_points_earned__gte=thresholds['silver'] * 0.8
-            ).count()
-            
-            # Silver to Gold  
-            silver_users = RewardAccount.objects.filter(tier_level='silver')
-            silver_close_to_gold = silver_users.filter(
-                total_points_earned__gte=thresholds['gold'] * 0.8
-            ).count()
-            
-            # Gold to Platinum
-            gold_users = RewardAccount.objects.filter(tier_level='gold')
-            gold_close_to_platinum = gold_users.filter(
-                total_points_earned__gte=thresholds['platinum'] * 0.8
-            ).count()
-            
+        if candidate_filter:
+            candidates = {row['tier_level']: row.pop('upgrade_candidates') for row in tier_distribution}
             tier_progression = {
-                'bronze_to_silver_candidates': bronze_close_to_silver,
-                'silver_to_gold_candidates': silver_close_to_gold,
-                'gold_to_platinum_candidates': gold_close_to_platinum
+                f'{tier}_to_{next_tier}_candidates': candidates.get(tier, 0)
+                for tier, next_tier in NEXT_TIER.items()
             }
         
         return {
-            'distribution': list(tier_distribution),
+            'distribution': tier_distribution,
             'progression_candidates': tier_progression
         }
     
@@ -282,21 +366,24 @@ class Command(BaseCommand):
         Returns:
             dict: Transaction pattern data
         """
-        self.stdout.write('📈 Analyzing transaction patterns...')
-        
-        # For SQLite, we'll use Python to extract time patterns
-        transactions = PointsTransaction.objects.filter(
-            created_at__gte=self.start_date
-        ).values_list('created_at', flat=True)
+        self.progress.write('📈 Analyzing transaction patterns...')
         
         # Initialize hourly and daily patterns
         hourly_pattern = {i: 0 for i in range(24)}
         weekly_pattern = {i: 0 for i in range(7)}  # 0=Monday, 6=Sunday
         
-        # Count transactions by hour and day of week
-        for created_at in transactions:
-            hourly_pattern[created_at.hour] += 1
-            weekly_pattern[created_at.weekday()] += 1
+        # One grouped query over (hour, weekday); both histograms fold out of it
+        buckets = PointsTransaction.objects.filter(
+            created_at__gte=self.start_date
+        ).annotate(
+            hour=ExtractHour('created_at'),
+            weekday=ExtractWeekDay('created_at')
+        ).values('hour', 'weekday').annotate(count=Count('id')).order_by()
+        
+        for bucket in buckets:
+            hourly_pattern[bucket['hour']] += bucket['count']
+            # ExtractWeekDay counts 1=Sunday .. 7=Saturday
+            weekly_pattern[(bucket['weekday'] + 5) % 7] += bucket['count']
         
         # Convert to format expected by report
         hourly_distribution = [{'hour': hour, 'count': count} for hour, count in hourly_pattern.items()]
@@ -314,9 +401,9 @@ class Command(BaseCommand):
         Returns:
             dict: Financial impact data
         """
-        self.stdout.write('💵 Analyzing financial impact...')
+        self.progress.write('💵 Analyzing financial impact...')
         
-        config = RewardsConfig.objects.filter(is_active=True).first()
+        config = self.config
         
         if not config:
             return {'error': 'No active configuration found'}
@@ -327,8 +414,8 @@ class Command(BaseCommand):
         )['total'] or 0
         
         total_points_redeemed_period = PointsTransaction.objects.filter(
-            created_at__gte=self.start_date,
-            transaction_type__in=['redeemed_voucher', 'redeemed_discount']
+            REDEEMED_TRANSACTIONS,
+            created_at__gte=self.start_date
         ).aggregate(
             total=Sum('points')
         )['total'] or 0
@@ -456,20 +543,14 @@ class Command(BaseCommand):
             timestamp = datetime.now().strftime('%Y-%m-%d')
             output_file = f'rewards_report_{timestamp}.json'
         
-        # Convert Decimal objects to float for JSON serialization
-        def decimal_converter(obj):
-            if isinstance(obj, Decimal):
-                return float(obj)
-            raise TypeError(f'Object of type {type(obj)} is not JSON serializable')
-        
         try:
             with open(output_file, 'w') as f:
                 json.dump(report_data, f, indent=2, default=decimal_converter)
             
-            self.stdout.write(
+            self.progress.write(
                 self.style.SUCCESS(f'\n📁 Report exported to: {output_file}')
             )
         except Exception as e:
-            self.stdout.write(
+            self.progress.write(
                 self.style.ERROR(f'\n❌ Export failed: {str(e)}')
             )
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rewards', '0008_alter_rewardsconfig_first_booking_bonus_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rewardvoucher',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['expires_at', 'id'], name='rewards_voucher_expiry_sweep'),
+        ),
+    ]
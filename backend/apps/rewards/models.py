@@ -17,7 +17,7 @@ Author: SewaBazaar Development Team
 Created: September 2025
 """
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -26,9 +26,19 @@ from decimal import Decimal
 import uuid
 import logging
 
+from apps.common.app_settings import setting_getter
+
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_VOUCHER_EXPIRY_SETTINGS = {
+    'BATCH_SIZE': 1000,
+}
+
+
+get_voucher_expiry_setting = setting_getter('VOUCHER_EXPIRY', DEFAULT_VOUCHER_EXPIRY_SETTINGS)
+
+
 class RewardsConfig(models.Model):
     """
     System-wide configuration for the rewards program.
@@ -706,38 +716,74 @@ class PointsTransaction(models.Model):
         return abs(self.points)
 
 
-class RewardVoucherManager(models.Manager):
-    """Custom manager for RewardVoucher with automatic expiry checking."""
-    
-    def get_queryset(self):
-        """Return standard queryset without automatic expiry updates to avoid recursion."""
-        return super().get_queryset()
-    
-    def update_expired_vouchers(self):
-        """Update status of expired vouchers that haven't been marked as expired yet."""
-        from django.utils import timezone
-        
-        # Use super().get_queryset() to avoid recursion
-        # Find vouchers that are expired but not marked as such
-        expired_vouchers = super().get_queryset().filter(
-            expires_at__lt=timezone.now(),
-            status__in=['active']  # Only update active vouchers
+class RewardVoucherQuerySet(models.QuerySet):
+    """QuerySet for RewardVoucher with a read-only view of voucher expiry."""
+    
+    def with_effective_status(self, now=None):
+        """
+        Annotate each voucher with its effective status.
+        
+        Active vouchers past their expiry read as 'expired' even before the
+        expiry sweep has marked them, so reads never need to write.
+        
+        Args:
+            now (datetime): Reference time (default: now)
+        
+        Returns:
+            QuerySet: Vouchers annotated with effective_status
+        """
+        return self.annotate(
+            effective_status=models.Case(
+                models.When(status='active', expires_at__lt=now or timezone.now(), then=models.Value('expired')),
+                default=models.F('status'),
+                output_field=models.CharField(),
+            )
         )
+
+
+class RewardVoucherManager(models.Manager.from_queryset(RewardVoucherQuerySet)):
+    """Custom manager for RewardVoucher with batched expiry."""
+    
+    def update_expired_vouchers(self, batch_size=None, now=None):
+        """
+        Mark active vouchers past their expiry as expired, in pk-ranged chunks.
+        
+        Each chunk is one short UPDATE over a primary key range, found through
+        the partial (status='active') expiry index, so the sweep never holds
+        locks on more than batch_size rows at once. Run it periodically
+        (expire_reward_vouchers_task / the expire_vouchers command), never on
+        read paths.
         
-        # Bulk update their status
-        count = expired_vouchers.update(status='expired')
+        Args:
+            batch_size (int): Vouchers per UPDATE (default: VOUCHER_EXPIRY['BATCH_SIZE'])
+            now (datetime): Reference time (default: now)
+        
+        Returns:
+            int: Number of vouchers marked as expired
+        """
+        batch_size = batch_size or get_voucher_expiry_setting('BATCH_SIZE')
+        now = now or timezone.now()
+        due = self.get_queryset().filter(status='active', expires_at__lt=now)
+        
+        count = 0
+        last_pk = 0
+        while True:
+            pks = list(due.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            count += due.filter(pk__gt=last_pk, pk__lte=pks[-1]).update(status='expired', updated_at=now)
+            last_pk = pks[-1]
+            if len(pks) < batch_size:
+                break
         
         if count > 0:
-            logger.info(f"Automatically marked {count} vouchers as expired")
+            logger.info(f"Marked {count} voucher(s) as expired")
         
         return count
     
     def get_user_vouchers(self, user):
-        """Get user's vouchers with automatic expiry checking."""
-        # First update any expired vouchers
-        self.update_expired_vouchers()
-        # Then return user's vouchers
-        return self.filter(user=user).order_by('-created_at')
+        """Get user's vouchers annotated with their effective status (never writes)."""
+        return self.filter(user=user).with_effective_status().order_by('-created_at')
 
 
 class RewardVoucher(models.Model):
@@ -901,6 +947,10 @@ class RewardVoucher(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['expires_at']),
             models.Index(fields=['booking']),
+            models.Index(
+                fields=['expires_at', 'id'], condition=models.Q(status='active'),
+                name='rewards_voucher_expiry_sweep',
+            ),
         ]
     
     def __str__(self):
@@ -912,54 +962,74 @@ class RewardVoucher(models.Model):
         """
         return f"Voucher {self.voucher_code} - Rs.{self.value} ({self.status})"
     
+    # Attempts at a fresh random code when a generated one is already taken
+    CODE_GENERATION_ATTEMPTS = 5
+    
     def save(self, *args, **kwargs):
         """
         Generate voucher code and QR data on creation.
         
+        Generated codes are not probed for existence first; the unique index
+        on voucher_code decides, and on the rare collision a new code is drawn
+        and the insert retried.
+        
         Args:
             *args: Variable length argument list
             **kwargs: Arbitrary keyword arguments
         """
-        if not self.voucher_code:
+        generated_code = not self.voucher_code
+        if generated_code:
             self.voucher_code = self.generate_voucher_code()
         
-        if not self.qr_code_data:
-            self.qr_code_data = self.generate_qr_data()
-        
         # Auto-set expiry date if not provided
         if not self.expires_at:
             config = RewardsConfig.get_active_config()
             self.expires_at = timezone.now() + timedelta(days=config.voucher_validity_days)
         
-        super().save(*args, **kwargs)
-    
-    def generate_voucher_code(self):
+        regenerate_qr = not self.qr_code_data
+        if regenerate_qr:
+            self.qr_code_data = self.generate_qr_data()
+        
+        if not generated_code or not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        
+        for attempt in range(self.CODE_GENERATION_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if attempt == self.CODE_GENERATION_ATTEMPTS - 1 or not type(self).objects.filter(
+                    voucher_code=self.voucher_code
+                ).exists():
+                    # Out of attempts, or the conflict was not the voucher code
+                    raise
+                self.voucher_code = self.generate_voucher_code()
+                if regenerate_qr:
+                    self.qr_code_data = self.generate_qr_data()
+    
+    @staticmethod
+    def generate_voucher_code(issued_on=None):
         """
-        Generate a unique voucher code.
+        Generate a random voucher code.
         
         Format: SB-YYYYMMDD-XXXXXX
-        Where XXXXXX is a random 6-character alphanumeric string
+        Where XXXXXX is a random 6-character alphanumeric string (36^6 codes
+        per day). Uniqueness is enforced by the database, not checked here.
+        
+        Args:
+            issued_on (date): Date encoded in the code (default: today)
         
         Returns:
-            str: Unique voucher code
+            str: Voucher code
         """
         import secrets
         import string
-        from datetime import datetime
         
-        date_str = datetime.now().strftime('%Y%m%d')
+        date_str = (issued_on or timezone.localdate()).strftime('%Y%m%d')
         random_str = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))
-        
-        base_code = f"SB-{date_str}-{random_str}"
-        
-        # Ensure uniqueness
-        counter = 1
-        voucher_code = base_code
-        while RewardVoucher.objects.filter(voucher_code=voucher_code).exists():
-            voucher_code = f"{base_code}-{counter}"
-            counter += 1
-        
-        return voucher_code
+        return f"SB-{date_str}-{random_str}"
     
     def generate_qr_data(self):
         """
@@ -974,7 +1044,7 @@ class RewardVoucher(models.Model):
             'type': 'sewabazaar_voucher',
             'code': self.voucher_code,
             'value': str(self.value),
-            'user_id': self.user.id,
+            'user_id': self.user_id,
             'created': self.created_at.isoformat() if self.created_at else timezone.now().isoformat(),
             'expires': self.expires_at.isoformat() if self.expires_at else None
         }
@@ -1016,15 +1086,26 @@ class RewardVoucher(models.Model):
     
     def get_current_status(self):
         """
-        Get current voucher status, automatically updating expiry if needed.
+        Get current voucher status, treating active vouchers past expiry as expired.
         Use this method instead of directly accessing .status to ensure accuracy.
         
+        Uses the effective_status annotation when the voucher was loaded with
+        with_effective_status(); never writes (the expiry sweep does that).
+        
         Returns:
             str: Current voucher status
         """
-        self.check_and_update_expiry()
+        effective_status = getattr(self, 'effective_status', None)
+        if effective_status is not None:
+            return effective_status
+        if self.status == 'active' and self.is_expired:
+            return 'expired'
         return self.status
     
+    def get_current_status_display(self):
+        """Human-readable label of get_current_status()."""
+        return dict(self.VOUCHER_STATUS_CHOICES).get(self.get_current_status(), self.get_current_status())
+    
     @property
     def remaining_value(self):
         """Get remaining voucher value (for fixed-value vouchers, it's either full value or 0)."""
@@ -0,0 +1,172 @@
+"""
+VOUCHER QR CODES
+
+Content-addressed cache for rendered voucher QR codes.
+
+A voucher's QR payload (RewardVoucher.qr_code_data) only changes when its code
+or expiry changes, but the PNG used to be rendered again for every voucher on
+every list request and for every row in the admin. Rendered PNGs are now
+stored in the cache backend under a SHA-256 of the payload and render options:
+
+    rewards:qr:<box_size>:<border>:<sha256>
+
+so the same payload is rendered once, and a changed payload simply gets a new
+key (stale entries are never served and age out on their own). The same hash
+is the ETag of the PNG endpoint (/api/rewards/vouchers/<code>/qr.png), which
+lets clients revalidate with If-None-Match instead of downloading it again.
+
+An <img src> cannot send the JWT Authorization header, so the qr_code_url
+handed to clients is signed: `?expires=<unix time>&signature=<hmac>` for the
+voucher code. Expiry times are rounded up to the next SIGNED_URL_MAX_AGE
+window, so a voucher's URL stays the same (and browser-cacheable) for a
+while and is valid for one to two windows.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import time
+
+from django.core import signing
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+from apps.common.app_settings import setting_getter
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_VOUCHER_QR_SETTINGS = {
+    'CACHE_TIMEOUT': 7 * 24 * 60 * 60,
+    'BROWSER_MAX_AGE': 24 * 60 * 60,
+    'BOX_SIZE': 10,
+    'BORDER': 4,
+    'SIGNED_URL_MAX_AGE': 60 * 60,
+}
+
+QR_URL_SIGNING_SALT = 'apps.rewards.qr_codes.voucher_qr_url'
+
+
+get_voucher_qr_setting = setting_getter('VOUCHER_QR', DEFAULT_VOUCHER_QR_SETTINGS)
+
+
+def qr_content_hash(data, box_size=None, border=None):
+    """
+    Hash a QR payload together with its render options.
+
+    Args:
+        data (str): QR payload
+        box_size (int): Pixels per QR module (default: BOX_SIZE)
+        border (int): Quiet zone in modules (default: BORDER)
+
+    Returns:
+        str: Hex SHA-256 digest identifying the rendered image
+    """
+    box_size = box_size or get_voucher_qr_setting('BOX_SIZE')
+    border = get_voucher_qr_setting('BORDER') if border is None else border
+    return hashlib.sha256(f'{box_size}:{border}:{data}'.encode('utf-8')).hexdigest()
+
+
+def render_qr_png(data, box_size=None, border=None):
+    """
+    Render a QR code as PNG bytes, reusing a cached rendering when there is one.
+
+    Args:
+        data (str): QR payload
+        box_size (int): Pixels per QR module (default: BOX_SIZE)
+        border (int): Quiet zone in modules (default: BORDER)
+
+    Returns:
+        tuple: (png_bytes, content_hash), or (None, None) if data is empty or
+            the QR library is unavailable
+    """
+    if not data:
+        return None, None
+    box_size = box_size or get_voucher_qr_setting('BOX_SIZE')
+    border = get_voucher_qr_setting('BORDER') if border is None else border
+
+    content_hash = qr_content_hash(data, box_size, border)
+    cache_key = f'rewards:qr:{box_size}:{border}:{content_hash}'
+    png = cache.get(cache_key)
+    if png is not None:
+        return png, content_hash
+
+    try:
+        import qrcode
+    except ImportError:
+        return None, None
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+    png = buffer.getvalue()
+
+    cache.set(cache_key, png, get_voucher_qr_setting('CACHE_TIMEOUT'))
+    return png, content_hash
+
+
+def qr_data_uri(data, box_size=None, border=None):
+    """
+    Render a QR code as a base64 PNG data URI (cached like render_qr_png).
+
+    Args:
+        data (str): QR payload
+        box_size (int): Pixels per QR module (default: BOX_SIZE)
+        border (int): Quiet zone in modules (default: BORDER)
+
+    Returns:
+        str: "data:image/png;base64,..." or None if it cannot be rendered
+    """
+    png, _ = render_qr_png(data, box_size, border)
+    if png is None:
+        return None
+    return f"data:image/png;base64,{base64.b64encode(png).decode()}"
+
+
+def sign_qr_url(voucher_code, now=None):
+    """
+    Build the query parameters that let a voucher's QR PNG load without a JWT.
+
+    Args:
+        voucher_code (str): The voucher whose QR code may be fetched
+        now (float): Reference unix time (default: time.time())
+
+    Returns:
+        dict: 'expires' (unix time) and 'signature' query parameters
+    """
+    window = get_voucher_qr_setting('SIGNED_URL_MAX_AGE')
+    expires = (int(now if now is not None else time.time()) // window + 2) * window
+    signer = signing.Signer(salt=QR_URL_SIGNING_SALT)
+    return {'expires': expires, 'signature': signer.signature(f'{voucher_code}:{expires}')}
+
+
+def verify_qr_url(voucher_code, expires, signature, now=None):
+    """
+    Check the signed query parameters of a QR PNG request.
+
+    Args:
+        voucher_code (str): Voucher code from the URL path
+        expires (str): 'expires' query parameter
+        signature (str): 'signature' query parameter
+        now (float): Reference unix time (default: time.time())
+
+    Returns:
+        bool: True if the signature matches and has not expired
+    """
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if not signature or expires < (now if now is not None else time.time()):
+        return False
+    signer = signing.Signer(salt=QR_URL_SIGNING_SALT)
+    return constant_time_compare(signature, signer.signature(f'{voucher_code}:{expires}'))
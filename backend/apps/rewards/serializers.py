@@ -22,7 +22,10 @@ Features:
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.http import urlencode
 from .models import RewardAccount, PointsTransaction, RewardsConfig, RewardVoucher
+from .qr_codes import qr_data_uri, sign_qr_url
 
 User = get_user_model()
 
@@ -691,13 +694,15 @@ class RewardVoucherSerializer(serializers.ModelSerializer):
         user_email (str): User's email address
         booking_details (dict): Booking information if voucher was used
         qr_code_data (str): QR code data for mobile redemption
-        qr_code_image (str): Base64 encoded QR code image
+        qr_code_image (str): Base64 encoded QR code image (detail views only)
+        qr_code_url (str): Signed, short-lived URL of the QR code PNG
         metadata (dict): Additional voucher metadata
         updated_at (DateTime): When this voucher was last updated
     """
     
-    # Enhanced display fields
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    # Enhanced display fields (effective status: active vouchers past expiry read as expired)
+    status = serializers.CharField(source='get_current_status', read_only=True)
+    status_display = serializers.CharField(source='get_current_status_display', read_only=True)
     is_valid = serializers.BooleanField(read_only=True)
     is_expired = serializers.BooleanField(read_only=True)
     remaining_value = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
@@ -711,8 +716,9 @@ class RewardVoucherSerializer(serializers.ModelSerializer):
     # Booking information
     booking_details = serializers.SerializerMethodField()
     
-    # QR code data (base64 encoded)
+    # QR code image (base64 encoded, detail views only) and PNG URL
     qr_code_image = serializers.SerializerMethodField()
+    qr_code_url = serializers.SerializerMethodField()
     
     class Meta:
         model = RewardVoucher
@@ -721,13 +727,13 @@ class RewardVoucherSerializer(serializers.ModelSerializer):
             'created_at', 'expires_at', 'used_at', 'used_amount', 'remaining_value',
             'is_valid', 'is_expired', 'is_fully_used', 'days_until_expiry',
             'user_name', 'user_email', 'booking_details', 'qr_code_data', 'qr_code_image',
-            'metadata', 'updated_at'
+            'qr_code_url', 'metadata', 'updated_at'
         ]
         read_only_fields = [
             'id', 'voucher_code', 'created_at', 'updated_at', 'used_at',
             'status_display', 'is_valid', 'is_expired', 'remaining_value',
             'is_fully_used', 'days_until_expiry', 'user_name', 'user_email',
-            'booking_details', 'qr_code_image'
+            'booking_details', 'qr_code_image', 'qr_code_url'
         ]
     
     def get_booking_details(self, obj):
@@ -751,45 +757,42 @@ class RewardVoucherSerializer(serializers.ModelSerializer):
     
     def get_qr_code_image(self, obj):
         """
-        Generate base64 encoded QR code image.
+        Get the base64 encoded QR code image.
+        
+        Only embedded when the view asks for it (context['embed_qr_image'],
+        e.g. the voucher detail view); lists carry qr_code_url instead. The
+        PNG comes from the content-addressed QR cache.
         
         Args:
             obj (RewardVoucher): The reward voucher instance
             
         Returns:
-            str: Base64 encoded QR code image or None if error
+            str: Base64 encoded QR code image or None if not embedded or on error
         """
-        try:
-            import qrcode
-            import io
-            import base64
-            from PIL import Image
-            
-            # Create QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(obj.qr_code_data)
-            qr.make(fit=True)
-            
-            # Create image
-            img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            img_str = base64.b64encode(buffer.getvalue()).decode()
-            
-            return f"data:image/png;base64,{img_str}"
-        except ImportError:
-            # QR code library not available
+        if not self.context.get('embed_qr_image'):
             return None
+        try:
+            return qr_data_uri(obj.qr_code_data)
         except Exception:
             # Error generating QR code
             return None
+    
+    def get_qr_code_url(self, obj):
+        """
+        Get the signed URL of the voucher's QR code PNG.
+        
+        The signature stands in for the JWT, which an <img src> cannot send.
+        
+        Args:
+            obj (RewardVoucher): The reward voucher instance
+            
+        Returns:
+            str: Absolute URL when a request is available, else a path
+        """
+        url = reverse('rewards:voucher-qr', kwargs={'voucher_code': obj.voucher_code})
+        url = f"{url}?{urlencode(sign_qr_url(obj.voucher_code))}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class VoucherRedemptionSerializer(serializers.Serializer):
@@ -0,0 +1,37 @@
+"""
+CELERY TASKS FOR REWARDS
+
+This module contains Celery tasks for the rewards app.
+"""
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True)
+def expire_reward_vouchers_task(self, batch_size=None):
+    """
+    Mark active vouchers past their expiry as expired.
+    
+    Runs periodically instead of on every voucher list read; reads already
+    treat overdue vouchers as expired through the effective_status annotation.
+    Works in pk-ranged chunks of batch_size rows.
+    
+    Args:
+        batch_size (int): Vouchers per UPDATE (default: VOUCHER_EXPIRY['BATCH_SIZE'])
+    
+    Returns:
+        dict: Number of vouchers expired
+        
+    Example:
+        >>> expire_reward_vouchers_task.delay()
+        {'expired': 42}
+    """
+    from .models import RewardVoucher
+    
+    expired = RewardVoucher.objects.update_expired_vouchers(batch_size=batch_size)
+    if expired:
+        logger.info(f"Reward vouchers expired - Task ID: {self.request.id}, vouchers: {expired}")
+    return {'expired': expired}
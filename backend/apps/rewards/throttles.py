@@ -5,10 +5,10 @@ This module defines custom rate limiting classes to prevent abuse
 of the rewards system APIs, particularly voucher validation and redemption.
 """
 
-from rest_framework.throttling import ScopedRateThrottle
+from apps.common.throttling import SlidingWindowScopedRateThrottle
 
 
-class VoucherValidationThrottle(ScopedRateThrottle):
+class VoucherValidationThrottle(SlidingWindowScopedRateThrottle):
     """
     Throttle voucher validation requests.
     
@@ -21,7 +21,7 @@ class VoucherValidationThrottle(ScopedRateThrottle):
     scope = 'voucher_validation'
 
 
-class VoucherRedemptionThrottle(ScopedRateThrottle):
+class VoucherRedemptionThrottle(SlidingWindowScopedRateThrottle):
     """
     Throttle voucher redemption requests.
     
@@ -91,6 +91,13 @@ user_patterns = [
         name='voucher-detail'
     ),
     
+    # Voucher QR code PNG (cached, served with an ETag)
+    path(
+        'vouchers/<str:voucher_code>/qr.png', 
+        views.voucher_qr_code, 
+        name='voucher-qr'
+    ),
+    
     # Use voucher during checkout
     path(
         'vouchers/<str:voucher_code>/use/', 
@@ -29,6 +29,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Sum, Count, Q
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
+from django.http import HttpResponse
 from datetime import timedelta
 import logging
 import traceback
@@ -46,7 +47,9 @@ from .serializers import (
     VoucherValidationSerializer,
     AvailableVouchersSerializer
 )
+from .filters import RewardVoucherFilter
 from .throttles import VoucherValidationThrottle
+from .qr_codes import render_qr_png, get_voucher_qr_setting, verify_qr_url
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -661,13 +664,13 @@ class UserVoucherListView(generics.ListAPIView):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     
     # Filtering options
-    filterset_fields = ['status']
+    filterset_class = RewardVoucherFilter
     search_fields = ['voucher_code']
     ordering_fields = ['created_at', 'expires_at', 'value', 'status']
     ordering = ['-created_at']
     
     def get_queryset(self):
-        """Return vouchers for authenticated user with automatic expiry updates.
+        """Return vouchers for authenticated user annotated with their effective status.
         
         Returns:
             QuerySet: Filtered reward vouchers
@@ -692,12 +695,65 @@ class VoucherDetailView(generics.RetrieveAPIView):
     lookup_url_kwarg = 'voucher_code'
     
     def get_queryset(self):
-        """Return vouchers for authenticated user with automatic expiry updates.
+        """Return vouchers for authenticated user annotated with their effective status.
         
         Returns:
             QuerySet: Filtered reward vouchers
         """
         return RewardVoucher.objects.get_user_vouchers(self.request.user)
+    
+    def get_serializer_context(self):
+        """Embed the QR image in the detail payload (lists only carry its URL)."""
+        context = super().get_serializer_context()
+        context['embed_qr_image'] = True
+        return context
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def voucher_qr_code(request, voucher_code):
+    """
+    Serve a voucher's QR code as a PNG.
+    
+    Requests are authorized either by the signed expires/signature query
+    parameters of the serializer's qr_code_url (so the URL works as an
+    <img src>) or by the voucher owner's credentials.
+    
+    The PNG comes from the content-addressed QR cache and its ETag is the
+    hash of the QR payload, so a client holding the current image gets a
+    304 Not Modified for If-None-Match requests.
+    
+    Args:
+        request: HTTP request
+        voucher_code (str): Voucher code of one of the user's vouchers
+    
+    Returns:
+        HttpResponse: image/png, 304 when unchanged, 403 without a valid
+            signature or login, or 404
+    """
+    vouchers = RewardVoucher.objects.filter(voucher_code=voucher_code)
+    if not verify_qr_url(voucher_code, request.query_params.get('expires'), request.query_params.get('signature')):
+        if not request.user.is_authenticated:
+            return Response(
+                {"error": "A valid signed link or authentication is required"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        vouchers = vouchers.filter(user=request.user)
+    qr_code_data = vouchers.values_list('qr_code_data', flat=True).first()
+    png, content_hash = render_qr_png(qr_code_data)
+    if png is None:
+        return Response({"error": "Voucher not found"}, status=status.HTTP_404_NOT_FOUND)
+    
+    etag = f'"{content_hash}"'
+    max_age = get_voucher_qr_setting('BROWSER_MAX_AGE')
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(png, content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = f'private, max-age={max_age}'
+    return response
 
 
 @api_view(['GET'])
@@ -798,7 +854,9 @@ def redeem_voucher(request):
             voucher = serializer.save()
             
             # Return created voucher details
-            voucher_serializer = RewardVoucherSerializer(voucher)
+            voucher_serializer = RewardVoucherSerializer(
+                voucher, context={'request': request, 'embed_qr_image': True}
+            )
             
             # Get updated account information
             account = RewardAccount.objects.get(user=request.user)
@@ -873,10 +931,7 @@ def validate_voucher(request):
                 user=request.user
             )
             
-            # Check and update expiry status automatically
-            voucher.check_and_update_expiry()
-            
-            # Check if voucher is in a valid state (after potential expiry update)
+            # Check if voucher is in a valid state (active vouchers past expiry count as expired)
             current_status = voucher.get_current_status()
             if current_status != 'active':
                 return Response(
@@ -887,7 +942,9 @@ def validate_voucher(request):
                 )
             
             # Return voucher details
-            serializer = RewardVoucherSerializer(voucher)
+            serializer = RewardVoucherSerializer(
+                voucher, context={'request': request, 'embed_qr_image': True}
+            )
             response_data = serializer.data
             # Only add error_message for backward compatibility in error cases
             response_data['error_message'] = None
@@ -1133,7 +1190,9 @@ def use_voucher(request, voucher_code):
         result = voucher.apply_to_booking(booking_amount, booking)
         
         # Return usage results
-        voucher_serializer = RewardVoucherSerializer(voucher)
+        voucher_serializer = RewardVoucherSerializer(
+            voucher, context={'request': request, 'embed_qr_image': True}
+        )
         
         return Response({
             "discount_amount": result['discount_amount'],
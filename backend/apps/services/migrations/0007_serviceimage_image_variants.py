@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0006_remove_deprecated_image_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serviceimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/JPEG derivatives of the image (see apps.common.images)'),
+        ),
+    ]
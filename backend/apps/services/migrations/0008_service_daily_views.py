@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_serviceimage_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceDailyView',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='services.service')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('service', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:13
+
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_service_rating_totals(apps, schema_editor):
+    """
+    Recompute each service's rating totals from its service reviews and the
+    reviews and customer feedback of its bookings.
+    """
+    Service = apps.get_model('services', 'Service')
+    ServiceReview = apps.get_model('services', 'ServiceReview')
+    Review = apps.get_model('reviews', 'Review')
+    CustomerFeedback = apps.get_model('bookings', 'CustomerFeedback')
+
+    totals = defaultdict(lambda: [0, 0])
+    sources = (
+        (ServiceReview.objects, 'service'),
+        (Review.objects, 'booking__service'),
+        (CustomerFeedback.objects, 'booking__service'),
+    )
+    for queryset, key in sources:
+        for row in queryset.order_by().values(key).annotate(total=Sum('rating'), count=Count('pk')):
+            if row[key] is not None:
+                totals[row[key]][0] += row['total']
+                totals[row[key]][1] += row['count']
+
+    for service in Service.objects.filter(Q(pk__in=list(totals)) | Q(reviews_count__gt=0)).only('pk'):
+        total, count = totals.get(service.pk, (0, 0))
+        average = (Decimal(total) / count).quantize(Decimal('0.01'), ROUND_HALF_UP) if count else Decimal('0')
+        Service.objects.filter(pk=service.pk).update(rating_sum=total, reviews_count=count, average_rating=average)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0008_service_daily_views'),
+        ('reviews', '0006_reviewimage_image_variants'),
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Running sum of review ratings (see apps.common.ratings)'),
+        ),
+        migrations.RunPython(backfill_service_rating_totals, migrations.RunPython.noop),
+    ]
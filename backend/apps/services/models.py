@@ -17,11 +17,15 @@ Models:
 import os
 from uuid import uuid4
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils.text import slugify
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from apps.common.ratings import RatingSnapshotMixin, RatingTotalsService
+
 def service_image_upload_path(instance, filename):
     """
     Generate upload path for service images with descriptive naming.
@@ -173,6 +177,7 @@ class Service(models.Model):
         is_featured (bool): Whether this is a featured/promoted service
         average_rating (Decimal): Average user rating for this service
         reviews_count (int): Number of reviews for this service
+        rating_sum (int): Sum of the ratings behind average_rating
         tags (list): Search tags for better discovery
         is_verified_provider (bool): Whether the provider has verified credentials
         response_time (str): Provider's typical response time
@@ -213,6 +218,7 @@ class Service(models.Model):
     
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0)
     reviews_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0, help_text="Running sum of review ratings (see apps.common.ratings)")
     
     tags = models.JSONField(default=list, blank=True, help_text="Search tags for better discovery")
     is_verified_provider = models.BooleanField(default=False, help_text="Provider has verified credentials")
@@ -263,6 +269,9 @@ class Service(models.Model):
         Returns:
             ServiceImage: The featured image instance or None if not found
         """
+        # Use prefetched images (eager-loaded list endpoints) instead of a query per service
+        if 'images' in getattr(self, '_prefetched_objects_cache', {}):
+            return next((image for image in self.images.all() if image.is_featured), None)
         try:
             return self.images.filter(is_featured=True).first()
         except:
@@ -302,6 +311,7 @@ class ServiceImage(models.Model):
     Attributes:
         service (Service): The service this image belongs to
         image (ImageField): The actual image file
+        image_variants (dict): Stored names of the resized derivatives of the image
         caption (str): Caption/description for the image
         order (int): Display order in gallery
         is_featured (bool): Whether this is the featured image for the service
@@ -311,6 +321,10 @@ class ServiceImage(models.Model):
     """
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to=service_image_upload_path)
+    image_variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Resized WebP/JPEG derivatives of the image (see apps.common.images)"
+    )
     caption = models.CharField(max_length=100, blank=True, null=True)
     
     # PHASE 2 NEW: Enhanced portfolio management
@@ -419,7 +433,37 @@ class Favorite(models.Model):
         ordering = ['-created_at']
 
 
-class ServiceReview(models.Model):
+class ServiceDailyView(models.Model):
+    """
+    Model for storing how often a service was viewed each day.
+    
+    Rows are written by the buffered view counter (apps.services.view_counter)
+    together with Service.view_count, for view trends in analytics.
+    
+    Attributes:
+        service (Service): The service that was viewed
+        date (Date): The day the views happened on
+        views (int): Number of views counted that day
+    """
+    service = models.ForeignKey('Service', on_delete=models.CASCADE, related_name='daily_views')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        """
+        Return string representation of the ServiceDailyView instance.
+        
+        Returns:
+            str: Service, day and view count
+        """
+        return f"{self.service_id} on {self.date}: {self.views} views"
+    
+    class Meta:
+        unique_together = ['service', 'date']
+        ordering = ['-date']
+
+
+class ServiceReview(RatingSnapshotMixin, models.Model):
     """
     
     Purpose: Store detailed reviews with ratings for services
@@ -452,6 +496,8 @@ class ServiceReview(models.Model):
         (5, '5 - Excellent'),
     )
     
+    RATING_SNAPSHOT_FIELDS = ('service_id', 'rating')
+    
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='reviews')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='service_reviews')
     
@@ -493,16 +539,33 @@ class ServiceReview(models.Model):
         """
         Override save method to update service cached ratings.
         
-        Updates the service's average rating and review count when a review is saved.
+        Applies the review's rating change (new review, edited rating or moved
+        service) to the service's running rating totals in the same transaction.
         
         Args:
             *args: Variable length argument list
             **kwargs: Arbitrary keyword arguments
         """
-        super().save(*args, **kwargs)
-        # Update service cached ratings
-        self.service.average_rating = self.service.reviews.aggregate(
-            models.Avg('rating')
-        )['rating__avg'] or 0
-        self.service.reviews_count = self.service.reviews.count()
-        self.service.save(update_fields=['average_rating', 'reviews_count'])
\ No newline at end of file
+        stored = self.get_stored_rating()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Update service cached ratings by this review's delta only
+            RatingTotalsService.apply(
+                RatingTotalsService.adjust_service,
+                (stored['service_id'], stored['rating']) if stored else None,
+                (self.service_id, self.rating),
+            )
+        self.remember_rating()
+
+
+@receiver(post_delete, sender=ServiceReview)
+def remove_service_review_rating(sender, instance, **kwargs):
+    """
+    Take a deleted review's rating off the service's cached totals.
+    
+    Args:
+        sender (Model): The ServiceReview model class
+        instance (ServiceReview): The deleted review
+        **kwargs: Additional signal arguments
+    """
+    RatingTotalsService.adjust_service(instance.service_id, -instance.rating, -1)
\ No newline at end of file
@@ -11,11 +11,18 @@ Serializers:
 - ServiceAvailabilitySerializer: Serializes ServiceAvailability model data
 - ServiceSerializer: Serializes Service model data with related information
 - ServiceDetailSerializer: Extends ServiceSerializer with detailed information
+- ServiceSummarySerializer: Compact service rows for listings, rendered from values()
 - FavoriteSerializer: Serializes Favorite model data
 """
 
+from django.core.files.storage import default_storage
+from django.db.models import CharField, F, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Concat
 from rest_framework import serializers
 from .models import City, ServiceCategory, Service, ServiceImage, ServiceAvailability, Favorite
+from apps.common.eager_loading import EagerLoadingMixin
+from apps.common.sparse_fields import SparseFieldsetMixin, SummarySerializer
+from apps.common.images import image_url_for_request, image_variant_urls
 from apps.reviews.serializers import ReviewSerializer
 
 class CitySerializer(serializers.ModelSerializer):
@@ -65,21 +72,37 @@ class ServiceImageSerializer(serializers.ModelSerializer):
     
     Fields:
         id (int): Unique identifier for the image
-        image (str): URL of the image file
+        image (str): URL of the image at the requested size (?image_size=, default large)
+        image_variants (dict): URLs of every resized WebP/JPEG derivative
         caption (str): Caption/description for the image
         is_featured (bool): Whether this is the featured image
         order (int): Display order in gallery
         alt_text (str): Accessibility alt text
     """
+    image_variants = serializers.SerializerMethodField()
+    
     class Meta:
         model = ServiceImage
-        fields = ['id', 'image', 'caption', 'is_featured', 'order', 'alt_text']
+        fields = ['id', 'image', 'image_variants', 'caption', 'is_featured', 'order', 'alt_text']
+    
+    def get_image_variants(self, obj):
+        """
+        Get URLs of the resized derivatives of the image.
+        
+        Args:
+            obj (ServiceImage): The ServiceImage instance being serialized
+            
+        Returns:
+            dict: {size: {'width', 'height', 'webp', 'jpeg'}}, empty until generated
+        """
+        return image_variant_urls(obj.image, obj.image_variants, self.context.get('request'))
         
     def to_representation(self, instance):
         """
         Override to_representation to generate absolute image URLs.
         
-        Ensures that image URLs are properly formatted for frontend consumption.
+        Ensures that image URLs are properly formatted for frontend consumption
+        and point at a resized derivative when one is available.
         
         Args:
             instance (ServiceImage): The ServiceImage instance being serialized
@@ -89,10 +112,11 @@ class ServiceImageSerializer(serializers.ModelSerializer):
         """
         representation = super().to_representation(instance)
         request = self.context.get('request')
-        if instance.image and request:
-            representation['image'] = request.build_absolute_uri(instance.image.url)
+        image_url = image_url_for_request(instance.image, instance.image_variants, request, default_size='large')
+        if image_url and request:
+            representation['image'] = request.build_absolute_uri(image_url)
         else:
-            representation['image'] = instance.image.url if instance.image else None
+            representation['image'] = image_url
         return representation
 
 class ServiceAvailabilitySerializer(serializers.ModelSerializer):
@@ -116,7 +140,7 @@ class ServiceAvailabilitySerializer(serializers.ModelSerializer):
         model = ServiceAvailability
         fields = ['id', 'day_of_week', 'day_name', 'start_time', 'end_time', 'is_available']
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for Service model with related data.
     
@@ -157,6 +181,9 @@ class ServiceSerializer(serializers.ModelSerializer):
         inquiry_count (int): Number of inquiries received
         last_activity (DateTime): Last activity timestamp
     """
+    select_related_fields = ('category', 'provider__profile')
+    prefetch_related_fields = ('cities', 'images', 'availability')
+    
     category_name = serializers.CharField(source='category.title', read_only=True)
     provider = serializers.SerializerMethodField()
     cities = CitySerializer(many=True, read_only=True)
@@ -224,10 +251,13 @@ class ServiceSerializer(serializers.ModelSerializer):
         main_image = obj.main_image  # Uses the property we defined in the model
         if main_image and main_image.image:
             request = self.context.get('request')
+            image_url = image_url_for_request(
+                main_image.image, main_image.image_variants, request, default_size='medium'
+            )
             if request:
-                return request.build_absolute_uri(main_image.image.url)
+                return request.build_absolute_uri(image_url)
             else:
-                return main_image.image.url
+                return image_url
         return None
     
     def to_representation(self, instance):
@@ -282,7 +312,7 @@ class ServiceSerializer(serializers.ModelSerializer):
         else:
             representation['last_activity'] = None
         
-        return representation
+        return self.prune_representation(representation)
     
     def create(self, validated_data):
         """
@@ -331,9 +361,29 @@ class ServiceSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            if hasattr(obj, 'current_user_favorites'):
+                return bool(obj.current_user_favorites)
             return Favorite.objects.filter(user=request.user, service=obj).exists()
         return False
 
+    @classmethod
+    def get_prefetch_related_fields(cls, context=None):
+        """
+        Add the current user's favorite for each service when eager loading.
+        
+        get_is_favorited() reads the prefetched 'current_user_favorites' list
+        instead of running an EXISTS query per service.
+        """
+        lookups = super().get_prefetch_related_fields(context)
+        request = (context or {}).get('request')
+        if request and request.user.is_authenticated:
+            lookups.append(Prefetch(
+                'favorited_by',
+                queryset=Favorite.objects.filter(user=request.user),
+                to_attr='current_user_favorites'
+            ))
+        return lookups
+
 class ServiceDetailSerializer(ServiceSerializer):
     """
     Extended serializer for detailed service information.
@@ -349,6 +399,69 @@ class ServiceDetailSerializer(ServiceSerializer):
     class Meta(ServiceSerializer.Meta):
         fields = ServiceSerializer.Meta.fields + ['reviews']
 
+class ServiceSummarySerializer(SummarySerializer):
+    """
+    Compact service rows for listings (?shape=summary).
+    
+    Rendered from queryset.values(); the featured image comes from a
+    subquery, so a page of services costs one query.
+    
+    Fields:
+        id (int): Unique identifier for the service
+        title (str): Title/name of the service
+        slug (str): URL-friendly version of the title
+        price (Decimal): Price of the service
+        discount_price (Decimal): Discounted price if applicable
+        status (str): Current status of the service listing
+        is_featured (bool): Whether this is a featured/promoted service
+        average_rating (Decimal): Average user rating for this service
+        reviews_count (int): Number of reviews for this service
+        category_name (str): Name of the service category
+        provider_id (int): ID of the provider
+        provider_name (str): Provider's full name
+        image (str): Featured image URL
+    """
+    values_fields = (
+        'id', 'title', 'slug', 'price', 'discount_price', 'status', 'is_featured',
+        'average_rating', 'reviews_count', 'provider_id'
+    )
+    values_expressions = {
+        'category_name': F('category__title'),
+        'provider_name': Concat(
+            'provider__first_name', Value(' '), 'provider__last_name', output_field=CharField()
+        ),
+        'image_name': Subquery(
+            ServiceImage.objects.filter(service=OuterRef('pk'), is_featured=True).values('image')[:1]
+        ),
+    }
+    
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    slug = serializers.CharField(read_only=True)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    discount_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    status = serializers.CharField(read_only=True)
+    is_featured = serializers.BooleanField(read_only=True)
+    average_rating = serializers.DecimalField(max_digits=3, decimal_places=2, read_only=True)
+    reviews_count = serializers.IntegerField(read_only=True)
+    category_name = serializers.CharField(read_only=True)
+    provider_id = serializers.IntegerField(read_only=True)
+    provider_name = serializers.SerializerMethodField()
+    image = serializers.SerializerMethodField()
+    
+    def get_provider_name(self, row):
+        """Full name with the separator trimmed when a name part is blank"""
+        return (row.get('provider_name') or '').strip()
+    
+    def get_image(self, row):
+        """Absolute URL of the featured image, or None"""
+        if not row.get('image_name'):
+            return None
+        image_url = default_storage.url(row['image_name'])
+        request = self.context.get('request')
+        return request.build_absolute_uri(image_url) if request else image_url
+
+
 class FavoriteSerializer(serializers.ModelSerializer):
     """
     Serializer for Favorite model.
@@ -0,0 +1,201 @@
+"""
+BUFFERED SERVICE VIEW COUNTER
+
+Coalesces service page views into periodic bulk UPDATEs.
+
+`POST /api/services/{slug}/increment_view/` used to load the full service and
+save `view_count` on every page view, so a popular service's row was locked
+by a stream of single-row UPDATEs. Views are now added to an in-memory buffer
+in each worker process, keyed by (service, day), and written out at most once
+per FLUSH_INTERVAL_SECONDS (or sooner when the buffer grows past
+MAX_BUFFERED_SERVICES):
+
+    UPDATE services_service SET view_count = view_count + <delta> WHERE id IN (...)
+    UPDATE services_servicedailyview SET views = views + <delta> WHERE ...
+
+Services with the same delta share one statement, so a flush costs a few
+queries however many views it carries. The flush runs on the request that
+finds it due and once more when the worker exits, so counts lag by at most
+the flush interval while there is traffic.
+
+Repeat views of the same service by the same viewer (user, session or IP)
+within DEDUPE_SECONDS are counted once; set it to 0 to count every view.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.common.app_settings import setting_getter
+
+from .models import Service, ServiceDailyView
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SERVICE_VIEW_SETTINGS = {
+    'FLUSH_INTERVAL_SECONDS': 30,
+    'MAX_BUFFERED_SERVICES': 500,
+    'DEDUPE_SECONDS': 30 * 60,
+}
+
+
+get_service_view_setting = setting_getter('SERVICE_VIEWS', DEFAULT_SERVICE_VIEW_SETTINGS)
+
+
+def get_viewer_key(request):
+    """
+    Identify who is viewing, for repeat-view deduplication.
+
+    Args:
+        request (Request): The incoming request
+
+    Returns:
+        str or None: 'user:<id>', 'session:<key>' or 'ip:<address>'
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f'session:{session.session_key}'
+    address = request.META.get('REMOTE_ADDR')
+    return f'ip:{address}' if address else None
+
+
+class ServiceViewCounter:
+    """
+    Per-process buffer of service view increments.
+
+    Example:
+        >>> service_view_counter.record(service.id, viewer='user:7')
+        True
+        >>> service_view_counter.flush()
+        1
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, service_id, viewer=None):
+        """
+        Count one view of a service, flushing the buffer if it is due.
+
+        Args:
+            service_id (int): The viewed service
+            viewer (str, optional): Viewer key from get_viewer_key()
+
+        Returns:
+            bool: False if the view was a repeat and was not counted
+        """
+        dedupe_seconds = get_service_view_setting('DEDUPE_SECONDS')
+        if dedupe_seconds and viewer is not None:
+            if not cache.add(f'service_view_seen:{service_id}:{viewer}', 1, dedupe_seconds):
+                return False
+
+        with self._lock:
+            self._pending[(service_id, timezone.localdate())] += 1
+            due = (
+                time.monotonic() - self._last_flush >= get_service_view_setting('FLUSH_INTERVAL_SECONDS')
+                or len(self._pending) >= get_service_view_setting('MAX_BUFFERED_SERVICES')
+            )
+        if due:
+            self.flush()
+        return True
+
+    def pending_views(self):
+        """Return the number of views waiting to be written."""
+        with self._lock:
+            return sum(self._pending.values())
+
+    def flush(self):
+        """
+        Write the buffered views to Service.view_count and ServiceDailyView.
+
+        On a database error the views are put back into the buffer and retried
+        on the next flush.
+
+        Returns:
+            int: Number of views written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            self.write(pending)
+        except Exception as e:
+            logger.error(f"Failed to flush {sum(pending.values())} service views: {str(e)}")
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+        return sum(pending.values())
+
+    @staticmethod
+    def write(pending):
+        """
+        Apply a batch of (service_id, date) -> views increments.
+
+        Args:
+            pending (Counter): Views keyed by (service_id, date)
+        """
+        totals = Counter()
+        for (service_id, day), views in pending.items():
+            totals[service_id] += views
+
+        with transaction.atomic():
+            existing = set(Service.objects.filter(pk__in=totals).values_list('pk', flat=True))
+            totals = {service_id: views for service_id, views in totals.items() if service_id in existing}
+            for delta, service_ids in group_by_delta(totals).items():
+                Service.objects.filter(pk__in=service_ids).update(view_count=F('view_count') + delta)
+
+            daily = {key: views for key, views in pending.items() if key[0] in existing}
+            # Make sure every (service, day) row exists, then add to all of them
+            ServiceDailyView.objects.bulk_create(
+                [ServiceDailyView(service_id=service_id, date=day) for service_id, day in daily],
+                ignore_conflicts=True,
+            )
+            for delta, keys in group_by_delta(daily).items():
+                rows = Q()
+                for service_id, day in keys:
+                    rows |= Q(service_id=service_id, date=day)
+                ServiceDailyView.objects.filter(rows).update(views=F('views') + delta)
+
+
+def group_by_delta(increments):
+    """
+    Group keys that get the same increment so they share one UPDATE.
+
+    Args:
+        increments (dict): key -> increment
+
+    Returns:
+        dict: increment -> list of keys
+    """
+    groups = defaultdict(list)
+    for key, delta in increments.items():
+        groups[delta].append(key)
+    return groups
+
+
+service_view_counter = ServiceViewCounter()
+
+
+@atexit.register
+def flush_on_exit():
+    """Write whatever is still buffered when the worker shuts down."""
+    try:
+        service_view_counter.flush()
+    except Exception as e:
+        logger.error(f"Failed to flush service views on exit: {str(e)}")
@@ -19,9 +19,12 @@ from .models import City, ServiceCategory, Service, ServiceImage, ServiceAvailab
 from .serializers import (
     CitySerializer, ServiceCategorySerializer, ServiceSerializer,
     ServiceDetailSerializer, ServiceImageSerializer, ServiceAvailabilitySerializer,
-    FavoriteSerializer
+    FavoriteSerializer, ServiceSummarySerializer
 )
 from .filters import ServiceFilter
+from apps.common.eager_loading import EagerLoadingViewSetMixin
+from .view_counter import get_viewer_key, service_view_counter
+from apps.common.sparse_fields import SummaryShapeViewSetMixin
 from apps.common.permissions import IsProvider, IsAdmin, IsOwnerOrAdmin
 from django.db.models import Q, Avg, Count
 from django.core.paginator import Paginator
@@ -141,7 +144,7 @@ class ServiceCategoryViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAuthenticated]
         return [permission() for permission in permission_classes]
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(SummaryShapeViewSetMixin, EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Service model.
     
@@ -149,7 +152,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
     search, and management capabilities.
     
     Endpoints:
-    - GET /api/services/ - List services with filtering
+    - GET /api/services/ - List services with filtering (?fields=, ?expand=, ?shape=summary)
     - GET /api/services/{slug}/ - Retrieve specific service details
     - POST /api/services/ - Create new service (providers/admins)
     - PUT/PATCH /api/services/{slug}/ - Update service (owners/admins)
@@ -173,6 +176,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
     """
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
+    summary_serializer_class = ServiceSummarySerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'status', 'provider']
     search_fields = ['title', 'description', 'category__title', 'tags']
@@ -211,7 +215,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Returns:
             QuerySet: Filtered Service queryset
         """
-        queryset = Service.objects.select_related('category', 'provider').prefetch_related('cities', 'images')
+        queryset = Service.objects.select_related('category', 'provider')
         
         # Filter by status for non-admin users
         user = self.request.user
@@ -429,7 +433,14 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Returns:
             Response: Paginated response with enhanced metadata
         """
-        queryset = self.get_queryset()
+        # Compact listing rows straight from values()
+        if self.wants_summary():
+            response = self.summary_list_response(self.get_queryset())
+            if isinstance(response.data, dict):
+                response.data['total_services'] = response.data['count']
+            return response
+        
+        queryset = self.eager_load(self.get_queryset())
         
         # Apply pagination
         page = self.paginate_queryset(queryset)
@@ -560,7 +571,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({"detail": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
             
-        queryset = Service.objects.filter(provider=request.user)
+        queryset = self.eager_load(Service.objects.filter(provider=request.user))
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -592,7 +603,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Returns:
             Response: HTTP response with featured services
         """
-        queryset = Service.objects.filter(status='active', is_featured=True)
+        queryset = self.eager_load(Service.objects.filter(status='active', is_featured=True))
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -638,6 +649,8 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Increment view count for a service.
         
         Tracks service profile views for analytics and ranking purposes.
+        Views are buffered per worker and flushed in bulk, and repeat views
+        by the same viewer are counted once (see apps.services.view_counter).
         
         Args:
             request (Request): The HTTP request object
@@ -646,13 +659,19 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Returns:
             Response: HTTP response with success status
         """
-        """Increment view count for a service"""
-        service = self.get_object()
-        service.view_count += 1
-        service.save(update_fields=['view_count'])
-        return Response({"status": "success"})
+        # Only the id is needed; the view itself is buffered and written in bulk
+        services = Service.objects.all()
+        if not request.user.is_authenticated or request.user.role != 'admin':
+            services = services.filter(status='active')
+        lookup = Q(slug=slug) | Q(pk=int(slug)) if slug.isdigit() else Q(slug=slug)
+        service_id = services.filter(lookup).values_list('pk', flat=True).first()
+        if service_id is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        
+        counted = service_view_counter.record(service_id, viewer=get_viewer_key(request))
+        return Response({"status": "success", "counted": counted})
 
-class FavoriteViewSet(viewsets.ModelViewSet):
+class FavoriteViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Favorite model.
     
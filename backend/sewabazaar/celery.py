@@ -53,6 +53,36 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=5, minute=0),
         'kwargs': {'grace_period': 1, 'dry_run': False}
     },
+    
+    # Drain the outbound email queue every minute
+    'send-queued-emails': {
+        'task': 'apps.notifications.tasks.send_queued_emails_task',
+        'schedule': 60.0,
+    },
+    
+    # Release expired booking slot holds every minute
+    'release-expired-slot-holds': {
+        'task': 'apps.bookings.tasks.release_expired_slot_holds_task',
+        'schedule': 60.0,
+    },
+    
+    # Mark overdue reward vouchers as expired every 15 minutes
+    'expire-reward-vouchers': {
+        'task': 'apps.rewards.tasks.expire_reward_vouchers_task',
+        'schedule': crontab(minute='*/15'),
+    },
+    
+    # Purge old read notifications and fix drifted unread counters daily at 3:30 AM
+    'purge-read-notifications': {
+        'task': 'apps.notifications.tasks.purge_read_notifications_task',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    
+    # Fix drift in cached service and provider ratings daily at 4:30 AM
+    'reconcile-rating-totals': {
+        'task': 'apps.reviews.tasks.reconcile_rating_totals_task',
+        'schedule': crontab(hour=4, minute=30),
+    },
 }
 
 # Configure task queues
@@ -163,10 +163,31 @@ if os.environ.get('USE_SUPABASE_STORAGE') == 'True':
     SUPABASE_URL = os.environ.get('SUPABASE_URL')
     SUPABASE_KEY = os.environ.get('SUPABASE_KEY')
     SUPABASE_BUCKET = os.environ.get('SUPABASE_BUCKET', 'sewabazaar')
+    # Uploads above the threshold are streamed in resumable 6MB chunks (sewabazaar.storage)
+    SUPABASE_STORAGE = {
+        'CHUNK_SIZE': 6 * 1024 * 1024,
+        'RESUMABLE_THRESHOLD': int(os.environ.get('SUPABASE_RESUMABLE_THRESHOLD', 6 * 1024 * 1024)),
+        'CHUNK_RETRIES': 3,
+    }
 else:
     # Use local file storage
     DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# Multi-file uploads (apps.common.uploads)
+BATCH_UPLOAD = {
+    'MAX_WORKERS': int(os.environ.get('BATCH_UPLOAD_MAX_WORKERS', 4)),  # Concurrent storage writes per request
+}
+
+# Resized image derivatives (apps.common.images)
+IMAGE_DERIVATIVES = {
+    'SIZES': {'small': 200, 'medium': 600, 'large': 1200},  # Derivative widths in pixels
+    'WEBP_QUALITY': 80,
+    'JPEG_QUALITY': 82,
+    # 'thread' (in-process pool), 'celery' (generate_image_derivatives_task) or 'sync'
+    'DISPATCH': os.environ.get('IMAGE_DERIVATIVES_DISPATCH', 'thread'),
+    'THREAD_WORKERS': 2,
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -179,8 +200,9 @@ EARNINGS_REQUIRE_PAID = os.environ.get('EARNINGS_REQUIRE_PAID', 'true').lower()
 
 # REST Framework settings
 REST_FRAMEWORK = {
+    # JWTAuthentication with the user resolved from a cached snapshot
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -201,10 +223,11 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
+    # Sliding-window counters (apps.common.throttling), O(1) per request
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.ScopedRateThrottle'
+        'apps.common.throttling.SlidingWindowAnonRateThrottle',
+        'apps.common.throttling.SlidingWindowUserRateThrottle',
+        'apps.common.throttling.SlidingWindowScopedRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '1000/hour',    # Increased from 100/day to 1000/hour
@@ -259,6 +282,15 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', 'sewabazaar.contact@gmail.co
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'SewaBazaar <noreply@sewabazaar.com>')
 
+# Outbound email queue (apps.notifications.email_queue)
+EMAIL_QUEUE = {
+    'BATCH_SIZE': int(os.environ.get('EMAIL_QUEUE_BATCH_SIZE', 50)),
+    'MAX_ATTEMPTS': int(os.environ.get('EMAIL_QUEUE_MAX_ATTEMPTS', 5)),
+    'RETRY_BACKOFF_SECONDS': 60,       # First retry after 1 minute, doubling each attempt
+    'MAX_BACKOFF_SECONDS': 60 * 60,    # Never wait more than an hour between attempts
+    'LEASE_SECONDS': 60 * 5,           # Reclaim rows held by a crashed worker after 5 minutes
+}
+
 # Frontend URL for password reset links
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
@@ -268,6 +300,91 @@ KHALTI_PUBLIC_KEY = os.environ.get('KHALTI_PUBLIC_KEY', '8b58c9047e584751beaddea
 KHALTI_SECRET_KEY = os.environ.get('KHALTI_SECRET_KEY', '2d71118e5d26404fb3b1fe1fd386d33a')
 KHALTI_BASE_URL = os.environ.get('KHALTI_BASE_URL', 'https://dev.khalti.com/api/v2')
 
+# Khalti HTTP client (apps.bookings.gateway_client)
+KHALTI_HTTP = {
+    'CONNECT_TIMEOUT': float(os.environ.get('KHALTI_CONNECT_TIMEOUT', 3.05)),  # Fail fast if Khalti is unreachable
+    'READ_TIMEOUT': float(os.environ.get('KHALTI_READ_TIMEOUT', 15)),
+    'LOOKUP_MAX_RETRIES': 2,           # Extra attempts for idempotent lookups only
+    'RETRY_BACKOFF': 0.5,              # Base seconds for jittered exponential backoff
+    'POOL_MAXSIZE': 10,                # Pooled keep-alive connections per host
+    'BREAKER_FAILURE_THRESHOLD': 5,    # Consecutive failures before the circuit opens
+    'BREAKER_RESET_TIMEOUT': 30,       # Seconds before a trial call is allowed again
+}
+
+# Voucher QR code cache (apps.rewards.qr_codes)
+VOUCHER_QR = {
+    'CACHE_TIMEOUT': 7 * 24 * 60 * 60,  # Rendered PNGs are content-addressed, so they never go stale
+    'BROWSER_MAX_AGE': 24 * 60 * 60,    # Cache-Control max-age of the QR PNG endpoint
+    'BOX_SIZE': 10,                     # Pixels per QR module
+    'BORDER': 4,                        # Quiet zone in modules
+    'SIGNED_URL_MAX_AGE': 60 * 60,      # qr_code_url signatures last one to two of these windows
+}
+
+# Bulk voucher issuance (apps.rewards.issuance)
+VOUCHER_ISSUANCE = {
+    'BATCH_SIZE': 500,        # Vouchers inserted (and points charged) per transaction
+    'MAX_CODE_ATTEMPTS': 5,   # Insert rounds before giving up on colliding codes
+}
+
+# Voucher expiry sweep (RewardVoucher.objects.update_expired_vouchers)
+VOUCHER_EXPIRY = {
+    'BATCH_SIZE': 1000,  # Vouchers marked expired per UPDATE
+}
+
+# Cached review eligibility (apps.reviews.services.ReviewEligibilityService)
+REVIEW_ELIGIBILITY = {
+    'CACHE_TIMEOUT': 15 * 60,  # Per (customer, provider); invalidated by booking/review signals
+}
+
+# Old read notification purge (apps.notifications.retention)
+NOTIFICATION_RETENTION = {
+    'READ_RETENTION_DAYS': 90,  # Read notifications older than this are deleted; unread ones are kept
+    'BATCH_SIZE': 1000,  # Notifications deleted per chunk
+}
+
+# In-app notification fan-out (apps.notifications.dispatch)
+NOTIFICATION_DISPATCH = {
+    'PREFERENCE_CACHE_TIMEOUT': 10 * 60,  # Per-user type preferences; settings saves invalidate earlier
+    'BATCH_SIZE': 500,  # Notifications per bulk INSERT / broadcast chunk
+    'REALTIME_PUSH': True,  # Push new notifications to the recipients' user_<id> channel groups
+}
+
+# Expired booking auto-cancellation (apps.bookings.expiry)
+BOOKING_EXPIRY = {
+    'GRACE_PERIOD_DAYS': 1,  # Days after the booking date before pending/confirmed bookings are cancelled
+    'BATCH_SIZE': 500,  # Bookings cancelled (slots released, notifications sent) per transaction
+}
+
+# Buffered service view counter (apps.services.view_counter)
+SERVICE_VIEWS = {
+    'FLUSH_INTERVAL_SECONDS': 30,  # Buffered views are written at most this often per worker
+    'MAX_BUFFERED_SERVICES': 500,  # Flush early once this many (service, day) pairs are pending
+    'DEDUPE_SECONDS': 30 * 60,  # Repeat views by the same viewer count once; 0 counts every view
+}
+
+# Authenticated user snapshots (apps.accounts.authentication)
+AUTH_USER_CACHE = {
+    'TIMEOUT': 60,  # Seconds; user/profile saves invalidate earlier
+}
+
+# API rate throttles (apps.common.throttling)
+API_THROTTLE = {
+    'CACHE_ALIAS': 'throttle',  # Cache holding the per-window request counters
+}
+
+# Realtime messaging consumer (apps.messaging.consumers)
+MESSAGING_REALTIME = {
+    'TYPING_COALESCE_MS': 1000,  # Repeated typing frames per conversation are broadcast once per window
+    'MEMBERSHIP_RELOAD_SECONDS': 5,  # Throttle for reloading a socket's conversations on unknown ids
+}
+
+# Booking slot holds (apps.bookings.reservations)
+SLOT_RESERVATION = {
+    'HOLD_TTL_SECONDS': 10 * 60,       # Seat held while the customer fills in checkout
+    'MAX_HOLD_TTL_SECONDS': 30 * 60,   # Upper bound for a single hold or extension
+    'SWEEP_BATCH_SIZE': 500,           # Expired holds released per DELETE/UPDATE round
+}
+
 # PHASE 1 NEW SETTINGS: Feature Flags for gradual rollout
 FEATURE_FLAGS = {
     # Phase 1 Features
@@ -349,6 +466,36 @@ CRONJOBS = [
         'grace_period': 1,
         'verbosity': 1,
     }),
+    
+    # Reconcile Khalti payments whose verification was deferred - Every 10 minutes
+    ('*/10 * * * *', 'django.core.management.call_command', ['reconcile_khalti_payments'], {
+        'verbosity': 1,
+    }),
+    
+    # Deliver queued outbound emails - Every minute
+    ('* * * * *', 'django.core.management.call_command', ['send_queued_emails'], {
+        'verbosity': 0,
+    }),
+    
+    # Release expired booking slot holds - Every minute
+    ('* * * * *', 'django.core.management.call_command', ['release_expired_slot_holds'], {
+        'verbosity': 0,
+    }),
+    
+    # Mark overdue reward vouchers as expired - Every 15 minutes
+    ('*/15 * * * *', 'django.core.management.call_command', ['expire_vouchers'], {
+        'verbosity': 0,
+    }),
+    
+    # Purge old read notifications and fix drifted unread counters - Daily at 3:30 AM
+    ('30 3 * * *', 'django.core.management.call_command', ['purge_read_notifications'], {
+        'verbosity': 1,
+    }),
+    
+    # Fix drift in cached service and provider ratings - Daily at 4:30 AM
+    ('30 4 * * *', 'django.core.management.call_command', ['reconcile_ratings'], {
+        'verbosity': 1,
+    }),
 ]
 
 # Crontab configuration 
@@ -366,6 +513,15 @@ CACHES = {
         'OPTIONS': {
             'MAX_ENTRIES': 1000,
         }
+    },
+    # API throttle counters, kept apart so they never evict analytics entries.
+    # Use a shared backend (Redis/Memcached) when running several workers.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sewabazaar-throttle',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        }
     }
 }
 
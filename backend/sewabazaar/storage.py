@@ -1,20 +1,60 @@
+import base64
+import logging
 import os
 import uuid
 import mimetypes
+import requests
 from django.conf import settings
 from django.core.files.storage import Storage
 from django.core.files.base import ContentFile
 from supabase import create_client, Client
 
+from apps.common.app_settings import setting_getter
+
+logger = logging.getLogger(__name__)
+
+
+# Supabase resumable (TUS) uploads require every chunk except the last to be exactly 6MB
+DEFAULT_SUPABASE_STORAGE_SETTINGS = {
+    'CHUNK_SIZE': 6 * 1024 * 1024,
+    'RESUMABLE_THRESHOLD': 6 * 1024 * 1024,   # Larger files use chunked resumable uploads
+    'CHUNK_RETRIES': 3,                       # Resume attempts per chunk after a network error
+    'TIMEOUT': (3.05, 60),                    # (connect, read) seconds per upload request
+}
+
+
+get_supabase_storage_setting = setting_getter('SUPABASE_STORAGE', DEFAULT_SUPABASE_STORAGE_SETTINGS)
+
+
 class SupabaseStorage(Storage):
     """
-    Custom storage backend for Supabase
+    Custom storage backend for Supabase.
+
+    Small files are uploaded in a single request. Files larger than
+    SUPABASE_STORAGE['RESUMABLE_THRESHOLD'] are streamed with Supabase's
+    resumable (TUS) upload endpoint one chunk at a time, so an upload is never
+    held in memory as a whole and an interrupted chunk resumes from the last
+    offset the server acknowledged.
+
+    move() and copy() are performed server-side and transfer no file data.
     """
     def __init__(self):
+        """
+        Initialize the Supabase storage backend.
+
+        Sets up the Supabase client, a pooled HTTP session for chunked uploads,
+        and ensures the storage bucket exists.
+        """
         self.supabase_url = settings.SUPABASE_URL
         self.supabase_key = settings.SUPABASE_KEY
         self.bucket_name = settings.SUPABASE_BUCKET
         self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+        self.resumable_upload_url = f"{self.supabase_url.rstrip('/')}/storage/v1/upload/resumable"
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.supabase_key}',
+            'apikey': self.supabase_key,
+        })
         
         # Create bucket if it doesn't exist
         try:
@@ -23,6 +63,19 @@ class SupabaseStorage(Storage):
             self.supabase.storage.create_bucket(self.bucket_name, {'public': True})
     
     def _save(self, name, content):
+        """
+        Save a file to Supabase storage.
+
+        Generates a unique filename to avoid collisions and uploads the file,
+        streaming it in chunks when it is larger than the resumable threshold.
+
+        Args:
+            name (str): The original file name (its folder is kept)
+            content (File): The file content to upload
+
+        Returns:
+            str: The unique path of the uploaded file
+        """
         # Generate a unique filename to avoid collisions
         file_ext = os.path.splitext(name)[1]
         unique_name = f"{uuid.uuid4().hex}{file_ext}"
@@ -39,20 +92,134 @@ class SupabaseStorage(Storage):
         if not content_type:
             content_type = 'application/octet-stream'
         
-        # Upload file to Supabase
-        file_data = content.read()
-        self.supabase.storage.from_(self.bucket_name).upload(
-            unique_path, 
-            file_data,
-            {"content-type": content_type}
-        )
+        if hasattr(content, 'seek'):
+            content.seek(0)
+
+        if content.size is not None and content.size > get_supabase_storage_setting('RESUMABLE_THRESHOLD'):
+            self._resumable_upload(unique_path, content, content_type)
+        else:
+            # Upload file to Supabase in a single request
+            file_data = content.read()
+            self.supabase.storage.from_(self.bucket_name).upload(
+                unique_path,
+                file_data,
+                {"content-type": content_type}
+            )
         
         return unique_path
     
+    def _resumable_upload(self, path, content, content_type):
+        """
+        Stream a file to Supabase using the resumable (TUS) upload protocol.
+
+        Only one chunk is read into memory at a time. When a chunk fails with a
+        network error the upload's offset is fetched from the server and the
+        upload continues from there, up to CHUNK_RETRIES times per chunk.
+
+        Args:
+            path (str): Destination path inside the bucket
+            content (File): Seekable file content to upload
+            content_type (str): MIME type stored with the object
+
+        Raises:
+            requests.exceptions.RequestException: If the upload cannot be completed
+        """
+        chunk_size = get_supabase_storage_setting('CHUNK_SIZE')
+        max_retries = get_supabase_storage_setting('CHUNK_RETRIES')
+        timeout = get_supabase_storage_setting('TIMEOUT')
+        size = content.size
+
+        metadata = {
+            'bucketName': self.bucket_name,
+            'objectName': path,
+            'contentType': content_type,
+            'cacheControl': '3600',
+        }
+        response = self.session.post(
+            self.resumable_upload_url,
+            headers={
+                'Tus-Resumable': '1.0.0',
+                'Upload-Length': str(size),
+                'Upload-Metadata': ','.join(
+                    f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items()
+                ),
+                'x-upsert': 'false',
+            },
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        upload_url = requests.compat.urljoin(self.resumable_upload_url, response.headers['Location'])
+
+        offset = 0
+        retries = 0
+        while offset < size:
+            content.seek(offset)
+            chunk = content.read(min(chunk_size, size - offset))
+            try:
+                response = self.session.patch(
+                    upload_url,
+                    data=chunk,
+                    headers={
+                        'Tus-Resumable': '1.0.0',
+                        'Upload-Offset': str(offset),
+                        'Content-Type': 'application/offset+octet-stream',
+                    },
+                    timeout=timeout,
+                )
+                response.raise_for_status()
+                offset = int(response.headers['Upload-Offset'])
+                retries = 0
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                retries += 1
+                if retries > max_retries:
+                    raise
+                logger.warning(f"Chunk upload of {path} failed at offset {offset}, resuming: {str(e)}")
+                head = self.session.head(upload_url, headers={'Tus-Resumable': '1.0.0'}, timeout=timeout)
+                head.raise_for_status()
+                offset = int(head.headers['Upload-Offset'])
+
     def _open(self, name, mode='rb'):
+        """
+        Open a file from Supabase storage.
+
+        Args:
+            name (str): The name of the file to open
+            mode (str): The mode to open the file in (default: 'rb')
+
+        Returns:
+            ContentFile: The file content
+        """
         # Download file from Supabase
         response = self.supabase.storage.from_(self.bucket_name).download(name)
         return ContentFile(response)
+
+    def move(self, old_name, new_name):
+        """
+        Move a file to a new path inside the bucket without re-uploading it.
+
+        Args:
+            old_name (str): Current path of the file
+            new_name (str): Destination path
+
+        Returns:
+            str: The destination path
+        """
+        self.supabase.storage.from_(self.bucket_name).move(old_name, new_name)
+        return new_name
+
+    def copy(self, old_name, new_name):
+        """
+        Copy a file to a new path inside the bucket without re-uploading it.
+
+        Args:
+            old_name (str): Path of the file to copy
+            new_name (str): Destination path
+
+        Returns:
+            str: The destination path
+        """
+        self.supabase.storage.from_(self.bucket_name).copy(old_name, new_name)
+        return new_name
     
     def exists(self, name):
         try:
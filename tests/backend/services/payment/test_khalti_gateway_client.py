@@ -0,0 +1,246 @@
+"""
+Tests for the pooled Khalti gateway client and payment reconciliation.
+
+These tests run KhaltiPaymentService against a local stub of the Khalti
+e-Payment API served over HTTP/1.1 keep-alive.
+"""
+
+import json
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.bookings.gateway_client import GatewayClient, reset_gateway_state
+from apps.bookings.models import Booking, Payment, PaymentMethod
+from apps.bookings.services import KhaltiPaymentService
+from apps.services.models import Service, ServiceCategory
+
+
+class StubKhaltiHandler(BaseHTTPRequestHandler):
+    """Minimal Khalti API stub returning scripted responses per path."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        server = self.server
+        server.requests.append((self.path, body, self.client_address[1]))
+
+        script = server.scripts.get(self.path, [])
+        status_code, payload, delay = script.pop(0) if len(script) > 1 else script[0]
+        if delay:
+            time.sleep(delay)
+
+        data = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+LOOKUP_PATH = '/api/v2/epayment/lookup/'
+INITIATE_PATH = '/api/v2/epayment/initiate/'
+
+
+class KhaltiGatewayClientTest(TestCase):
+    """Test cases for pooled sessions, retries and the circuit breaker"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubKhaltiHandler)
+        cls.server.daemon_threads = True
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}/api/v2'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        reset_gateway_state()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_gateway_state()
+        self.server.requests = []
+        self.server.scripts = {}
+        self.settings_override = override_settings(
+            KHALTI_BASE_URL=self.base_url,
+            KHALTI_HTTP={
+                'CONNECT_TIMEOUT': 1,
+                'READ_TIMEOUT': 0.5,
+                'LOOKUP_MAX_RETRIES': 2,
+                'RETRY_BACKOFF': 0,
+                'BREAKER_FAILURE_THRESHOLD': 3,
+                'BREAKER_RESET_TIMEOUT': 60,
+            }
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.provider = User.objects.create_user(
+            username='khaltiprovider', email='provider@khalti.test', password='testpass123', role='provider'
+        )
+        self.customer = User.objects.create_user(
+            username='khalticustomer', email='customer@khalti.test', password='testpass123', role='customer'
+        )
+        category = ServiceCategory.objects.create(title='Cleaning')
+        service = Service.objects.create(
+            provider=self.provider,
+            title='Home Cleaning',
+            slug='home-cleaning-khalti',
+            description='Deep cleaning',
+            price=Decimal('1000.00'),
+            category=category,
+            status='active'
+        )
+        self.booking = Booking.objects.create(
+            service=service,
+            customer=self.customer,
+            status='pending',
+            price=Decimal('1000.00'),
+            total_amount=Decimal('1000.00'),
+            booking_date=timezone.now().date() + timedelta(days=2),
+            booking_time=timezone.now().time().replace(microsecond=0),
+            address='Thamel',
+            city='Kathmandu',
+            phone='9800000000'
+        )
+        PaymentMethod.objects.create(name='Khalti', payment_type='digital_wallet')
+
+    def completed_lookup(self, amount_paisa=113000):
+        return (200, {'pidx': 'pidx_1', 'status': 'Completed', 'total_amount': amount_paisa,
+                      'transaction_id': 'txn_1'}, 0)
+
+    def test_lookups_reuse_one_pooled_connection(self):
+        """Consecutive lookups travel over the same keep-alive connection"""
+        self.server.scripts[LOOKUP_PATH] = [self.completed_lookup()]
+        service = KhaltiPaymentService()
+
+        for _ in range(3):
+            self.assertTrue(service.lookup_payment('pidx_1')['success'])
+        # A fresh service instance shares the module-level session too
+        self.assertTrue(KhaltiPaymentService().lookup_payment('pidx_1')['success'])
+
+        client_ports = {port for _, _, port in self.server.requests}
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(len(client_ports), 1)
+
+    def test_lookup_retries_transient_errors(self):
+        """Idempotent lookups are retried on 503 and succeed once Khalti recovers"""
+        self.server.scripts[LOOKUP_PATH] = [
+            (503, {'detail': 'unavailable'}, 0),
+            (503, {'detail': 'unavailable'}, 0),
+            self.completed_lookup(),
+        ]
+
+        result = KhaltiPaymentService().lookup_payment('pidx_1')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_lookup_read_timeout_is_bounded(self):
+        """A hanging gateway fails within the read timeout instead of 30 seconds"""
+        self.server.scripts[LOOKUP_PATH] = [(200, {}, 1.0)]
+
+        started = time.monotonic()
+        result = KhaltiPaymentService().lookup_payment('pidx_1')
+
+        self.assertFalse(result['success'])
+        self.assertTrue(result['retryable'])
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_initiation_is_not_retried(self):
+        """Payment initiation is sent exactly once even on a retryable status"""
+        self.server.scripts[INITIATE_PATH] = [(503, {'detail': 'unavailable'}, 0)]
+
+        result = KhaltiPaymentService().initiate_payment(
+            self.booking, 'http://example.com/callback', 'http://example.com'
+        )
+
+        self.assertFalse(result['success'])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_circuit_breaker_fails_fast(self):
+        """After repeated failures the breaker stops calls from reaching Khalti"""
+        self.server.scripts[LOOKUP_PATH] = [(503, {'detail': 'unavailable'}, 0)]
+        service = KhaltiPaymentService()
+
+        # Three failed attempts (one lookup with two retries) open the breaker
+        self.assertTrue(service.lookup_payment('pidx_1')['retryable'])
+        self.assertEqual(len(self.server.requests), 3)
+
+        result = service.lookup_payment('pidx_1')
+        self.assertFalse(result['success'])
+        self.assertTrue(result['retryable'])
+        self.assertIn('circuit open', result['exception'])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_unexpected_error_ends_half_open_trial(self):
+        """An error other than a connection failure during the trial call does not wedge the breaker"""
+        self.server.scripts[LOOKUP_PATH] = [self.completed_lookup()]
+        client = GatewayClient('khalti-trial', failure_threshold=1, reset_timeout=0)
+        client.breaker.record_failure()
+
+        with mock.patch.object(client.session, 'post', side_effect=ValueError('bad payload')):
+            with self.assertRaises(ValueError):
+                client.post(f'{self.base_url}/epayment/lookup/', json={'pidx': 'pidx_1'})
+
+        response = client.post(f'{self.base_url}/epayment/lookup/', json={'pidx': 'pidx_1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.breaker.state, 'closed')
+
+    def test_callback_defers_and_reconciliation_completes(self):
+        """An unreachable gateway defers verification; the command completes it later"""
+        self.server.scripts[LOOKUP_PATH] = [(503, {'detail': 'unavailable'}, 0)]
+
+        result = KhaltiPaymentService().process_booking_payment_with_callback(
+            self.booking.id, 'pidx_1', 'txn_1', f'booking_{self.booking.id}', self.customer
+        )
+
+        self.assertTrue(result['pending_verification'])
+        payment = Payment.objects.get(booking=self.booking)
+        self.assertEqual(payment.status, 'processing')
+        self.assertEqual(payment.total_amount, Decimal('1130.00'))
+
+        reset_gateway_state()
+        self.server.scripts[LOOKUP_PATH] = [self.completed_lookup()]
+        call_command('reconcile_khalti_payments', min_age=0, verbosity=0)
+
+        payment.refresh_from_db()
+        self.booking.refresh_from_db()
+        self.assertEqual(payment.status, 'completed')
+        self.assertIsNotNone(payment.paid_at)
+        self.assertEqual(self.booking.status, 'confirmed')
+
+    def test_reconciliation_fails_expired_payments(self):
+        """Payments Khalti reports as expired are marked failed"""
+        Payment.objects.create(
+            booking=self.booking,
+            payment_method=PaymentMethod.objects.get(name='Khalti'),
+            amount=Decimal('1130.00'),
+            total_amount=Decimal('1130.00'),
+            khalti_token='pidx_1',
+            status='processing'
+        )
+        self.server.scripts[LOOKUP_PATH] = [(200, {'pidx': 'pidx_1', 'status': 'Expired', 'total_amount': 113000}, 0)]
+
+        call_command('reconcile_khalti_payments', min_age=0, verbosity=0)
+
+        payment = Payment.objects.get(booking=self.booking)
+        self.assertEqual(payment.status, 'failed')
+        self.assertIn('Expired', payment.failure_reason)
@@ -0,0 +1,139 @@
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import ProviderDocument, User
+from apps.common.uploads import BatchUploadError, BatchUploadService
+
+
+class SlowStorage(FileSystemStorage):
+    """Local storage that simulates remote write latency and tracks concurrency."""
+
+    delay = 0.2
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _save(self, name, content):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return super()._save(name, content)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def pdf(name='licence.pdf', size=1024):
+    return SimpleUploadedFile(name, b'%PDF' + b'0' * size, content_type='application/pdf')
+
+
+class BatchUploadServiceTest(TestCase):
+    """Test cases for concurrent batch uploads"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.provider = User.objects.create_user(
+            username='docprovider', email='provider@docs.test', password='testpass123', role='provider'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.provider)
+
+    def test_files_are_written_concurrently(self):
+        """Writes overlap up to the worker limit instead of running one by one"""
+        storage = SlowStorage(location=self.media_root)
+        files = [(f'batch/file_{i}.pdf', pdf()) for i in range(4)]
+
+        started = time.perf_counter()
+        stored = BatchUploadService.store(files, storage=storage, max_workers=4)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(storage.peak, 4)
+        self.assertLess(elapsed, 4 * SlowStorage.delay)
+        self.assertEqual([item['original_name'] for item in stored], ['licence.pdf'] * 4)
+        self.assertTrue(all(item['duration_ms'] >= SlowStorage.delay * 1000 for item in stored))
+
+    def test_failed_write_discards_stored_files(self):
+        """If one write fails, the files already written are deleted"""
+        storage = FileSystemStorage(location=self.media_root)
+        original_save = FileSystemStorage._save
+
+        def flaky_save(self, name, content):
+            if name.endswith('bad.pdf'):
+                raise OSError('disk full')
+            return original_save(self, name, content)
+
+        with patch.object(FileSystemStorage, '_save', flaky_save):
+            with self.assertRaises(BatchUploadError) as ctx:
+                BatchUploadService.store(
+                    [('batch/good.pdf', pdf()), ('batch/bad.pdf', pdf('bad.pdf')), ('batch/other.pdf', pdf())],
+                    storage=storage
+                )
+
+        self.assertEqual(ctx.exception.stage, 'storage')
+        self.assertIn('disk full', ctx.exception.errors[0])
+        self.assertEqual(storage.listdir('batch')[1], [])
+
+    def test_bulk_upload_creates_documents_in_one_insert(self):
+        """Bulk upload stores every file and inserts all rows with one query"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/auth/provider-documents/bulk_upload/', {
+                'files': [pdf('licence.pdf'), pdf('citizenship.pdf')],
+                'document_types': ['business_license', 'identity_document'],
+                'titles': ['Licence', 'Citizenship'],
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "accounts_providerdocument"')]
+        self.assertEqual(len(inserts), 1)
+        documents = ProviderDocument.objects.filter(provider__user=self.provider).order_by('title')
+        self.assertEqual(documents.count(), 2)
+        self.assertEqual(documents[0].title, 'Citizenship')
+        self.assertEqual(documents[0].file_type, 'application/pdf')
+        self.assertTrue(default_storage.exists(documents[0].file.name))
+        self.assertEqual([timing['file'] for timing in response.data['upload_timings']],
+                         ['licence.pdf', 'citizenship.pdf'])
+
+    def test_bulk_upload_rejects_whole_batch_on_invalid_file(self):
+        """One invalid file rejects the batch before anything is stored"""
+        with patch('apps.common.uploads.BatchUploadService.store') as mock_store:
+            response = self.client.post('/api/auth/provider-documents/bulk_upload/', {
+                'files': [pdf(), SimpleUploadedFile('run.exe', b'MZ', content_type='application/x-msdownload')],
+                'document_types': ['business_license', 'identity_document'],
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data['errors']), 1)
+        mock_store.assert_not_called()
+        self.assertFalse(ProviderDocument.objects.exists())
+
+    def test_bulk_upload_removes_files_when_insert_fails(self):
+        """Stored files are deleted again if the rows cannot be inserted"""
+        with patch.object(ProviderDocument.objects, 'bulk_create', side_effect=RuntimeError('db down')):
+            response = self.client.post('/api/auth/provider-documents/bulk_upload/', {
+                'files': [pdf(), pdf('second.pdf')],
+                'document_types': ['business_license', 'identity_document'],
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(ProviderDocument.objects.exists())
+        self.assertEqual(default_storage.listdir(f'documents/{self.provider.id}/identity_document')[1], [])
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.authentication import UserSnapshotCache
+from apps.accounts.models import Profile, User
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    """Test cases for JWT authentication backed by the user snapshot cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='snapshotuser', email='snapshot@auth.test', password='testpass123', role='provider'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_user_and_profile_come_from_cache(self):
+        """After the first lookup the user and profile flags cost no queries"""
+        UserSnapshotCache.get_user(self.user.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            user = UserSnapshotCache.get_user(self.user.pk)
+            role, approved = user.role, user.profile.is_approved
+
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertEqual((user.pk, role, approved), (self.user.pk, 'provider', False))
+        # Fields outside the snapshot are loaded on demand
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_me_endpoint_reads_user_and_profile_from_cache(self):
+        """Rendering the current user never goes back to the user or profile table"""
+        self.client.get('/api/auth/users/me/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/users/me/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'snapshot@auth.test')
+        tables = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('FROM "accounts_user"', tables)
+        self.assertNotIn('FROM "accounts_profile"', tables)
+
+        user = UserSnapshotCache.get_user(self.user.pk)
+        self.assertEqual(user.get_deferred_fields(), {'password'})
+        self.assertEqual(user.profile.get_deferred_fields(), set())
+
+    def test_saves_invalidate_the_snapshot(self):
+        """User and profile saves are visible on the next request"""
+        UserSnapshotCache.get_user(self.user.pk)
+
+        self.user.profile.is_approved = True
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.save()
+        self.assertTrue(UserSnapshotCache.get_user(self.user.pk).profile.is_approved)
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.client.get('/api/auth/users/me/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_login_does_not_resave_unchanged_profile(self):
+        """Saving the user only writes a profile that was changed"""
+        user = User.objects.get(pk=self.user.pk)
+        user.profile  # loaded but untouched
+
+        with CaptureQueriesContext(connection) as queries:
+            user.save(update_fields=['last_login'])
+        self.assertFalse([query for query in queries.captured_queries if 'accounts_profile' in query['sql']])
+
+        user.profile.bio = 'Plumber for 10 years'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "accounts_profile"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"is_approved"', updates[0])
+        user.profile.refresh_from_db()
+        self.assertEqual(user.profile.bio, 'Plumber for 10 years')
+
+    def test_benchmark_command(self):
+        """benchmark_authentication reports both classes"""
+        stdout = StringIO()
+        call_command('benchmark_authentication', '--requests', '5', stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn('JWTAuthentication:', output)
+        self.assertIn('CachedJWTAuthentication: ', output)
+
+    def test_assigned_deferred_profile_field_is_saved(self):
+        """A profile field that was deferred on load and assigned later is written"""
+        profile = Profile.objects.only('id', 'user_id', 'is_approved').get(user=self.user)
+        profile.city  # loaded on access, unchanged
+        self.assertFalse(profile.save_if_changed())
+
+        profile.bio = 'Electrician'
+        self.assertTrue(profile.save_if_changed())
+        self.assertEqual(Profile.objects.get(pk=profile.pk).bio, 'Electrician')
@@ -0,0 +1,231 @@
+"""
+Tests for chunked Supabase uploads and server-side portfolio file moves.
+
+SupabaseStorage runs against a local in-memory stand-in for the Supabase
+Storage API, so every byte sent to "Supabase" can be counted.
+"""
+
+import base64
+import json
+import threading
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import PortfolioMedia, PortfolioProject, User
+
+BUCKET = 'sewabazaar'
+PREFIX = '/storage/v1'
+
+
+class StubStorageHandler(BaseHTTPRequestHandler):
+    """In-memory stand-in for the Supabase Storage REST API."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _reply(self, status_code, payload=None, headers=None):
+        data = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status_code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path[len(PREFIX):]
+        if path == f'/bucket/{BUCKET}':
+            return self._reply(200, {
+                'id': BUCKET, 'name': BUCKET, 'owner': '', 'public': True,
+                'created_at': '2026-01-01T00:00:00Z', 'updated_at': '2026-01-01T00:00:00Z',
+                'file_size_limit': None, 'allowed_mime_types': None,
+            })
+        key = path[len(f'/object/{BUCKET}/'):]
+        data = self.server.objects[key]
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        path = self.path[len(PREFIX):]
+        body = self._body()
+        self.server.log.append(('POST', path, len(body)))
+
+        if path == '/upload/resumable':
+            metadata = dict(item.split(' ') for item in self.headers['Upload-Metadata'].split(','))
+            upload_id = uuid.uuid4().hex
+            self.server.uploads[upload_id] = {
+                'key': base64.b64decode(metadata['objectName']).decode(),
+                'length': int(self.headers['Upload-Length']),
+                'data': b'',
+            }
+            return self._reply(201, headers={'Location': f'{PREFIX}/upload/resumable/{upload_id}'})
+
+        if path in ('/object/move', '/object/copy'):
+            payload = json.loads(body)
+            data = self.server.objects[payload['sourceKey']]
+            self.server.objects[payload['destinationKey']] = data
+            if path == '/object/move':
+                del self.server.objects[payload['sourceKey']]
+            return self._reply(200, {'message': 'Successfully moved'})
+
+        # Single-request multipart upload
+        message = BytesParser(policy=default_policy).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        part = next(p for p in message.iter_parts() if p.get_param('name', header='content-disposition') == 'file')
+        self.server.objects[path[len(f'/object/{BUCKET}/'):]] = part.get_payload(decode=True)
+        return self._reply(200, {'Key': path})
+
+    def do_PATCH(self):
+        upload = self.server.uploads[self.path.rsplit('/', 1)[-1]]
+        body = self._body()
+        self.server.log.append(('PATCH', self.path, len(body)))
+
+        if self.server.drop_next_patch:
+            # Simulate a connection lost after the server stored half the chunk
+            self.server.drop_next_patch = False
+            upload['data'] += body[:len(body) // 2]
+            self.close_connection = True
+            return
+
+        assert int(self.headers['Upload-Offset']) == len(upload['data'])
+        upload['data'] += body
+        if len(upload['data']) == upload['length']:
+            self.server.objects[upload['key']] = upload['data']
+        self._reply(204, headers={'Upload-Offset': str(len(upload['data'])), 'Tus-Resumable': '1.0.0'})
+
+    def do_HEAD(self):
+        upload = self.server.uploads[self.path.rsplit('/', 1)[-1]]
+        self.send_response(200)
+        self.send_header('Upload-Offset', str(len(upload['data'])))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_DELETE(self):
+        for key in json.loads(self._body())['prefixes']:
+            self.server.objects.pop(key, None)
+        self._reply(200, [])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StreamingSupabaseStorageTest(TestCase):
+    """Test cases for chunked uploads and server-side moves in SupabaseStorage"""
+
+    chunk_size = 64 * 1024
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubStorageHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.objects = {}
+        self.server.uploads = {}
+        self.server.log = []
+        self.server.drop_next_patch = False
+
+        self.settings_override = override_settings(
+            STORAGES={**settings.STORAGES, 'default': {'BACKEND': 'sewabazaar.storage.SupabaseStorage'}},
+            SUPABASE_URL=f'http://127.0.0.1:{self.server.server_address[1]}',
+            SUPABASE_KEY='header.payload.signature',
+            SUPABASE_BUCKET=BUCKET,
+            SUPABASE_STORAGE={
+                'CHUNK_SIZE': self.chunk_size,
+                'RESUMABLE_THRESHOLD': self.chunk_size,
+                'CHUNK_RETRIES': 2,
+            }
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_small_file_uses_single_request(self):
+        """Files under the threshold are uploaded in one request"""
+        name = default_storage.save('portfolio/temp/small.jpg', ContentFile(b'x' * 1000))
+
+        self.assertEqual(self.server.objects[name], b'x' * 1000)
+        self.assertEqual(len(self.server.log), 1)
+
+    def test_large_file_is_streamed_in_chunks(self):
+        """Large files are sent in chunk-sized resumable requests"""
+        data = bytes(range(256)) * 1000  # 256000 bytes -> 4 chunks
+        name = default_storage.save('portfolio/temp/video.mp4', ContentFile(data))
+
+        self.assertEqual(self.server.objects[name], data)
+        patches = [size for method, _, size in self.server.log if method == 'PATCH']
+        self.assertEqual(len(patches), 4)
+        self.assertLessEqual(max(patches), self.chunk_size)
+
+    def test_interrupted_chunk_resumes_from_server_offset(self):
+        """A dropped connection resumes at the offset the server acknowledged"""
+        self.server.drop_next_patch = True
+        data = bytes(range(256)) * 600
+        name = default_storage.save('portfolio/temp/video.mp4', ContentFile(data))
+
+        self.assertEqual(self.server.objects[name], data)
+
+    def test_portfolio_media_move_does_not_reupload(self):
+        """Moving a portfolio upload out of the temp folder is a server-side rename"""
+        provider = User.objects.create_user(
+            username='storageprovider', email='provider@storage.test', password='testpass123', role='provider'
+        )
+        project = PortfolioProject.objects.create(profile=provider.profile, title='Kitchen remodel')
+        data = bytes(range(256)) * 600
+        temp_name = default_storage.save('portfolio/temp/fallback/video.mp4', ContentFile(data))
+        uploads_before = len(self.server.log)
+
+        media = PortfolioMedia.objects.create(project=project, media_type='video', file=temp_name)
+
+        media.refresh_from_db()
+        self.assertTrue(media.file.name.startswith(f'portfolio/{provider.id}/projects/{project.id}/videos/'))
+        self.assertEqual(self.server.objects[media.file.name], data)
+        self.assertNotIn(temp_name, self.server.objects)
+        self.assertEqual(
+            [(method, path) for method, path, _ in self.server.log[uploads_before:]],
+            [('POST', '/object/move')]
+        )
+
+
+class FileSystemMoveTest(TestCase):
+    """Test cases for move_file on local storage"""
+
+    def test_move_renames_on_disk(self):
+        """Local storage moves are a rename and never overwrite an existing file"""
+        import shutil
+        import tempfile
+        from django.core.files.storage import FileSystemStorage
+        from apps.common.storage import move_file
+
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        storage = FileSystemStorage(location=location)
+        storage.save('portfolio/1/projects/2/images/photo.jpg', ContentFile(b'existing'))
+        temp_name = storage.save('portfolio/temp/photo.jpg', ContentFile(b'new'))
+
+        moved_name = move_file(storage, temp_name, 'portfolio/1/projects/2/images/photo.jpg')
+
+        self.assertNotEqual(moved_name, 'portfolio/1/projects/2/images/photo.jpg')
+        self.assertFalse(storage.exists(temp_name))
+        with storage.open(moved_name) as f:
+            self.assertEqual(f.read(), b'new')
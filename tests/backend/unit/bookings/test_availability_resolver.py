@@ -0,0 +1,134 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.bookings.availability import AvailabilityResolver, merge_intervals, subtract_intervals
+from apps.bookings.models import Booking, BookingSlot, ProviderAvailability, ProviderSchedule
+from apps.bookings.services import TimeSlotService
+from apps.services.models import Service, ServiceCategory
+
+
+class IntervalArithmeticTest(TestCase):
+    """Test cases for the sorted interval helpers"""
+
+    def test_merge_intervals(self):
+        self.assertEqual(merge_intervals([(60, 120), (0, 30), (30, 45), (100, 150), (200, 200)]),
+                         [(0, 45), (60, 150)])
+
+    def test_subtract_intervals(self):
+        base = [(540, 780), (840, 1020)]
+        cuts = [(500, 560), (600, 660), (760, 900), (1000, 1100)]
+        self.assertEqual(subtract_intervals(base, cuts), [(560, 600), (660, 760), (900, 1000)])
+        self.assertEqual(subtract_intervals(base, []), base)
+        self.assertEqual(subtract_intervals(base, [(0, 1440)]), [])
+
+
+class AvailabilityResolverTest(TestCase):
+    """Test cases for free windows built from templates, blocks and bookings"""
+
+    def setUp(self):
+        self.provider = User.objects.create_user(
+            username='availprovider', email='provider@avail.test', password='testpass123', role='provider'
+        )
+        self.customer = User.objects.create_user(
+            username='availcustomer', email='customer@avail.test', password='testpass123', role='customer'
+        )
+        category = ServiceCategory.objects.create(title='Gardening')
+        self.service = Service.objects.create(
+            provider=self.provider, category=category, title='Lawn mowing', slug='lawn-mowing',
+            description='Front and back lawn', price=Decimal('900.00'), status='active'
+        )
+        self.other_service = Service.objects.create(
+            provider=self.provider, category=category, title='Hedge trimming', slug='hedge-trimming',
+            description='Hedges', price=Decimal('700.00'), status='active'
+        )
+        for weekday in range(7):
+            ProviderAvailability.objects.create(
+                provider=self.provider, weekday=weekday, start_time=time(9), end_time=time(17),
+                break_start=time(13), break_end=time(14)
+            )
+        self.day = date.today() + timedelta(days=7)
+
+    def book(self, service, start, end, slot=None):
+        slot = slot or BookingSlot.objects.create(service=service, date=self.day, start_time=start, end_time=end)
+        return Booking.objects.create(
+            customer=self.customer, service=service, booking_slot=slot, booking_date=self.day,
+            booking_time=start, address='Jhamsikhel', city='Lalitpur', phone='9800000003',
+            price=service.price, total_amount=service.price
+        )
+
+    def test_free_windows_subtract_breaks_blocks_and_bookings(self):
+        """Free time is working hours minus break, schedule blocks and other bookings"""
+        ProviderSchedule.objects.create(
+            provider=self.provider, date=self.day, start_time=time(10), end_time=time(11), schedule_type='blocked'
+        )
+        ProviderSchedule.objects.create(
+            provider=self.provider, date=self.day + timedelta(days=1), is_all_day=True, schedule_type='vacation'
+        )
+        self.book(self.other_service, time(15), time(16))
+
+        windows = AvailabilityResolver(self.provider, self.service).free_windows(
+            self.day, self.day + timedelta(days=2)
+        )
+
+        self.assertEqual(windows[self.day], [
+            (time(9), time(10)), (time(11), time(13)), (time(14), time(15)), (time(16), time(17))
+        ])
+        self.assertNotIn(self.day + timedelta(days=1), windows)
+        self.assertEqual(windows[self.day + timedelta(days=2)], [(time(9), time(13)), (time(14), time(17))])
+
+    def test_query_count_does_not_grow_with_range(self):
+        """A month of windows costs the same queries as a day"""
+        resolver = AvailabilityResolver(self.provider, self.service)
+        with CaptureQueriesContext(connection) as one_day:
+            resolver.free_windows(self.day, self.day)
+        with CaptureQueriesContext(connection) as one_month:
+            resolver.free_windows(self.day, self.day + timedelta(days=30))
+        self.assertEqual(len(one_month.captured_queries), len(one_day.captured_queries))
+
+    def test_generation_skips_vacation_and_break(self):
+        """No slots are generated on vacation days or during the break"""
+        ProviderSchedule.objects.create(
+            provider=self.provider, date=self.day, is_all_day=True, schedule_type='vacation'
+        )
+        next_day = self.day + timedelta(days=1)
+
+        slots = TimeSlotService.generate_slots_from_availability(self.provider, self.service, self.day, next_day)
+
+        self.assertTrue(slots)
+        self.assertEqual({slot.date for slot in slots}, {next_day})
+        self.assertEqual(
+            [slot.start_time for slot in slots],
+            [time(9), time(10), time(11), time(12), time(14), time(15), time(16)]
+        )
+
+    def test_available_slots_and_reschedule_options_hide_blocked_slots(self):
+        """Existing slots that clash with blocks or other bookings are not offered"""
+        free_slot = BookingSlot.objects.create(service=self.service, date=self.day, start_time=time(9), end_time=time(10))
+        blocked_slot = BookingSlot.objects.create(service=self.service, date=self.day, start_time=time(11), end_time=time(12))
+        busy_slot = BookingSlot.objects.create(service=self.service, date=self.day, start_time=time(15), end_time=time(16))
+        ProviderSchedule.objects.create(
+            provider=self.provider, date=self.day, start_time=time(11), end_time=time(12), schedule_type='maintenance'
+        )
+        self.book(self.other_service, time(15), time(16))
+        booking = self.book(self.service, time(16), time(17))
+
+        client = APIClient()
+        response = client.get('/api/bookings/booking_slots/available_slots/', {
+            'service_id': self.service.id, 'date': self.day.isoformat(), 'prevent_auto_generation': 'true'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([slot['id'] for slot in response.data], [free_slot.id])
+
+        client.force_authenticate(self.customer)
+        response = client.get(f'/api/bookings/bookings/{booking.id}/reschedule_options/')
+        self.assertEqual(response.status_code, 200)
+        offered = [slot['id'] for slot in response.data['available_slots']]
+        self.assertIn(free_slot.id, offered)
+        self.assertNotIn(blocked_slot.id, offered)
+        self.assertNotIn(busy_slot.id, offered)
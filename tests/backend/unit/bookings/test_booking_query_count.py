@@ -0,0 +1,137 @@
+"""
+Query-count regression tests for list endpoints.
+
+A list endpoint that eager-loads what its serializer reads runs the same
+number of queries whatever the page size. QueryCountScalingMixin renders a
+list at two page sizes and fails if the second page costs more queries than
+the first, which is how per-row (N+1) lookups show up.
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking, BookingSlot, Payment, PaymentMethod, ServiceDelivery
+from apps.services.models import City, Favorite, Service, ServiceAvailability, ServiceCategory, ServiceImage
+from apps.services.views import ServiceViewSet
+
+
+class QueryCountScalingMixin:
+    """Assertions comparing a list endpoint's query count across page sizes."""
+
+    small_page_size = 2
+    large_page_size = 6
+
+    def count_list_queries(self, url, page_size, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'page_size': page_size, **params})
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return len(queries.captured_queries), response
+
+    def assertQueryCountConstant(self, url, **params):
+        """
+        Fail if rendering more rows of `url` runs more queries.
+
+        The caller must have created at least large_page_size rows.
+        """
+        small_count, small_response = self.count_list_queries(url, self.small_page_size, **params)
+        large_count, large_response = self.count_list_queries(url, self.large_page_size, **params)
+
+        self.assertEqual(len(small_response.data['results']), self.small_page_size)
+        self.assertEqual(len(large_response.data['results']), self.large_page_size)
+        self.assertEqual(
+            large_count, small_count,
+            f"{url} ran {small_count} queries for {self.small_page_size} rows but "
+            f"{large_count} for {self.large_page_size}; something is loaded per row"
+        )
+
+
+class BookingListQueryCountTest(QueryCountScalingMixin, TestCase):
+    """Test cases for eager loading on booking and service list endpoints"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='querycustomer', email='customer@queries.test', password='testpass123', role='customer'
+        )
+        self.category = ServiceCategory.objects.create(title='Cleaning')
+        self.city = City.objects.create(name='Kathmandu')
+        self.payment_method = PaymentMethod.objects.create(name='Cash', payment_type='cash')
+
+        for index in range(self.large_page_size):
+            self.make_booking(index)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def make_booking(self, index):
+        """Create a booking whose every nested relation points at its own rows."""
+        provider = User.objects.create_user(
+            username=f'queryprovider{index}', email=f'provider{index}@queries.test',
+            password='testpass123', role='provider'
+        )
+        service = Service.objects.create(
+            provider=provider, category=self.category, title=f'Deep clean {index}',
+            slug=f'deep-clean-{index}', description='Full house', price=Decimal('1500.00'), status='active'
+        )
+        service.cities.add(self.city)
+        ServiceImage.objects.create(service=service, image=f'service_images/clean_{index}.jpg', is_featured=True)
+        ServiceAvailability.objects.create(service=service, day_of_week=index % 7,
+                                           start_time=time(9), end_time=time(17))
+        if index % 2:
+            Favorite.objects.create(user=self.customer, service=service)
+
+        booking_date = date.today() + timedelta(days=index + 1)
+        slot = BookingSlot.objects.create(service=service, date=booking_date, start_time=time(10), end_time=time(12))
+        booking = Booking.objects.create(
+            customer=self.customer, service=service, booking_slot=slot,
+            booking_date=booking_date, booking_time=time(10), address='Thamel', city='Kathmandu',
+            phone='9800000000', price=Decimal('1500.00'), total_amount=Decimal('1500.00'), status='completed'
+        )
+        Payment.objects.create(
+            booking=booking, payment_method=self.payment_method, amount=Decimal('1500.00'),
+            total_amount=Decimal('1500.00'), transaction_id=f'TXN-QUERY-{index}',
+            status='completed', cash_collected_by=provider
+        )
+        ServiceDelivery.objects.create(booking=booking, delivered_by=provider)
+        return booking
+
+    def test_booking_list_query_count_is_constant(self):
+        """The booking list does not query per booking"""
+        self.assertQueryCountConstant('/api/bookings/bookings/')
+
+    def test_customer_bookings_query_count_is_constant(self):
+        """The customer bookings list does not query per booking"""
+        self.assertQueryCountConstant('/api/bookings/bookings/customer_bookings/')
+
+    def test_service_list_query_count_is_constant(self):
+        """The service list does not query per service"""
+        self.assertQueryCountConstant('/api/services/')
+
+    def test_eager_loaded_output_matches_lazy_output(self):
+        """Prefetched favorites and featured images serialize like the per-row lookups"""
+        response = self.client.get('/api/bookings/bookings/', {'page_size': self.large_page_size})
+
+        rows = {row['service_details']['slug']: row for row in response.data['results']}
+        self.assertTrue(rows['deep-clean-1']['service_details']['is_favorited'])
+        self.assertFalse(rows['deep-clean-2']['service_details']['is_favorited'])
+        self.assertTrue(rows['deep-clean-0']['service_details']['image'].endswith('clean_0.jpg'))
+        self.assertEqual(rows['deep-clean-0']['payment_details']['cash_collected_by_name'], '')
+        self.assertEqual(rows['deep-clean-0']['booking_slot_details']['calculated_price'], Decimal('1500.00'))
+
+    def test_service_detail_actions_join_provider_and_category(self):
+        """Detail actions that skip filter_queryset still read the provider and category from the join"""
+        service = Service.objects.get(slug='deep-clean-0')
+        request = Request(APIRequestFactory().post('/'))
+        request.user = service.provider
+        view = ServiceViewSet(request=request, action='add_availability', kwargs={}, format_kwarg=None)
+
+        fetched = view.get_queryset().get(pk=service.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(fetched.provider.email, 'provider0@queries.test')
+            self.assertEqual(fetched.category.title, 'Cleaning')
@@ -0,0 +1,98 @@
+from datetime import time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.bookings.expiry import AUTO_CANCEL_REASON, ExpiredBookingService
+from apps.bookings.models import Booking, BookingSlot
+from apps.notifications.models import Notification
+from apps.services.models import Service, ServiceCategory
+
+
+class ExpiredBookingCancellationTest(TestCase):
+    """Test cases for the chunked, set-based auto-cancellation of expired bookings"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='expirycustomer', email='customer@expiry.test', password='testpass123', role='customer'
+        )
+        self.provider = User.objects.create_user(
+            username='expiryprovider', email='provider@expiry.test', password='testpass123', role='provider'
+        )
+        category = ServiceCategory.objects.create(title='Gardening')
+        self.service = Service.objects.create(
+            provider=self.provider, category=category, title='Lawn mowing', slug='lawn-mowing',
+            description='Mow the lawn', price=Decimal('500.00'), status='active'
+        )
+        self.past = timezone.localdate() - timedelta(days=5)
+        self.slots = [
+            BookingSlot.objects.create(
+                service=self.service, date=self.past, start_time=time(9 + index), end_time=time(10 + index),
+                max_bookings=3
+            )
+            for index in range(2)
+        ]
+        # Three expired bookings on the first slot, one on the second, one without a slot
+        self.expired = [self.book(self.past, self.slots[0]) for _ in range(3)]
+        self.expired.append(self.book(self.past, self.slots[1], status='confirmed'))
+        self.expired.append(self.book(self.past, None))
+        self.completed = self.book(self.past, self.slots[1], status='completed')
+        self.upcoming = self.book(timezone.localdate() + timedelta(days=3), None)
+        BookingSlot.objects.filter(pk=self.slots[0].pk).update(current_bookings=3)
+        BookingSlot.objects.filter(pk=self.slots[1].pk).update(current_bookings=2)
+        Notification.objects.all().delete()
+
+    def book(self, booking_date, slot, status='pending'):
+        booking = Booking.objects.create(
+            customer=self.customer, service=self.service, booking_slot=slot, booking_date=booking_date,
+            booking_time=time(9), address='Patan', city='Lalitpur', phone='9800000004',
+            price=Decimal('500.00'), total_amount=Decimal('500.00')
+        )
+        Booking.objects.filter(pk=booking.pk).update(status=status)
+        return booking
+
+    def test_cancels_in_chunks_and_releases_slots(self):
+        """Every chunk cancels, releases grouped slot capacity and notifies in a fixed number of queries"""
+        with CaptureQueriesContext(connection) as queries:
+            result = ExpiredBookingService.cancel_expired(grace_period=1, batch_size=2)
+
+        self.assertEqual(result['cancelled'], 5)
+        self.assertEqual(result['notifications'], 10)
+        self.assertEqual([batch['selected'] for batch in result['batches']], [2, 2, 1])
+        self.assertEqual([batch['cancelled'] for batch in result['batches']], [2, 2, 1])
+        # Chunks: [slot0, slot0], [slot0, slot1], [no slot]
+        self.assertEqual([batch['slots_updated'] for batch in result['batches']], [1, 2, 0])
+        self.assertLessEqual(len(queries.captured_queries), 3 * 11)
+
+        self.assertEqual(
+            set(Booking.objects.filter(status='cancelled').values_list('pk', flat=True)),
+            {booking.pk for booking in self.expired}
+        )
+        self.assertEqual(
+            set(Booking.objects.filter(status='cancelled').values_list('cancellation_reason', flat=True)),
+            {AUTO_CANCEL_REASON}
+        )
+        self.assertEqual(
+            list(BookingSlot.objects.order_by('start_time').values_list('current_bookings', flat=True)), [0, 1]
+        )
+        self.assertEqual(Notification.objects.filter(user=self.customer).count(), 5)
+        self.assertEqual(Notification.objects.filter(user=self.provider, type='booking').count(), 5)
+        self.assertEqual(Booking.objects.get(pk=self.completed.pk).status, 'completed')
+        self.assertEqual(Booking.objects.get(pk=self.upcoming.pk).status, 'pending')
+
+        # A second run finds nothing left to do
+        self.assertEqual(ExpiredBookingService.cancel_expired(grace_period=1)['cancelled'], 0)
+
+    def test_dry_run_changes_nothing(self):
+        """The command's dry run only reports the expired bookings"""
+        call_command('auto_cancel_expired_bookings', dry_run=True, stdout=StringIO())
+
+        self.assertFalse(Booking.objects.filter(status='cancelled').exists())
+        self.assertEqual(BookingSlot.objects.get(pk=self.slots[0].pk).current_bookings, 3)
+        self.assertFalse(Notification.objects.exists())
@@ -0,0 +1,92 @@
+from datetime import date, time
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.bookings.availability import AvailabilityResolver
+from apps.bookings.models import ProviderAvailability, ProviderSchedule
+
+
+class RecurringScheduleTest(TestCase):
+    """Test cases for rule-based recurring provider schedule entries"""
+
+    def setUp(self):
+        self.provider = User.objects.create_user(
+            username='ruleprovider', email='provider@rules.test', password='testpass123', role='provider'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.provider)
+
+    def rule(self, pattern, start, until=None, interval=1, **extra):
+        return ProviderSchedule.objects.create(
+            provider=self.provider, date=start, is_all_day=True, schedule_type='blocked',
+            is_recurring=True, recurring_pattern=pattern, recurring_interval=interval,
+            recurring_until=until, **extra
+        )
+
+    def test_occurrence_dates_for_each_pattern(self):
+        """Rules expand only inside the requested window"""
+        daily = self.rule('daily', date(2030, 1, 1), interval=3)
+        weekly = self.rule('weekly', date(2030, 1, 7), until=date(2030, 2, 4))
+        monthly = self.rule('monthly', date(2030, 1, 31))
+
+        self.assertEqual(
+            list(daily.occurrence_dates(date(2030, 6, 1), date(2030, 6, 10))),
+            [date(2030, 6, 3), date(2030, 6, 6), date(2030, 6, 9)]
+        )
+        self.assertEqual(
+            list(weekly.occurrence_dates(date(2030, 1, 20), date(2030, 3, 1))),
+            [date(2030, 1, 21), date(2030, 1, 28), date(2030, 2, 4)]
+        )
+        # Months without a 31st are skipped
+        self.assertEqual(
+            list(monthly.occurrence_dates(date(2030, 2, 1), date(2030, 6, 30))),
+            [date(2030, 3, 31), date(2030, 5, 31)]
+        )
+
+    def test_create_stores_a_single_rule(self):
+        """A year-long daily block is one row, expanded on read"""
+        response = self.client.post('/api/bookings/provider_schedule/', {
+            'title': 'Morning gym', 'date': '2030-01-01', 'is_all_day': False,
+            'start_time': '06:00', 'end_time': '08:00', 'schedule_type': 'blocked',
+            'is_recurring': True, 'recurring_pattern': 'daily', 'recurring_until': '2030-12-31'
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ProviderSchedule.objects.count(), 1)
+        occurrences = ProviderSchedule.objects.occurrences(date(2030, 3, 1), date(2030, 3, 31))
+        self.assertEqual(len(occurrences), 31)
+
+    def test_materialize_inserts_occurrences(self):
+        """Materializing a rule stores one row per occurrence"""
+        response = self.client.post('/api/bookings/provider_schedule/', {
+            'date': '2030-01-07', 'schedule_type': 'vacation', 'is_recurring': True,
+            'recurring_pattern': 'weekly', 'recurring_until': '2030-02-04', 'materialize': True
+        }, format='json')
+
+        self.assertEqual(response.data['occurrences_created'], 4)
+        self.assertFalse(ProviderSchedule.objects.filter(is_recurring=True).exists())
+        self.assertEqual(
+            list(ProviderSchedule.objects.values_list('date', flat=True)),
+            [date(2030, 1, 7), date(2030, 1, 14), date(2030, 1, 21), date(2030, 1, 28), date(2030, 2, 4)]
+        )
+
+    def test_resolver_applies_rules_without_extra_queries(self):
+        """Recurring blocks remove free time in far-future windows"""
+        for weekday in range(7):
+            ProviderAvailability.objects.create(
+                provider=self.provider, weekday=weekday, start_time=time(9), end_time=time(17)
+            )
+        self.rule('weekly', date(2030, 1, 7))  # Mondays, no end date
+        resolver = AvailabilityResolver(self.provider)
+
+        with CaptureQueriesContext(connection) as queries:
+            windows = resolver.free_windows(date(2035, 6, 1), date(2035, 6, 14))
+
+        self.assertNotIn(date(2035, 6, 4), windows)
+        self.assertNotIn(date(2035, 6, 11), windows)
+        self.assertEqual(len(windows), 12)
+        self.assertLessEqual(len(queries.captured_queries), 3)
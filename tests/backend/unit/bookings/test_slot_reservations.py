@@ -0,0 +1,187 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking, BookingSlot, SlotHold
+from apps.bookings.reservations import SlotReservationService, SlotUnavailableError, run_contention_benchmark
+from apps.services.models import Service, ServiceCategory
+
+
+def make_service(provider):
+    category = ServiceCategory.objects.create(title='Electrical')
+    return Service.objects.create(
+        provider=provider, category=category, title='Wiring check', slug=f'wiring-check-{provider.pk}',
+        description='Full wiring inspection', price=Decimal('1000.00'), status='active'
+    )
+
+
+class SlotReservationTest(TestCase):
+    """Test cases for conditional slot claims and expiring slot holds"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='holdcustomer', email='customer@holds.test', password='testpass123', role='customer'
+        )
+        self.other_customer = User.objects.create_user(
+            username='holdcustomer2', email='customer2@holds.test', password='testpass123', role='customer'
+        )
+        self.provider = User.objects.create_user(
+            username='holdprovider', email='provider@holds.test', password='testpass123', role='provider'
+        )
+        self.service = make_service(self.provider)
+        self.slot = BookingSlot.objects.create(
+            service=self.service, date=date.today() + timedelta(days=2),
+            start_time=time(10), end_time=time(12), max_bookings=2
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def booking_payload(self, **extra):
+        return {
+            'service': self.service.id, 'booking_slot': self.slot.id,
+            'booking_date': str(self.slot.date), 'booking_time': '10:00:00',
+            'address': 'Baneshwor', 'city': 'Kathmandu', 'phone': '9800000002',
+            'price': '1000.00', 'total_amount': '1000.00', **extra
+        }
+
+    def create_booking(self, customer):
+        return Booking.objects.create(
+            customer=customer, service=self.service, booking_slot=self.slot,
+            booking_date=self.slot.date, booking_time=time(10), address='Baneshwor', city='Kathmandu',
+            phone='9800000002', price=Decimal('1000.00'), total_amount=Decimal('1000.00')
+        )
+
+    def test_claim_stops_at_capacity(self):
+        """Claims succeed until max_bookings is reached and then fail"""
+        self.assertTrue(SlotReservationService.claim(self.slot.id))
+        self.assertTrue(SlotReservationService.claim(self.slot.id))
+        self.assertFalse(SlotReservationService.claim(self.slot.id))
+
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 2)
+
+    def test_failed_insert_does_not_keep_the_seat(self):
+        """A booking whose INSERT fails gives its claimed seat back"""
+        with mock.patch.object(Booking, 'save_base', side_effect=IntegrityError('insert failed')):
+            with self.assertRaises(IntegrityError):
+                self.create_booking(self.customer)
+
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 0)
+
+    def test_stale_slot_save_does_not_overwrite_capacity(self):
+        """Saving a slot instance loaded earlier keeps the claimed count"""
+        stale = BookingSlot.objects.get(pk=self.slot.pk)
+        SlotReservationService.claim(self.slot.id)
+
+        stale.is_rush = True
+        stale.save()
+
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 1)
+
+    def test_full_slot_rejects_booking_and_cancel_frees_seat(self):
+        """A booking on a full slot is refused until another booking is cancelled"""
+        first = self.create_booking(self.customer)
+        self.create_booking(self.other_customer)
+
+        with self.assertRaises(SlotUnavailableError):
+            self.create_booking(self.customer)
+        response = self.client.post('/api/bookings/bookings/', self.booking_payload(), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('booking_slot', response.data)
+
+        first.status = 'cancelled'
+        first.save()
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 1)
+
+    def test_hold_is_consumed_by_booking(self):
+        """A held seat cannot be taken by others and is kept by the holder's booking"""
+        response = self.client.post(f'/api/bookings/booking_slots/{self.slot.id}/hold/', {}, format='json')
+        self.assertEqual(response.status_code, 201)
+        hold_token = response.data['hold_token']
+        self.create_booking(self.other_customer)
+
+        # Both seats are taken now: one booked, one held
+        other_client = APIClient()
+        other_client.force_authenticate(self.other_customer)
+        response = other_client.post(f'/api/bookings/booking_slots/{self.slot.id}/hold/', {}, format='json')
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.post(
+            '/api/bookings/bookings/', self.booking_payload(hold_token=hold_token), format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertFalse(SlotHold.objects.exists())
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 2)
+
+    def test_hold_can_be_extended_and_released(self):
+        """PATCH pushes back the expiry and DELETE gives the seat back"""
+        hold = SlotReservationService.place_hold(self.slot, self.customer, ttl_seconds=60)
+        url = f'/api/bookings/booking_slots/{self.slot.id}/hold/'
+
+        response = self.client.patch(url, {'hold_token': str(hold.token), 'ttl_seconds': 900}, format='json')
+        self.assertEqual(response.status_code, 200)
+        hold.refresh_from_db()
+        self.assertGreater(hold.expires_at, timezone.now() + timedelta(seconds=800))
+
+        response = self.client.delete(f'{url}?hold_token={hold.token}')
+        self.assertEqual(response.status_code, 204)
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 0)
+
+    def test_sweeper_releases_expired_holds_in_bulk(self):
+        """Expired holds are deleted and their seats returned; live holds stay"""
+        other_slot = BookingSlot.objects.create(
+            service=self.service, date=self.slot.date, start_time=time(13), end_time=time(15), max_bookings=3
+        )
+        expired = [
+            SlotReservationService.place_hold(self.slot, self.customer),
+            SlotReservationService.place_hold(other_slot, self.customer),
+            SlotReservationService.place_hold(other_slot, self.other_customer),
+        ]
+        live = SlotReservationService.place_hold(self.slot, self.other_customer)
+        SlotHold.objects.filter(pk__in=[hold.pk for hold in expired]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        result = SlotReservationService.release_expired_holds(batch_size=2)
+
+        self.assertEqual(result, {'holds_released': 3, 'slots_updated': 3, 'batches': 2})
+        self.assertEqual(list(SlotHold.objects.values_list('pk', flat=True)), [live.pk])
+        self.slot.refresh_from_db()
+        other_slot.refresh_from_db()
+        self.assertEqual(self.slot.current_bookings, 1)
+        self.assertEqual(other_slot.current_bookings, 0)
+
+        # An expired hold can no longer be used to book
+        self.assertFalse(SlotReservationService.consume_hold(expired[0].token, self.customer, self.slot))
+
+
+class SlotContentionTest(TransactionTestCase):
+    """Concurrent claims on one slot never overbook it"""
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_concurrent_claims_never_overbook(self):
+        provider = User.objects.create_user(
+            username='benchprovider', email='provider@bench.test', password='testpass123', role='provider'
+        )
+        slot = BookingSlot.objects.create(
+            service=make_service(provider), date=date.today() + timedelta(days=3),
+            start_time=time(9), end_time=time(10), max_bookings=5
+        )
+
+        result = run_contention_benchmark(slot.id, threads=8, attempts_per_thread=3)
+
+        self.assertFalse(result['overbooked'])
+        self.assertEqual(result['claimed'], 5)
+        self.assertEqual(result['final_count'], 5)
+        self.assertEqual(result['claimed'] + result['rejected'] + result['errors'], 24)
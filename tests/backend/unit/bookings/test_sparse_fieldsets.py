@@ -0,0 +1,113 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking, Payment, PaymentMethod
+from apps.common.sparse_fields import parse_field_tree
+from apps.services.models import Service, ServiceCategory, ServiceImage
+
+
+class SparseFieldsetTest(TestCase):
+    """Test cases for ?fields=/?expand= and ?shape=summary list responses"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='sparsecustomer', email='customer@sparse.test', password='testpass123',
+            role='customer', first_name='Sita', last_name='Rai'
+        )
+        self.provider = User.objects.create_user(
+            username='sparseprovider', email='provider@sparse.test', password='testpass123',
+            role='provider', first_name='Ram', last_name='Thapa'
+        )
+        category = ServiceCategory.objects.create(title='Plumbing')
+        self.service = Service.objects.create(
+            provider=self.provider, category=category, title='Leak repair', slug='leak-repair',
+            description='Fix leaks', price=Decimal('800.00'), status='active'
+        )
+        ServiceImage.objects.create(service=self.service, image='service_images/leak.jpg', is_featured=True)
+        payment_method = PaymentMethod.objects.create(name='Cash', payment_type='cash')
+
+        for index in range(3):
+            booking = Booking.objects.create(
+                customer=self.customer, service=self.service,
+                booking_date=date.today() + timedelta(days=index + 1), booking_time=time(9 + index),
+                address='Patan', city='Lalitpur', phone='9800000001',
+                price=Decimal('800.00'), total_amount=Decimal('800.00'), status='confirmed'
+            )
+            Payment.objects.create(
+                booking=booking, payment_method=payment_method, amount=Decimal('800.00'),
+                total_amount=Decimal('800.00'), transaction_id=f'TXN-SPARSE-{index}'
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def test_parse_field_tree(self):
+        """Dotted names select nested fields and a plain name selects the whole field"""
+        self.assertIsNone(parse_field_tree('', None))
+        self.assertEqual(
+            parse_field_tree('id, service_details.title,service_details.price', 'payment_details'),
+            {'id': None, 'service_details': {'title': None, 'price': None}, 'payment_details': None}
+        )
+        self.assertEqual(parse_field_tree('service_details,service_details.title'), {'service_details': None})
+
+    def test_fields_restricts_top_level_and_nested_output(self):
+        """Only the requested fields are rendered, including computed ones"""
+        response = self.client.get('/api/bookings/bookings/', {
+            'fields': 'id,status,booking_date,total_amount,service_details.title,status_info'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {'id', 'status', 'booking_date', 'total_amount', 'service_details', 'status_info'})
+        self.assertEqual(row['service_details'], {'title': 'Leak repair'})
+
+    def test_expand_adds_whole_nested_objects(self):
+        """?expand= renders nested objects in full next to the selected fields"""
+        response = self.client.get('/api/bookings/bookings/', {'fields': 'id', 'expand': 'payment_details'})
+
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {'id', 'payment_details'})
+        self.assertEqual(row['payment_details']['payment_method_details']['name'], 'Cash')
+
+    def test_without_fields_the_full_representation_is_kept(self):
+        """Clients that do not ask for a fieldset get the same payload as before"""
+        response = self.client.get('/api/bookings/bookings/')
+
+        row = response.data['results'][0]
+        self.assertIn('customer_details', row)
+        self.assertIn('legacy_status', row)
+        self.assertIn('is_favorited', row['service_details'])
+
+    def test_summary_shape_uses_values_rows(self):
+        """The summary shape renders compact rows with a single data query"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/bookings/bookings/customer_bookings/', {'shape': 'summary'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {
+            'id', 'status', 'booking_date', 'booking_time', 'total_amount',
+            'service_id', 'service_title', 'customer_id', 'customer_name'
+        })
+        self.assertEqual(row['service_title'], 'Leak repair')
+        self.assertEqual(row['customer_name'], 'Sita Rai')
+        # One COUNT for pagination and one SELECT for the page
+        self.assertEqual(len(queries.captured_queries), 2)
+
+    def test_service_list_summary_shape(self):
+        """Services can be listed as summary rows with the featured image URL"""
+        response = self.client.get('/api/services/', {'shape': 'summary'})
+
+        self.assertEqual(response.status_code, 200)
+        row = response.data['results'][0]
+        self.assertEqual(row['provider_name'], 'Ram Thapa')
+        self.assertEqual(row['category_name'], 'Plumbing')
+        self.assertTrue(row['image'].endswith('service_images/leak.jpg'))
+        self.assertEqual(response.data['total_services'], 1)
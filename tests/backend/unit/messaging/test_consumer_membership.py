@@ -0,0 +1,117 @@
+import json
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.messaging.consumers import MessagingConsumer
+from apps.messaging.models import Conversation
+from apps.services.models import Service, ServiceCategory
+
+
+async def connect(user):
+    """Open a messaging socket for a user and skip the connection confirmation."""
+    communicator = WebsocketCommunicator(MessagingConsumer.as_asgi(), f'/ws/messaging/?user_id={user.id}')
+    connected, _ = await communicator.connect()
+    assert connected
+    assert (await communicator.receive_json_from())['type'] == 'connection'
+    return communicator
+
+
+async def typing(communicator, conversation_id, is_typing=True):
+    await communicator.send_to(text_data=json.dumps({
+        'type': 'typing', 'data': {'conversation_id': conversation_id, 'is_typing': is_typing}
+    }))
+
+
+async def receive_typing(communicator):
+    """Collect the typing events a socket has received, ignoring presence updates."""
+    events = []
+    while not await communicator.receive_nothing(timeout=0.2):
+        event = await communicator.receive_json_from()
+        if event['type'] == 'typing':
+            events.append(event['data'])
+    return events
+
+
+@override_settings(MESSAGING_REALTIME={'TYPING_COALESCE_MS': 60000, 'MEMBERSHIP_RELOAD_SECONDS': 3600})
+class ConsumerMembershipTest(TransactionTestCase):
+    """Test cases for the per-socket membership map and typing coalescing"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='socketcustomer', email='customer@socket.test', password='testpass123', role='customer'
+        )
+        self.provider = User.objects.create_user(
+            username='socketprovider', email='provider@socket.test', password='testpass123', role='provider'
+        )
+        category = ServiceCategory.objects.create(title='Plumbing')
+        self.service = Service.objects.create(
+            provider=self.provider, category=category, title='Pipe repair', slug='pipe-repair',
+            description='Repair', price=Decimal('500.00'), status='active'
+        )
+        self.other_service = Service.objects.create(
+            provider=self.provider, category=category, title='Drain cleaning', slug='drain-cleaning',
+            description='Drains', price=Decimal('300.00'), status='active'
+        )
+        self.conversation = Conversation.objects.create(
+            service=self.service, customer=self.customer, provider=self.provider
+        )
+
+    def test_typing_frames_are_coalesced_without_queries(self):
+        """Repeated typing frames reach the other side once and never hit the database"""
+        async def scenario():
+            customer = await connect(self.customer)
+            provider = await connect(self.provider)
+            await receive_typing(customer)
+
+            for _ in range(5):
+                await typing(customer, self.conversation.id)
+            await typing(customer, self.conversation.id, is_typing=False)
+            await typing(customer, 999999)
+            events = await receive_typing(provider)
+
+            await customer.disconnect()
+            await provider.disconnect()
+            return events
+
+        with CaptureQueriesContext(connection) as queries:
+            events = async_to_sync(scenario)()
+
+        self.assertEqual([event['is_typing'] for event in events], [True, False])
+        # Only the two users and their membership maps are loaded
+        self.assertEqual(len(queries.captured_queries), 4)
+
+    def test_new_conversation_reaches_open_sockets(self):
+        """Creating a conversation updates both participants' membership maps"""
+        async def scenario():
+            customer = await connect(self.customer)
+            provider = await connect(self.provider)
+            await receive_typing(customer)
+
+            conversation = await database_sync_to_async(Conversation.objects.create)(
+                service=self.other_service, customer=self.customer, provider=self.provider
+            )
+            await customer.receive_nothing(timeout=0.1)
+            await typing(customer, conversation.id)
+            events = await receive_typing(provider)
+
+            await database_sync_to_async(conversation.delete)()
+            await customer.receive_nothing(timeout=0.1)
+            await typing(customer, conversation.id, is_typing=False)
+            after_delete = await receive_typing(provider)
+
+            await customer.disconnect()
+            await provider.disconnect()
+            return events, after_delete
+
+        events, after_delete = async_to_sync(scenario)()
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['user_id'], self.customer.id)
+        self.assertEqual(after_delete, [])
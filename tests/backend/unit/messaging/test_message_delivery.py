@@ -0,0 +1,87 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.messaging.models import Conversation, Message
+from apps.messaging.services import MessageDeliveryError, MessageDeliveryService
+from apps.notifications.models import Notification
+from apps.services.models import Service, ServiceCategory
+
+
+def create_conversation():
+    """A customer and a provider talking about one service."""
+    customer = User.objects.create_user(
+        username='deliverycustomer', email='customer@delivery.test', password='testpass123', role='customer'
+    )
+    provider = User.objects.create_user(
+        username='deliveryprovider', email='provider@delivery.test', password='testpass123', role='provider'
+    )
+    service = Service.objects.create(
+        provider=provider, category=ServiceCategory.objects.create(title='Electrical'), title='Wiring',
+        slug='wiring', description='Wiring', price=Decimal('800.00'), status='active'
+    )
+    return Conversation.objects.create(service=service, customer=customer, provider=provider)
+
+
+class MessageDeliveryServiceTest(TestCase):
+    """Test cases for the one-hop persist-and-render message path"""
+
+    def setUp(self):
+        self.conversation = create_conversation()
+
+    def test_persist_and_render(self):
+        """The message is stored, counted with F() and rendered without extra queries"""
+        with CaptureQueriesContext(connection) as queries:
+            result = MessageDeliveryService.persist_and_render(self.conversation.customer, self.conversation.id, ' Hi ')
+        MessageDeliveryService.persist_and_render(self.conversation.customer, self.conversation.id, 'Still there?')
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([s for s in sql if s.startswith('UPDATE "messaging_conversation"')]), 1)
+        self.assertFalse([s for s in sql if 'messaging_messagereadstatus' in s])
+        self.assertEqual(result['payload']['type'], 'message')
+        self.assertEqual(result['payload']['data']['text'], 'Hi')
+        self.assertEqual(result['payload']['data']['read_statuses'], [])
+        self.assertEqual(result['participant_ids'], (self.conversation.customer_id, self.conversation.provider_id))
+
+        self.conversation.refresh_from_db()
+        self.assertEqual((self.conversation.unread_count_provider, self.conversation.unread_count_customer), (2, 0))
+        self.assertEqual(Notification.objects.filter(user=self.conversation.provider).count(), 2)
+
+    def test_rejects_outsiders_and_inactive_conversations(self):
+        """Only participants can post, and only to active conversations"""
+        outsider = User.objects.create_user(
+            username='deliveryoutsider', email='outsider@delivery.test', password='testpass123', role='customer'
+        )
+        with self.assertRaisesMessage(MessageDeliveryError, 'access denied'):
+            MessageDeliveryService.persist_and_render(outsider, self.conversation.id, 'Hello')
+
+        Conversation.objects.filter(pk=self.conversation.pk).update(is_active=False)
+        with self.assertRaisesMessage(MessageDeliveryError, 'no longer active'):
+            MessageDeliveryService.persist_and_render(self.conversation.customer, self.conversation.id, 'Hello')
+        self.assertFalse(Message.objects.exists())
+
+
+class MessagingThroughputBenchmarkTest(TransactionTestCase):
+    """Test cases for benchmark_messaging (WebsocketCommunicator end to end)"""
+
+    def test_each_message_delivered_once_and_cleaned_up(self):
+        """Both sides see every message exactly once and the benchmark leaves no trace"""
+        conversation = create_conversation()
+        stdout = StringIO()
+
+        call_command('benchmark_messaging', '--messages', '10', stdout=stdout)
+
+        self.assertIn('10 received, 10 echoed to the sender', stdout.getvalue())
+        # The benchmark runs on its own throwaway conversation and removes it afterwards
+        self.assertEqual(list(Conversation.objects.values_list('pk', flat=True)), [conversation.pk])
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(ServiceCategory.objects.count(), 1)
+        self.assertFalse(Message.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+        conversation.refresh_from_db()
+        self.assertEqual((conversation.unread_count_provider, conversation.last_message_preview), (0, ''))
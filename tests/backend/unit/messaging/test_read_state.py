@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.messaging.models import Conversation, Message
+from apps.messaging.read_state import ReadStateService
+from apps.services.models import Service, ServiceCategory
+
+
+class ReadStateTest(TestCase):
+    """Test cases for conversation read watermarks and atomic unread counters"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='readcustomer', email='customer@read.test', password='testpass123', role='customer'
+        )
+        self.provider = User.objects.create_user(
+            username='readprovider', email='provider@read.test', password='testpass123', role='provider'
+        )
+        service = Service.objects.create(
+            provider=self.provider, category=ServiceCategory.objects.create(title='Painting'), title='Wall paint',
+            slug='wall-paint', description='Paint', price=Decimal('900.00'), status='active'
+        )
+        self.conversation = Conversation.objects.create(service=service, customer=self.customer, provider=self.provider)
+
+    def create_thread(self, count):
+        """Bulk insert messages from the customer and count them as unread for the provider."""
+        Message.objects.bulk_create([
+            Message(conversation=self.conversation, sender=self.customer, text=f'Message {index}')
+            for index in range(count)
+        ])
+        Conversation.objects.filter(pk=self.conversation.pk).update(unread_count_provider=count)
+        self.conversation.refresh_from_db()
+        return list(self.conversation.messages.order_by('pk').values_list('pk', flat=True))
+
+    def test_marking_a_long_thread_read_is_one_statement(self):
+        """A 500-message thread is read with a single UPDATE"""
+        message_ids = self.create_thread(500)
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = ReadStateService.mark_read(self.conversation, self.provider)
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.provider_read_watermark, message_ids[-1])
+        self.assertEqual(self.conversation.unread_count_provider, 0)
+        self.assertEqual(ReadStateService.count_unread(self.conversation, self.provider), 0)
+
+    def test_partial_read_recounts_and_never_moves_back(self):
+        """Reading up to a message leaves the later ones unread"""
+        message_ids = self.create_thread(10)
+
+        self.conversation.mark_as_read_for_user(self.provider, message_ids[6])
+        self.assertEqual(self.conversation.unread_count_provider, 3)
+        self.assertEqual(ReadStateService.count_unread(self.conversation, self.provider), 3)
+
+        self.conversation.mark_as_read_for_user(self.provider, message_ids[2])
+        self.assertEqual(self.conversation.provider_read_watermark, message_ids[6])
+        self.assertEqual(self.conversation.unread_count_provider, 3)
+
+    def test_unread_increments_are_not_lost(self):
+        """Messages saved through stale conversation instances all count"""
+        first = Conversation.objects.get(pk=self.conversation.pk)
+        second = Conversation.objects.get(pk=self.conversation.pk)
+
+        Message.objects.create(conversation=first, sender=self.customer, text='One')
+        Message.objects.create(conversation=second, sender=self.customer, text='Two')
+        Message.objects.create(conversation=second, sender=self.provider, text='Reply')
+
+        self.conversation.refresh_from_db()
+        self.assertEqual((self.conversation.unread_count_provider, self.conversation.unread_count_customer), (2, 1))
+
+    def test_message_read_endpoint_moves_the_watermark(self):
+        """Reading one message marks it and everything before it as read"""
+        message_ids = self.create_thread(3)
+        client = APIClient()
+        client.force_authenticate(self.provider)
+
+        response = client.post(f'/api/messaging/messages/{message_ids[1]}/mark_as_read/')
+
+        self.assertEqual(response.status_code, 200)
+        listing = client.get('/api/messaging/messages/', {'conversation': self.conversation.id})
+        results = listing.data['results'] if isinstance(listing.data, dict) else listing.data
+        self.assertEqual(
+            {row['id']: row['status'] for row in results},
+            {message_ids[0]: 'read', message_ids[1]: 'read', message_ids[2]: 'sent'}
+        )
+
+    def test_out_of_range_ids_are_clamped(self):
+        """Ids past the latest message or below zero cannot push the watermark out of range"""
+        message_ids = self.create_thread(3)
+        client = APIClient()
+        client.force_authenticate(self.provider)
+        url = f'/api/messaging/conversations/{self.conversation.id}/mark_as_read/'
+
+        response = client.post(url, {'up_to_message_id': message_ids[-1] + 10 ** 9}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.provider_read_watermark, message_ids[-1])
+
+        # A message sent afterwards still arrives unread
+        later = Message.objects.create(conversation=self.conversation, sender=self.customer, text='Later')
+        self.conversation.refresh_from_db()
+        self.assertFalse(ReadStateService.is_read_by_recipient(later))
+        self.assertEqual(ReadStateService.count_unread(self.conversation, self.provider), 1)
+
+        response = client.post(url, {'up_to_message_id': -5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.provider_read_watermark, message_ids[-1])
+        self.assertEqual(self.conversation.unread_count_provider, 1)
+
+        empty = Conversation.objects.create(
+            service=self.conversation.service, customer=self.provider, provider=self.customer
+        )
+        ReadStateService.mark_read(empty, self.customer, up_to_message_id=-5)
+        empty.refresh_from_db()
+        self.assertEqual(empty.provider_read_watermark, 0)
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.contact.models import ContactMessage
+from apps.notifications.email_queue import EmailQueueService
+from apps.notifications.models import OutboundEmail
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailQueueServiceTest(TestCase):
+    """Test cases for the outbound email queue"""
+
+    def setUp(self):
+        self.contact_message = ContactMessage.objects.create(
+            name='Sita Sharma',
+            email='sita@example.com',
+            subject='Booking question',
+            message='When can I reschedule my booking?'
+        )
+
+    def test_contact_create_queues_instead_of_sending(self):
+        """Posting the contact form queues both emails without sending anything"""
+        client = APIClient()
+        response = client.post('/api/contact/messages/', {
+            'name': 'Ram Thapa',
+            'email': 'ram@example.com',
+            'subject': 'Provider onboarding',
+            'message': 'How do I register as a service provider?'
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            set(OutboundEmail.objects.values_list('builder', flat=True)),
+            {'apps.contact.emails.build_admin_notification', 'apps.contact.emails.build_confirmation_email'}
+        )
+
+    def test_send_pending_renders_and_delivers_batch(self):
+        """Queued emails are rendered by the worker and marked as sent"""
+        EmailQueueService.enqueue('apps.contact.emails.build_admin_notification', {'message_id': self.contact_message.id})
+        EmailQueueService.enqueue('apps.contact.emails.build_confirmation_email', {'message_id': self.contact_message.id})
+
+        results = EmailQueueService.send_pending()
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[1].to, ['sita@example.com'])
+        self.assertIn('text/html', mail.outbox[1].alternatives[0][1])
+        self.assertFalse(OutboundEmail.objects.exclude(status='sent').exists())
+        self.assertEqual(OutboundEmail.objects.first().attempts, 1)
+
+    def test_batches_share_one_connection(self):
+        """All batches of a drain reuse a single opened connection"""
+        for _ in range(5):
+            EmailQueueService.enqueue('apps.contact.emails.build_confirmation_email', {'message_id': self.contact_message.id})
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.open') as mock_open:
+            results = EmailQueueService.send_pending(batch_size=2)
+
+        self.assertEqual(results['batches'], 3)
+        self.assertEqual(results['sent'], 5)
+        self.assertEqual(mock_open.call_count, 1)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        """A delivery error reschedules the email with exponential backoff"""
+        outbound = EmailQueueService.enqueue(
+            'apps.contact.emails.build_confirmation_email', {'message_id': self.contact_message.id}
+        )
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('SMTP down')):
+            results = EmailQueueService.send_pending()
+
+        outbound.refresh_from_db()
+        self.assertEqual(results['retried'], 1)
+        self.assertEqual(outbound.status, 'pending')
+        self.assertEqual(outbound.attempts, 1)
+        self.assertIn('SMTP down', outbound.last_error)
+        self.assertGreater(outbound.next_attempt_at, timezone.now() + timedelta(seconds=30))
+
+        # Not due yet, so a second drain leaves it alone
+        self.assertEqual(EmailQueueService.send_pending()['sent'], 0)
+
+        OutboundEmail.objects.filter(pk=outbound.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(EmailQueueService.send_pending()['sent'], 1)
+        outbound.refresh_from_db()
+        self.assertEqual(outbound.status, 'sent')
+        self.assertEqual(outbound.attempts, 2)
+
+    @override_settings(EMAIL_QUEUE={'MAX_ATTEMPTS': 1})
+    def test_gives_up_after_max_attempts(self):
+        """Emails are marked failed once the attempt limit is reached"""
+        outbound = EmailQueueService.enqueue(
+            'apps.contact.emails.build_confirmation_email', {'message_id': self.contact_message.id}
+        )
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('SMTP down')):
+            results = EmailQueueService.send_pending()
+
+        outbound.refresh_from_db()
+        self.assertEqual(results['failed'], 1)
+        self.assertEqual(outbound.status, 'failed')
+
+    def test_missing_object_fails_permanently(self):
+        """Emails about deleted objects are not retried"""
+        outbound = EmailQueueService.enqueue('apps.contact.emails.build_confirmation_email', {'message_id': 0})
+
+        results = EmailQueueService.send_pending()
+
+        outbound.refresh_from_db()
+        self.assertEqual(results['failed'], 1)
+        self.assertEqual(outbound.status, 'failed')
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_expired_lease_is_reclaimed(self):
+        """Rows left in 'sending' by a crashed worker are picked up again"""
+        outbound = EmailQueueService.enqueue(
+            'apps.contact.emails.build_confirmation_email', {'message_id': self.contact_message.id}
+        )
+        OutboundEmail.objects.filter(pk=outbound.pk).update(
+            status='sending', locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(EmailQueueService.send_pending()['sent'], 1)
@@ -0,0 +1,114 @@
+from datetime import time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking
+from apps.notifications.dispatch import NotificationDispatcher, NotificationPreferenceCache
+from apps.notifications.models import Notification, UserNotificationSetting
+from apps.services.models import Service, ServiceCategory
+
+
+class NotificationDispatchTest(TestCase):
+    """Test cases for the bulk notification dispatcher and the cached preferences"""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f'dispatchuser{index}', email=f'user{index}@dispatch.test',
+                password='testpass123', role='provider' if index % 2 else 'customer'
+            )
+            for index in range(4)
+        ]
+        UserNotificationSetting.objects.update_or_create(
+            user=self.users[0], defaults={'review_notifications': False}
+        )
+        Notification.objects.all().delete()
+        cache.clear()
+
+    def review_items(self):
+        return [
+            {'user': user, 'type': 'review', 'title': 'New Review', 'message': 'You got a review', 'related_id': 9}
+            for user in self.users
+        ]
+
+    def test_dispatch_honors_preferences_with_bulk_insert(self):
+        """Preferences load in one query, disabled types are skipped and the rest go in one INSERT"""
+        with CaptureQueriesContext(connection) as queries:
+            created = NotificationDispatcher.dispatch(self.review_items())
+
+        self.assertEqual(len(created), 3)
+        # Preferences, INSERT, counter lookup and seed, plus the atomic block's savepoint pair
+        self.assertEqual(len(queries.captured_queries), 7)
+        self.assertFalse(Notification.objects.filter(user=self.users[0]).exists())
+        notification = Notification.objects.get(user=self.users[1])
+        self.assertEqual((notification.type, notification.notification_type, notification.related_id), ('review', 'review', 9))
+
+        # Preferences now come from the cache and the existing counters take one UPDATE
+        with CaptureQueriesContext(connection) as queries:
+            NotificationDispatcher.dispatch(self.review_items())
+        self.assertEqual(len(queries.captured_queries), 5)
+
+    def test_settings_change_invalidates_cache(self):
+        """Saving a user's notification settings takes effect on the next dispatch"""
+        NotificationPreferenceCache.get_many([user.id for user in self.users])
+
+        settings_row = UserNotificationSetting.objects.get(user=self.users[0])
+        settings_row.review_notifications = True
+        settings_row.save()
+
+        created = NotificationDispatcher.dispatch(self.review_items())
+        self.assertEqual(len(created), 4)
+
+    def test_push_after_commit_in_one_call(self):
+        """Realtime delivery runs once per dispatch, after the transaction commits"""
+        with patch.object(NotificationDispatcher, 'push') as push:
+            with self.captureOnCommitCallbacks(execute=True):
+                created = NotificationDispatcher.dispatch(self.review_items())
+                push.assert_not_called()
+
+        push.assert_called_once_with(created)
+
+    def test_broadcast_command(self):
+        """The broadcast command notifies every active user of a role"""
+        call_command(
+            'broadcast_notification', title='Maintenance', message='Back soon', role='provider', stdout=StringIO()
+        )
+
+        self.assertEqual(
+            set(Notification.objects.values_list('user_id', flat=True)),
+            {self.users[1].id, self.users[3].id}
+        )
+        self.assertEqual(set(Notification.objects.values_list('type', flat=True)), {'system'})
+
+    def test_new_booking_follows_booking_requests_preference(self):
+        """A provider who turned off booking requests is not notified of new bookings"""
+        customer, provider = self.users[0], self.users[1]
+        UserNotificationSetting.objects.update_or_create(
+            user=provider, defaults={'booking_requests': False, 'booking_updates': True}
+        )
+        category = ServiceCategory.objects.create(title='Plumbing')
+        service = Service.objects.create(
+            provider=provider, category=category, title='Leak repair', slug='leak-repair',
+            description='Fix leaks', price=Decimal('800.00'), status='active'
+        )
+
+        booking = Booking.objects.create(
+            customer=customer, service=service, booking_date=timezone.localdate() + timedelta(days=2),
+            booking_time=time(9), address='Baneshwor', city='Kathmandu', phone='9800000005',
+            price=Decimal('800.00'), total_amount=Decimal('800.00')
+        )
+        self.assertFalse(Notification.objects.filter(user=provider).exists())
+
+        booking.status = 'cancelled'
+        booking.save()
+        self.assertEqual(list(Notification.objects.filter(user=provider).values_list('type', flat=True)), ['booking'])
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.notifications.counters import UnreadCounterService
+from apps.notifications.dispatch import NotificationDispatcher
+from apps.notifications.models import Notification, NotificationCounter
+from apps.notifications.retention import NotificationRetentionService
+
+
+class UnreadCounterTest(TestCase):
+    """Test cases for the denormalized unread notification counter"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='counteruser', email='user@counter.test', password='testpass123', role='customer'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def notify(self, count=1):
+        return [
+            Notification.objects.create(user=self.user, title='Hello', message='World', notification_type='system')
+            for _ in range(count)
+        ]
+
+    def unread_count(self):
+        response = self.client.get('/api/notifications/unread_count/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['unread_count']
+
+    def test_counter_follows_create_read_and_delete(self):
+        """Single notification changes adjust the counter without counting rows"""
+        first, second, third = self.notify(3)
+        NotificationDispatcher.dispatch([{'user': self.user.id, 'type': 'system', 'title': 'Bulk', 'message': 'Hi'}])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.unread_count(), 4)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+        self.client.post(f'/api/notifications/{first.id}/mark_read/')
+        self.client.post(f'/api/notifications/{first.id}/mark_read/')
+        self.assertEqual(self.unread_count(), 3)
+
+        self.client.patch(f'/api/notifications/{first.id}/', {'is_read': False}, format='json')
+        self.assertEqual(self.unread_count(), 4)
+
+        self.client.delete(f'/api/notifications/{second.id}/')
+        self.assertEqual(self.unread_count(), 3)
+
+        self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(self.unread_count(), 0)
+        self.client.delete('/api/notifications/clear_read/')
+        self.assertFalse(Notification.objects.filter(user=self.user).exists())
+        self.assertEqual(self.unread_count(), 0)
+
+    def test_stale_instances_change_the_counter_once(self):
+        """Two copies of one notification marked read or deleted only count once"""
+        notification, _ = self.notify(2)
+        first, second = Notification.objects.get(pk=notification.pk), Notification.objects.get(pk=notification.pk)
+
+        first.is_read = True
+        first.save()
+        second.is_read = True
+        second.save()
+        self.assertEqual(UnreadCounterService.get(self.user.id), 1)
+
+        first.is_read = False
+        first.save()
+        first.delete()
+        Notification(pk=notification.pk, user=self.user).delete()
+        self.assertEqual(UnreadCounterService.get(self.user.id), 1)
+
+    def test_missing_counter_is_seeded_and_drift_reconciled(self):
+        """Counters are created from a COUNT on first use and fixed by the reconcile step"""
+        self.notify(2)
+        NotificationCounter.objects.filter(user=self.user).delete()
+        self.assertEqual(UnreadCounterService.get(self.user.id), 2)
+
+        # Bulk updates bypass the counter
+        Notification.objects.filter(user=self.user).update(is_read=True)
+        self.assertEqual(UnreadCounterService.reconcile(), 1)
+        self.assertEqual(UnreadCounterService.get(self.user.id), 0)
+        self.assertEqual(UnreadCounterService.reconcile(), 0)
+
+    def test_retention_purges_old_read_notifications_in_chunks(self):
+        """Only read notifications past the retention period are deleted"""
+        old_read = self.notify(5)
+        old_unread, recent_read = self.notify(2)
+        for notification in old_read:
+            notification.is_read = True
+            notification.save()
+        recent_read.is_read = True
+        recent_read.save()
+        Notification.objects.filter(pk__in=[n.pk for n in old_read + [old_unread]]).update(
+            created_at=timezone.now() - timedelta(days=120)
+        )
+
+        result = NotificationRetentionService.purge_read(retention_days=90, batch_size=2)
+
+        self.assertEqual(result, {'deleted': 5, 'batches': 3})
+        self.assertEqual(
+            set(Notification.objects.values_list('pk', flat=True)), {old_unread.pk, recent_read.pk}
+        )
+        self.assertEqual(UnreadCounterService.get(self.user.id), 1)
+
+        out = StringIO()
+        call_command('purge_read_notifications', days=90, stdout=out)
+        self.assertIn('Deleted 0 read notification(s)', out.getvalue())
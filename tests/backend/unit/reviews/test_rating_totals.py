@@ -0,0 +1,135 @@
+from datetime import date, time
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import Profile, User
+from apps.bookings.models import Booking, CustomerFeedback
+from apps.common.ratings import reconcile_rating_totals
+from apps.reviews.models import Review
+from apps.services.models import Service, ServiceCategory, ServiceReview
+
+
+class RunningRatingTotalsTest(TestCase):
+    """Test cases for the F()-maintained service and provider rating totals"""
+
+    def setUp(self):
+        self.provider = User.objects.create_user(
+            username='ratedprovider', email='provider@ratings.test', password='testpass123', role='provider'
+        )
+        Profile.objects.get_or_create(user=self.provider)
+        category = ServiceCategory.objects.create(title='Plumbing')
+        self.service = Service.objects.create(
+            provider=self.provider, category=category, title='Leak repair', slug='leak-repair',
+            description='Fix leaks', price=Decimal('800.00'), status='active'
+        )
+        self.customers = [
+            User.objects.create_user(
+                username=f'ratingcustomer{index}', email=f'customer{index}@ratings.test',
+                password='testpass123', role='customer'
+            )
+            for index in range(3)
+        ]
+        self.bookings = [
+            Booking.objects.create(
+                customer=customer, service=self.service, booking_date=date(2024, 5, index + 1),
+                booking_time=time(9), address='Lalitpur', city='Lalitpur', phone='9800000003',
+                price=Decimal('800.00'), total_amount=Decimal('800.00'), status='completed'
+            )
+            for index, customer in enumerate(self.customers)
+        ]
+
+    def service_review(self, customer, rating):
+        return ServiceReview.objects.create(
+            service=self.service, user=customer, rating=rating, comment='Good',
+            quality_rating=rating, value_rating=rating, communication_rating=rating, punctuality_rating=rating
+        )
+
+    def assert_service_totals(self, rating_sum, count, average):
+        self.service.refresh_from_db()
+        self.assertEqual(
+            (self.service.rating_sum, self.service.reviews_count, self.service.average_rating),
+            (rating_sum, count, Decimal(average))
+        )
+
+    def assert_provider_totals(self, rating_sum, count, average):
+        profile = Profile.objects.get(user=self.provider)
+        self.assertEqual((profile.rating_sum, profile.reviews_count, profile.avg_rating), (rating_sum, count, Decimal(average)))
+
+    def test_service_review_create_edit_delete(self):
+        """Service reviews apply their own delta without aggregating the other reviews"""
+        self.service_review(self.customers[0], 5)
+        with CaptureQueriesContext(connection) as queries:
+            review = self.service_review(self.customers[1], 4)
+        self.assertFalse(any('AVG(' in query['sql'] or 'COUNT(' in query['sql'] for query in queries.captured_queries))
+        self.assert_service_totals(9, 2, '4.50')
+
+        review.rating = 2
+        review.save()
+        self.assert_service_totals(7, 2, '3.50')
+
+        # A reloaded instance applies the difference against the stored rating
+        reloaded = ServiceReview.objects.get(pk=review.pk)
+        reloaded.rating = 3
+        reloaded.save()
+        self.assert_service_totals(8, 2, '4.00')
+
+        reloaded.delete()
+        self.assert_service_totals(5, 1, '5.00')
+
+    def test_booking_reviews_and_feedback_count_for_the_service(self):
+        """Booking reviews move the service and provider totals; feedback moves the service totals"""
+        self.service_review(self.customers[2], 2)
+        review = Review.objects.create(
+            customer=self.customers[0], provider=self.provider, booking=self.bookings[0], rating=4, comment='Neat'
+        )
+        feedback = CustomerFeedback.objects.create(
+            booking=self.bookings[1], rating=1, punctuality_rating=1, quality_rating=1,
+            communication_rating=1, value_rating=1, comment='Late'
+        )
+        self.assert_service_totals(7, 3, '2.33')
+        self.assert_provider_totals(4, 1, '4.00')
+
+        review.rating = 5
+        review.save()
+        self.assert_service_totals(8, 3, '2.67')
+        self.assert_provider_totals(5, 1, '5.00')
+
+        with CaptureQueriesContext(connection) as queries:
+            feedback.rating = 4
+            feedback.save()
+        self.assertFalse(any('AVG(' in query['sql'] or 'COUNT(' in query['sql'] for query in queries.captured_queries))
+        self.assert_service_totals(11, 3, '3.67')
+
+        # Deleting the booking cascades to its feedback
+        self.bookings[1].delete()
+        self.assert_service_totals(7, 2, '3.50')
+        self.assert_provider_totals(5, 1, '5.00')
+        review.delete()
+        self.assert_service_totals(2, 1, '2.00')
+        self.assert_provider_totals(0, 0, '0.00')
+
+    def test_reconcile_fixes_drift(self):
+        """The reconcile command rewrites only rows whose totals drifted"""
+        self.service_review(self.customers[0], 5)
+        self.service_review(self.customers[1], 2)
+        Review.objects.create(
+            customer=self.customers[2], provider=self.provider, booking=self.bookings[2], rating=3, comment='Ok'
+        )
+        CustomerFeedback.objects.create(
+            booking=self.bookings[0], rating=4, punctuality_rating=4, quality_rating=4,
+            communication_rating=4, value_rating=4, comment='Fine'
+        )
+        self.assertEqual(reconcile_rating_totals(), {'services': 0, 'providers': 0})
+
+        # Bulk updates bypass save() and leave the totals stale
+        ServiceReview.objects.update(rating=1)
+        Profile.objects.filter(user=self.provider).update(avg_rating=Decimal('4.90'))
+
+        call_command('reconcile_ratings', verbosity=0)
+        self.assert_service_totals(9, 4, '2.25')
+        self.assert_provider_totals(3, 1, '3.00')
+        self.assertEqual(reconcile_rating_totals(), {'services': 0, 'providers': 0})
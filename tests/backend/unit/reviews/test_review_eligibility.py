@@ -0,0 +1,104 @@
+from datetime import date, time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking
+from apps.reviews.models import Review
+from apps.reviews.services import ReviewEligibilityService
+from apps.services.models import Service, ServiceCategory
+
+
+class ReviewEligibilityIndexTest(TestCase):
+    """Test cases for the cached anti-join review eligibility lookup"""
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create_user(
+            username='eligiblecustomer', email='customer@eligibility.test', password='testpass123', role='customer'
+        )
+        category = ServiceCategory.objects.create(title='Cleaning')
+        self.providers = []
+        self.bookings = []
+        for index in range(3):
+            provider = User.objects.create_user(
+                username=f'eligibleprovider{index}', email=f'provider{index}@eligibility.test',
+                password='testpass123', role='provider'
+            )
+            service = Service.objects.create(
+                provider=provider, category=category, title=f'Deep clean {index}', slug=f'deep-clean-{index}',
+                description='Clean', price=Decimal('1000.00'), status='active'
+            )
+            self.providers.append(provider)
+            self.bookings.append(Booking.objects.create(
+                customer=self.customer, service=service, booking_date=date(2024, 3, index + 1),
+                booking_time=time(10), address='Baneshwor', city='Kathmandu', phone='9800000002',
+                price=Decimal('1000.00'), total_amount=Decimal('1000.00'),
+                status='completed' if index < 2 else 'confirmed'
+            ))
+
+    def test_many_providers_in_one_lookup(self):
+        """Reviewable bookings for several providers load together and then come from cache"""
+        provider_ids = [provider.id for provider in self.providers]
+        with CaptureQueriesContext(connection) as queries:
+            index = ReviewEligibilityService.get_eligibility_index(self.customer, provider_ids)
+
+        # One anti-join plus one grouped query for the provider without reviewable bookings
+        self.assertEqual(len(queries.captured_queries), 2)
+        self.assertEqual([row['id'] for row in index[self.providers[0].id]['bookings']], [self.bookings[0].id])
+        self.assertEqual(index[self.providers[2].id], {'bookings': [], 'has_bookings': True, 'has_completed': False})
+
+        with CaptureQueriesContext(connection) as queries:
+            result = ReviewEligibilityService.is_eligible(self.customer, self.providers[1], self.bookings[1].id)
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertTrue(result['eligible'])
+        self.assertEqual(result['booking']['id'], self.bookings[1].id)
+
+    def test_review_creation_invalidates_the_entry(self):
+        """Writing a review removes its booking from the cached eligibility"""
+        provider = self.providers[0]
+        self.assertTrue(ReviewEligibilityService.is_eligible(self.customer, provider)['eligible'])
+
+        Review.objects.create(
+            customer=self.customer, provider=provider, booking=self.bookings[0], rating=5, comment='Spotless work'
+        )
+
+        result = ReviewEligibilityService.is_eligible(self.customer, provider)
+        self.assertFalse(result['eligible'])
+        self.assertEqual(
+            result['reason'], 'You have already reviewed all your completed bookings with this provider'
+        )
+
+    def test_booking_completion_invalidates_the_entry(self):
+        """Completing a booking makes it reviewable straight away"""
+        provider = self.providers[2]
+        self.assertEqual(
+            ReviewEligibilityService.is_eligible(self.customer, provider)['reason'],
+            'You can only review completed bookings'
+        )
+
+        booking = self.bookings[2]
+        booking.status = 'completed'
+        booking.save()
+
+        self.assertTrue(ReviewEligibilityService.is_eligible(self.customer, provider, booking.id)['eligible'])
+
+    def test_batch_endpoint(self):
+        """Customers can check several providers in one request"""
+        client = APIClient()
+        client.force_authenticate(self.customer)
+
+        response = client.get('/api/reviews/providers/review_eligibility_batch/', {
+            'provider_ids': ','.join(str(provider.id) for provider in self.providers)
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {provider_id: entry['eligible'] for provider_id, entry in response.data['results'].items()},
+            {str(self.providers[0].id): True, str(self.providers[1].id): True, str(self.providers[2].id): False}
+        )
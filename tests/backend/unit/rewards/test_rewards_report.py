@@ -0,0 +1,96 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.rewards.models import PointsTransaction, RewardAccount, RewardsConfig
+
+
+def create_report_data():
+    """Two users with earning and redemption transactions spread over a few days."""
+    RewardsConfig.get_active_config()
+    now = timezone.now()
+    for index, tier in enumerate(['bronze', 'silver']):
+        user = User.objects.create_user(
+            username=f'reportuser{index}', email=f'report{index}@rewards.test', password='testpass123', role='customer'
+        )
+        RewardAccount.objects.update_or_create(
+            user=user, defaults={'current_balance': 500, 'total_points_earned': 900 + index * 4000, 'tier_level': tier}
+        )
+        for days_ago, transaction_type, points in [(1, 'earned_booking', 100), (2, 'earned_review', 50),
+                                                   (2, 'redeemed_voucher', -30)]:
+            transaction = PointsTransaction.objects.create(
+                user=user, transaction_type=transaction_type, points=points, balance_after=500,
+                description='Report test'
+            )
+            PointsTransaction.objects.filter(pk=transaction.pk).update(created_at=now - timedelta(days=days_ago))
+
+
+def run_report(*args):
+    """Run rewards_report and return its stdout."""
+    stdout = StringIO()
+    call_command('rewards_report', *args, stdout=stdout, stderr=StringIO())
+    return stdout.getvalue()
+
+
+class RewardsReportTest(TestCase):
+    """Test cases for the grouped-query rewards_report command"""
+
+    def setUp(self):
+        create_report_data()
+
+    def test_report_totals_from_grouped_queries(self):
+        """Daily trends, histograms and tier candidates come out of grouped queries"""
+        report = json.loads(run_report('--format', 'json', '--date-range', '7'))
+
+        summary = report['points_analytics']['period_summary']
+        self.assertEqual(summary['total_earned'], 300)
+        self.assertEqual(summary['total_redeemed'], 60)
+        self.assertEqual(summary['transaction_count'], 6)
+        self.assertEqual(sum(day['transaction_count'] for day in report['points_analytics']['daily_trends']), 6)
+        self.assertEqual(len(report['points_analytics']['daily_trends']), 7)
+        self.assertEqual(sum(hour['count'] for hour in report['transaction_patterns']['hourly_distribution']), 6)
+        self.assertEqual(sum(day['count'] for day in report['transaction_patterns']['weekly_distribution']), 6)
+        self.assertEqual(report['tier_analysis']['progression_candidates']['bronze_to_silver_candidates'], 1)
+        self.assertEqual(report['tier_analysis']['progression_candidates']['silver_to_gold_candidates'], 1)
+        self.assertEqual(report['user_engagement']['active_users_period'], 2)
+
+    def test_query_count_does_not_grow_with_date_range(self):
+        """A year-long report runs the same queries as a week-long one"""
+        with CaptureQueriesContext(connection) as week:
+            run_report('--format', 'json', '--date-range', '7')
+        with CaptureQueriesContext(connection) as year:
+            run_report('--format', 'json', '--date-range', '365')
+
+        self.assertEqual(len(week.captured_queries), len(year.captured_queries))
+
+    def test_jsonl_streams_one_line_per_section(self):
+        """--format jsonl writes each section as its own JSON line"""
+        lines = [json.loads(line) for line in run_report('--format', 'jsonl').splitlines()]
+
+        self.assertEqual(
+            sorted(line['section'] for line in lines),
+            sorted(['system_overview', 'user_engagement', 'points_analytics', 'tier_analysis',
+                    'transaction_patterns', 'financial_impact', 'recommendations'])
+        )
+
+
+class ParallelRewardsReportTest(TransactionTestCase):
+    """Test cases for rewards_report --parallel (sections use their own connections)"""
+
+    def test_parallel_report_matches_serial_report(self):
+        """Running the sections concurrently gives the same report"""
+        create_report_data()
+
+        serial = json.loads(run_report('--format', 'json'))
+        parallel = json.loads(run_report('--format', 'json', '--parallel'))
+
+        for report in (serial, parallel):
+            report['system_overview'].pop('report_date')
+        self.assertEqual(serial, parallel)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from apps.common.throttling import SlidingWindowUserRateThrottle, get_api_throttle_setting
+from apps.rewards.throttles import VoucherValidationThrottle
+
+
+class Clock:
+    """Controllable replacement for the throttle timer."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class SlidingWindowThrottleTest(SimpleTestCase):
+    """Test cases for the two-counter sliding-window throttles"""
+
+    def setUp(self):
+        self.cache = caches[get_api_throttle_setting('CACHE_ALIAS')]
+        self.cache.clear()
+        self.clock = Clock(6000.0)
+        self.request = SimpleNamespace(user=SimpleNamespace(is_authenticated=True, pk=42), META={})
+
+    def make_throttle(self, cls=SlidingWindowUserRateThrottle, rate='3/min'):
+        throttle_class = type('TestThrottle', (cls,), {'rate': rate, 'timer': self.clock})
+        return throttle_class()
+
+    def allowed(self, count, view=None):
+        return [self.make_throttle().allow_request(self.request, view) for _ in range(count)]
+
+    def test_counts_are_two_integers_per_key(self):
+        """Requests over the rate are refused and the store holds one integer per window"""
+        self.assertEqual(self.allowed(4), [True, True, True, False])
+
+        self.assertEqual(self.cache.get('throttle_user_42:100'), 3)
+        self.assertIsNone(self.cache.get('throttle_user_42'))
+
+    def test_previous_window_decays(self):
+        """Half way into the next window half of the previous count still applies"""
+        self.allowed(3)
+        self.clock.now += 90
+
+        throttle = self.make_throttle()
+        self.assertTrue(throttle.allow_request(self.request, None))
+        self.assertFalse(throttle.allow_request(self.request, None))
+        # 3 * (1 - elapsed) + 1 must fall to 2 before the next request fits
+        self.assertAlmostEqual(throttle.wait(), 10.0)
+
+        self.clock.now += 10
+        self.assertEqual(self.allowed(2), [True, False])
+
+    def test_voucher_validation_scope(self):
+        """Scoped throttles read the view's scope rate and keep separate counters"""
+        view = SimpleNamespace(throttle_scope='voucher_validation')
+        throttle = VoucherValidationThrottle()
+        throttle.timer = self.clock
+
+        results = [throttle.allow_request(self.request, view) for _ in range(100)]
+
+        self.assertEqual(results.count(True), throttle.num_requests)
+        self.assertFalse(results[-1])
+        self.assertEqual(self.cache.get(f'throttle_voucher_validation_42:{int(self.clock.now // 60)}'), throttle.num_requests)
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.rewards.models import RewardVoucher
+
+
+class VoucherExpiryTest(TestCase):
+    """Test cases for read-only effective voucher status and the batched expiry sweep"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='expiryuser', email='expiry@vouchers.test', password='testpass123', role='customer'
+        )
+        now = timezone.now()
+        self.overdue = [
+            RewardVoucher.objects.create(
+                user=self.user, value=Decimal('100'), points_redeemed=0, expires_at=now - timedelta(days=1)
+            )
+            for _ in range(5)
+        ]
+        self.current = RewardVoucher.objects.create(
+            user=self.user, value=Decimal('100'), points_redeemed=0, expires_at=now + timedelta(days=30)
+        )
+        self.used = RewardVoucher.objects.create(
+            user=self.user, value=Decimal('100'), points_redeemed=0, status='used', expires_at=now - timedelta(days=1)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_listing_vouchers_never_writes(self):
+        """Overdue vouchers read as expired without updating any rows"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/rewards/vouchers/', {'status': 'expired'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        self.assertTrue(all(row['status'] == 'expired' for row in response.data['results']))
+        self.assertFalse([query for query in queries.captured_queries if query['sql'].startswith('UPDATE')])
+        self.assertEqual(RewardVoucher.objects.filter(status='active').count(), 6)
+
+        active = self.client.get('/api/rewards/vouchers/', {'status': 'active'})
+        self.assertEqual([row['voucher_code'] for row in active.data['results']], [self.current.voucher_code])
+
+    def test_sweep_expires_in_pk_ranged_batches(self):
+        """The sweep marks only overdue active vouchers, one UPDATE per chunk"""
+        with CaptureQueriesContext(connection) as queries:
+            expired = RewardVoucher.objects.update_expired_vouchers(batch_size=2)
+
+        self.assertEqual(expired, 5)
+        self.assertEqual(len([query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]), 3)
+        self.assertEqual(RewardVoucher.objects.filter(status='expired').count(), 5)
+        self.current.refresh_from_db()
+        self.used.refresh_from_db()
+        self.assertEqual((self.current.status, self.used.status), ('active', 'used'))
+        self.assertEqual(RewardVoucher.objects.update_expired_vouchers(), 0)
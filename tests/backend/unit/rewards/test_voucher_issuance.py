@@ -0,0 +1,115 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.rewards.issuance import VoucherIssuanceError, VoucherIssuanceService
+from apps.rewards.models import PointsTransaction, RewardAccount, RewardVoucher
+
+
+class VoucherIssuanceTest(TestCase):
+    """Test cases for bulk voucher issuance and collision-safe voucher codes"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f'issueuser{index}', email=f'issue{index}@vouchers.test',
+                password='testpass123', role='customer'
+            )
+            for index in range(3)
+        ]
+        for user in self.users:
+            RewardAccount.objects.update_or_create(user=user, defaults={'current_balance': 5000})
+
+    def test_bulk_issue_uses_constant_queries(self):
+        """Issuing more vouchers does not issue more queries"""
+        def issue(count):
+            grants = [{'user': self.users[index % 3], 'value': 100, 'points': 100} for index in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                VoucherIssuanceService.issue(grants)
+            return len(queries.captured_queries)
+
+        issue(1)  # Creates the default RewardsConfig
+        self.assertEqual(issue(3), issue(15))
+        self.assertEqual(RewardVoucher.objects.count(), 19)
+
+    def test_points_are_charged_with_matching_transactions(self):
+        """Charged grants deduct points and record one transaction per voucher"""
+        user = self.users[0]
+        vouchers = VoucherIssuanceService.issue([
+            {'user': user, 'value': Decimal('100'), 'points': 1000},
+            {'user': user, 'value': Decimal('200'), 'points': 2000},
+        ])
+
+        account = RewardAccount.objects.get(user=user)
+        self.assertEqual(account.current_balance, 2000)
+        self.assertEqual(account.total_points_redeemed, 3000)
+
+        transactions = PointsTransaction.objects.filter(user=user, transaction_type='redeemed_voucher')
+        self.assertEqual(
+            sorted(transactions.values_list('voucher_id', 'points', 'balance_after')),
+            sorted([(vouchers[0].pk, -1000, 4000), (vouchers[1].pk, -2000, 2000)])
+        )
+
+    def test_insufficient_points_rolls_back_the_batch(self):
+        """A batch that cannot be paid for issues nothing"""
+        with self.assertRaises(VoucherIssuanceError):
+            VoucherIssuanceService.issue([
+                {'user': self.users[0], 'value': 100, 'points': 1000},
+                {'user': self.users[1], 'value': 100, 'points': 9000},
+            ])
+
+        self.assertFalse(RewardVoucher.objects.exists())
+        self.assertEqual(RewardAccount.objects.get(user=self.users[0]).current_balance, 5000)
+
+    def test_only_colliding_codes_are_retried(self):
+        """Rows whose code is taken get a new code; the others keep theirs"""
+        taken = RewardVoucher.objects.create(
+            user=self.users[0], value=Decimal('50'), points_redeemed=0, voucher_code='SB-20240101-TAKEN1'
+        )
+        codes = iter(['SB-20240101-TAKEN1', 'SB-20240101-FRESH1', 'SB-20240101-FRESH2'])
+
+        with mock.patch.object(RewardVoucher, 'generate_voucher_code', side_effect=lambda *args: next(codes)):
+            vouchers = VoucherIssuanceService.issue(
+                [{'user': self.users[1], 'value': 100}, {'user': self.users[2], 'value': 100}]
+            )
+
+        self.assertEqual([voucher.voucher_code for voucher in vouchers], ['SB-20240101-FRESH2', 'SB-20240101-FRESH1'])
+        self.assertEqual(RewardVoucher.objects.get(voucher_code='SB-20240101-TAKEN1').pk, taken.pk)
+        self.assertIn('SB-20240101-FRESH2', vouchers[0].qr_code_data)
+
+    def test_duplicate_codes_within_a_batch_are_regenerated(self):
+        """A code generated twice in one batch is inserted, charged and read back once"""
+        user = self.users[0]
+        codes = iter(['SB-20240101-TWICE1', 'SB-20240101-TWICE1', 'SB-20240101-FRESH1'])
+
+        with mock.patch.object(RewardVoucher, 'generate_voucher_code', side_effect=lambda *args: next(codes)):
+            vouchers = VoucherIssuanceService.issue([
+                {'user': user, 'value': 100, 'points': 100},
+                {'user': user, 'value': 100, 'points': 100},
+            ])
+
+        self.assertEqual([voucher.voucher_code for voucher in vouchers], ['SB-20240101-TWICE1', 'SB-20240101-FRESH1'])
+        self.assertNotEqual(vouchers[0].pk, vouchers[1].pk)
+        self.assertEqual(RewardVoucher.objects.filter(user=user).count(), 2)
+        self.assertEqual(
+            sorted(PointsTransaction.objects.filter(user=user).values_list('voucher_id', flat=True)),
+            sorted(voucher.pk for voucher in vouchers)
+        )
+        self.assertEqual(RewardAccount.objects.get(user=user).current_balance, 4800)
+
+    def test_single_save_retries_on_code_collision(self):
+        """A generated code that is already taken is replaced on insert"""
+        RewardVoucher.objects.create(
+            user=self.users[0], value=Decimal('50'), points_redeemed=0, voucher_code='SB-20240101-TAKEN1'
+        )
+        codes = iter(['SB-20240101-TAKEN1', 'SB-20240101-FRESH1'])
+
+        with mock.patch.object(RewardVoucher, 'generate_voucher_code', side_effect=lambda *args: next(codes)):
+            voucher = RewardVoucher.objects.create(user=self.users[1], value=Decimal('100'), points_redeemed=0)
+
+        self.assertEqual(voucher.voucher_code, 'SB-20240101-FRESH1')
+        self.assertIn('SB-20240101-FRESH1', voucher.qr_code_data)
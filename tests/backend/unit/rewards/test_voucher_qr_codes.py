@@ -0,0 +1,89 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.rewards import qr_codes
+from apps.rewards.models import RewardVoucher
+
+
+class VoucherQRCodeTest(TestCase):
+    """Test cases for the content-addressed voucher QR cache and PNG endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='qruser', email='qr@vouchers.test', password='testpass123', role='customer'
+        )
+        self.vouchers = [
+            RewardVoucher.objects.create(user=self.user, value=Decimal('100.00'), points_redeemed=1000)
+            for _ in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_same_payload_is_rendered_once(self):
+        """A cached PNG is reused until the payload changes"""
+        with mock.patch('qrcode.QRCode', wraps=__import__('qrcode').QRCode) as qr_class:
+            first, first_hash = qr_codes.render_qr_png('payload-a')
+            second, second_hash = qr_codes.render_qr_png('payload-a')
+            _, other_hash = qr_codes.render_qr_png('payload-b')
+
+        self.assertEqual(qr_class.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith(b'\x89PNG'))
+        self.assertEqual(first_hash, second_hash)
+        self.assertNotEqual(first_hash, other_hash)
+
+    def test_list_carries_urls_and_detail_embeds_image(self):
+        """The voucher list does not render QR images; the detail view does"""
+        with mock.patch('apps.rewards.serializers.qr_data_uri') as render:
+            response = self.client.get('/api/rewards/vouchers/')
+        self.assertEqual(response.status_code, 200)
+        render.assert_not_called()
+        row = response.data['results'][0]
+        self.assertIsNone(row['qr_code_image'])
+        self.assertIn(f"/api/rewards/vouchers/{row['voucher_code']}/qr.png?expires=", row['qr_code_url'])
+
+        response = self.client.get(f'/api/rewards/vouchers/{self.vouchers[0].voucher_code}/')
+        self.assertTrue(response.data['qr_code_image'].startswith('data:image/png;base64,'))
+
+    def test_png_endpoint_supports_etag_revalidation(self):
+        """The PNG endpoint answers If-None-Match with 304"""
+        url = f'/api/rewards/vouchers/{self.vouchers[0].voucher_code}/qr.png'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        other_user = User.objects.create_user(
+            username='qrother', email='other@vouchers.test', password='testpass123', role='customer'
+        )
+        self.client.force_authenticate(other_user)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_signed_url_loads_without_credentials(self):
+        """The qr_code_url works as an <img src>; unsigned or tampered requests need a login"""
+        voucher = self.vouchers[0]
+        url = self.client.get(f'/api/rewards/vouchers/{voucher.voucher_code}/').data['qr_code_url']
+
+        anonymous = APIClient()
+        response = anonymous.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+
+        other_url = url.replace(voucher.voucher_code, self.vouchers[1].voucher_code)
+        self.assertEqual(anonymous.get(other_url).status_code, 403)
+        self.assertEqual(anonymous.get(url.split('?')[0]).status_code, 403)
+
+        params = qr_codes.sign_qr_url(voucher.voucher_code, now=0)
+        self.assertFalse(qr_codes.verify_qr_url(voucher.voucher_code, params['expires'], params['signature']))
@@ -0,0 +1,165 @@
+import io
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking, ServiceDelivery
+from apps.common.images import generate_mapped_image_derivatives
+from apps.services.models import Service, ServiceCategory, ServiceImage
+from apps.services.serializers import ServiceImageSerializer, ServiceSerializer
+
+
+def make_image(width=1600, height=1200, image_format='JPEG', mode='RGB'):
+    """Return encoded bytes of a solid-colour test image"""
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 80, 40) if mode == 'RGB' else (200, 80, 40, 128)).save(
+        buffer, format=image_format
+    )
+    return buffer.getvalue()
+
+
+class ImageDerivativesTest(TestCase):
+    """Test cases for resized image derivative generation and selection"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            IMAGE_DERIVATIVES={'DISPATCH': 'sync'}
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.provider = User.objects.create_user(
+            username='imageprovider', email='provider@images.test', password='testpass123', role='provider'
+        )
+        category = ServiceCategory.objects.create(title='Painting')
+        self.service = Service.objects.create(
+            provider=self.provider,
+            title='Wall Painting',
+            slug='wall-painting-images',
+            description='Interior painting',
+            price=Decimal('2500.00'),
+            category=category,
+            status='active'
+        )
+        self.factory = RequestFactory()
+
+    def create_service_image(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ServiceImage.objects.create(
+                service=self.service,
+                image=SimpleUploadedFile('photo.jpg', make_image(**kwargs), content_type='image/jpeg'),
+                is_featured=True
+            )
+
+    def test_upload_generates_webp_and_jpeg_sizes(self):
+        """Saving an image produces WebP and JPEG derivatives for every size"""
+        service_image = self.create_service_image()
+        service_image.refresh_from_db()
+
+        variants = service_image.image_variants
+        self.assertEqual(variants['source'], service_image.image.name)
+        self.assertEqual(
+            {size: variant['width'] for size, variant in variants['sizes'].items()},
+            {'small': 200, 'medium': 600, 'large': 1200}
+        )
+        self.assertEqual(variants['sizes']['small']['height'], 150)
+        with default_storage.open(variants['sizes']['medium']['webp']) as f:
+            self.assertEqual(Image.open(f).format, 'WEBP')
+        with default_storage.open(variants['sizes']['medium']['jpeg']) as f:
+            self.assertEqual(Image.open(f).size, (600, 450))
+
+    def test_small_images_are_not_upscaled(self):
+        """Sizes wider than the original reuse a single original-width derivative"""
+        service_image = self.create_service_image(width=400, height=300)
+        service_image.refresh_from_db()
+
+        sizes = service_image.image_variants['sizes']
+        self.assertEqual(sizes['small']['width'], 200)
+        self.assertEqual(sizes['medium']['width'], 400)
+        self.assertEqual(sizes['medium']['webp'], sizes['large']['webp'])
+
+    def test_serializers_return_requested_size_and_format(self):
+        """List cards get the medium JPEG by default; clients can ask for other sizes and WebP"""
+        service_image = self.create_service_image()
+        service_image.refresh_from_db()
+        sizes = service_image.image_variants['sizes']
+
+        card_request = self.factory.get('/')
+        card_request.user = self.provider
+        card = ServiceSerializer(self.service, context={'request': card_request}).data
+        self.assertTrue(card['image'].endswith(sizes['medium']['jpeg']))
+
+        request = self.factory.get('/', {'image_size': 'small'}, HTTP_ACCEPT='image/webp,image/*')
+        data = ServiceImageSerializer(service_image, context={'request': request}).data
+        self.assertTrue(data['image'].endswith(sizes['small']['webp']))
+        self.assertEqual(set(data['image_variants']), {'small', 'medium', 'large'})
+
+        original = ServiceImageSerializer(
+            service_image, context={'request': self.factory.get('/', {'image_size': 'original'})}
+        ).data
+        self.assertTrue(original['image'].endswith(service_image.image.name))
+
+    def test_serializer_falls_back_to_original_before_generation(self):
+        """Until derivatives exist the original URL is served"""
+        with override_settings(IMAGE_DERIVATIVES={'DISPATCH': 'celery'}):
+            service_image = ServiceImage.objects.create(
+                service=self.service,
+                image=SimpleUploadedFile('photo.jpg', make_image(), content_type='image/jpeg')
+            )
+
+        data = ServiceImageSerializer(service_image, context={'request': self.factory.get('/')}).data
+        self.assertTrue(data['image'].endswith(service_image.image.name))
+        self.assertEqual(data['image_variants'], {})
+
+    def test_replacing_image_regenerates_and_removes_stale_files(self):
+        """A new upload replaces the variants and deletes the previous derivatives"""
+        service_image = self.create_service_image()
+        service_image.refresh_from_db()
+        old_webp = service_image.image_variants['sizes']['small']['webp']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            service_image.image = SimpleUploadedFile('new.png', make_image(image_format='PNG', mode='RGBA'))
+            service_image.save()
+        service_image.refresh_from_db()
+
+        self.assertEqual(service_image.image_variants['source'], service_image.image.name)
+        self.assertFalse(default_storage.exists(old_webp))
+        # Transparent PNGs still get an (opaque) JPEG fallback
+        with default_storage.open(service_image.image_variants['sizes']['small']['jpeg']) as f:
+            self.assertEqual(Image.open(f).mode, 'RGB')
+
+    def test_delivery_photo_variants_are_keyed_by_url(self):
+        """Delivery photo derivatives are merged into the delivery by photo URL"""
+        customer = User.objects.create_user(
+            username='imagecustomer', email='customer@images.test', password='testpass123', role='customer'
+        )
+        booking = Booking.objects.create(
+            service=self.service,
+            customer=customer,
+            status='completed',
+            price=Decimal('2500.00'),
+            total_amount=Decimal('2500.00'),
+            booking_date='2026-01-10',
+            booking_time='10:00',
+            address='Patan',
+            city='Lalitpur',
+            phone='9800000001'
+        )
+        name = default_storage.save('service_delivery_photos/1/photo.jpg', io.BytesIO(make_image()))
+        url = f'http://localhost:8000{default_storage.url(name)}'
+        delivery = ServiceDelivery.objects.create(booking=booking, delivered_by=self.provider, delivery_photos=[url])
+
+        generate_mapped_image_derivatives('bookings.ServiceDelivery', delivery.pk, 'delivery_photo_variants', [[url, name]])
+
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.delivery_photo_variants[url]['source'], name)
+        self.assertEqual(delivery.delivery_photo_variants[url]['sizes']['large']['width'], 1200)
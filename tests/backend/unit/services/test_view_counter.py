@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.services.models import Service, ServiceCategory, ServiceDailyView
+from apps.services.view_counter import service_view_counter
+
+
+@override_settings(SERVICE_VIEWS={'FLUSH_INTERVAL_SECONDS': 3600, 'MAX_BUFFERED_SERVICES': 500, 'DEDUPE_SECONDS': 0})
+class ServiceViewCounterTest(TestCase):
+    """Test cases for buffered, bulk-flushed service view counting"""
+
+    def setUp(self):
+        cache.clear()
+        service_view_counter.flush()
+        provider = User.objects.create_user(
+            username='viewprovider', email='provider@views.test', password='testpass123', role='provider'
+        )
+        category = ServiceCategory.objects.create(title='Gardening')
+        self.services = [
+            Service.objects.create(
+                provider=provider, category=category, title=f'Lawn care {index}', slug=f'lawn-care-{index}',
+                description='Lawn', price=Decimal('400.00'), status='active'
+            )
+            for index in range(3)
+        ]
+
+    def tearDown(self):
+        service_view_counter.flush()
+
+    def test_views_are_buffered_then_flushed_in_bulk(self):
+        """Views only touch the database on flush, with one UPDATE per distinct delta"""
+        with CaptureQueriesContext(connection) as queries:
+            for service, views in zip(self.services, [5, 1, 1]):
+                for _ in range(views):
+                    service_view_counter.record(service.id)
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertEqual(service_view_counter.pending_views(), 7)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(service_view_counter.flush(), 7)
+        service_updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "services_service"')]
+        self.assertEqual(len(service_updates), 2)
+
+        self.assertEqual(
+            list(Service.objects.order_by('pk').values_list('view_count', flat=True)), [5, 1, 1]
+        )
+        today = ServiceDailyView.objects.get(service=self.services[0], date=timezone.localdate())
+        self.assertEqual(today.views, 5)
+
+        service_view_counter.record(self.services[0].id)
+        service_view_counter.flush()
+        today.refresh_from_db()
+        self.assertEqual(today.views, 6)
+
+    @override_settings(SERVICE_VIEWS={'FLUSH_INTERVAL_SECONDS': 0, 'MAX_BUFFERED_SERVICES': 500, 'DEDUPE_SECONDS': 60})
+    def test_endpoint_dedupes_repeat_views(self):
+        """The same viewer counts once per dedupe window"""
+        client = APIClient()
+        client.force_authenticate(self.services[0].provider)
+        url = f'/api/services/{self.services[1].slug}/increment_view/'
+
+        first = client.post(url)
+        second = client.post(url)
+
+        self.assertEqual((first.data['counted'], second.data['counted']), (True, False))
+        self.services[1].refresh_from_db()
+        self.assertEqual(self.services[1].view_count, 1)
+        self.assertEqual(client.post('/api/services/missing-service/increment_view/').status_code, 404)